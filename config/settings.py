@@ -38,6 +38,10 @@ HISTORY = 60
 GRAPH_WIDTH = 800
 GRAPH_HEIGHT = 20
 
+# Perfil de ahorro con la pantalla atenuada/apagada: multiplica el refresco de la UI
+# y el sondeo de los monitores que solo alimentan ventanas (no el de las alertas)
+IDLE_STRETCH = 10
+
 # Umbrales de advertencia y críticos
 CPU_WARN = 60
 CPU_CRIT = 85
@@ -26,6 +26,7 @@ from .weather_service import WeatherService
 from .i2c_monitor import I2CMonitor
 from .gpio_monitor import GPIOMonitor
 from .event_bus import EventBus, get_event_bus
+from .demand_registry import DemandRegistry, get_demand_registry
 from .data_logger import DataLogger
 from .data_analyzer import DataAnalyzer
 from .data_collection_service import DataCollectionService
@@ -58,6 +59,8 @@ __all__ = [
     'GPIOMonitor',
     'EventBus',
     'get_event_bus',
+    'DemandRegistry',
+    'get_demand_registry',
     'DataLogger',
     'DataAnalyzer',
     'DataCollectionService',
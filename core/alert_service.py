@@ -5,6 +5,11 @@ Sin dependencias nuevas — usa urllib de la stdlib.
 Lógica anti-spam: cada alerta debe mantenerse activa durante
 ALERT_SUSTAIN_S segundos antes de enviarse, y no se repite
 hasta que baje del umbral y vuelva a subir (edge-trigger).
+
+Historial: cada alerta enviada se añade a la tabla alert_history de
+data/history.db (una inserción, sin reescribir nada). La retención la marca
+la limpieza de la BD (CleanupService); el antiguo data/alert_history.json
+se importa una sola vez al arrancar.
 """
 import threading
 import time
@@ -12,9 +17,12 @@ import json
 import urllib.request
 import urllib.error
 from pathlib import Path
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
+from core.data_logger import DataLogger
+from core.demand_registry import get_demand_registry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +33,9 @@ ALERT_SUSTAIN_S = 60
 # Intervalo de comprobación (segundos)
 CHECK_INTERVAL  = 15
 
+# Cadencia mínima de ServiceMonitor que necesita la alerta de servicios caídos
+SERVICES_LEASE_S = ALERT_SUSTAIN_S
+
 # Umbrales (se pueden sobrescribir en settings.py si se prefiere)
 THRESHOLDS = {
     'temp':  {'warn': 60, 'crit': 70},
@@ -32,10 +43,10 @@ THRESHOLDS = {
     'ram':   {'warn': 85, 'crit': 95},
     'disk':  {'warn': 85, 'crit': 95},
 }
-# Constante: máximo de entradas en el historial
-MAX_HISTORY_ENTRIES = 100
-# Archivo JSON para persistir el historial de alertas enviadas
-_HISTORY_FILE = Path(__file__).resolve().parent.parent / "data" / "alert_history.json"
+# Máximo de entradas que devuelve get_history() por consulta (la BD guarda todas)
+MAX_HISTORY_ENTRIES = 500
+# Historial en JSON de versiones anteriores: se importa a la BD y se renombra a .bak
+_LEGACY_HISTORY_FILE = Path(__file__).resolve().parent.parent / "data" / "alert_history.json"
 
 def _load_telegram_config() -> tuple:
     """
@@ -84,13 +95,15 @@ class AlertService:
     Nota: Si no se configuran token y chat_id de Telegram, las alertas se desactivan.
     """
 
-    def __init__(self, system_monitor, service_monitor):
+    def __init__(self, system_monitor, service_monitor,
+                 data_logger: Optional[DataLogger] = None):
         """
         Inicializa el servicio de alertas con los monitores del sistema y de servicios.
 
         Args:
             system_monitor: Monitor de métricas del sistema como CPU, temperatura, RAM y disco.
             service_monitor: Monitor de servicios para detectar fallas.
+            data_logger (DataLogger, opcional): BD donde se guarda el historial.
 
         Returns:
             None
@@ -100,6 +113,8 @@ class AlertService:
         """
         self._system_monitor  = system_monitor
         self._service_monitor = service_monitor
+        self._data_logger     = data_logger or DataLogger()
+        self._migrate_legacy_history()
 
         self._token, self._chat_id = _load_telegram_config()
 
@@ -141,6 +156,7 @@ class AlertService:
             target=self._loop, daemon=True, name="AlertService"
         )
         self._thread.start()
+        get_demand_registry().acquire("service_monitor", "alert_service", SERVICES_LEASE_S)
         logger.info("[AlertService] Servicio iniciado (cada %ds)", CHECK_INTERVAL)
 
 
@@ -161,6 +177,7 @@ class AlertService:
         self._stop_evt.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5)
+        get_demand_registry().release("service_monitor", "alert_service")
         logger.info("[AlertService] Servicio detenido")
 
     
@@ -327,7 +344,7 @@ class AlertService:
             
     def _save_to_history(self, key: str, message: str, value: float, unit: str, level: str) -> None:
         """
-        Guarda una alerta disparada en el historial de registros.
+        Añade una alerta disparada al historial de la BD.
 
         Args:
             key (str): Clave identificativa de la alerta.
@@ -340,7 +357,7 @@ class AlertService:
             None
 
         Raises:
-            Exception: Si ocurre un error durante el guardado del historial.
+            None
         """
         entry = {
             "ts":      time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -351,40 +368,83 @@ class AlertService:
             "message": message.replace("*", "").replace("\n", " "),  # limpiar markdown
         }
         try:
-            _HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-            history = []
-            if _HISTORY_FILE.exists():
-                with open(_HISTORY_FILE, "r", encoding="utf-8") as f:
-                    history = json.load(f)
-            history.append(entry)
-            # Mantener solo las últimas MAX_HISTORY_ENTRIES
-            history = history[-MAX_HISTORY_ENTRIES:]
-            with open(_HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
+            self._data_logger.log_alerts([entry])
         except Exception as e:
             logger.error("[AlertService] Error guardando historial: %s", e)
 
-    def get_history(self) -> list:
+    def _migrate_legacy_history(self) -> None:
         """
-        Obtiene el historial de alertas enviadas desde el archivo de datos.
+        Importa el historial JSON de versiones anteriores a la BD (una sola vez).
+
+        Tras importarlo, el fichero se renombra a alert_history.json.bak.
 
         Args:
             None
 
         Returns:
-            list[dict]: Entradas con información de alertas, incluyendo timestamp, clave, nivel, valor, unidad y mensaje, ordenadas por recencia.
+            None
+
+        Raises:
+            None
+        """
+        if not _LEGACY_HISTORY_FILE.exists():
+            return
+        try:
+            with open(_LEGACY_HISTORY_FILE, "r", encoding="utf-8") as f:
+                entries = [e for e in json.load(f) if isinstance(e, dict) and e.get("ts")]
+            self._data_logger.log_alerts(entries)
+            os.replace(_LEGACY_HISTORY_FILE,
+                       _LEGACY_HISTORY_FILE.with_name(_LEGACY_HISTORY_FILE.name + ".bak"))
+            logger.info("[AlertService] Historial JSON importado a la BD (%d alertas)",
+                        len(entries))
+        except Exception as e:
+            logger.error("[AlertService] Error importando historial JSON: %s", e)
+
+    def get_history(self, key: Optional[str] = None, level: Optional[str] = None,
+                    since: Optional[datetime] = None,
+                    limit: int = MAX_HISTORY_ENTRIES) -> List[Dict]:
+        """
+        Obtiene el historial de alertas enviadas, filtrado en la BD.
+
+        Args:
+            key (str, opcional): Solo alertas con esta clave (p. ej. 'temp_crit').
+            level (str, opcional): Solo alertas de este nivel ('warn' o 'crit').
+            since (datetime, opcional): Solo alertas posteriores a esta fecha.
+            limit (int): Máximo de entradas, las más recientes.
+
+        Returns:
+            list[dict]: Entradas con información de alertas, incluyendo timestamp, clave, nivel, valor, unidad y mensaje, en orden cronológico.
 
         Raises:
             None
         """
         try:
-            if _HISTORY_FILE.exists():
-                with open(_HISTORY_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except Exception:
-            pass
+            return self._data_logger.get_alerts(key=key, level=level, since=since, limit=limit)
+        except Exception as e:
+            logger.error("[AlertService] Error leyendo historial: %s", e)
         return []
 
+    def count_history(self, key: Optional[str] = None, level: Optional[str] = None,
+                      since: Optional[datetime] = None) -> int:
+        """
+        Cuenta las alertas del historial que cumplen los filtros.
+
+        Args:
+            key (str, opcional): Clave de alerta.
+            level (str, opcional): Nivel ('warn' o 'crit').
+            since (datetime, opcional): Solo alertas posteriores a esta fecha.
+
+        Returns:
+            int: Número de alertas (0 si la BD no está disponible).
+
+        Raises:
+            None
+        """
+        try:
+            return self._data_logger.count_alerts(key=key, level=level, since=since)
+        except Exception as e:
+            logger.error("[AlertService] Error contando historial: %s", e)
+        return 0
 
     def clear_history(self) -> None:
         """
@@ -400,8 +460,7 @@ class AlertService:
             Exception: Si ocurre un error al borrar el historial.
         """
         try:
-            if _HISTORY_FILE.exists():
-                _HISTORY_FILE.unlink()
+            self._data_logger.clear_alerts()
             logger.info("[AlertService] Historial de alertas borrado")
         except Exception as e:
             logger.error("[AlertService] Error borrando historial: %s", e)
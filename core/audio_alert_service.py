@@ -13,6 +13,7 @@ import threading
 import time
 import os
 from pathlib import Path
+from core.demand_registry import get_demand_registry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -29,6 +30,9 @@ _THRESHOLDS = {
 WARN_REPEAT_S = 45 # cada 45 segundos mientras siga en aviso
 CRIT_REPEAT_S = 30       # cada 30 segundos mientras siga crítico
 
+# Cadencia mínima de ServiceMonitor para detectar servicios caídos
+_SERVICES_LEASE_S = 60
+
 # ── Sonidos ───────────────────────────────────────────────────────────────────
 _SOUNDS_DIR = Path(__file__).resolve().parent.parent / "scripts" / "sounds"
 
@@ -146,6 +150,9 @@ class AudioAlertService:
             target=self._loop, daemon=True, name="AudioAlertService"
         )
         self._thread.start()
+        if self._service_monitor:
+            get_demand_registry().acquire(
+                "service_monitor", "audio_alert_service", _SERVICES_LEASE_S)
         logger.info("[AudioAlertService] Iniciado")
 
 
@@ -166,6 +173,7 @@ class AudioAlertService:
         self._stop_evt.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5)
+        get_demand_registry().release("service_monitor", "audio_alert_service")
         logger.info("[AudioAlertService] Detenido")
 
     
@@ -240,6 +240,163 @@ class DataAnalyzer:
         data = self.get_data_range_between(start, end)
         self._write_csv(output_path, data)
 
+    # ─────────────────────────────────────────────
+    # Disco por dispositivo
+    # ─────────────────────────────────────────────
+
+    def get_disk_devices(self, start: datetime, end: datetime) -> List[str]:
+        """
+        Lista los dispositivos de bloque con datos agregados en un rango de fechas.
+
+        Args:
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+
+        Returns:
+            List[str]: Nombres de dispositivo ordenados.
+        """
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                rows = conn.execute('''
+                    SELECT DISTINCT device FROM disk_device_metrics
+                    WHERE timestamp >= ? AND timestamp <= ?
+                    ORDER BY device
+                ''', (_fmt(start), _fmt(end))).fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.OperationalError as e:
+            logger.error("[DataAnalyzer] get_disk_devices: error BD: %s", e)
+            return []
+
+    def get_disk_device_rollup(self, device: str, start: datetime, end: datetime,
+                               bucket_minutes: int = 60) -> List[Dict]:
+        """
+        Agrega las métricas de un dispositivo en tramos de tiempo fijos.
+
+        Args:
+            device (str): Nombre del dispositivo (ej. 'nvme0n1').
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+            bucket_minutes (int): Duración de cada tramo en minutos (por defecto 60).
+
+        Returns:
+            List[Dict]: Por tramo: timestamp (inicio), read_mb, write_mb, iops,
+                        queue_depth y util_percent medios, y await_ms máximo.
+        """
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute('''
+                    SELECT MIN(timestamp)                  AS timestamp,
+                           AVG(read_mb)                    AS read_mb,
+                           AVG(write_mb)                   AS write_mb,
+                           AVG(read_iops + write_iops)     AS iops,
+                           AVG(queue_depth)                AS queue_depth,
+                           MAX(await_ms)                   AS await_ms,
+                           AVG(util_percent)               AS util_percent
+                    FROM disk_device_metrics
+                    WHERE device = ? AND timestamp >= ? AND timestamp <= ?
+                    GROUP BY CAST(strftime('%s', timestamp) AS INTEGER) / ?
+                    ORDER BY timestamp ASC
+                ''', (device, _fmt(start), _fmt(end), bucket_minutes * 60)).fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.OperationalError as e:
+            logger.error("[DataAnalyzer] get_disk_device_rollup %s: error BD: %s", device, e)
+            return []
+
+    def get_disk_health_trend(self, start: datetime, end: datetime,
+                              device: str = "nvme0") -> List[Dict]:
+        """
+        Obtiene las lecturas SMART guardadas de un NVMe entre dos fechas.
+
+        Args:
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+            device (str): Controlador NVMe (por defecto 'nvme0').
+
+        Returns:
+            List[Dict]: Lecturas con temperatura, desgaste y datos escritos/leídos.
+        """
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute('''
+                    SELECT * FROM disk_health
+                    WHERE device = ? AND timestamp >= ? AND timestamp <= ?
+                    ORDER BY timestamp ASC
+                ''', (device, _fmt(start), _fmt(end))).fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.OperationalError as e:
+            logger.error("[DataAnalyzer] get_disk_health_trend %s: error BD: %s", device, e)
+            return []
+
+    # ─────────────────────────────────────────────
+    # Pi-hole (DNS)
+    # ─────────────────────────────────────────────
+
+    def get_pihole_rollup(self, start: datetime, end: datetime,
+                          bucket_minutes: int = 60) -> List[Dict]:
+        """
+        Agrega la serie temporal de Pi-hole en tramos de tiempo fijos.
+
+        Args:
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+            bucket_minutes (int): Duración de cada tramo en minutos (por defecto 60).
+
+        Returns:
+            List[Dict]: Por tramo: timestamp (inicio), queries, blocked, cached y
+                        forwarded (sumas), queries_per_min, block_percent y clients (máximo).
+        """
+        try:
+            with sqlite3.connect(self._db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute('''
+                    SELECT MIN(timestamp)                  AS timestamp,
+                           SUM(queries)                    AS queries,
+                           SUM(blocked)                    AS blocked,
+                           SUM(cached)                     AS cached,
+                           SUM(forwarded)                  AS forwarded,
+                           SUM(interval_s)                 AS seconds,
+                           MAX(clients)                    AS clients
+                    FROM pihole_metrics
+                    WHERE timestamp >= ? AND timestamp <= ?
+                    GROUP BY CAST(strftime('%s', timestamp) AS INTEGER) / ?
+                    ORDER BY timestamp ASC
+                ''', (_fmt(start), _fmt(end), bucket_minutes * 60)).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.error("[DataAnalyzer] get_pihole_rollup: error BD: %s", e)
+            return []
+
+        result = []
+        for row in rows:
+            bucket = dict(row)
+            seconds = bucket.pop('seconds') or 0
+            queries = bucket['queries'] or 0
+            bucket['queries_per_min'] = queries * 60 / seconds if seconds else 0.0
+            bucket['block_percent'] = 100.0 * (bucket['blocked'] or 0) / queries if queries else 0.0
+            result.append(bucket)
+        return result
+
+    def get_pihole_graph_data(self, metric: str, start: datetime, end: datetime,
+                              bucket_minutes: int = 60) -> Tuple[List, List]:
+        """
+        Obtiene una métrica agregada de Pi-hole lista para graficar.
+
+        Args:
+            metric (str): Campo de get_pihole_rollup() (ej. 'queries_per_min', 'block_percent').
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+            bucket_minutes (int): Duración de cada tramo en minutos.
+
+        Returns:
+            Tuple[List, List]: Timestamps y valores por tramo.
+        """
+        try:
+            return self._extract_metric(self.get_pihole_rollup(start, end, bucket_minutes), metric)
+        except Exception as e:
+            logger.error("[DataAnalyzer] get_pihole_graph_data %s: %s", metric, e)
+            return [], []
+
     # ─────────────────────────────────────────────
     # Detección de anomalías
     # ─────────────────────────────────────────────
@@ -5,10 +5,14 @@ import threading
 import time
 from datetime import datetime
 from core import DataLogger
+from core.demand_registry import get_demand_registry
 from utils.file_manager import FileManager
 from utils.logger import get_logger
  
 logger = get_logger(__name__)
+
+# Cadencia mínima de DiskMonitor: las tasas de I/O se promedian sobre este intervalo
+_DISK_LEASE_S = 60
  
  
 class DataCollectionService:
@@ -22,6 +26,7 @@ class DataCollectionService:
         disk_monitor: Monitor de disco.
         update_monitor: Monitor de actualizaciones.
         interval_minutes (int): Minutos entre recolecciones (por defecto, 5).
+        pihole_monitor: Monitor de Pi-hole (opcional) para la serie temporal DNS.
 
     Returns:
         None
@@ -55,7 +60,8 @@ class DataCollectionService:
 
  
     def __init__(self, system_monitor, fan_controller, network_monitor,
-                 disk_monitor, update_monitor, interval_minutes: int = 5):
+                 disk_monitor, update_monitor, interval_minutes: int = 5,
+                 pihole_monitor=None):
         """
         Inicializa el servicio de recolección de datos con fuentes métricas y un intervalo de actualización.
 
@@ -66,6 +72,7 @@ class DataCollectionService:
             disk_monitor: Fuente de monitorización del disco.
             update_monitor: Fuente de monitorización de actualizaciones.
             interval_minutes (int): Intervalo en minutos entre recolecciones de datos (por defecto, 5).
+            pihole_monitor: Monitor de Pi-hole (opcional) para la serie temporal DNS.
 
         Raises: 
             None
@@ -80,9 +87,11 @@ class DataCollectionService:
         self._network_monitor  = network_monitor
         self._disk_monitor     = disk_monitor
         self._update_monitor   = update_monitor
+        self._pihole_monitor   = pihole_monitor
         self._interval_minutes = interval_minutes
  
         self._data_logger = DataLogger()
+        self._last_smart_ts = None   # última lectura SMART ya guardada
         self._running     = False
         self._stop_evt    = threading.Event()
         self._thread      = None
@@ -114,6 +123,7 @@ class DataCollectionService:
             target=self._collection_loop, daemon=True, name="DataCollection"
         )
         self._thread.start()
+        get_demand_registry().acquire("disk_monitor", "data_service", _DISK_LEASE_S)
         logger.info("[DataCollection] Servicio iniciado (cada %d min)", self._interval_minutes)
  
     def stop(self):
@@ -135,6 +145,7 @@ class DataCollectionService:
         self._stop_evt.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=6)
+        get_demand_registry().release("disk_monitor", "data_service")
         logger.info("[DataCollection] Servicio detenido")
  
     def is_running(self) -> bool:
@@ -189,6 +200,7 @@ class DataCollectionService:
         disk_stats    = self._disk_monitor.get_current_stats()
         update_stats  = self._update_monitor.check_updates()
         fan_state     = self._fan_file.load_state()
+        cores         = system_stats.get('cpu_cores', [])
  
         metrics = {
             'cpu_percent':       system_stats.get('cpu', 0),
@@ -204,9 +216,22 @@ class DataCollectionService:
             'fan_mode':          fan_state.get('mode', 'unknown'),
             'updates_available': update_stats.get('pending', 0),
             'uptime_s':          system_stats.get('uptime_s', 0),
+            'cpu_freq_mhz':      system_stats.get('cpu_freq_mhz', 0),
+            'cpu_core_max_percent': max(cores) if cores else None,
+            'cpu_cores_percent': [round(c, 1) for c in cores],
+            'throttled':         system_stats.get('throttled'),
         }
  
         self._data_logger.log_metrics(metrics)
+        self._data_logger.log_disk_rollup(self._disk_monitor.take_rollup())
+        if self._pihole_monitor is not None:
+            self._data_logger.log_pihole_samples(self._pihole_monitor.take_rollup())
+
+        # SMART solo si el recolector tiene una lectura nueva desde la última vez
+        smart = self._disk_monitor.get_nvme_smart()
+        if smart.get('available') and smart.get('timestamp') != self._last_smart_ts:
+            self._data_logger.log_disk_health(smart)
+            self._last_smart_ts = smart.get('timestamp')
  
         if metrics['temperature'] > 80:
             self._data_logger.log_event(
@@ -222,6 +247,16 @@ class DataCollectionService:
                 {'cpu': metrics['cpu_percent']}
             )
  
+        flags = system_stats.get('throttle_flags', {})
+        active = [name for name in ('under_voltage', 'freq_capped', 'throttled', 'soft_temp_limit')
+                  if flags.get(name)]
+        if active:
+            self._data_logger.log_event(
+                'cpu_throttled', 'warning',
+                "Throttling activo: %s" % ", ".join(active),
+                {'throttled': metrics['throttled'], 'flags': active}
+            )
+ 
         logger.info(
             "[DataCollection] Métricas guardadas: %s",
             datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -5,9 +5,17 @@ import sqlite3
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 from utils import DashboardLogger
 
+# Columnas añadidas tras la versión inicial del esquema: se migran con ALTER TABLE
+_METRICS_EXTRA_COLUMNS = {
+    'cpu_freq_mhz':         'REAL',
+    'cpu_core_max_percent': 'REAL',
+    'cpu_cores_percent':    'TEXT',
+    'throttled':            'INTEGER',
+}
+
 
 class DataLogger:
     """
@@ -75,15 +83,122 @@ class DataLogger:
                     fan_pwm INTEGER,
                     fan_mode TEXT,
                     updates_available INTEGER,
-                    uptime_s INTEGER
+                    uptime_s INTEGER,
+                    cpu_freq_mhz REAL,
+                    cpu_core_max_percent REAL,
+                    cpu_cores_percent TEXT,
+                    throttled INTEGER
                 )
             ''')
 
+            self._migrate_metrics(cursor)
+
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_timestamp
                 ON metrics(timestamp)
             ''')
 
+            # Agregados por intervalo de recolección, uno por dispositivo / montaje
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS disk_device_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    device TEXT,
+                    read_mb REAL,
+                    write_mb REAL,
+                    read_iops REAL,
+                    write_iops REAL,
+                    queue_depth REAL,
+                    await_ms REAL,
+                    util_percent REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_disk_device_ts
+                ON disk_device_metrics(device, timestamp)
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS mount_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    mountpoint TEXT,
+                    device TEXT,
+                    fstype TEXT,
+                    used_percent REAL,
+                    used_gb REAL,
+                    total_gb REAL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_mount_usage_ts
+                ON mount_usage(mountpoint, timestamp)
+            ''')
+
+            # Tendencias SMART (desgaste y temperatura), una fila por lectura de smartctl
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS disk_health (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    device TEXT,
+                    temperature REAL,
+                    percentage_used INTEGER,
+                    data_written_tb REAL,
+                    data_read_tb REAL,
+                    power_on_hours INTEGER,
+                    unsafe_shutdowns INTEGER,
+                    media_errors INTEGER
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_disk_health_ts
+                ON disk_health(device, timestamp)
+            ''')
+
+            # Serie temporal de Pi-hole: un registro por tramo de /api/history
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS pihole_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    interval_s REAL,
+                    queries INTEGER,
+                    blocked INTEGER,
+                    cached INTEGER,
+                    forwarded INTEGER,
+                    clients INTEGER
+                )
+            ''')
+            self._migrate_pihole(cursor)
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_pihole_metrics_slot
+                ON pihole_metrics(timestamp)
+            ''')
+
+            # Historial de alertas enviadas por AlertService (append-only)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS alert_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME,
+                    key TEXT,
+                    level TEXT,
+                    value REAL,
+                    unit TEXT,
+                    message TEXT
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_alert_history_ts
+                ON alert_history(timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_alert_history_key
+                ON alert_history(key, timestamp)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_alert_history_level
+                ON alert_history(level, timestamp)
+            ''')
+
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -97,6 +212,44 @@ class DataLogger:
 
             conn.commit()
 
+    @staticmethod
+    def _migrate_metrics(cursor):
+        """
+        Añade a la tabla metrics las columnas que falten en BDs creadas con un esquema anterior.
+
+        Args:
+            cursor: Cursor SQLite abierto sobre la BD.
+
+        Returns:
+            None
+        """
+        cursor.execute('PRAGMA table_info(metrics)')
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, col_type in _METRICS_EXTRA_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE metrics ADD COLUMN {column} {col_type}')
+
+    @staticmethod
+    def _migrate_pihole(cursor):
+        """
+        Prepara pihole_metrics para el upsert por tramo en BDs con el esquema anterior.
+
+        Quita el índice no único y las filas con timestamp repetido, que
+        impedirían crear idx_pihole_metrics_slot.
+
+        Args:
+            cursor: Cursor SQLite abierto sobre la BD.
+
+        Returns:
+            None
+        """
+        cursor.execute('DROP INDEX IF EXISTS idx_pihole_metrics_ts')
+        cursor.execute('''
+            DELETE FROM pihole_metrics WHERE id NOT IN (
+                SELECT MIN(id) FROM pihole_metrics GROUP BY timestamp
+            )
+        ''')
+
     def log_metrics(self, metrics: Dict):
         """
         Guarda un conjunto de métricas en la base de datos.
@@ -122,8 +275,9 @@ class DataLogger:
                     cpu_percent, ram_percent, ram_used_gb, temperature,
                     disk_used_percent, disk_read_mb, disk_write_mb,
                     net_download_mb, net_upload_mb, fan_pwm, fan_mode, updates_available,
-                    uptime_s
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    uptime_s, cpu_freq_mhz, cpu_core_max_percent, cpu_cores_percent,
+                    throttled
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 now,
                 metrics.get('cpu_percent'),
@@ -138,9 +292,133 @@ class DataLogger:
                 metrics.get('fan_pwm'),
                 metrics.get('fan_mode'),
                 metrics.get('updates_available'),
-                metrics.get('uptime_s')
+                metrics.get('uptime_s'),
+                metrics.get('cpu_freq_mhz'),
+                metrics.get('cpu_core_max_percent'),
+                json.dumps(metrics['cpu_cores_percent']) if metrics.get('cpu_cores_percent') else None,
+                metrics.get('throttled'),
+            ))
+
+            conn.commit()
+
+    def log_disk_rollup(self, rollup: Dict):
+        """
+        Guarda el agregado por dispositivo y el uso por montaje de un intervalo.
+
+        Args:
+            rollup (Dict): Resultado de DiskMonitor.take_rollup()
+                           ({'devices': {device: métricas}, 'mounts': [...]}).
+
+        Returns:
+            None
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al escribir en la base de datos.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        devices = rollup.get('devices', {})
+        mounts  = rollup.get('mounts', [])
+        with sqlite3.connect(self._db_path) as conn:
+            conn.executemany('''
+                INSERT INTO disk_device_metrics (
+                    timestamp, device, read_mb, write_mb, read_iops, write_iops,
+                    queue_depth, await_ms, util_percent
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (now, dev, m['read_mb'], m['write_mb'], m['read_iops'], m['write_iops'],
+                 m['queue_depth'], m['await_ms'], m['util'])
+                for dev, m in devices.items()
+            ])
+            conn.executemany('''
+                INSERT INTO mount_usage (
+                    timestamp, mountpoint, device, fstype, used_percent, used_gb, total_gb
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (now, m['mountpoint'], m['device'], m['fstype'], m['percent'],
+                 round(m['used_gb'], 2), round(m['total_gb'], 2))
+                for m in mounts
+            ])
+            conn.commit()
+
+    def log_disk_health(self, smart: Dict):
+        """
+        Guarda una lectura SMART para las tendencias de desgaste y temperatura.
+
+        Args:
+            smart (Dict): Resultado de DiskMonitor.get_nvme_smart() con available=True.
+
+        Returns:
+            None
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al escribir en la base de datos.
+        """
+        ts = smart.get('timestamp')
+        when = datetime.fromtimestamp(ts) if ts else datetime.now()
+        with sqlite3.connect(self._db_path) as conn:
+            conn.execute('''
+                INSERT INTO disk_health (
+                    timestamp, device, temperature, percentage_used, data_written_tb,
+                    data_read_tb, power_on_hours, unsafe_shutdowns, media_errors
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                when.strftime("%Y-%m-%d %H:%M:%S"),
+                smart.get('device'),
+                smart.get('temperature'),
+                smart.get('percentage_used'),
+                smart.get('data_written_tb'),
+                smart.get('data_read_tb'),
+                smart.get('power_on_hours'),
+                smart.get('unsafe_shutdowns'),
+                smart.get('media_errors'),
             ))
+            conn.commit()
+
+    def log_pihole_samples(self, samples: List[Dict]):
+        """
+        Guarda (upsert por timestamp) los tramos de la serie temporal de Pi-hole.
+
+        Un tramo puede llegar otra vez (p.ej. tras reiniciar el dashboard, que
+        reingiere las últimas 24h): se conserva el mayor recuento, ya que el GC
+        de FTL solo puede recortar los tramos más antiguos. Las filas del formato
+        anterior (una por sondeo) que caen dentro de un tramo se sustituyen por él.
+
+        Args:
+            samples (List[Dict]): Resultado de PiholeMonitor.take_rollup().
 
+        Returns:
+            None
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al escribir en la base de datos.
+        """
+        if not samples:
+            return
+        fmt = '%Y-%m-%d %H:%M:%S'
+        with sqlite3.connect(self._db_path) as conn:
+            conn.executemany(
+                'DELETE FROM pihole_metrics WHERE timestamp > ? AND timestamp < ?', [
+                    (s['timestamp'],
+                     (datetime.strptime(s['timestamp'], fmt)
+                      + timedelta(seconds=s['interval_s'])).strftime(fmt))
+                    for s in samples
+                ])
+            conn.executemany('''
+                INSERT INTO pihole_metrics (
+                    timestamp, interval_s, queries, blocked, cached, forwarded, clients
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(timestamp) DO UPDATE SET
+                    interval_s = excluded.interval_s,
+                    queries    = MAX(queries,   excluded.queries),
+                    blocked    = MAX(blocked,   excluded.blocked),
+                    cached     = MAX(cached,    excluded.cached),
+                    forwarded  = MAX(forwarded, excluded.forwarded),
+                    clients    = COALESCE(excluded.clients, clients)
+            ''', [
+                (s['timestamp'], s['interval_s'], s['queries'], s['blocked'],
+                 s['cached'], s['forwarded'], s['clients'])
+                for s in samples
+            ])
             conn.commit()
 
     def log_event(self, event_type: str, severity: str, message: str, data: Dict = None):
@@ -172,6 +450,127 @@ class DataLogger:
             conn.commit()
 
 
+    def log_alerts(self, entries: List[Dict]):
+        """
+        Añade alertas al historial (una inserción por alerta, sin reescribir nada).
+
+        Args:
+            entries (List[Dict]): Entradas con ts, key, level, value, unit y message.
+
+        Returns:
+            None
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al escribir en la base de datos.
+        """
+        if not entries:
+            return
+        with sqlite3.connect(self._db_path) as conn:
+            conn.executemany('''
+                INSERT INTO alert_history (timestamp, key, level, value, unit, message)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (e['ts'], e.get('key', ''), e.get('level', ''), e.get('value', 0.0),
+                 e.get('unit', ''), e.get('message', ''))
+                for e in entries
+            ])
+            conn.commit()
+
+    @staticmethod
+    def _alert_filters(key: Optional[str], level: Optional[str],
+                       since: Optional[datetime]) -> tuple:
+        """
+        Construye la cláusula WHERE de las consultas del historial de alertas.
+
+        Args:
+            key (str, opcional): Clave de alerta exacta.
+            level (str, opcional): Nivel ('warn' o 'crit').
+            since (datetime, opcional): Solo alertas posteriores.
+
+        Returns:
+            tuple: (cláusula WHERE, parámetros).
+        """
+        clauses, params = [], []
+        if key:
+            clauses.append('key = ?')
+            params.append(key)
+        if level:
+            clauses.append('level = ?')
+            params.append(level)
+        if since is not None:
+            clauses.append('timestamp >= ?')
+            params.append(since.strftime("%Y-%m-%d %H:%M:%S"))
+        where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        return where, params
+
+    def get_alerts(self, key: Optional[str] = None, level: Optional[str] = None,
+                   since: Optional[datetime] = None, limit: int = 200) -> List[Dict]:
+        """
+        Consulta el historial de alertas usando los índices por clave, nivel y fecha.
+
+        Args:
+            key (str, opcional): Clave de alerta exacta.
+            level (str, opcional): Nivel ('warn' o 'crit').
+            since (datetime, opcional): Solo alertas posteriores.
+            limit (int): Máximo de entradas (las más recientes).
+
+        Returns:
+            List[Dict]: Entradas (ts, key, level, value, unit, message) en orden cronológico.
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al leer la base de datos.
+        """
+        where, params = self._alert_filters(key, level, since)
+        with sqlite3.connect(self._db_path) as conn:
+            rows = conn.execute(f'''
+                SELECT timestamp, key, level, value, unit, message
+                FROM alert_history {where}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            ''', (*params, limit)).fetchall()
+        return [
+            {"ts": ts, "key": k, "level": lv, "value": v, "unit": u, "message": m}
+            for ts, k, lv, v, u, m in reversed(rows)
+        ]
+
+    def count_alerts(self, key: Optional[str] = None, level: Optional[str] = None,
+                     since: Optional[datetime] = None) -> int:
+        """
+        Cuenta las alertas que cumplen los filtros.
+
+        Args:
+            key (str, opcional): Clave de alerta exacta.
+            level (str, opcional): Nivel ('warn' o 'crit').
+            since (datetime, opcional): Solo alertas posteriores.
+
+        Returns:
+            int: Número de alertas.
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al leer la base de datos.
+        """
+        where, params = self._alert_filters(key, level, since)
+        with sqlite3.connect(self._db_path) as conn:
+            return conn.execute(
+                f'SELECT COUNT(*) FROM alert_history {where}', params).fetchone()[0]
+
+    def clear_alerts(self):
+        """
+        Borra todo el historial de alertas.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            sqlite3.Error: Si ocurre un error al escribir en la base de datos.
+        """
+        with sqlite3.connect(self._db_path) as conn:
+            conn.execute('DELETE FROM alert_history')
+            conn.commit()
+
     def get_metrics_count(self) -> int:
         """
         Obtiene el número total de registros en la tabla de métricas.
@@ -227,6 +626,11 @@ class DataLogger:
 
             cursor.execute('DELETE FROM metrics WHERE timestamp < ?', (cutoff,))
             cursor.execute('DELETE FROM events  WHERE timestamp < ?', (cutoff,))
+            cursor.execute('DELETE FROM disk_device_metrics WHERE timestamp < ?', (cutoff,))
+            cursor.execute('DELETE FROM mount_usage WHERE timestamp < ?', (cutoff,))
+            cursor.execute('DELETE FROM disk_health WHERE timestamp < ?', (cutoff,))
+            cursor.execute('DELETE FROM pihole_metrics WHERE timestamp < ?', (cutoff,))
+            cursor.execute('DELETE FROM alert_history WHERE timestamp < ?', (cutoff,))
 
             conn.commit()
             cursor.execute('VACUUM')
@@ -0,0 +1,373 @@
+"""
+Registro de demanda (leases) sobre las fuentes de datos del dashboard.
+
+Las ventanas y los servicios adquieren interés en una fuente ("process_monitor",
+"service_monitor", ...) y lo liberan al cerrarse. Cada monitor consulta el
+registro para decidir su cadencia:
+  - Con un lease a ritmo completo (interval_s=None) sondea a su intervalo nativo
+  - Con leases "mínimos" (interval_s=N) sondea al menor de los intervalos pedidos
+  - Sin leases cae a su cadencia de reposo, o se detiene si no tiene ninguna
+
+Perfil de ahorro (idle): con la pantalla atenuada o apagada (DisplayService) los
+leases a ritmo completo se estiran IDLE_STRETCH veces; los leases mínimos de los
+servicios de alerta no cambian. Los bucles after() de las ventanas (ui/refresh_loop.py)
+se suspenden y UpdateLoop estira los badges con refresh_ms().
+
+Uso en un monitor:
+    self._demand = get_demand_registry()
+    while not self._demand.wait("process_monitor", self._stop_evt,
+                                active_s=PROCESS_POLL_INTERVAL, idle_s=None):
+        self._do_poll()
+    # En stop(), tras self._stop_evt.set():
+    self._demand.wake("process_monitor")
+
+Uso en una ventana o servicio:
+    get_demand_registry().acquire("service_monitor", "alert_service", interval_s=60)
+    ...
+    get_demand_registry().release("service_monitor", "alert_service")
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from config.settings import IDLE_STRETCH
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DemandRegistry:
+    """
+    Registro thread-safe de leases de interés sobre fuentes de datos.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Raises:
+        None
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """
+        Crea y devuelve la instancia única de DemandRegistry.
+
+        Args:
+            None
+
+        Returns:
+            La instancia única de DemandRegistry.
+
+        Raises:
+            None
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """
+        Inicializa el registro la primera vez que se instancia.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if self._initialized:
+            return
+
+        self._initialized = True
+        # source → {owner: interval_s | None}
+        self._leases: Dict[str, Dict[str, Optional[float]]] = {}
+        # source → contador de acquire, para despertar a los monitores en espera
+        self._generation: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._idle = False
+        self._idle_listeners: List[Callable[[bool], None]] = []
+
+    # ── Leases ────────────────────────────────────────────────────────────────
+
+    def acquire(self, source: str, owner: str, interval_s: Optional[float] = None) -> None:
+        """
+        Registra interés de un propietario en una fuente de datos.
+
+        Un segundo acquire del mismo propietario sustituye al anterior.
+
+        Args:
+            source (str): Nombre de la fuente (clave del ServiceRegistry).
+            owner (str): Identificador del interesado (ej. 'window:process_window').
+            interval_s (float, opcional): Intervalo máximo aceptable en segundos.
+                None pide el ritmo completo del monitor.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            self._leases.setdefault(source, {})[owner] = interval_s
+            self._generation[source] = self._generation.get(source, 0) + 1
+            self._cond.notify_all()
+        logger.debug("[DemandRegistry] acquire %s ← %s (%s)", source, owner,
+                     "completo" if interval_s is None else f"{interval_s}s")
+
+    def release(self, source: str, owner: str) -> None:
+        """
+        Libera el interés de un propietario en una fuente de datos.
+
+        Args:
+            source (str): Nombre de la fuente.
+            owner (str): Identificador del interesado.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            leases = self._leases.get(source)
+            if leases is not None:
+                leases.pop(owner, None)
+                if not leases:
+                    del self._leases[source]
+        logger.debug("[DemandRegistry] release %s ← %s", source, owner)
+
+    def release_owner(self, owner: str) -> None:
+        """
+        Libera todos los leases de un propietario.
+
+        Args:
+            owner (str): Identificador del interesado.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            for source in list(self._leases):
+                self._leases[source].pop(owner, None)
+                if not self._leases[source]:
+                    del self._leases[source]
+
+    # ── Consulta ──────────────────────────────────────────────────────────────
+
+    def has_demand(self, source: str) -> bool:
+        """
+        Indica si alguien tiene un lease sobre la fuente.
+
+        Args:
+            source (str): Nombre de la fuente.
+
+        Returns:
+            bool: True si hay al menos un lease.
+        """
+        with self._cond:
+            return bool(self._leases.get(source))
+
+    def is_watched(self, source: str) -> bool:
+        """
+        Indica si alguien pide la fuente a ritmo completo (normalmente una ventana abierta).
+
+        Args:
+            source (str): Nombre de la fuente.
+
+        Returns:
+            bool: True si hay al menos un lease con interval_s=None.
+        """
+        with self._cond:
+            return any(v is None for v in self._leases.get(source, {}).values())
+
+    def interval(self, source: str, active_s: float,
+                 idle_s: Optional[float] = None) -> Optional[float]:
+        """
+        Calcula el intervalo de sondeo efectivo para una fuente.
+
+        Args:
+            source (str): Nombre de la fuente.
+            active_s (float): Intervalo nativo del monitor (ritmo completo).
+            idle_s (float, opcional): Intervalo sin leases; None detiene el sondeo.
+
+        Returns:
+            Optional[float]: Segundos hasta el siguiente sondeo, o None si no hay que sondear.
+        """
+        with self._cond:
+            leases = list(self._leases.get(source, {}).values())
+        if not leases:
+            return idle_s
+        full_s = active_s * IDLE_STRETCH if self._idle else active_s
+        return min(full_s if v is None else max(v, active_s) for v in leases)
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Devuelve una copia de los leases activos, para diagnóstico.
+
+        Returns:
+            Dict[str, Dict[str, Optional[float]]]: source → {owner: interval_s}.
+        """
+        with self._cond:
+            return {s: dict(owners) for s, owners in self._leases.items()}
+
+    # ── Perfil de ahorro ──────────────────────────────────────────────────────
+
+    def set_idle(self, idle: bool) -> None:
+        """
+        Activa o desactiva el perfil de ahorro y avisa a los suscriptores.
+
+        Al salir del perfil se despierta a todos los monitores para que sondeen
+        de inmediato y la UI muestre datos frescos.
+
+        Args:
+            idle (bool): True con la pantalla atenuada/apagada.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            if self._idle == idle:
+                return
+            self._idle = idle
+            if not idle:
+                for source in self._leases:
+                    self._generation[source] = self._generation.get(source, 0) + 1
+            self._cond.notify_all()
+            listeners = list(self._idle_listeners)
+        logger.info("[DemandRegistry] Perfil de ahorro %s", "activado" if idle else "desactivado")
+        for cb in listeners:
+            try:
+                cb(idle)
+            except Exception as e:
+                logger.error("[DemandRegistry] Error en listener de perfil: %s", e)
+
+    def is_idle(self) -> bool:
+        """
+        Indica si el perfil de ahorro está activo.
+
+        Returns:
+            bool: True con la pantalla atenuada/apagada.
+        """
+        return self._idle
+
+    def refresh_ms(self, base_ms: int) -> int:
+        """
+        Devuelve el intervalo de refresco de UI a usar según el perfil activo.
+
+        Args:
+            base_ms (int): Intervalo normal en milisegundos.
+
+        Returns:
+            int: base_ms, o base_ms * IDLE_STRETCH con el perfil de ahorro activo.
+        """
+        return base_ms * IDLE_STRETCH if self._idle else base_ms
+
+    def add_idle_listener(self, callback: Callable[[bool], None]) -> None:
+        """
+        Suscribe un callback a los cambios del perfil de ahorro.
+
+        El callback se ejecuta en el thread que cambia el perfil: los temporizadores
+        de DisplayService al atenuar y el thread de Tk al detectar actividad.
+
+        Args:
+            callback (Callable[[bool], None]): Recibe el nuevo estado idle.
+
+        Returns:
+            None
+        """
+        with self._cond:
+            if callback not in self._idle_listeners:
+                self._idle_listeners.append(callback)
+
+    def remove_idle_listener(self, callback: Callable[[bool], None]) -> None:
+        """
+        Cancela la suscripción de un callback del perfil de ahorro.
+
+        Args:
+            callback (Callable[[bool], None]): Callback registrado previamente.
+
+        Returns:
+            None
+        """
+        with self._cond:
+            if callback in self._idle_listeners:
+                self._idle_listeners.remove(callback)
+
+    # ── Espera de los monitores ───────────────────────────────────────────────
+
+    def wait(self, source: str, stop_evt: threading.Event, active_s: float,
+             idle_s: Optional[float] = None) -> bool:
+        """
+        Espera hasta el siguiente sondeo de una fuente según la demanda actual.
+
+        Vuelve antes de tiempo si llega un acquire nuevo (para que una ventana
+        recién abierta reciba datos frescos) o si se pide parar el monitor.
+
+        Args:
+            source (str): Nombre de la fuente.
+            stop_evt (threading.Event): Evento de parada del monitor.
+            active_s (float): Intervalo nativo del monitor.
+            idle_s (float, opcional): Intervalo sin leases; None detiene el sondeo.
+
+        Returns:
+            bool: True si se pidió parar (igual que Event.wait), False si toca sondear.
+        """
+        start = time.monotonic()
+        with self._cond:
+            generation = self._generation.get(source, 0)
+            while not stop_evt.is_set():
+                if self._generation.get(source, 0) != generation:
+                    return False
+                timeout = self.interval(source, active_s, idle_s)
+                if timeout is not None:
+                    timeout -= time.monotonic() - start
+                    if timeout <= 0:
+                        return False
+                self._cond.wait(timeout)
+        return True
+
+    def wake(self, source: str) -> None:
+        """
+        Despierta a los monitores que esperan en wait(), típicamente al pararlos.
+
+        Args:
+            source (str): Nombre de la fuente.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._cond:
+            self._cond.notify_all()
+
+
+# Instancia global singleton
+_demand_registry = DemandRegistry()
+
+
+def get_demand_registry() -> DemandRegistry:
+    """
+    Obtiene la instancia global del registro de demanda.
+
+    Returns:
+        La instancia global de DemandRegistry.
+    """
+    return _demand_registry
@@ -1,17 +1,101 @@
 """
 Monitor de disco
+
+Además del agregado de psutil, lee /proc/diskstats para métricas por dispositivo
+(MB/s, IOPS, cola media y latencia) y statvfs de cada sistema de archivos montado.
 """
-import subprocess
-import json
+import os
 import threading
+import time
 from collections import deque
-from typing import Dict
+from typing import Dict, List
 from config.settings import HISTORY, UPDATE_MS, COLORS
-from utils.system_utils import SystemUtils, get_logger
+from utils.system_utils import get_logger
+from core.demand_registry import get_demand_registry
+from core.smart_collector import SmartCollector
 import psutil
 
 logger = get_logger(__name__)
 
+# Consumidores: DiskWindow/Overview (ritmo completo) y DataCollection (lease mínimo).
+# Sin ningún lease el sondeo se detiene.
+_DEMAND_KEY = "disk_monitor"
+
+_DISKSTATS_PATH = "/proc/diskstats"
+_SYS_BLOCK_PATH = "/sys/block"
+_SECTOR_BYTES   = 512
+# Dispositivos virtuales sin interés para el dashboard
+_IGNORED_DEVICE_PREFIXES = ("loop", "ram", "zram", "fd")
+# Sistemas de archivos montados que no se muestran (snaps, overlays, memoria)
+_IGNORED_FSTYPES = ("squashfs", "tmpfs", "devtmpfs", "overlay")
+
+# Métricas por dispositivo con historial propio
+DEVICE_METRICS = ("read_mb", "write_mb", "read_iops", "write_iops",
+                  "queue_depth", "await_ms", "util")
+
+
+def _read_diskstats() -> Dict[str, tuple]:
+    """
+    Lee los contadores acumulados de los discos completos (sin particiones) de /proc/diskstats.
+
+    Returns:
+        Dict[str, tuple]: device → (reads, sectores_leídos, ms_lectura, writes,
+                          sectores_escritos, ms_escritura, ms_io, ms_io_ponderado).
+    """
+    try:
+        disks = set(os.listdir(_SYS_BLOCK_PATH))
+    except OSError:
+        disks = None
+    counters = {}
+    try:
+        with open(_DISKSTATS_PATH) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 14:
+                    continue
+                name = parts[2]
+                if name.startswith(_IGNORED_DEVICE_PREFIXES):
+                    continue
+                if disks is not None and name not in disks:
+                    continue   # partición: ya se cuenta en su disco
+                counters[name] = (
+                    int(parts[3]), int(parts[5]), int(parts[6]),
+                    int(parts[7]), int(parts[9]), int(parts[10]),
+                    int(parts[12]), int(parts[13]),
+                )
+    except OSError as e:
+        logger.debug("[DiskMonitor] No se pudo leer %s: %s", _DISKSTATS_PATH, e)
+    return counters
+
+
+def _device_rates(prev: tuple, cur: tuple, elapsed: float) -> Dict[str, float]:
+    """
+    Calcula las métricas de un dispositivo a partir de dos lecturas de sus contadores.
+
+    Args:
+        prev (tuple): Contadores anteriores (formato de _read_diskstats).
+        cur (tuple): Contadores actuales.
+        elapsed (float): Segundos entre ambas lecturas.
+
+    Returns:
+        Dict[str, float]: read_mb, write_mb (MB/s), read_iops, write_iops,
+                          queue_depth (cola media), await_ms (latencia media
+                          por operación) y util (% del tiempo ocupado).
+    """
+    d = [max(0, c - p) for c, p in zip(cur, prev)]
+    reads, sect_r, ms_r, writes, sect_w, ms_w, ms_io, weighted = d
+    elapsed_ms = elapsed * 1000.0
+    ios = reads + writes
+    return {
+        'read_mb':     sect_r * _SECTOR_BYTES / (1024 * 1024) / elapsed,
+        'write_mb':    sect_w * _SECTOR_BYTES / (1024 * 1024) / elapsed,
+        'read_iops':   reads / elapsed,
+        'write_iops':  writes / elapsed,
+        'queue_depth': weighted / elapsed_ms,
+        'await_ms':    (ms_r + ms_w) / ios if ios else 0.0,
+        'util':        min(100.0, ms_io / elapsed_ms * 100.0),
+    }
+
 
 class DiskMonitor:
     """
@@ -37,7 +121,8 @@ class DiskMonitor:
 
         Raises: None
         """
-        self._system_utils = SystemUtils()
+        # SMART en su propio thread lento; aquí solo se leen sus resultados cacheados
+        self._smart = SmartCollector()
 
         self._usage_hist    = deque(maxlen=HISTORY)
         self._read_hist     = deque(maxlen=HISTORY)
@@ -53,6 +138,21 @@ class DiskMonitor:
         }
 
         self._last_disk_io = psutil.disk_io_counters()
+        self._last_io_ts   = time.monotonic()
+
+        # Por dispositivo / punto de montaje (protegido por _cache_lock)
+        self._devices: Dict[str, Dict[str, float]] = {}
+        self._mounts: List[Dict] = []
+        self._device_hist: Dict[str, Dict[str, deque]] = {}
+        self._mount_hist: Dict[str, deque] = {}
+        self._last_diskstats = _read_diskstats()
+
+        # Contadores de la última agregación para la BD (take_rollup)
+        self._rollup_lock = threading.Lock()
+        self._rollup_counters = self._last_diskstats
+        self._rollup_ts = self._last_io_ts
+
+        self._demand    = get_demand_registry()
         self._running   = False
         self._stop_evt  = threading.Event()
         self._thread    = None
@@ -82,6 +182,7 @@ class DiskMonitor:
             target=self._poll_loop, daemon=True, name="DiskMonitorPoll"
         )
         self._thread.start()
+        self._smart.start()
         logger.info("[DiskMonitor] sondeo iniciado (cada %.1fs)", self._interval_s)
 
 
@@ -100,8 +201,10 @@ class DiskMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._demand.wake(_DEMAND_KEY)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5)
+        self._smart.stop()
         with self._cache_lock:
             self._cache = {
                 'disk_usage':   0.0,
@@ -140,11 +243,8 @@ class DiskMonitor:
         Raises:
             None
         """
-        self._do_poll()
-        while self._running:
-            self._stop_evt.wait(timeout=self._interval_s)
-            if self._stop_evt.is_set():
-                break
+        while not self._demand.wait(_DEMAND_KEY, self._stop_evt,
+                                    active_s=self._interval_s, idle_s=None):
             self._do_poll()
 
 
@@ -165,14 +265,18 @@ class DiskMonitor:
             disk_usage = psutil.disk_usage('/').percent
 
             disk_io     = psutil.disk_io_counters()
+            now         = time.monotonic()
             read_bytes  = max(0, disk_io.read_bytes  - self._last_disk_io.read_bytes)
             write_bytes = max(0, disk_io.write_bytes - self._last_disk_io.write_bytes)
+            # La cadencia depende de la demanda: usar el tiempo real transcurrido
+            elapsed     = max(now - self._last_io_ts, 1e-3)
             self._last_disk_io = disk_io
+            self._last_io_ts   = now
 
-            read_mb  = (read_bytes  / (1024 * 1024)) / self._interval_s
-            write_mb = (write_bytes / (1024 * 1024)) / self._interval_s
+            read_mb  = (read_bytes  / (1024 * 1024)) / elapsed
+            write_mb = (write_bytes / (1024 * 1024)) / elapsed
 
-            nvme_temp = self._system_utils.get_nvme_temp()
+            nvme_temp = self._smart.get_temperature()
             stats = {
                 'disk_usage':   disk_usage,
                 'disk_read_mb': read_mb,
@@ -180,8 +284,19 @@ class DiskMonitor:
                 'nvme_temp':    nvme_temp,
             }
 
+            counters = _read_diskstats()
+            devices  = {
+                dev: _device_rates(self._last_diskstats[dev], c, elapsed)
+                for dev, c in counters.items() if dev in self._last_diskstats
+            }
+            self._last_diskstats = counters
+            mounts = self.read_mount_usage()
+
             with self._cache_lock:
-                self._cache = stats
+                self._cache   = stats
+                self._devices = devices
+                self._mounts  = mounts
+                self._update_device_history(devices, mounts)
             self.update_history(stats)
 
         except Exception as e:
@@ -214,6 +329,138 @@ class DiskMonitor:
 
     get_cached_stats = get_current_stats
 
+    # ── Por dispositivo y punto de montaje ────────────────────────────────────
+
+    def _update_device_history(self, devices: Dict[str, Dict[str, float]],
+                               mounts: List[Dict]) -> None:
+        """
+        Añade la muestra actual al historial de cada dispositivo y montaje.
+
+        Los dispositivos o montajes que desaparecen (USB extraído) pierden su historial.
+        Debe llamarse con _cache_lock adquirido.
+
+        Args:
+            devices (Dict[str, Dict[str, float]]): Métricas por dispositivo.
+            mounts (List[Dict]): Uso por punto de montaje.
+
+        Returns:
+            None
+        """
+        for dev in list(self._device_hist):
+            if dev not in devices:
+                del self._device_hist[dev]
+        for dev, rates in devices.items():
+            hist = self._device_hist.setdefault(
+                dev, {m: deque(maxlen=HISTORY) for m in DEVICE_METRICS})
+            for metric in DEVICE_METRICS:
+                hist[metric].append(rates[metric])
+
+        current = {m['mountpoint'] for m in mounts}
+        for mp in list(self._mount_hist):
+            if mp not in current:
+                del self._mount_hist[mp]
+        for m in mounts:
+            self._mount_hist.setdefault(m['mountpoint'], deque(maxlen=HISTORY)).append(m['percent'])
+
+    @staticmethod
+    def read_mount_usage() -> List[Dict]:
+        """
+        Lee el uso de cada sistema de archivos montado (sin snaps, tmpfs ni overlays).
+
+        Returns:
+            List[Dict]: mountpoint, device, fstype, percent, used_gb y total_gb por montaje.
+        """
+        mounts, seen = [], set()
+        for part in psutil.disk_partitions(all=False):
+            if part.fstype in _IGNORED_FSTYPES or part.device.startswith("/dev/loop"):
+                continue
+            if part.device in seen:
+                continue   # bind mounts del mismo dispositivo
+            try:
+                usage = psutil.disk_usage(part.mountpoint)
+            except (PermissionError, OSError):
+                continue
+            seen.add(part.device)
+            mounts.append({
+                'mountpoint': part.mountpoint,
+                'device':     part.device,
+                'fstype':     part.fstype,
+                'percent':    usage.percent,
+                'used_gb':    usage.used / (1024 ** 3),
+                'total_gb':   usage.total / (1024 ** 3),
+            })
+        return mounts
+
+    def get_device_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Devuelve las métricas actuales de cada dispositivo de bloque.
+
+        Returns:
+            Dict[str, Dict[str, float]]: device → métricas de DEVICE_METRICS.
+        """
+        with self._cache_lock:
+            return {dev: dict(rates) for dev, rates in self._devices.items()}
+
+    def get_device_history(self, device: str) -> Dict[str, List[float]]:
+        """
+        Devuelve el historial de un dispositivo de bloque.
+
+        Args:
+            device (str): Nombre del dispositivo (ej. 'nvme0n1', 'mmcblk0', 'sda').
+
+        Returns:
+            Dict[str, List[float]]: métrica → valores; vacío si el dispositivo no existe.
+        """
+        with self._cache_lock:
+            hist = self._device_hist.get(device, {})
+            return {metric: list(values) for metric, values in hist.items()}
+
+    def get_mount_stats(self) -> List[Dict]:
+        """
+        Devuelve el uso actual de cada sistema de archivos montado.
+
+        Returns:
+            List[Dict]: Una entrada por punto de montaje.
+        """
+        with self._cache_lock:
+            return [dict(m) for m in self._mounts]
+
+    def get_mount_history(self, mountpoint: str) -> List[float]:
+        """
+        Devuelve el historial de % de uso de un punto de montaje.
+
+        Args:
+            mountpoint (str): Punto de montaje (ej. '/', '/boot/firmware').
+
+        Returns:
+            List[float]: Porcentajes de uso, del más antiguo al más reciente.
+        """
+        with self._cache_lock:
+            return list(self._mount_hist.get(mountpoint, ()))
+
+    def take_rollup(self) -> Dict:
+        """
+        Agrega las métricas por dispositivo desde la llamada anterior, para la BD.
+
+        Calcula las medias exactas del intervalo a partir de los contadores de
+        /proc/diskstats, sin depender de la cadencia de sondeo (que varía con la
+        demanda). La primera llamada agrega desde la creación del monitor.
+
+        Returns:
+            Dict: {'devices': {device: métricas}, 'mounts': [uso por montaje]}.
+        """
+        counters = _read_diskstats()
+        now = time.monotonic()
+        with self._rollup_lock:
+            prev, prev_ts = self._rollup_counters, self._rollup_ts
+            self._rollup_counters, self._rollup_ts = counters, now
+        elapsed = max(now - prev_ts, 1e-3)
+        devices = {
+            dev: _device_rates(prev[dev], c, elapsed)
+            for dev, c in counters.items() if dev in prev
+        }
+        return {'devices': devices, 'mounts': self.read_mount_usage()}
+
     def update_history(self, stats: Dict) -> None:
         """
         Actualiza los historiales de estadísticas del disco con los datos proporcionados.
@@ -255,65 +502,24 @@ class DiskMonitor:
 
     def get_nvme_smart(self) -> dict:
         """
-        Recupera las métricas SMART extendidas del dispositivo NVMe mediante smartctl.
+        Devuelve las métricas SMART extendidas del NVMe desde el caché del SmartCollector.
+
+        No ejecuta smartctl: el recolector lo hace en segundo plano cada pocos
+        minutos, así que la llamada nunca bloquea.
 
         Args:
             Ninguno.
 
         Returns:
-            Un diccionario con las métricas SMART extendidas del NVMe.
+            Un diccionario con las métricas SMART extendidas del NVMe, más
+            'timestamp', 'age_s' y 'stale' del último smartctl.
 
         Raises:
-            No se lanzan excepciones explícitas, pero puede fallar si no hay dispositivo NVMe disponible o si smartctl no está instalado.
+            None
         """
         if not self._running:
             return {'available': False}
-
-        result = {
-            "power_on_hours":   None,
-            "power_cycles":     None,
-            "unsafe_shutdowns": None,
-            "data_written_tb":  None,
-            "data_read_tb":     None,
-            "percentage_used":  None,
-            "available":        False,
-        }
-        try:
-            r = subprocess.run(
-                ["sudo", "smartctl", "-A", "--json", "/dev/nvme0"],
-                capture_output=True, text=True, timeout=10
-            )
-            # smartctl devuelve 0 o bitmask de warnings no fatales (2, 4, 6...)
-            # Solo falla si el bit 0 o bit 1 está activo (error real)
-            if r.returncode & 0b00000011:
-                return result
-
-            data  = json.loads(r.stdout)
-            attrs = data.get("nvme_smart_health_information_log", {})
-
-            result["power_on_hours"]   = attrs.get("power_on_hours")
-            result["power_cycles"]     = attrs.get("power_cycles")
-            result["unsafe_shutdowns"] = attrs.get("unsafe_shutdowns")
-            result["percentage_used"]  = attrs.get("percentage_used")
-
-            # data_units_written/read vienen en unidades de 512.000 bytes
-            dw = attrs.get("data_units_written")
-            dr = attrs.get("data_units_read")
-            if dw is not None:
-                result["data_written_tb"] = round(dw * 512_000 / (1024 ** 4), 2)
-            if dr is not None:
-                result["data_read_tb"]    = round(dr * 512_000 / (1024 ** 4), 2)
-
-            result["available"] = True
-
-        except FileNotFoundError:
-            pass   # smartctl no instalado
-        except subprocess.TimeoutExpired:
-            pass   # NVMe no responde
-        except Exception as e:
-            logger.debug("[DiskMonitor] get_nvme_smart error: %s", e)
-
-        return result
+        return self._smart.get()
 
     @staticmethod
     def level_color(value: float, warn: float, crit: float) -> str:
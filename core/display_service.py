@@ -13,6 +13,7 @@ import threading
 import json
 from pathlib import Path
 from typing import Optional
+from core.demand_registry import get_demand_registry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -120,7 +121,9 @@ class DisplayService:
         self._lock      = threading.Lock()
         self._brightness: int = BRIGHTNESS_MAX
         self._dimmed    = False
+        self._restore_brightness: int = BRIGHTNESS_MAX   # brillo previo al dim/apagado
         self._dim_timer: Optional[threading.Timer] = None
+        self._dim_enabled = False
         self._running   = True
 
         logger.info("[DisplayService] Método detectado: %s", self._method)
@@ -166,6 +169,7 @@ class DisplayService:
         """
         self._running = False
         self._cancel_dim_timer()
+        get_demand_registry().set_idle(False)
         logger.info("[DisplayService] Detenido")
     
     def is_running(self) -> bool:
@@ -268,7 +272,13 @@ class DisplayService:
         Raises:
             No se lanzan excepciones explícitas.
         """
-        return self.set_brightness(BRIGHTNESS_OFF)
+        with self._lock:
+            if not self._dimmed:
+                self._restore_brightness = self._brightness
+        ok = self.set_brightness(BRIGHTNESS_OFF)
+        if ok:
+            get_demand_registry().set_idle(True)
+        return ok
 
     def screen_on(self) -> bool:
         """
@@ -283,7 +293,13 @@ class DisplayService:
         Raises:
             None
         """
-        target = self._brightness if self._brightness >= BRIGHTNESS_MIN else BRIGHTNESS_MAX
+        if self._dimmed:
+            target = self._restore_brightness
+        else:
+            target = self._brightness
+        if target < BRIGHTNESS_MIN:
+            target = BRIGHTNESS_MAX
+        get_demand_registry().set_idle(False)
         return self.set_brightness(target)
 
     # ── Backends de control ───────────────────────────────────────────────────
@@ -382,6 +398,8 @@ class DisplayService:
         """
         Notifica una interacción del usuario para actualizar el estado de la pantalla.
 
+        Sale del perfil de ahorro al instante. Se llama desde el thread de Tk.
+
         Args:
             None
 
@@ -393,12 +411,14 @@ class DisplayService:
         """
         if not self._running:
             return
-        self._cancel_dim_timer()
+        get_demand_registry().set_idle(False)
         if self._dimmed:
+            self._cancel_dim_timer()
             self.screen_on()
             with self._lock:
                 self._dimmed = False
-        self._start_dim_timer()
+        if self._dim_enabled:
+            self._start_dim_timer()
 
     def enable_dim_on_idle(self):
         """
@@ -415,6 +435,7 @@ class DisplayService:
         """
         if not self._running:
             return
+        self._dim_enabled = True
         self._start_dim_timer()
         logger.info("[DisplayService] Dim automático activado (%ds→dim, %ds→off)",
                     DIM_TIMEOUT_S, OFF_TIMEOUT_S)
@@ -426,6 +447,7 @@ class DisplayService:
         Returns: 
         Raises: 
         """
+        self._dim_enabled = False
         self._cancel_dim_timer()
 
     def _start_dim_timer(self):
@@ -477,8 +499,12 @@ class DisplayService:
         if not self._dimmed and self._running:
             logger.debug("[DisplayService] Dim por inactividad")
             with self._lock:
-                self._dimmed = True
+                self._restore_brightness = self._brightness
             self.set_brightness(20)
+            # set_brightness recalcula _dimmed por umbral; el dim es explícito
+            with self._lock:
+                self._dimmed = True
+            get_demand_registry().set_idle(True)
         if self._running:
             t = threading.Timer(OFF_TIMEOUT_S - DIM_TIMEOUT_S, self._on_off)
             t.daemon = True
@@ -501,6 +527,7 @@ class DisplayService:
         if self._running:
             logger.debug("[DisplayService] Apagado por inactividad")
             self.screen_off()
+            get_demand_registry().set_idle(True)
 
     # ── Persistencia ──────────────────────────────────────────────────────────
 
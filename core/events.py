@@ -0,0 +1,119 @@
+"""
+Eventos tipados que publican los monitores en el EventBus.
+
+Los monitores publican solo cuando algún valor cambia más allá de su zona
+muerta (deadband), de modo que el thread de Tk trabaja en proporción a los
+cambios reales y no al ritmo de sondeo.
+
+Eventos y payload:
+  - system.sample       {"stats": dict, "changed": [claves]}   (SystemMonitor)
+  - services.changed    {"stats": dict, "changed": [nombres]}  (ServiceMonitor)
+  - vpn.state_changed   {"state": dict, "changed": [vpns], "offline": int}  (VpnMonitor)
+  - network.device_joined  {"device": dict}   (NetworkScanner, descubrimiento pasivo)
+  - network.device_left    {"device": dict}   (NetworkScanner, descubrimiento pasivo)
+  - gpio.input_changed  {"pin": int, "value": bool, "ts_ns": int, "stats": dict}  (GPIOMonitor)
+  - homebridge.accessories_changed  {"changed": [dict], "removed": [uid], "order": [uid],
+                                     "reachable": bool}  (HomebridgeMonitor)
+
+Uso en un monitor:
+    self._delta = DeltaFilter({"cpu": 1.0, "temp": 0.5})
+    changed = self._delta.changes(stats)
+    if changed:
+        get_event_bus().publish(SYSTEM_SAMPLE, {"stats": stats, "changed": changed})
+
+Uso en la UI (los callbacks se ejecutan en el thread de Tk):
+    get_event_bus().subscribe(SYSTEM_SAMPLE, self._on_system_sample)
+    # al destruir la ventana:
+    get_event_bus().unsubscribe(SYSTEM_SAMPLE, self._on_system_sample)
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+SYSTEM_SAMPLE     = "system.sample"
+SERVICES_CHANGED  = "services.changed"
+VPN_STATE_CHANGED = "vpn.state_changed"
+NETWORK_DEVICE_JOINED = "network.device_joined"
+NETWORK_DEVICE_LEFT   = "network.device_left"
+GPIO_INPUT_CHANGED    = "gpio.input_changed"
+HOMEBRIDGE_ACCESSORIES_CHANGED = "homebridge.accessories_changed"
+
+
+class DeltaFilter:
+    """
+    Detecta qué valores de una muestra han cambiado respecto a lo último publicado.
+
+    Las claves numéricas con deadband solo cuentan como cambio si se alejan más
+    de la zona muerta del último valor publicado (no del último leído), así una
+    deriva lenta acaba publicándose. El resto de claves vigiladas se comparan
+    por igualdad.
+
+    Args:
+        deadbands (Dict[str, float]): Zona muerta por clave numérica.
+        keys (Iterable[str], opcional): Claves extra comparadas por igualdad.
+    """
+
+    def __init__(self, deadbands: Dict[str, float], keys: Optional[Iterable[str]] = None):
+        """
+        Inicializa el filtro sin valores publicados.
+
+        Args:
+            deadbands (Dict[str, float]): Zona muerta por clave numérica.
+            keys (Iterable[str], opcional): Claves extra comparadas por igualdad.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._deadbands = dict(deadbands)
+        self._keys = list(self._deadbands) + [k for k in (keys or []) if k not in self._deadbands]
+        self._published: Dict[str, Any] = {}
+
+    def changes(self, values: Dict[str, Any]) -> List[str]:
+        """
+        Devuelve las claves vigiladas que han cambiado y las marca como publicadas.
+
+        La primera llamada devuelve todas las claves presentes.
+
+        Args:
+            values (Dict[str, Any]): Muestra actual del monitor.
+
+        Returns:
+            List[str]: Claves cambiadas; lista vacía si no hay nada que publicar.
+
+        Raises:
+            None
+        """
+        changed = []
+        for key in self._keys:
+            if key not in values:
+                continue
+            new = values[key]
+            if key not in self._published:
+                changed.append(key)
+            else:
+                old = self._published[key]
+                band = self._deadbands.get(key)
+                if band is not None and isinstance(new, (int, float)) and isinstance(old, (int, float)):
+                    if abs(new - old) > band:
+                        changed.append(key)
+                elif new != old:
+                    changed.append(key)
+        for key in changed:
+            self._published[key] = values[key]
+        return changed
+
+    def reset(self) -> None:
+        """
+        Olvida los valores publicados para que la próxima muestra se publique entera.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._published.clear()
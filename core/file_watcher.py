@@ -0,0 +1,229 @@
+"""
+Vigilancia de ficheros y directorios sin dependencias externas.
+
+Usa inotify del kernel vía ctypes; si no está disponible compara (inodo,
+tamaño, mtime) de cada ruta. La consulta no bloquea, así que encaja en los
+bucles de DemandRegistry.wait() de los monitores.
+
+Uso:
+    watcher = FileWatcher(["/var/run/utmp", "/var/log/wtmp"])
+    changed = watcher.changes()   # rutas con cambios desde la última llamada
+    watcher.close()
+
+Un fichero rotado o recreado (logrotate) se vuelve a vigilar solo y se
+informa como cambiado. Para un directorio se informa el propio directorio
+cuando se crea, borra o renombra algo dentro.
+"""
+import os
+import struct
+from typing import Dict, Iterable, Optional, Set, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_IN_MODIFY      = 0x00000002
+_IN_ATTRIB      = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM  = 0x00000040
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE      = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF   = 0x00000800
+_IN_IGNORED     = 0x00008000
+
+_FILE_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_ATTRIB | _IN_DELETE_SELF | _IN_MOVE_SELF
+_DIR_MASK  = (_IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_ATTRIB
+              | _IN_DELETE_SELF | _IN_MOVE_SELF)
+# Tras estos eventos el watch deja de apuntar a la ruta vigilada
+_GONE_MASK = _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED
+
+_EVENT     = struct.Struct("iIII")   # wd, mask, cookie, len
+_READ_SIZE = 4096
+
+_libc = None
+
+
+def _load_libc():
+    """
+    Carga libc con las funciones de inotify, una sola vez.
+
+    Returns:
+        ctypes.CDLL | None: libc, o None si no ofrece inotify.
+    """
+    global _libc
+    if _libc is None:
+        try:
+            import ctypes
+            import ctypes.util
+            lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            lib.inotify_init1
+            lib.inotify_add_watch
+            lib.inotify_rm_watch
+            _libc = lib
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Huella de una ruta para detectar cambios sin inotify.
+
+    Args:
+        path (str): Ruta a comprobar.
+
+    Returns:
+        Optional[Tuple[int, int, int]]: (inodo, tamaño, mtime_ns) o None si no existe.
+    """
+    try:
+        st = os.stat(path)
+        return st.st_ino, st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+class FileWatcher:
+    """
+    Detecta cambios en un conjunto de ficheros o directorios.
+
+    Args:
+        paths (Iterable[str]): Rutas a vigilar (pueden no existir todavía).
+        use_inotify (bool): False fuerza la comparación por mtime.
+    """
+
+    def __init__(self, paths: Iterable[str], use_inotify: bool = True):
+        """
+        Abre inotify (si se puede) y registra las rutas.
+
+        Args:
+            paths (Iterable[str]): Rutas a vigilar.
+            use_inotify (bool): False fuerza la comparación por mtime.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._paths: Tuple[str, ...] = tuple(paths)
+        self._stamps: Dict[str, Optional[Tuple[int, int, int]]] = {
+            p: _stamp(p) for p in self._paths
+        }
+        self._wds: Dict[int, str] = {}
+        self._unwatched: Set[str] = set(self._paths)
+        self._fd: Optional[int] = None
+
+        libc = _load_libc() if use_inotify else None
+        if libc is not None:
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+                for path in self._paths:
+                    self._add_watch(path)
+            else:
+                logger.debug("[FileWatcher] inotify_init1 falló, usando mtime")
+
+    @property
+    def uses_inotify(self) -> bool:
+        """
+        Indica si los cambios llegan por inotify.
+
+        Returns:
+            bool: False si se comparan mtimes.
+        """
+        return self._fd is not None
+
+    def changes(self) -> Set[str]:
+        """
+        Devuelve las rutas que han cambiado desde la última llamada. No bloquea.
+
+        Returns:
+            Set[str]: Rutas vigiladas con cambios.
+        """
+        if self._fd is None:
+            changed = set()
+            for path in self._paths:
+                stamp = _stamp(path)
+                if stamp != self._stamps[path]:
+                    self._stamps[path] = stamp
+                    changed.add(path)
+            return changed
+
+        changed = self._read_events()
+        # Rutas rotadas o que aún no existían: volver a vigilarlas si ya están
+        for path in list(self._unwatched):
+            if self._add_watch(path):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """
+        Libera el descriptor de inotify.
+
+        Returns:
+            None
+        """
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._wds.clear()
+
+    # ── Internos ──────────────────────────────────────────────────────────────
+
+    def _add_watch(self, path: str) -> bool:
+        """
+        Registra un watch de inotify sobre una ruta.
+
+        Args:
+            path (str): Fichero o directorio.
+
+        Returns:
+            bool: True si la ruta existe y quedó vigilada.
+        """
+        if not os.path.exists(path):
+            return False
+        mask = _DIR_MASK if os.path.isdir(path) else _FILE_MASK
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            return False
+        self._wds[wd] = path
+        self._unwatched.discard(path)
+        return True
+
+    def _read_events(self) -> Set[str]:
+        """
+        Vacía la cola de eventos de inotify.
+
+        Returns:
+            Set[str]: Rutas vigiladas afectadas.
+        """
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logger.warning("[FileWatcher] Error leyendo inotify: %s", e)
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _cookie, name_len = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size + name_len
+                path = self._wds.get(wd)
+                if path is None:
+                    continue
+                changed.add(path)
+                if mask & _GONE_MASK:
+                    # Tras un rename el watch seguiría al fichero viejo
+                    if mask & _IN_MOVE_SELF:
+                        _libc.inotify_rm_watch(self._fd, wd)
+                    del self._wds[wd]
+                    self._unwatched.add(path)
+        return changed
@@ -13,6 +13,14 @@ Modos de operación globales:
                 Los scripts externos pueden usar los pines sin conflictos.
                 No se lee ningún estado de hardware.
 
+Entradas por flancos:
+  Los pines INPUT no se sondean: gpiozero llama a when_activated /
+  when_deactivated en cada flanco y se guarda (timestamp monotónico en ns,
+  valor) en un buffer circular por pin. De ahí salen el contador de pulsos,
+  la frecuencia y el duty cycle de la ventana reciente. Los cambios se
+  publican en el EventBus (gpio.input_changed) agrupados cada
+  _PUBLISH_MIN_S para no saturar el thread de Tk con señales rápidas.
+
 Persistencia:
   La configuración de pines se guarda en local_settings.py via
   local_settings_io bajo la clave "gpio_pins_config".
@@ -25,10 +33,14 @@ Pines reservados por fase1.py — nunca tocar:
   UART: GPIO 14, 15
 """
 import threading
+import time
+from collections import deque
 import gpiozero
 from gpiozero import Device
 from gpiozero.pins.lgpio import LGPIOFactory
 from config.local_settings_io import update_params, read
+from core.event_bus import get_event_bus
+from core.events import GPIO_INPUT_CHANGED
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -46,6 +58,12 @@ OP_LIBRE       = "LIBRE"
 # ── Pines reservados ──────────────────────────────────────────────────────────
 _RESERVED_PINS = {2, 3, 12, 13, 14, 15, 18, 19}
 
+# ── Flancos de entrada ────────────────────────────────────────────────────────
+EDGE_BUFFER       = 512    # flancos guardados por pin
+_STATS_WINDOW_S   = 5.0    # ventana para frecuencia y duty cycle
+_PUBLISH_MIN_S    = 0.05   # agrupa flancos rápidos antes de publicar
+_RESYNC_INTERVAL  = 30.0   # lectura de seguridad por si se perdió un flanco
+
 # ── Clave de persistencia en local_settings.py ───────────────────────────────
 _SETTINGS_KEY = "gpio_pins_config"
 
@@ -132,8 +150,6 @@ class GPIOMonitor:
         None
     """
 
-    POLL_INTERVAL = 1.0
-
     def __init__(self, config: dict | None = None, op_mode: str = OP_LIBRE):
         """
         Inicializa el monitor de GPIO con la configuración proporcionada.
@@ -166,6 +182,10 @@ class GPIOMonitor:
         self._devices: dict[int, object] = {}
 
         self._state: dict[int, dict] = {}
+        self._edges: dict[int, deque] = {}
+        self._pulses: dict[int, int] = {}
+        self._pending: set[int] = set()
+        self._edge_evt = threading.Event()
         self._init_state()
 
 
@@ -201,7 +221,7 @@ class GPIOMonitor:
 
     def start(self):
         """
-        Inicia el hilo daemon de monitoreo de GPIO con un intervalo de polling de 1 segundo.
+        Inicia el hilo daemon que abre los pines y publica los flancos de entrada.
 
         Args: 
             Ninguno
@@ -236,6 +256,7 @@ class GPIOMonitor:
         if not self._running:
             return
         self._stop_evt.set()
+        self._edge_evt.set()
         if self._thread:
             self._thread.join(timeout=5)
         self._release_devices()
@@ -265,7 +286,9 @@ class GPIOMonitor:
         """
         Ejecuta el bucle principal del thread daemon.
 
-        Setup dispositivos si se está controlando, sondea entradas cada segundo y maneja el evento de parada.
+        Setup dispositivos si se está controlando y duerme hasta que llegan
+        flancos; entonces los publica agrupados. Cada _RESYNC_INTERVAL sin
+        flancos relee las entradas por si se perdió alguno.
 
         Args:
             Ninguno
@@ -280,9 +303,15 @@ class GPIOMonitor:
             self._setup_devices()
         try:
             while not self._stop_evt.is_set():
-                if self._op_mode == OP_CONTROLANDO:
+                if self._edge_evt.wait(_RESYNC_INTERVAL):
+                    if self._stop_evt.is_set():
+                        break
+                    self._edge_evt.clear()
+                    self._publish_pending()
+                    # Deja acumular la ráfaga siguiente antes de volver a publicar
+                    self._stop_evt.wait(_PUBLISH_MIN_S)
+                elif self._op_mode == OP_CONTROLANDO:
                     self._poll_inputs()
-                self._stop_evt.wait(self.POLL_INTERVAL)
         finally:
             self._running = False
 
@@ -365,6 +394,9 @@ class GPIOMonitor:
         try:
             if mode == MODE_INPUT:
                 dev = self._gz.Button(pin, pull_up=None, active_state=True)
+                self._reset_edges(pin, dev.is_active)
+                dev.when_activated   = lambda: self._on_edge(pin, True)
+                dev.when_deactivated = lambda: self._on_edge(pin, False)
             elif mode == MODE_OUTPUT:
                 dev = self._gz.LED(pin)
                 dev.off()
@@ -398,6 +430,9 @@ class GPIOMonitor:
             None
         """
         dev = self._devices.pop(pin, None)
+        with self._lock:
+            self._edges.pop(pin, None)
+            self._pulses.pop(pin, None)
         if dev is not None:
             try:
                 dev.close()
@@ -431,11 +466,131 @@ class GPIOMonitor:
         self._gpio_available = False
 
 
-    # ── Poll inputs ───────────────────────────────────────────────────────────
+    # ── Flancos de entrada ────────────────────────────────────────────────────
+
+    def _reset_edges(self, pin: int, value: bool) -> None:
+        """
+        Vacía el buffer de flancos de un pin y fija su valor inicial.
+
+        Args:
+            pin (int): Número de pin BCM.
+            value (bool): Estado leído al abrir el pin.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._edges[pin]  = deque(maxlen=EDGE_BUFFER)
+            self._pulses[pin] = 0
+            if pin in self._state:
+                self._state[pin]["value"] = bool(value)
+            self._pending.add(pin)
+        self._edge_evt.set()
+
+    def _on_edge(self, pin: int, value: bool) -> None:
+        """
+        Callback de gpiozero en cada flanco (se ejecuta en su thread).
+
+        Args:
+            pin (int): Número de pin BCM.
+            value (bool): True en flanco de activación, False en desactivación.
+
+        Returns:
+            None
+        """
+        ts_ns = time.monotonic_ns()
+        with self._lock:
+            edges = self._edges.get(pin)
+            if edges is None or pin not in self._state:
+                return
+            edges.append((ts_ns, value))
+            if value:
+                self._pulses[pin] += 1
+            self._state[pin]["value"] = value
+            self._state[pin]["error"] = None
+            self._pending.add(pin)
+        self._edge_evt.set()
+
+    def _edge_stats(self, pin: int, now_ns: int) -> dict:
+        """
+        Calcula contadores derivados de los flancos. Debe llamarse con self._lock.
+
+        Args:
+            pin (int): Número de pin BCM.
+            now_ns (int): time.monotonic_ns() de referencia.
+
+        Returns:
+            dict: pulses, freq_hz, duty_cycle (0.0–1.0 o None), last_edge_ns
+                  y last_interval_ms (entre los dos últimos flancos).
+        """
+        edges = self._edges.get(pin)
+        if edges is None:
+            return {}
+        window_start = now_ns - int(_STATS_WINDOW_S * 1e9)
+        recent = [e for e in edges if e[0] >= window_start]
+        rising = [ts for ts, value in recent if value]
+
+        freq_hz = 0.0
+        if len(rising) >= 2 and rising[-1] > rising[0]:
+            freq_hz = (len(rising) - 1) * 1e9 / (rising[-1] - rising[0])
+
+        duty = None
+        value = self._state.get(pin, {}).get("value")
+        if recent:
+            if len(recent) < len(edges):
+                # Hay un flanco anterior: se conoce el estado al inicio de la ventana
+                start, active, todo = window_start, edges[-len(recent) - 1][1], recent
+            else:
+                # El buffer no cubre toda la ventana: se mide desde el primer flanco
+                start, active, todo = recent[0][0], recent[0][1], recent[1:]
+            high_ns, since = 0, start
+            for ts, val in todo:
+                if active:
+                    high_ns += ts - since
+                active, since = val, ts
+            if active:
+                high_ns += now_ns - since
+            span = now_ns - start
+            duty = high_ns / span if span > 0 else None
+        elif value is not None:
+            duty = 1.0 if value else 0.0
+
+        return {
+            "pulses":           self._pulses.get(pin, 0),
+            "freq_hz":          round(freq_hz, 3),
+            "duty_cycle":       duty,
+            "last_edge_ns":     edges[-1][0] if edges else None,
+            "last_interval_ms": ((edges[-1][0] - edges[-2][0]) / 1e6
+                                 if len(edges) >= 2 else None),
+        }
+
+    def _publish_pending(self) -> None:
+        """
+        Publica en el EventBus el estado de los pines con flancos nuevos.
+
+        Returns:
+            None
+        """
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            pins, self._pending = self._pending, set()
+            payloads = [
+                {
+                    "pin":   pin,
+                    "value": self._state[pin]["value"],
+                    "ts_ns": now_ns,
+                    "stats": self._edge_stats(pin, now_ns),
+                }
+                for pin in pins if pin in self._state and pin in self._edges
+            ]
+        bus = get_event_bus()
+        for payload in payloads:
+            bus.publish(GPIO_INPUT_CHANGED, payload)
 
     def _poll_inputs(self):
         """
-        Actualiza de forma segura el estado de los pines de entrada de la GPIO.
+        Relectura de seguridad de las entradas: si un pin no coincide con el
+        último flanco registrado se anota como flanco perdido.
 
         Args: 
             Ninguno
@@ -458,10 +613,9 @@ class GPIOMonitor:
                 continue
             try:
                 value = dev.is_active
-                with self._lock:
-                    if pin in self._state:
-                        self._state[pin]["value"] = value
-                        self._state[pin]["error"] = None
+                if value != data["value"]:
+                    logger.debug("[GPIOMonitor] GPIO %d: flanco perdido, resincronizado", pin)
+                    self._on_edge(pin, value)
             except Exception as exc:
                 with self._lock:
                     if pin in self._state:
@@ -542,12 +696,39 @@ class GPIOMonitor:
 
         Returns:
             dict[int, dict]: Un diccionario donde cada clave es un número de pin BCM y cada valor es otro diccionario con los detalles del estado del pin.
+                Los pines INPUT abiertos incluyen además pulses, freq_hz, duty_cycle,
+                last_edge_ns y last_interval_ms.
+
+        Raises:
+            None
+        """
+        now_ns = time.monotonic_ns()
+        with self._lock:
+            state = {pin: dict(data) for pin, data in self._state.items()}
+            for pin, data in state.items():
+                if data["mode"] == MODE_INPUT and pin in self._edges:
+                    data.update(self._edge_stats(pin, now_ns))
+            return state
+
+    def get_events(self, pin: int, limit: int | None = None) -> list[dict]:
+        """
+        Devuelve los flancos registrados de un pin INPUT, más antiguos primero.
+
+        Args:
+            pin (int): Número de pin BCM.
+            limit (int, optional): Solo los N más recientes.
+
+        Returns:
+            list[dict]: {"ts_ns": int (time.monotonic_ns), "value": bool} por flanco.
 
         Raises:
             None
         """
         with self._lock:
-            return {pin: dict(data) for pin, data in self._state.items()}
+            edges = list(self._edges.get(pin, ()))
+        if limit is not None:
+            edges = edges[-limit:]
+        return [{"ts_ns": ts, "value": value} for ts, value in edges]
 
     def is_gpio_available(self) -> bool:
         """
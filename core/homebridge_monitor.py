@@ -3,16 +3,31 @@ Monitor de Homebridge
 Integración con la API REST de homebridge-config-ui-x
 Credenciales cargadas desde .env (nunca hardcodeadas)
 
-Incluye sondeo ligero en background cada 30s para mantener
-los badges del menú actualizados sin necesidad de abrir la ventana.
+Un único thread sondea /api/accessories (cada 30s en reposo, cada 5s con la
+ventana abierta), compara la lista nueva con la caché por uniqueId y publica
+en el EventBus solo los accesorios que han cambiado. Las escrituras actualizan
+la caché de forma optimista y agrupan el refresco de confirmación.
+
+Modo streaming (HOMEBRIDGE_STREAM=1, por defecto): un segundo thread mantiene
+abierto el socket de accesorios de config-ui-x (Socket.IO sobre WebSocket) y
+aplica a la caché los cambios que empuja el servidor, de modo que lo que se
+toca desde HomeKit aparece al instante. Mientras el socket está conectado el
+sondeo baja a un resync cada STREAM_RESYNC_S; si se cae, se reconecta con
+backoff exponencial y el sondeo normal vuelve a cubrir el hueco.
+Servidor falso para pruebas: utils/homebridge_stub.py.
 """
 import json
 import os
 import threading
-import urllib.request
-import urllib.error
+import time
+import urllib.parse
 from pathlib import Path
 from typing import Dict, List, Optional
+from core.demand_registry import get_demand_registry
+from core.event_bus import get_event_bus
+from core.events import HOMEBRIDGE_ACCESSORIES_CHANGED
+from utils.http_client import HttpClient, HttpError
+from utils.ws_client import WebSocketClient, WebSocketError
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -63,7 +78,18 @@ HOMEBRIDGE_PASS  = os.environ.get("HOMEBRIDGE_PASS", "")
 
 HOMEBRIDGE_URL   = f"http://{HOMEBRIDGE_HOST}:{HOMEBRIDGE_PORT}"
 REQUEST_TIMEOUT  = 5   # segundos por petición HTTP
+REQUEST_RETRIES  = 1   # reintentos ante errores transitorios (red, 5xx)
 POLL_INTERVAL_S  = 30  # segundos entre sondeos en background
+ACTIVE_POLL_S    = 5   # segundos entre sondeos con la ventana abierta
+WRITE_SETTLE_S   = 1.5 # espera tras una escritura antes del refresco de confirmación
+
+STREAM_ENABLED       = os.environ.get("HOMEBRIDGE_STREAM", "1").lower() not in ("0", "false", "no")
+STREAM_RESYNC_S      = 300  # sondeo de seguridad con el socket conectado
+STREAM_BACKOFF_MIN_S = 2    # primera espera antes de reconectar el socket
+STREAM_BACKOFF_MAX_S = 120
+
+_DEMAND_KEY = "homebridge_monitor"
+_SOCKET_NS  = "/accessories"
 
 
 class HomebridgeMonitor:
@@ -81,12 +107,12 @@ class HomebridgeMonitor:
         Ninguno
     """
 
-    def __init__(self):
+    def __init__(self, base_url: str = HOMEBRIDGE_URL):
         """
         Inicializa el monitor de Homebridge.
 
         Args:
-            Ninguno
+            base_url (str): URL de homebridge-config-ui-x (por defecto la del .env).
 
         Returns:
             Ninguno
@@ -94,11 +120,28 @@ class HomebridgeMonitor:
         Raises:
             Ninguno
         """
+        self._base_url = base_url
+        self._http = HttpClient(base_url, timeout=REQUEST_TIMEOUT,
+                                retries=REQUEST_RETRIES)
         self._token: Optional[str]      = None
         self._token_lock                = threading.Lock()
-        self._accessories: List[Dict]   = []
+        self._auth_lock                 = threading.Lock()  # un solo login a la vez (sondeo y socket)
+        self._accessories: Dict[str, Dict] = {}  # uniqueId → accesorio, en orden de la API
         self._accessories_lock          = threading.Lock()
         self._reachable: Optional[bool] = None  # None = aún no consultado
+        self._version                   = 0
+
+        # Refresco bajo demanda (botón, escrituras): instante en que toca
+        self._refresh_evt = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._refresh_due: Optional[float] = None
+        self._demand = get_demand_registry()
+
+        # Streaming por socket
+        self._ws: Optional[WebSocketClient] = None
+        self._streaming = False
+        self._awaiting_full = False   # la próxima lista del socket es completa
+        self._stream_thread: Optional[threading.Thread] = None
 
         # Control del thread de background
         self._running  = False
@@ -143,8 +186,16 @@ class HomebridgeMonitor:
             name="HomebridgePoll",
         )
         self._thread.start()
+        if STREAM_ENABLED:
+            self._stream_thread = threading.Thread(
+                target=self._stream_loop,
+                daemon=True,
+                name="HomebridgeStream",
+            )
+            self._stream_thread.start()
         logger.info(
-            "[HomebridgeMonitor] Sondeo iniciado (cada %ds)", POLL_INTERVAL_S
+            "[HomebridgeMonitor] Sondeo iniciado (cada %ds%s)", POLL_INTERVAL_S,
+            ", socket en vivo" if STREAM_ENABLED else "",
         )
 
     def stop(self) -> None:
@@ -162,11 +213,18 @@ class HomebridgeMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._refresh_evt.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()   # desbloquea el recv() del thread de streaming
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=REQUEST_TIMEOUT + 1)
+        if self._stream_thread and self._stream_thread.is_alive():
+            self._stream_thread.join(timeout=REQUEST_TIMEOUT + 1)
         # ── limpiar caché y token ──
         with self._accessories_lock:
-            self._accessories = []
+            self._accessories = {}
+            self._version += 1
         with self._token_lock:
             self._token = None
         self._reachable = False
@@ -187,9 +245,23 @@ class HomebridgeMonitor:
         """
         return self._running
 
+    def is_streaming(self) -> bool:
+        """
+        Indica si el socket de accesorios está conectado y empujando cambios.
+
+        Returns:
+            bool: True si los cambios llegan en vivo.
+        """
+        return self._streaming
+
     def _poll_loop(self) -> None:
         """
-        Ejecuta un bucle de sondeo en segundo plano para obtener información de los accesorios de Homebridge.
+        Único bucle de sondeo de accesorios de Homebridge.
+
+        Sondea a ACTIVE_POLL_S mientras alguna ventana tenga demanda sobre
+        "homebridge_monitor" y a POLL_INTERVAL_S en reposo; con el socket
+        conectado solo hace un resync cada STREAM_RESYNC_S. request_refresh()
+        adelanta el siguiente sondeo.
 
         Args:
             Ninguno
@@ -202,16 +274,177 @@ class HomebridgeMonitor:
 
         Nota: El bucle se ejecuta hasta que se detenga explícitamente.
         """
-        while self._running:
+        next_poll = 0.0
+        while not self._stop_evt.is_set():
+            with self._refresh_lock:
+                due = self._refresh_due
+            target = next_poll if due is None else min(next_poll, due)
+            now = time.monotonic()
+            if now < target:
+                # Espera interrumpible: stop() y request_refresh() lo despiertan
+                self._refresh_evt.wait(timeout=target - now)
+                self._refresh_evt.clear()
+                continue
+
+            with self._refresh_lock:
+                self._refresh_due = None
             try:
-                self.get_accessories()
+                self.refresh()
             except Exception as e:
                 logger.error("[HomebridgeMonitor] Error en poll_loop: %s", e)
+            if self._streaming:
+                interval = STREAM_RESYNC_S
+            else:
+                interval = self._demand.interval(_DEMAND_KEY, ACTIVE_POLL_S, POLL_INTERVAL_S)
+            next_poll = time.monotonic() + interval
+
+    def request_refresh(self, delay: float = 0.0) -> None:
+        """
+        Pide un sondeo fuera de ciclo, agrupando peticiones cercanas.
 
-            # Espera interrumpible: stop() lo despierta al instante
-            self._stop_evt.wait(timeout=POLL_INTERVAL_S)
+        Con delay > 0 (confirmación tras una escritura) cada nueva petición
+        pospone el sondeo, de modo que una ráfaga de escrituras produce un
+        solo refresco. Con delay = 0 (botón Refrescar) se sondea en cuanto
+        el thread de sondeo queda libre.
+
+        Args:
+            delay (float): Segundos de espera antes del sondeo.
+
+        Returns:
+            None
+        """
+        due = time.monotonic() + max(0.0, delay)
+        with self._refresh_lock:
+            if self._refresh_due is None or delay > 0 or due < self._refresh_due:
+                self._refresh_due = due
+        self._refresh_evt.set()
+
+    # ── Streaming por socket ──────────────────────────────────────────────────
+
+    def _stream_loop(self) -> None:
+        """
+        Mantiene el socket de accesorios conectado, reconectando con backoff exponencial.
+
+        Cada caída devuelve el control al sondeo (refresco inmediato) hasta que
+        el socket vuelve a conectar.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+        """
+        backoff = STREAM_BACKOFF_MIN_S
+        while not self._stop_evt.is_set():
+            try:
+                self._stream_session()
+            except (WebSocketError, OSError, ValueError) as e:
+                if not self._stop_evt.is_set():
+                    logger.debug("[HomebridgeMonitor] Socket no disponible: %s", e)
+            finally:
+                was_streaming = self._streaming
+                self._streaming = False
+                self._ws = None
             if self._stop_evt.is_set():
                 break
+            if was_streaming:
+                logger.warning("[HomebridgeMonitor] Socket perdido — volviendo a sondeo")
+                self.request_refresh()
+                backoff = STREAM_BACKOFF_MIN_S
+            if self._stop_evt.wait(backoff):
+                break
+            backoff = min(backoff * 2, STREAM_BACKOFF_MAX_S)
+
+    def _stream_session(self) -> None:
+        """
+        Abre una sesión Engine.IO v4 / Socket.IO sobre WebSocket y procesa paquetes hasta que se cierre.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            WebSocketError: Si el servidor rechaza o cierra la sesión, o deja de enviar pings.
+            OSError: Si falla la red.
+        """
+        token = self._get_token()
+        if not token:
+            raise WebSocketError("sin token de autenticación")
+        ws_base = "ws" + self._base_url[len("http"):] if self._base_url.startswith("http") else self._base_url
+        url = (f"{ws_base}/socket.io/?EIO=4&transport=websocket"
+               f"&token={urllib.parse.quote(token)}")
+        ws = WebSocketClient.connect(url, timeout=REQUEST_TIMEOUT)
+        self._ws = ws
+        try:
+            if self._stop_evt.is_set():
+                return
+            packet = ws.recv(timeout=REQUEST_TIMEOUT)
+            if not packet or packet[0] != "0":
+                raise WebSocketError(f"apertura Engine.IO inesperada: {packet!r}")
+            info = json.loads(packet[1:])
+            # El servidor hace ping cada pingInterval; sin noticias en ese plazo + pingTimeout, está caído
+            silence_s = (info.get("pingInterval", 25000) + info.get("pingTimeout", 20000)) / 1000
+            ws.send_text(f"40{_SOCKET_NS},")
+
+            while not self._stop_evt.is_set():
+                packet = ws.recv(timeout=silence_s)
+                if packet is None:
+                    raise WebSocketError("sin ping del servidor")
+                if packet == "2":
+                    ws.send_text("3")
+                elif packet == "1":
+                    raise WebSocketError("Engine.IO cerrado por el servidor")
+                elif packet.startswith("4"):
+                    self._on_socket_packet(ws, packet[1:])
+        finally:
+            ws.close()
+
+    def _on_socket_packet(self, ws: WebSocketClient, packet: str) -> None:
+        """
+        Procesa un paquete Socket.IO del namespace de accesorios.
+
+        Args:
+            ws (WebSocketClient): Conexión, para responder.
+            packet (str): Paquete sin el prefijo de mensaje Engine.IO ("4").
+
+        Returns:
+            Ninguno
+
+        Raises:
+            WebSocketError: Si el servidor rechaza o cierra el namespace.
+        """
+        ptype, rest = packet[:1], packet[1:]
+        namespace = "/"
+        if rest.startswith("/"):
+            namespace, _, rest = rest.partition(",")
+        if namespace != _SOCKET_NS:
+            return
+
+        if ptype == "0":
+            self._streaming = True
+            self._awaiting_full = True
+            ws.send_text(f"42{_SOCKET_NS}," + json.dumps(["get-accessories"]))
+            logger.info("[HomebridgeMonitor] Socket de accesorios conectado")
+        elif ptype == "4":
+            # Normalmente token caducado: el siguiente intento se autentica de nuevo
+            with self._token_lock:
+                self._token = None
+            raise WebSocketError(f"namespace rechazado: {rest}")
+        elif ptype == "1":
+            raise WebSocketError("namespace cerrado por el servidor")
+        elif ptype == "2":
+            start = rest.find("[")       # puede llevar un id de ack delante
+            event = json.loads(rest[start:]) if start >= 0 else []
+            if not event:
+                return
+            if event[0] == "accessories-data" and len(event) > 1:
+                full, self._awaiting_full = self._awaiting_full, False
+                self._apply(self._parse_accessories(event[1]), partial=not full)
+            elif event[0] == "accessories-reload-required":
+                self._awaiting_full = True
+                ws.send_text(f"42{_SOCKET_NS}," + json.dumps(["get-accessories"]))
 
     # ── Autenticación ─────────────────────────────────────────────────────────
 
@@ -232,28 +465,19 @@ class HomebridgeMonitor:
             logger.error("[HomebridgeMonitor] HOMEBRIDGE_HOST no configurado en .env")
             return False
 
-        payload = json.dumps({
-            "username": HOMEBRIDGE_USER,
-            "password": HOMEBRIDGE_PASS,
-        }).encode("utf-8")
-
-        req = urllib.request.Request(
-            f"{HOMEBRIDGE_URL}/api/auth/login",
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
         try:
-            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-                data = json.loads(resp.read().decode())
-                token = data.get("access_token")
-                if token:
-                    with self._token_lock:
-                        self._token = token
-                    logger.info("[HomebridgeMonitor] Autenticación correcta")
-                    return True
-                logger.warning("[HomebridgeMonitor] Respuesta sin token: %s", data)
-                return False
+            data = self._http.request_json("POST", "/api/auth/login", json_body={
+                "username": HOMEBRIDGE_USER,
+                "password": HOMEBRIDGE_PASS,
+            })
+            token = data.get("access_token")
+            if token:
+                with self._token_lock:
+                    self._token = token
+                logger.info("[HomebridgeMonitor] Autenticación correcta")
+                return True
+            logger.warning("[HomebridgeMonitor] Respuesta sin token: %s", data)
+            return False
         except Exception as e:
             logger.error("[HomebridgeMonitor] Error de autenticación: %s", e)
             return False
@@ -271,13 +495,14 @@ class HomebridgeMonitor:
         Raises:
             Ninguno
         """
-        with self._token_lock:
-            token = self._token
-        if token:
-            return token
-        if self._authenticate():
+        with self._auth_lock:
             with self._token_lock:
-                return self._token
+                token = self._token
+            if token:
+                return token
+            if self._authenticate():
+                with self._token_lock:
+                    return self._token
         return None
 
     def _request(self, method: str, path: str, body: Optional[Dict] = None) -> Optional[Dict]:
@@ -300,28 +525,18 @@ class HomebridgeMonitor:
             if not token:
                 return None
 
-            payload = json.dumps(body).encode() if body else None
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json",
-            }
-            req = urllib.request.Request(
-                f"{HOMEBRIDGE_URL}{path}",
-                data=payload,
-                headers=headers,
-                method=method,
-            )
             try:
-                with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-                    content = resp.read().decode()
-                    return json.loads(content) if content else {}
-            except urllib.error.HTTPError as e:
-                if e.code == 401 and attempt == 0:
+                return self._http.request_json(
+                    method, path, json_body=body or None,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+            except HttpError as e:
+                if e.status == 401 and attempt == 0:
                     logger.warning("[HomebridgeMonitor] Token caducado, renovando...")
                     with self._token_lock:
                         self._token = None
                     continue
-                logger.error("[HomebridgeMonitor] HTTP %s en %s: %s", e.code, path, e)
+                logger.error("[HomebridgeMonitor] HTTP %s en %s: %s", e.status, path, e)
                 return None
             except Exception as e:
                 logger.error("[HomebridgeMonitor] Error en petición %s %s: %s", method, path, e)
@@ -330,33 +545,17 @@ class HomebridgeMonitor:
 
     # ── Accesorios ────────────────────────────────────────────────────────────
 
-    def get_accessories(self) -> List[Dict]:
+    @staticmethod
+    def _parse_accessories(data) -> List[Dict]:
         """
-        Recupera la lista de accesorios disponibles en Homebridge.
+        Convierte la respuesta de /api/accessories en la lista de dispositivos del dashboard.
 
-        Args: 
-            Ninguno
+        Args:
+            data: Respuesta JSON (lista, o dict con "accessories").
 
         Returns:
-            List[Dict]: Lista de diccionarios con información de los accesorios.
-
-        Raises:
-            Ninguna excepción específica.
-
-        Nota: Si el monitor no está en ejecución o no se puede conectar a Homebridge, 
-              se devuelve una lista vacía y se actualiza el estado de alcanzabilidad.
+            List[Dict]: Dispositivos con uniqueId, displayName, type y campos propios del tipo.
         """
-        # Si el monitor se ha detenido mientras esta función estaba en ejecución, no actualiza el estado ni el caché.
-        if not self._running:
-            self._reachable = False
-            return []
-        data = self._request("GET", "/api/accessories")
-        if data is None:
-            self._reachable = False
-            logger.warning("[HomebridgeMonitor] Sin conexión con Homebridge")
-            return []
-
-        self._reachable = True
         accesorios = data if isinstance(data, list) else data.get("accessories", [])
 
         devices = []
@@ -409,20 +608,153 @@ class HomebridgeMonitor:
                     "humidity": float(values.get("CurrentRelativeHumidity", 0))
                                 if "CurrentRelativeHumidity" in values else None,
                 })
+        return devices
+
+    def refresh(self) -> bool:
+        """
+        Sondea /api/accessories y publica los accesorios que han cambiado.
+
+        Args:
+            Ninguno
+
+        Returns:
+            bool: True si Homebridge respondió.
 
+        Nota: Si el monitor no está en ejecución no actualiza el estado ni la caché.
+        """
+        if not self._running:
+            return False
+        data = self._request("GET", "/api/accessories")
+        if data is None:
+            logger.warning("[HomebridgeMonitor] Sin conexión con Homebridge")
+            self._apply(None)
+            return False
+        self._apply(self._parse_accessories(data))
+        return True
+
+    def _apply(self, devices: Optional[List[Dict]], partial: bool = False) -> None:
+        """
+        Compara una lista nueva con la caché por uniqueId y publica solo las diferencias.
+
+        Args:
+            devices (Optional[List[Dict]]): Lista sondeada, o None si Homebridge no respondió
+                (se conserva la caché y solo cambia la alcanzabilidad).
+            partial (bool): La lista solo trae los accesorios cambiados (push del socket);
+                el resto de la caché se conserva.
+
+        Returns:
+            None
+        """
+        reachable = devices is not None
         with self._accessories_lock:
-            self._accessories = devices
-
-        """logger.debug(
-            "[HomebridgeMonitor] Sondeo OK — %d dispositivos (%s)",
-            len(devices),
-            ", ".join(
-                f"{t}:{sum(1 for d in devices if d['type']==t)}"
-                for t in ('switch','light','thermostat','sensor','blind')
-                if any(d['type']==t for d in devices)
-            ),
-        )"""
-        return devices
+            old = self._accessories
+            if devices is None:
+                new = old
+            elif partial:
+                new = dict(old)
+                new.update((d["uniqueId"], d) for d in devices)
+            else:
+                new = {d["uniqueId"]: d for d in devices}
+            changed = [d for uid, d in new.items() if old.get(uid) != d]
+            removed = [uid for uid in old if uid not in new]
+            order_changed = list(old) != list(new)
+            reach_changed = self._reachable != reachable
+            self._accessories = new
+            self._reachable = reachable
+            if not (changed or removed or order_changed or reach_changed):
+                return
+            self._version += 1
+            order = list(new)
+
+        get_event_bus().publish(HOMEBRIDGE_ACCESSORIES_CHANGED, {
+            "changed":   changed,
+            "removed":   removed,
+            "order":     order,
+            "reachable": reachable,
+        })
+
+    def _patch(self, unique_id: str, fields: Dict) -> Optional[Dict]:
+        """
+        Actualiza campos de un accesorio en caché y publica el cambio.
+
+        Args:
+            unique_id (str): Identificador único del accesorio.
+            fields (Dict): Campos a sobrescribir.
+
+        Returns:
+            Optional[Dict]: Valores anteriores de esos campos, o None si el accesorio no está en caché.
+        """
+        with self._accessories_lock:
+            acc = self._accessories.get(unique_id)
+            if acc is None:
+                return None
+            previous = {k: acc.get(k) for k in fields}
+            updated = {**acc, **fields}
+            if updated == acc:
+                return previous
+            self._accessories = {**self._accessories, unique_id: updated}
+            self._version += 1
+            order = list(self._accessories)
+            reachable = bool(self._reachable)
+
+        get_event_bus().publish(HOMEBRIDGE_ACCESSORIES_CHANGED, {
+            "changed":   [updated],
+            "removed":   [],
+            "order":     order,
+            "reachable": reachable,
+        })
+        return previous
+
+    def _write(self, unique_id: str, characteristic: str, value, fields: Dict) -> bool:
+        """
+        Escribe una característica con actualización optimista de la caché.
+
+        La caché (y la ventana) reflejan el nuevo valor antes de la petición; si
+        el PUT falla se restauran los valores anteriores. Si tiene éxito se pide
+        un refresco de confirmación que se agrupa con las escrituras cercanas
+        (con el socket conectado no hace falta: el servidor empuja el valor).
+
+        Args:
+            unique_id (str): Identificador único del accesorio.
+            characteristic (str): Característica HomeKit (On, Brightness, TargetTemperature).
+            value: Valor a escribir.
+            fields (Dict): Campos de la caché que cambian con la escritura.
+
+        Returns:
+            bool: True si Homebridge aceptó la escritura.
+        """
+        previous = self._patch(unique_id, fields)
+        result = self._request(
+            "PUT", f"/api/accessories/{unique_id}",
+            {"characteristicType": characteristic, "value": value},
+        )
+        if result is None:
+            if previous is not None:
+                self._patch(unique_id, previous)
+            return False
+        if not self._streaming:
+            self.request_refresh(WRITE_SETTLE_S)
+        return True
+
+    def get_accessories(self) -> List[Dict]:
+        """
+        Sondea Homebridge y devuelve la lista de accesorios.
+
+        Args: 
+            Ninguno
+
+        Returns:
+            List[Dict]: Lista de diccionarios con información de los accesorios.
+
+        Raises:
+            Ninguna excepción específica.
+
+        Nota: Si el monitor no está en ejecución o no se puede conectar a Homebridge, 
+              se devuelve una lista vacía y se actualiza el estado de alcanzabilidad.
+        """
+        if not self.refresh():
+            return []
+        return self.get_accessories_cached()
 
     def get_accessories_cached(self) -> List[Dict]:
         """
@@ -441,7 +773,17 @@ class HomebridgeMonitor:
         if not self._running:
             return []
         with self._accessories_lock:
-            return list(self._accessories)
+            return list(self._accessories.values())
+
+    def get_version(self) -> int:
+        """
+        Contador que aumenta con cada cambio en la caché de accesorios.
+
+        Returns:
+            int: Versión actual.
+        """
+        with self._accessories_lock:
+            return self._version
 
     def toggle(self, unique_id: str, turn_on: bool) -> bool:
         """
@@ -461,19 +803,11 @@ class HomebridgeMonitor:
         if not self._running:
             logger.warning("[HomebridgeMonitor] toggle() ignorado — servicio parado")
             return False
-        body   = {"characteristicType": "On", "value": turn_on}
-        result = self._request("PUT", f"/api/accessories/{unique_id}", body)
-        if result is not None:
+        if self._write(unique_id, "On", turn_on, {"on": bool(turn_on)}):
             logger.info(
                 "[HomebridgeMonitor] %s → %s",
                 unique_id, "ON" if turn_on else "OFF",
             )
-            # Sondeo inmediato para actualizar badges al instante
-            threading.Thread(
-                target=self.get_accessories,
-                daemon=True,
-                name="HB-PostToggle",
-            ).start()
             return True
         logger.error("[HomebridgeMonitor] Fallo al togglear %s", unique_id)
         return False
@@ -528,7 +862,7 @@ class HomebridgeMonitor:
         if self._reachable is None:
             return 0
         with self._accessories_lock:
-            return sum(1 for a in self._accessories if a.get("on", False))
+            return sum(1 for a in self._accessories.values() if a.get("on", False))
 
     def get_fault_count(self) -> int:
         """
@@ -546,7 +880,7 @@ class HomebridgeMonitor:
         if self._reachable is None:
             return 0
         with self._accessories_lock:
-            return sum(1 for a in self._accessories if a.get("fault", False))
+            return sum(1 for a in self._accessories.values() if a.get("fault", False))
         
     def set_brightness(self, unique_id: str, brightness: int) -> bool:
         """
@@ -567,14 +901,8 @@ class HomebridgeMonitor:
             logger.warning("[HomebridgeMonitor] set_brightness() ignorado — servicio parado")
             return False
         brightness = max(0, min(100, brightness))
-        result = self._request(
-            "PUT", f"/api/accessories/{unique_id}",
-            {"characteristicType": "Brightness", "value": brightness}
-        )
-        if result is not None:
+        if self._write(unique_id, "Brightness", brightness, {"brightness": brightness}):
             logger.info("[HomebridgeMonitor] Brillo %s → %d%%", unique_id, brightness)
-            threading.Thread(target=self.get_accessories, daemon=True,
-                             name="HB-PostBrightness").start()
             return True
         return False
 
@@ -596,13 +924,7 @@ class HomebridgeMonitor:
         if not self._running:
             logger.warning("[HomebridgeMonitor] set_target_temp() ignorado — servicio parado")
             return False
-        result = self._request(
-            "PUT", f"/api/accessories/{unique_id}",
-            {"characteristicType": "TargetTemperature", "value": temp}
-        )
-        if result is not None:
+        if self._write(unique_id, "TargetTemperature", temp, {"target_temp": float(temp)}):
             logger.info("[HomebridgeMonitor] Termostato %s → %.1f°C", unique_id, temp)
-            threading.Thread(target=self.get_accessories, daemon=True,
-                             name="HB-PostTemp").start()
             return True
         return False
\ No newline at end of file
@@ -5,18 +5,30 @@ Escaner I2C de solo lectura usando smbus2.
 Detecta dispositivos en todos los buses /dev/i2c-* disponibles.
 
 Arquitectura:
-  - Thread daemon que escanea cada INTERVAL_SECONDS
+  - Barrido completo (0x03-0x77) solo al arrancar, bajo petición (scan_now)
+    y cuando aparece o desaparece un bus en /dev (inotify vía FileWatcher)
+  - Entre barridos, mientras I2CWindow está abierta, solo se comprueba la
+    presencia de las direcciones ya conocidas cada PRESENCE_INTERVAL
+  - Cada bus se sondea en su propio hilo; se guarda el tiempo de cada sondeo
   - get_stats() devuelve cache — nunca bloquea la UI
   - SOLO LECTURA: usa read_byte() para detectar ACK, nunca escribe
   - smbus2 es opcional — si no está instalado devuelve error descriptivo
 """
 import threading
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from core.demand_registry import get_demand_registry
+from core.file_watcher import FileWatcher
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-INTERVAL_SECONDS = 30
+PRESENCE_INTERVAL   = 5     # comprobación de direcciones conocidas con la ventana abierta
+DEV_CHECK_INTERVAL  = 5     # consulta de cambios en /dev (inotify, no toca el bus)
+_DEMAND_KEY      = "i2c_monitor"   # sin lease no se comprueba la presencia
+_DEV_DIR         = "/dev"
 
 # Rango estándar de direcciones I2C válidas (evita reservadas)
 _ADDR_MIN = 0x03
@@ -47,9 +59,64 @@ _KNOWN_DEVICES = {
 }
 
 
+def _list_buses() -> List[int]:
+    """
+    Números de bus de los /dev/i2c-* presentes.
+
+    Returns:
+        List[int]: Buses ordenados.
+    """
+    try:
+        return sorted(
+            int(f[4:]) for f in os.listdir(_DEV_DIR)
+            if f.startswith("i2c-") and f[4:].isdigit()
+        )
+    except OSError:
+        return []
+
+
+def _probe(bus, addr: int) -> Optional[float]:
+    """
+    Sondea una dirección con read_byte() y mide lo que tarda.
+
+    Args:
+        bus: smbus2.SMBus abierto.
+        addr (int): Dirección de 7 bits.
+
+    Returns:
+        Optional[float]: Milisegundos hasta el ACK, o None si no responde.
+    """
+    start = time.perf_counter()
+    try:
+        bus.read_byte(addr)
+    except OSError:
+        return None   # Sin ACK — dirección vacía
+    return (time.perf_counter() - start) * 1000
+
+
+def _device(addr: int, probe_ms: float) -> Dict:
+    """
+    Entrada de dispositivo para get_stats().
+
+    Args:
+        addr (int): Dirección de 7 bits.
+        probe_ms (float): Tiempo del último sondeo.
+
+    Returns:
+        Dict: addr, addr_hex, name y probe_ms.
+    """
+    return {
+        "addr":     addr,
+        "addr_hex": f"0x{addr:02X}",
+        "name":     _KNOWN_DEVICES.get(addr, "Desconocido"),
+        "probe_ms": round(probe_ms, 3),
+    }
+
+
 class I2CMonitor:
     """
-    Monitoriza el bus I2C mediante escaneo periódico y almacena en caché los resultados.
+    Monitoriza el bus I2C: barrido completo ocasional y comprobaciones de
+    presencia baratas entre barridos. Los resultados se guardan en caché.
     No realiza escrituras en el bus, solo lectura.
 
     Args:
@@ -76,10 +143,15 @@ class I2CMonitor:
             Ninguno
         """
         self._lock    = threading.Lock()
+        self._scan_lock = threading.Lock()   # un solo barrido/comprobación a la vez
         self._stats   = {}
+        self._buses: Dict[int, Dict] = {}
+        self._bus_list: List[int] = []
+        self._version = 0
         self._running = False
         self._stop_evt = threading.Event()
         self._thread  = None
+        self._demand  = get_demand_registry()
 
     # ── Ciclo de vida ─────────────────────────────────────────────────────────
 
@@ -120,10 +192,14 @@ class I2CMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._demand.wake(_DEMAND_KEY)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=3)
         with self._lock:
             self._stats   = {}
+            self._buses   = {}
+            self._bus_list = []
+            self._version += 1
         logger.info("[I2CMonitor] Detenido")
     
     def is_running(self) -> bool:
@@ -145,17 +221,22 @@ class I2CMonitor:
             Ninguno
 
         Returns:
-            dict: Diccionario con estadísticas, incluyendo 'error', 'buses' y 'total'.
+            dict: Diccionario con estadísticas, incluyendo 'error', 'buses', 'total',
+                  'scanning', 'last_full_scan', 'last_check' (epoch) y 'version'.
+                  Cada bus incluye 'scan_ms', 'avg_probe_ms' y 'check_ms'; cada
+                  dispositivo su 'probe_ms'.
 
         Raises:
             Ninguno
         """
         with self._lock:
-            return dict(self._stats)
+            stats = dict(self._stats)
+            stats["version"] = self._version
+            return stats
 
     def scan_now(self) -> None:
         """
-        Fuerza un escaneo inmediato del bus I2C en un hilo daemon separado.
+        Fuerza un barrido completo inmediato en un hilo daemon separado.
 
         Args: 
             Ninguno
@@ -167,14 +248,15 @@ class I2CMonitor:
             Ninguno
         """
         threading.Thread(
-            target=self._scan, daemon=True, name="I2CScanNow").start()
+            target=self._full_scan, daemon=True, name="I2CScanNow").start()
 
     # ── Lógica interna ────────────────────────────────────────────────────────
 
     def _loop(self) -> None:
         """
-        Ejecuta un bucle en un hilo daemon que realiza un escaneo inicial y luego 
-        se repite a intervalos regulares hasta ser detenido.
+        Barre todos los buses al arrancar y después, hasta ser detenido,
+        vuelve a barrer si cambian los buses de /dev y comprueba la presencia
+        de los dispositivos conocidos mientras haya demanda.
 
         Args:
             Ninguno
@@ -185,14 +267,46 @@ class I2CMonitor:
         Raises:
             Ninguno
         """
-        self._scan()
-        while not self._stop_evt.wait(timeout=INTERVAL_SECONDS):
-            if self._running:
-                self._scan()
+        watcher = FileWatcher([_DEV_DIR])
+        self._full_scan()
+        try:
+            while not self._demand.wait(_DEMAND_KEY, self._stop_evt,
+                                        active_s=PRESENCE_INTERVAL,
+                                        idle_s=DEV_CHECK_INTERVAL):
+                if not self._running:
+                    continue
+                if watcher.changes() and _list_buses() != self._bus_list:
+                    logger.info("[I2CMonitor] Cambio de buses en /dev, barrido completo")
+                    self._full_scan()
+                elif self._demand.is_watched(_DEMAND_KEY):
+                    self._check_presence()
+        finally:
+            watcher.close()
+
+    def _import_smbus(self):
+        """
+        Importa smbus2; si no está instalado deja el error en las estadísticas.
 
-    def _scan(self) -> None:
+        Returns:
+            module | None: smbus2, o None si no está disponible.
         """
-        Realiza un escaneo interno de buses I2C disponibles y cachea los resultados de manera thread-safe.
+        try:
+            import smbus2
+            return smbus2
+        except ImportError:
+            with self._lock:
+                self._stats = {
+                    "error":  "smbus2 no instalado — ejecuta: pip install smbus2",
+                    "buses":  [],
+                    "total":  0,
+                }
+                self._version += 1
+            return None
+
+    def _full_scan(self) -> None:
+        """
+        Barre todas las direcciones de todos los buses, un hilo por bus, y
+        cachea los resultados de manera thread-safe.
 
         Args: 
             Ninguno
@@ -203,70 +317,165 @@ class I2CMonitor:
         Raises: 
             Ninguno
 
-        Nota: En caso de error, se actualiza el estado con un mensaje de error y una lista vacía de buses.
+        Nota: Si ya hay un barrido o comprobación en curso no hace nada.
         """
+        if not self._scan_lock.acquire(blocking=False):
+            return
         try:
-            import smbus2
-        except ImportError:
+            smbus2 = self._import_smbus()
+            if smbus2 is None:
+                return
+
+            buses = _list_buses()
+            if not buses:
+                with self._lock:
+                    self._buses = {}
+                    self._bus_list = []
+                    self._stats = {
+                        "error": "No se encontraron buses I2C en /dev/i2c-*",
+                        "buses": [],
+                        "total": 0,
+                    }
+                    self._version += 1
+                return
+
             with self._lock:
-                self._stats = {
-                    "error":  "smbus2 no instalado — ejecuta: pip install smbus2",
-                    "buses":  [],
-                    "total":  0,
-                }
-            return
+                self._stats["scanning"] = True
+                self._version += 1
 
-        
-        # Detectar buses disponibles
-        buses = sorted([
-            int(f[5:]) for f in os.listdir("/dev")
-            if f.startswith("i2c-") and f[5:].isdigit()
-        ])
+            with ThreadPoolExecutor(max_workers=len(buses),
+                                    thread_name_prefix="I2CBus") as pool:
+                results = list(pool.map(
+                    lambda n: self._scan_bus(smbus2, n), buses))
 
-        if not buses:
             with self._lock:
-                self._stats = {
-                    "error": "No se encontraron buses I2C en /dev/i2c-*",
-                    "buses": [],
-                    "total": 0,
-                }
-            return
+                self._buses = {info["bus"]: info for info in results}
+                self._bus_list = buses
+                self._publish(full=True)
+            logger.debug("[I2CMonitor] Barrido completo: %d dispositivo(s) en %d bus(es)",
+                         sum(info["count"] for info in results), len(buses))
+        finally:
+            self._scan_lock.release()
+
+    def _scan_bus(self, smbus2, bus_num: int) -> Dict:
+        """
+        Barre todas las direcciones válidas de un bus.
 
-        result_buses = []
-        total = 0
+        Args:
+            smbus2: Módulo smbus2.
+            bus_num (int): Número de bus.
 
-        for bus_num in buses:
-            devices = []
-            try:
-                bus = smbus2.SMBus(bus_num)
+        Returns:
+            Dict: bus, label, devices, count, scan_ms, avg_probe_ms y check_ms.
+        """
+        devices = []
+        probes  = []
+        start = time.perf_counter()
+        try:
+            with smbus2.SMBus(bus_num) as bus:
                 for addr in range(_ADDR_MIN, _ADDR_MAX + 1):
-                    try:
-                        bus.read_byte(addr)
-                        name = _KNOWN_DEVICES.get(addr, "Desconocido")
-                        devices.append({
-                            "addr":     addr,
-                            "addr_hex": f"0x{addr:02X}",
-                            "name":     name,
-                        })
-                    except OSError:
-                        pass   # Sin ACK — dirección vacía
-                bus.close()
-            except Exception as e:
-                logger.debug("[I2CMonitor] Bus %d error: %s", bus_num, e)
-                pass
-            result_buses.append({
-                "bus":     bus_num,
-                "label":   f"i2c-{bus_num}",
-                "devices": devices,
-                "count":   len(devices),
-            })
-            total += len(devices)
+                    t0 = time.perf_counter()
+                    probe_ms = _probe(bus, addr)
+                    probes.append((time.perf_counter() - t0) * 1000)
+                    if probe_ms is not None:
+                        devices.append(_device(addr, probe_ms))
+        except Exception as e:
+            logger.debug("[I2CMonitor] Bus %d error: %s", bus_num, e)
+        return {
+            "bus":          bus_num,
+            "label":        f"i2c-{bus_num}",
+            "devices":      devices,
+            "count":        len(devices),
+            "scan_ms":      round((time.perf_counter() - start) * 1000, 1),
+            "avg_probe_ms": round(sum(probes) / len(probes), 3) if probes else 0.0,
+            "check_ms":     0.0,
+        }
+
+    def _check_presence(self) -> None:
+        """
+        Comprueba solo las direcciones conocidas de cada bus, en paralelo.
+        Los dispositivos que dejan de responder se quitan de la caché; los
+        nuevos solo aparecen con un barrido completo.
 
-        with self._lock:
-            self._stats = {
-                "error": "",
-                "buses": result_buses,
-                "total": total,
-            }
-        logger.debug("[I2CMonitor] Escaneo completado: %d dispositivo(s) en %d bus(es)",
-                    total, len(buses))
+        Returns:
+            None
+        """
+        if not self._scan_lock.acquire(blocking=False):
+            return
+        try:
+            smbus2 = self._import_smbus()
+            with self._lock:
+                buses = [dict(info) for info in self._buses.values() if info["devices"]]
+            if smbus2 is None or not buses:
+                return
+            with ThreadPoolExecutor(max_workers=len(buses),
+                                    thread_name_prefix="I2CBus") as pool:
+                results = list(pool.map(
+                    lambda info: self._check_bus(smbus2, info), buses))
+            with self._lock:
+                changed = False
+                for info in results:
+                    old = self._buses.get(info["bus"])
+                    if old is None:
+                        continue
+                    changed |= info["count"] != old["count"]
+                    self._buses[info["bus"]] = info
+                self._publish(full=False, changed=changed)
+        finally:
+            self._scan_lock.release()
+
+    def _check_bus(self, smbus2, info: Dict) -> Dict:
+        """
+        Sondea las direcciones conocidas de un bus.
+
+        Args:
+            smbus2: Módulo smbus2.
+            info (Dict): Estado cacheado del bus (copia).
+
+        Returns:
+            Dict: Estado del bus actualizado.
+        """
+        devices = []
+        start = time.perf_counter()
+        try:
+            with smbus2.SMBus(info["bus"]) as bus:
+                for dev in info["devices"]:
+                    probe_ms = _probe(bus, dev["addr"])
+                    if probe_ms is None:
+                        logger.info("[I2CMonitor] %s ya no responde en %s",
+                                    dev["addr_hex"], info["label"])
+                    else:
+                        devices.append(_device(dev["addr"], probe_ms))
+        except Exception as e:
+            logger.debug("[I2CMonitor] Bus %d error: %s", info["bus"], e)
+            return info
+        info["devices"]  = devices
+        info["count"]    = len(devices)
+        info["check_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return info
+
+    def _publish(self, full: bool, changed: bool = True) -> None:
+        """
+        Reconstruye las estadísticas a partir de la caché por bus.
+        Debe llamarse con self._lock adquirido.
+
+        Args:
+            full (bool): True tras un barrido completo.
+            changed (bool): False si solo cambian tiempos (no sube la versión,
+                            así la UI no repinta).
+
+        Returns:
+            None
+        """
+        now = time.time()
+        buses = [self._buses[n] for n in sorted(self._buses)]
+        self._stats = {
+            "error":          "",
+            "buses":          buses,
+            "total":          sum(info["count"] for info in buses),
+            "scanning":       False,
+            "last_full_scan": now if full else self._stats.get("last_full_scan"),
+            "last_check":     now,
+        }
+        if changed:
+            self._version += 1
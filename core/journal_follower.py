@@ -0,0 +1,363 @@
+"""
+Seguidor en streaming del journal de systemd para una unidad.
+
+Un único `journalctl -f -o json` de larga duración por vista de logs abierta,
+en lugar de relanzar `journalctl -n N` en cada refresco:
+  - Las entradas se guardan en un buffer circular acotado (JOURNAL_BUFFER_LINES)
+  - El filtro de prioridad se aplica en journalctl (-p), no en Python
+  - Se guarda el __CURSOR de la última entrada: si journalctl termina (rotación,
+    reinicio de journald) se relanza con --after-cursor sin huecos ni duplicados
+  - Cambiar la prioridad no bloquea: se señala al lector anterior (que termina
+    solo) y se lanza otro; cada lector lleva un número de generación y lo que
+    lea un lector antiguo se descarta
+
+Uso:
+    follower = service_monitor.follow_logs("nginx", lines=50, priority="warning")
+    seq, lines, reset = follower.get_lines(since_seq=0)
+    ...
+    follower.stop()
+"""
+import json
+import subprocess
+import threading
+from collections import deque
+from datetime import datetime
+from typing import List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Líneas máximas en memoria por vista de logs
+JOURNAL_BUFFER_LINES = 500
+# Espera antes de relanzar journalctl si termina inesperadamente
+_RESTART_BACKOFF_S = 2.0
+_RESTART_BACKOFF_MAX_S = 30.0
+
+# Prioridades aceptadas por journalctl -p (de más a menos grave)
+JOURNAL_PRIORITIES = ("emerg", "alert", "crit", "err", "warning", "notice", "info", "debug")
+
+
+class JournalFollower:
+    """
+    Sigue el journal de una unidad systemd en un thread lector.
+
+    Args:
+        unit (str): Nombre del servicio (sin extensión .service).
+        lines (int): Entradas históricas a cargar al empezar.
+        priority (str, opcional): Prioridad máxima a mostrar (ej. 'warning').
+        cursor (str, opcional): Reanudar justo después de este cursor.
+        maxlen (int): Tamaño del buffer circular.
+    """
+
+    def __init__(self, unit: str, lines: int = 50, priority: Optional[str] = None,
+                 cursor: Optional[str] = None, maxlen: int = JOURNAL_BUFFER_LINES):
+        """
+        Prepara el seguidor sin lanzar journalctl todavía.
+
+        Args:
+            unit (str): Nombre del servicio (sin extensión .service).
+            lines (int): Entradas históricas a cargar al empezar.
+            priority (str, opcional): Prioridad máxima a mostrar (ej. 'warning').
+            cursor (str, opcional): Reanudar justo después de este cursor.
+            maxlen (int): Tamaño del buffer circular.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: Si la prioridad no es válida.
+        """
+        if priority is not None and priority not in JOURNAL_PRIORITIES:
+            raise ValueError(f"Prioridad de journal no válida: {priority}")
+        self.unit     = unit
+        self.priority = priority
+        self._lines   = lines
+        self._cursor  = cursor
+
+        self._lock   = threading.Lock()
+        self._buffer: deque = deque(maxlen=maxlen)
+        self._seq    = 0   # nº de la última línea añadida
+        self._error: Optional[str] = None
+
+        # Lector activo: cada start() crea uno nuevo con su evento de parada
+        self._proc: Optional[subprocess.Popen] = None
+        self._stop_evt = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._generation = 0
+
+    # ── Ciclo de vida ─────────────────────────────────────────────────────────
+
+    def start(self) -> "JournalFollower":
+        """
+        Lanza el thread lector.
+
+        Returns:
+            JournalFollower: La propia instancia, para encadenar.
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive() and not self._stop_evt.is_set():
+                return self
+            self._stop_evt = threading.Event()
+            self._generation += 1
+            thread = threading.Thread(
+                target=self._read_loop, args=(self._stop_evt, self._generation),
+                daemon=True, name=f"JournalFollower-{self.unit}"
+            )
+            self._thread = thread
+        thread.start()
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        Termina journalctl y el thread lector.
+
+        Args:
+            wait (bool): Esperar a que el lector termine; False desde el thread de Tk.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._stop_evt.set()
+            proc, thread = self._proc, self._thread
+        self._signal(proc)
+        if wait and thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=3)
+
+    def set_priority(self, priority: Optional[str]) -> None:
+        """
+        Cambia el filtro de prioridad y recarga el histórico con el nuevo filtro.
+
+        No bloquea (se llama desde el thread de Tk): el lector anterior recibe
+        SIGTERM y termina por su cuenta mientras arranca el nuevo.
+
+        Args:
+            priority (str, opcional): Nueva prioridad máxima; None muestra todo.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: Si la prioridad no es válida.
+        """
+        if priority is not None and priority not in JOURNAL_PRIORITIES:
+            raise ValueError(f"Prioridad de journal no válida: {priority}")
+        with self._lock:
+            if priority == self.priority:
+                return
+            self._stop_evt.set()
+            old_proc = self._proc
+            self.priority = priority
+            self._cursor  = None
+            self._buffer.clear()
+            self._seq += 1   # fuerza reset en los lectores
+            self._error = None
+        self._signal(old_proc)
+        self.start()
+
+    # ── Consulta ──────────────────────────────────────────────────────────────
+
+    @property
+    def cursor(self) -> Optional[str]:
+        """
+        Cursor de la última entrada leída, para reanudar más tarde.
+
+        Returns:
+            Optional[str]: Cursor del journal o None si aún no se ha leído nada.
+        """
+        with self._lock:
+            return self._cursor
+
+    @property
+    def error(self) -> Optional[str]:
+        """
+        Último error de journalctl, si lo hubo.
+
+        Returns:
+            Optional[str]: Mensaje de error o None.
+        """
+        with self._lock:
+            return self._error
+
+    def get_lines(self, since_seq: int = 0) -> Tuple[int, List[str], bool]:
+        """
+        Devuelve las líneas añadidas desde una secuencia dada.
+
+        Args:
+            since_seq (int): Secuencia devuelta por la llamada anterior (0 la primera vez).
+
+        Returns:
+            Tuple[int, List[str], bool]: (secuencia actual, líneas nuevas, reset).
+                reset es True si el lector se quedó atrás o cambió el filtro:
+                las líneas son entonces el buffer completo y hay que repintar.
+        """
+        with self._lock:
+            seq = self._seq
+            new = seq - since_seq
+            if since_seq == 0 or new < 0 or new > len(self._buffer):
+                return seq, list(self._buffer), True
+            if new == 0:
+                return seq, [], False
+            return seq, list(self._buffer)[-new:], False
+
+    # ── Lectura ───────────────────────────────────────────────────────────────
+
+    def _command(self) -> List[str]:
+        """
+        Construye la línea de journalctl según el cursor y la prioridad actuales.
+
+        Returns:
+            List[str]: Comando a ejecutar.
+        """
+        cmd = ["journalctl", "-u", f"{self.unit}.service", "-f", "-o", "json", "--no-pager"]
+        with self._lock:
+            if self._cursor:
+                cmd += [f"--after-cursor={self._cursor}"]
+            else:
+                cmd += ["-n", str(self._lines)]
+            if self.priority:
+                cmd += ["-p", self.priority]
+        return cmd
+
+    def _read_loop(self, stop_evt: threading.Event, generation: int) -> None:
+        """
+        Lee journalctl línea a línea, relanzándolo desde el cursor si termina.
+
+        Args:
+            stop_evt (threading.Event): Evento de parada de este lector.
+            generation (int): Generación de este lector; si deja de ser la
+                actual, lo que lea se descarta.
+
+        Returns:
+            None
+        """
+        backoff = _RESTART_BACKOFF_S
+        while not stop_evt.is_set():
+            proc = None
+            try:
+                proc = subprocess.Popen(
+                    self._command(), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                    text=True, bufsize=1,
+                )
+                with self._lock:
+                    if stop_evt.is_set():
+                        break   # el finally termina este journalctl
+                    self._proc = proc
+                for raw in proc.stdout:
+                    if stop_evt.is_set():
+                        break
+                    if self._append(raw, generation):
+                        backoff = _RESTART_BACKOFF_S
+                proc.wait(timeout=2)
+                if not stop_evt.is_set() and proc.returncode:
+                    err = (proc.stderr.read() or "").strip()
+                    with self._lock:
+                        if generation == self._generation:
+                            self._error = err or f"journalctl salió con código {proc.returncode}"
+                    logger.warning("[JournalFollower] %s: %s", self.unit,
+                                   err or proc.returncode)
+            except Exception as e:
+                with self._lock:
+                    if generation == self._generation:
+                        self._error = str(e)
+                logger.error("[JournalFollower] Error leyendo journal de %s: %s", self.unit, e)
+            finally:
+                self._kill(proc)
+
+            if stop_evt.wait(backoff):
+                break
+            backoff = min(backoff * 2, _RESTART_BACKOFF_MAX_S)
+
+    def _append(self, raw: str, generation: int) -> bool:
+        """
+        Procesa una línea JSON de journalctl y la añade al buffer.
+
+        Args:
+            raw (str): Línea JSON.
+            generation (int): Generación del lector que la leyó.
+
+        Returns:
+            bool: True si se añadió una entrada.
+        """
+        try:
+            entry = json.loads(raw)
+        except ValueError:
+            return False
+        line = self._format(entry)
+        with self._lock:
+            if generation != self._generation:
+                return False   # lector antiguo (cambio de prioridad)
+            self._buffer.append(line)
+            self._seq += 1
+            self._cursor = entry.get("__CURSOR", self._cursor)
+            self._error = None
+        return True
+
+    @staticmethod
+    def _format(entry: dict) -> str:
+        """
+        Da a una entrada el formato 'short' de journalctl.
+
+        Args:
+            entry (dict): Entrada JSON del journal.
+
+        Returns:
+            str: Línea 'Oct 19 12:00:01 host ident[pid]: mensaje'.
+        """
+        message = entry.get("MESSAGE", "")
+        if isinstance(message, list):   # mensajes no UTF-8 llegan como lista de bytes
+            message = bytes(message).decode("utf-8", "replace")
+        try:
+            ts = datetime.fromtimestamp(int(entry["__REALTIME_TIMESTAMP"]) / 1e6)
+            stamp = ts.strftime("%b %d %H:%M:%S")
+        except (KeyError, ValueError):
+            stamp = ""
+        ident = entry.get("SYSLOG_IDENTIFIER") or entry.get("_COMM", "")
+        pid = entry.get("_PID")
+        source = f"{ident}[{pid}]" if pid else ident
+        prefix = " ".join(p for p in (stamp, entry.get("_HOSTNAME", ""), source) if p)
+        return f"{prefix}: {message}"
+
+    @staticmethod
+    def _signal(proc: Optional[subprocess.Popen]) -> None:
+        """
+        Envía SIGTERM a un journalctl sin esperar a que termine.
+
+        Su lector ve el fin de stdout y recoge el proceso en su propio thread.
+
+        Args:
+            proc (subprocess.Popen, opcional): Proceso a terminar.
+
+        Returns:
+            None
+        """
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+
+    def _kill(self, proc: Optional[subprocess.Popen]) -> None:
+        """
+        Termina un proceso journalctl si sigue vivo, esperando hasta 2 s.
+
+        Se llama desde el thread lector dueño del proceso.
+
+        Args:
+            proc (subprocess.Popen, opcional): Proceso a terminar.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._proc is proc:
+                self._proc = None
+        if proc and proc.poll() is None:
+            try:
+                proc.terminate()
+                proc.wait(timeout=2)
+            except Exception:
+                try:
+                    proc.kill()
+                except Exception:
+                    pass
@@ -0,0 +1,260 @@
+"""
+Lectura pasiva de la tabla de vecinos IPv4 del kernel (ARP).
+
+  - read_neighbours()        → entradas actuales con IP, MAC, interfaz y
+                               momento de la última confirmación
+  - open_neighbour_events()  → socket RTNETLINK que recibe RTM_NEWNEIGH /
+                               RTM_DELNEIGH, para despertar al lector
+
+La tabla se pide por RTNETLINK (RTM_GETNEIGH) porque incluye NDA_CACHEINFO:
+cuántos ticks hace que el kernel confirmó al vecino. /proc/net/arp no lo
+dice (una entrada STALE sigue ahí con flag 0x2 aunque el equipo se haya ido);
+se usa solo como fallback, tomando 'ahora' como última confirmación.
+"""
+import os
+import socket
+import struct
+import time
+from typing import Dict, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROC_ARP = "/proc/net/arp"
+
+_NETLINK_ROUTE = 0
+_RTMGRP_NEIGH  = 0x4
+_RTM_NEWNEIGH  = 28
+_RTM_GETNEIGH  = 30
+_NLMSG_ERROR   = 2
+_NLMSG_DONE    = 3
+_NLM_F_REQUEST = 0x001
+_NLM_F_DUMP    = 0x300
+
+_NDA_DST       = 1
+_NDA_LLADDR    = 2
+_NDA_CACHEINFO = 3
+
+# Estados NUD que no indican un vecino real
+_NUD_INCOMPLETE = 0x01
+_NUD_FAILED     = 0x20
+_NUD_NOARP      = 0x40
+_NUD_SKIP       = _NUD_INCOMPLETE | _NUD_FAILED | _NUD_NOARP
+
+_ATF_COM = 0x2   # flag 'completa' en /proc/net/arp
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_NDMSG    = struct.Struct("=BBHiHBB")
+_NLATTR   = struct.Struct("=HH")
+_CACHEINFO = struct.Struct("=IIII")   # confirmed, used, updated, refcnt (clock_t)
+_TIMEOUT_S = 2.0
+_RECV_BUF  = 65536
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_NULL_MAC = "00:00:00:00:00:00"
+
+
+def _parse_attrs(data: bytes) -> Dict[int, bytes]:
+    """
+    Decodifica los atributos rtattr de un mensaje RTNETLINK.
+
+    Args:
+        data (bytes): Atributos concatenados.
+
+    Returns:
+        Dict[int, bytes]: tipo → contenido.
+    """
+    attrs, offset = {}, 0
+    while offset + _NLATTR.size <= len(data):
+        length, atype = _NLATTR.unpack_from(data, offset)
+        if length < _NLATTR.size:
+            break
+        attrs[atype & 0x3FFF] = data[offset + _NLATTR.size: offset + length]
+        offset += (length + 3) & ~3
+    return attrs
+
+
+def _ifname(ifindex: int) -> str:
+    """
+    Nombre de interfaz a partir de su índice.
+
+    Args:
+        ifindex (int): Índice de la interfaz.
+
+    Returns:
+        str: Nombre, o cadena vacía si ya no existe.
+    """
+    try:
+        return socket.if_indextoname(ifindex)
+    except OSError:
+        return ""
+
+
+def parse_neigh_message(body: bytes, now: Optional[float] = None) -> Optional[Dict]:
+    """
+    Convierte el cuerpo de un RTM_NEWNEIGH en una entrada de vecino.
+
+    Args:
+        body (bytes): Mensaje sin la cabecera nlmsghdr.
+        now (float, opcional): Epoch de referencia para last_seen.
+
+    Returns:
+        Optional[Dict]: ip, mac, iface y last_seen; None si no es un vecino
+                        IPv4 con MAC válida y estado utilizable.
+    """
+    if len(body) < _NDMSG.size:
+        return None
+    family, _p1, _p2, ifindex, state, _flags, _type = _NDMSG.unpack_from(body)
+    if family != socket.AF_INET or state & _NUD_SKIP:
+        return None
+    attrs = _parse_attrs(body[_NDMSG.size:])
+    dst, lladdr = attrs.get(_NDA_DST), attrs.get(_NDA_LLADDR)
+    if not dst or len(dst) != 4 or not lladdr or len(lladdr) != 6:
+        return None
+    mac = ":".join(f"{b:02X}" for b in lladdr)
+    if mac == _NULL_MAC:
+        return None
+    now = time.time() if now is None else now
+    last_seen = now
+    cache = attrs.get(_NDA_CACHEINFO)
+    if cache and len(cache) >= _CACHEINFO.size:
+        confirmed = _CACHEINFO.unpack_from(cache)[0]
+        last_seen = now - confirmed / _CLK_TCK
+    return {
+        "ip":        socket.inet_ntoa(dst),
+        "mac":       mac,
+        "iface":     _ifname(ifindex),
+        "last_seen": last_seen,
+    }
+
+
+def _read_netlink() -> List[Dict]:
+    """
+    Vuelca la tabla de vecinos IPv4 por RTNETLINK.
+
+    Returns:
+        List[Dict]: Entradas de parse_neigh_message().
+
+    Raises:
+        OSError: Si RTNETLINK no está disponible o falla la petición.
+    """
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_ROUTE) as sock:
+        sock.settimeout(_TIMEOUT_S)
+        sock.bind((0, 0))
+        payload = _NDMSG.pack(socket.AF_INET, 0, 0, 0, 0, 0, 0)
+        sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(payload), _RTM_GETNEIGH,
+                                 _NLM_F_REQUEST | _NLM_F_DUMP, 1, 0) + payload)
+        now = time.time()
+        entries = []
+        while True:
+            data = sock.recv(_RECV_BUF)
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, mtype, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+                if length < _NLMSGHDR.size:
+                    return entries
+                body = data[offset + _NLMSGHDR.size: offset + length]
+                offset += (length + 3) & ~3
+                if mtype == _NLMSG_DONE:
+                    return entries
+                if mtype == _NLMSG_ERROR:
+                    err = struct.unpack_from("=i", body)[0]
+                    if err:
+                        raise OSError(-err, os.strerror(-err))
+                    return entries
+                if mtype == _RTM_NEWNEIGH:
+                    entry = parse_neigh_message(body, now)
+                    if entry:
+                        entries.append(entry)
+
+
+def _read_proc_arp(path: str = PROC_ARP) -> List[Dict]:
+    """
+    Lee la tabla ARP desde /proc/net/arp (fallback sin netlink).
+
+    Args:
+        path (str): Ruta del fichero.
+
+    Returns:
+        List[Dict]: Entradas completas con last_seen = ahora.
+    """
+    entries = []
+    now = time.time()
+    try:
+        with open(path, "r") as f:
+            next(f, None)   # cabecera
+            for line in f:
+                parts = line.split()
+                if len(parts) < 6:
+                    continue
+                try:
+                    flags = int(parts[2], 16)
+                except ValueError:
+                    continue
+                mac = parts[3].upper()
+                if not flags & _ATF_COM or mac == _NULL_MAC:
+                    continue
+                entries.append({
+                    "ip":        parts[0],
+                    "mac":       mac,
+                    "iface":     parts[5],
+                    "last_seen": now,
+                })
+    except OSError as e:
+        logger.debug("[NeighbourTable] No se pudo leer %s: %s", path, e)
+    return entries
+
+
+def read_neighbours() -> List[Dict]:
+    """
+    Devuelve la tabla de vecinos IPv4 actual.
+
+    Returns:
+        List[Dict]: ip, mac (mayúsculas), iface y last_seen (epoch de la
+                    última confirmación de alcanzabilidad).
+    """
+    try:
+        return _read_netlink()
+    except OSError as e:
+        logger.debug("[NeighbourTable] RTNETLINK no disponible (%s), usando %s", e, PROC_ARP)
+        return _read_proc_arp()
+
+
+def open_neighbour_events() -> Optional[socket.socket]:
+    """
+    Abre un socket RTNETLINK no bloqueante suscrito a cambios de vecinos.
+
+    Returns:
+        Optional[socket.socket]: Socket, o None si no está disponible.
+    """
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_ROUTE)
+        sock.bind((0, _RTMGRP_NEIGH))
+        sock.setblocking(False)
+        return sock
+    except (OSError, AttributeError) as e:
+        logger.info("[NeighbourTable] Eventos de vecinos no disponibles: %s", e)
+        return None
+
+
+def drain_events(sock: socket.socket) -> bool:
+    """
+    Vacía los mensajes pendientes del socket de eventos.
+
+    Args:
+        sock (socket.socket): Socket de open_neighbour_events().
+
+    Returns:
+        bool: True si llegó algún mensaje (o se perdieron por ENOBUFS).
+    """
+    received = False
+    while True:
+        try:
+            if not sock.recv(_RECV_BUF):
+                break
+            received = True
+        except BlockingIOError:
+            break
+        except OSError:
+            return True
+    return received
@@ -3,24 +3,235 @@ Escáner de red local usando arp-scan.
 Requiere: sudo arp-scan (disponible en Kali por defecto)
 
 Ejecuta arp-scan en un thread de background para no bloquear la UI.
+Los dispositivos se publican en cuanto termina arp-scan; los hostnames se
+resuelven después en un pool acotado y se rellenan según van llegando.
+Las resoluciones (también las fallidas) se guardan en un caché con TTL
+persistido en data/hostname_cache.json.
+
+Además hay descubrimiento pasivo continuo: un thread lee la tabla de vecinos
+del kernel (core.neighbour_table) al recibir eventos RTNETLINK o cada 30s,
+y mantiene un inventario persistente (data/network_inventory.json) con IP,
+fabricante, hostname, primera y última vez visto. Las altas y bajas se
+publican en el EventBus (network.device_joined / network.device_left).
+arp-scan queda para escaneos activos ocasionales, que también alimentan
+el inventario.
 """
+import json
+import os
+import select
 import subprocess
 import threading
 import socket
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import List, Dict, Optional
+from config.settings import DATA_DIR
+from core.event_bus import get_event_bus
+from core.events import NETWORK_DEVICE_JOINED, NETWORK_DEVICE_LEFT
+from core.neighbour_table import drain_events, open_neighbour_events, read_neighbours
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 ARP_TIMEOUT = 15
 
+# Resolución inversa de hostnames
+HOSTNAME_CACHE_FILE = DATA_DIR / "hostname_cache.json"
+_RESOLVE_WORKERS = 8
+_RESOLVE_TIMEOUT = 2.0     # segundos por lookup
+_HOSTNAME_TTL    = 86400   # nombre resuelto: 24h
+_NEGATIVE_TTL    = 3600    # sin PTR o timeout: 1h
+
+# Descubrimiento pasivo
+INVENTORY_FILE     = DATA_DIR / "network_inventory.json"
+PASSIVE_INTERVAL   = 30      # relectura de la tabla de vecinos con eventos netlink
+_PASSIVE_FALLBACK  = 10      # relectura sin eventos netlink
+_EVENT_DEBOUNCE_S  = 1.0     # agrupa ráfagas de eventos de vecinos
+LEAVE_AFTER_S      = 300     # sin confirmar en este tiempo → dispositivo fuera
+INVENTORY_MAX_AGE_S   = 7 * 86400  # fuera y sin verse en 7 días → se olvida
+INVENTORY_MAX_DEVICES = 512        # tope ante MACs aleatorias; se olvidan los más antiguos
+_INVENTORY_SAVE_S  = 60      # escritura del inventario como mucho cada minuto
+_SELECT_SLICE      = 1.0
+
+_OUI_FILES = (
+    "/etc/arp-scan/mac-vendor.txt",
+    "/usr/share/arp-scan/ieee-oui.txt",
+)
+
 _ARP_LINE = re.compile(
     r'^(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\t([\da-fA-F:]{17})\t(.*)$'
 )
 
 
+class _HostnameCache:
+    """
+    Caché persistente de resoluciones inversas, con clave MAC|IP.
+
+    Guarda también los resultados negativos (cadena vacía) con un TTL más
+    corto, para no repetir lookups que ya sabemos que tardan y fallan.
+
+    Args:
+        path: Fichero JSON donde se persiste.
+    """
+
+    def __init__(self, path):
+        """
+        Carga el caché del disco descartando las entradas caducadas.
+
+        Args:
+            path: Fichero JSON donde se persiste.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._path  = path
+        self._lock  = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict] = {}
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            now = time.time()
+            self._entries = {
+                k: v for k, v in data.items()
+                if isinstance(v, dict) and v.get("expires", 0) > now
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("[NetworkScanner] Caché de hostnames ilegible: %s", e)
+
+    @staticmethod
+    def _key(mac: str, ip: str) -> str:
+        """Clave del caché para un dispositivo."""
+        return f"{mac}|{ip}"
+
+    def get(self, mac: str, ip: str) -> Optional[str]:
+        """
+        Devuelve el hostname cacheado si no ha caducado.
+
+        Args:
+            mac (str): MAC del dispositivo.
+            ip (str): IP del dispositivo.
+
+        Returns:
+            Optional[str]: Hostname ('' = resultado negativo) o None si no hay entrada válida.
+        """
+        with self._lock:
+            entry = self._entries.get(self._key(mac, ip))
+        if entry is None or entry["expires"] <= time.time():
+            return None
+        return entry["hostname"]
+
+    def put(self, mac: str, ip: str, hostname: str) -> None:
+        """
+        Guarda una resolución (positiva o negativa).
+
+        Args:
+            mac (str): MAC del dispositivo.
+            ip (str): IP del dispositivo.
+            hostname (str): Nombre resuelto o '' si no se resolvió.
+
+        Returns:
+            None
+        """
+        ttl = _HOSTNAME_TTL if hostname else _NEGATIVE_TTL
+        with self._lock:
+            self._entries[self._key(mac, ip)] = {
+                "hostname": hostname,
+                "expires":  time.time() + ttl,
+            }
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Persiste el caché de forma atómica si hubo cambios.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            data = {k: v for k, v in self._entries.items() if v["expires"] > now}
+            self._dirty = False
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = str(self._path) + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, str(self._path))
+        except Exception as e:
+            logger.error("[NetworkScanner] Error guardando caché de hostnames: %s", e)
+
+
+class _OuiTable:
+    """
+    Fabricante a partir del prefijo de la MAC, con los ficheros de arp-scan.
+
+    Se carga de forma perezosa la primera vez que se consulta.
+    """
+
+    def __init__(self):
+        """
+        Inicializa la tabla sin cargar.
+
+        Returns:
+            None
+        """
+        self._table: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        """
+        Lee los ficheros OUI (prefijo hexadecimal → fabricante).
+
+        Returns:
+            Dict[str, str]: Tabla de prefijos; vacía si arp-scan no está instalado.
+        """
+        table: Dict[str, str] = {}
+        for path in _OUI_FILES:
+            try:
+                with open(path, "r", errors="replace") as f:
+                    for line in f:
+                        if not line.strip() or line.startswith("#"):
+                            continue
+                        prefix, _, vendor = line.rstrip("\n").partition("\t")
+                        prefix = prefix.replace(":", "").replace("-", "").upper()
+                        # mac-vendor.txt va primero: sus entradas tienen prioridad
+                        if prefix and vendor:
+                            table.setdefault(prefix, vendor.strip())
+            except OSError:
+                continue
+        return table
+
+    def lookup(self, mac: str) -> str:
+        """
+        Busca el fabricante de una MAC (prefijo más largo primero).
+
+        Args:
+            mac (str): MAC en formato AA:BB:CC:DD:EE:FF.
+
+        Returns:
+            str: Fabricante o cadena vacía.
+        """
+        with self._lock:
+            if self._table is None:
+                self._table = self._load()
+            table = self._table
+        digits = mac.replace(":", "").upper()
+        for length in (9, 7, 6):
+            vendor = table.get(digits[:length])
+            if vendor:
+                return vendor
+        return ""
+
+
 class NetworkScanner:
     """
     Activa el escáner de red para iniciar el proceso de detección de dispositivos.
@@ -51,12 +262,30 @@ class NetworkScanner:
         self._last_scan: Optional[float] = None
         self._lock                      = threading.Lock()
         self._running                   = True
+        self._version                   = 0   # sube con cada cambio en _devices
+
+        self._hostnames = _HostnameCache(HOSTNAME_CACHE_FILE)
+        self._resolver: Optional[ThreadPoolExecutor] = None
+        # gethostbyaddr no admite timeout: corre en su propio pool acotado y
+        # un lookup colgado ocupa como mucho uno de sus workers
+        self._ptr_pool: Optional[ThreadPoolExecutor] = None
+        self._resolving = 0
+
+        # Inventario pasivo: MAC → dispositivo
+        self._oui = _OuiTable()
+        self._inventory: Dict[str, Dict] = self._load_inventory()
+        self._inventory_dirty = False
+        self._inventory_saved = 0.0
+        self._stop_evt = threading.Event()
+        self._passive_thread: Optional[threading.Thread] = None
+
+        self.start()
 
     # ── Ciclo de vida ─────────────────────────────────────────────────────────
 
     def start(self) -> None:
         """
-        Inicia el escaneo de red.
+        Inicia el escaneo de red y el descubrimiento pasivo en segundo plano.
 
         Args:
             Ninguno
@@ -68,6 +297,13 @@ class NetworkScanner:
             Ninguno
         """
         self._running = True
+        if self._passive_thread and self._passive_thread.is_alive():
+            return
+        self._stop_evt.clear()
+        self._passive_thread = threading.Thread(
+            target=self._passive_loop, daemon=True, name="NetworkPassive"
+        )
+        self._passive_thread.start()
         logger.info("[NetworkScanner] Iniciado")
 
     def stop(self) -> None:
@@ -84,10 +320,26 @@ class NetworkScanner:
             Ninguno
         """
         self._running = False
+        self._stop_evt.set()
+        if self._passive_thread and self._passive_thread.is_alive():
+            self._passive_thread.join(timeout=_SELECT_SLICE + 2)
         with self._lock:
-            self._devices = []
-            self._status  = "idle"
-            self._error   = ""
+            resolver, self._resolver = self._resolver, None
+            ptr_pool, self._ptr_pool = self._ptr_pool, None
+        if resolver is not None:
+            resolver.shutdown(wait=False, cancel_futures=True)
+        if ptr_pool is not None:
+            ptr_pool.shutdown(wait=False, cancel_futures=True)
+        self._hostnames.save()
+        self._save_inventory(force=True)
+        with self._lock:
+            for device in self._inventory.values():
+                device["online"] = False
+            self._devices   = []
+            self._status    = "idle"
+            self._error     = ""
+            self._resolving = 0
+            self._version  += 1
         logger.info("[NetworkScanner] Detenido")
     
     def is_running(self) -> bool:
@@ -143,6 +395,45 @@ class NetworkScanner:
         with self._lock:
             return list(self._devices)
 
+    def get_inventory(self, online_only: bool = False) -> List[Dict]:
+        """
+        Devuelve el inventario de dispositivos vistos (pasivo + escaneos activos).
+
+        Args:
+            online_only (bool): Solo los confirmados en los últimos LEAVE_AFTER_S segundos.
+
+        Returns:
+            List[Dict]: ip, mac, vendor, hostname, iface, first_seen, last_seen
+                        (epoch) y online, ordenados por IP.
+        """
+        with self._lock:
+            devices = [dict(d) for d in self._inventory.values()
+                       if d["online"] or not online_only]
+        devices.sort(key=lambda d: tuple(int(x) for x in d["ip"].split(".")))
+        return devices
+
+    def get_version(self) -> int:
+        """
+        Devuelve un contador que cambia cada vez que cambia la lista de dispositivos.
+
+        La UI lo compara para repintar solo cuando llegan hostnames o resultados nuevos.
+
+        Returns:
+            int: Versión actual de la lista.
+        """
+        with self._lock:
+            return self._version
+
+    def is_resolving(self) -> bool:
+        """
+        Indica si quedan hostnames pendientes de resolver.
+
+        Returns:
+            bool: True mientras el pool de resolución tiene trabajo.
+        """
+        with self._lock:
+            return self._resolving > 0
+
     def get_status(self) -> str:
         """
         Obtiene el estado actual del escaneo de red.
@@ -223,29 +514,40 @@ class NetworkScanner:
                     f"arp-scan salió con código {result.returncode}: {result.stderr.strip()}"
                 )
             devices = self._parse_output(result.stdout)
+            pending = [(d["mac"], d["ip"]) for d in devices
+                       if self._hostnames.get(d["mac"], d["ip"]) is None]
             with self._lock:
                 self._devices   = devices
                 self._status    = "done"
                 self._last_scan = time.time()
                 self._error     = ""
-            logger.info("[NetworkScanner] Escaneo completado — %d dispositivos", len(devices))
+                self._version  += 1
+            logger.info("[NetworkScanner] Escaneo completado — %d dispositivos (%d hostnames por resolver)",
+                        len(devices), len(pending))
+            now = time.time()
+            self._update_inventory(
+                [{**d, "iface": "", "last_seen": now} for d in devices], baseline=False)
+            self._resolve_pending(pending)
 
         except subprocess.TimeoutExpired:
             with self._lock:
                 self._status = "error"
                 self._error  = f"Timeout ({ARP_TIMEOUT}s) — red puede ser grande"
+                self._version += 1
             logger.warning("[NetworkScanner] Timeout en arp-scan")
 
         except FileNotFoundError:
             with self._lock:
                 self._status = "error"
                 self._error  = "arp-scan no encontrado — instalar con: sudo apt install arp-scan"
+                self._version += 1
             logger.error("[NetworkScanner] arp-scan no instalado")
 
         except Exception as e:
             with self._lock:
                 self._status = "error"
                 self._error  = str(e)
+                self._version += 1
             logger.error("[NetworkScanner] Error en escaneo: %s", e)
 
     def _parse_output(self, output: str) -> list:
@@ -285,27 +587,324 @@ class NetworkScanner:
                 "ip":       ip,
                 "mac":      mac,
                 "vendor":   vendor,
-                "hostname": self._resolve_hostname(ip),
+                "hostname": self._hostnames.get(mac, ip) or "",
             })
 
         devices.sort(key=lambda d: tuple(int(x) for x in d["ip"].split(".")))
         return devices
 
+    # ── Descubrimiento pasivo ─────────────────────────────────────────────────
+
+    def _passive_loop(self) -> None:
+        """
+        Lee la tabla de vecinos al llegar eventos RTNETLINK (o periódicamente)
+        y actualiza el inventario.
+
+        La primera lectura tras arrancar es la línea base: marca los presentes
+        como online sin publicar altas.
+
+        Returns:
+            None
+        """
+        sock = open_neighbour_events()
+        interval = PASSIVE_INTERVAL if sock else _PASSIVE_FALLBACK
+        baseline = True
+        next_read = 0.0
+        try:
+            while not self._stop_evt.is_set():
+                now = time.monotonic()
+                if now >= next_read:
+                    try:
+                        self._update_inventory(read_neighbours(), baseline=baseline)
+                        baseline = False
+                        self._save_inventory()
+                    except Exception as e:
+                        logger.error("[NetworkScanner] Error en descubrimiento pasivo: %s", e)
+                    next_read = now + interval
+                    continue
+                timeout = min(next_read - now, _SELECT_SLICE)
+                if sock is None:
+                    self._stop_evt.wait(timeout=timeout)
+                    continue
+                try:
+                    readable, _, _ = select.select([sock], [], [], timeout)
+                except (OSError, ValueError):
+                    readable = []
+                if readable and drain_events(sock):
+                    next_read = min(next_read, now + _EVENT_DEBOUNCE_S)
+        finally:
+            if sock is not None:
+                sock.close()
+
+    def _update_inventory(self, entries: List[Dict], baseline: bool) -> None:
+        """
+        Incorpora entradas vistas al inventario y publica altas y bajas.
+
+        Args:
+            entries (List[Dict]): ip, mac, last_seen y opcionalmente iface, vendor y hostname.
+            baseline (bool): True en la primera lectura: no publica altas.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        joined, left, pending = [], [], []
+        with self._lock:
+            changed = False
+            for entry in entries:
+                mac = entry["mac"].upper()
+                device = self._inventory.get(mac)
+                if device is None:
+                    hostname = entry.get("hostname") or self._hostnames.get(mac, entry["ip"])
+                    device = {
+                        "mac":        mac,
+                        "ip":         entry["ip"],
+                        "vendor":     entry.get("vendor") or self._oui.lookup(mac),
+                        "hostname":   hostname or "",
+                        "iface":      entry.get("iface", ""),
+                        "first_seen": entry["last_seen"],
+                        "last_seen":  entry["last_seen"],
+                        "online":     False,
+                    }
+                    self._inventory[mac] = device
+                    if hostname is None:
+                        pending.append((mac, entry["ip"]))
+                    changed = True
+                else:
+                    if device["ip"] != entry["ip"]:
+                        # El hostname era del PTR de la IP anterior
+                        hostname = entry.get("hostname") or self._hostnames.get(mac, entry["ip"])
+                        device["ip"] = entry["ip"]
+                        device["hostname"] = hostname or ""
+                        if hostname is None:
+                            pending.append((mac, entry["ip"]))
+                        changed = True
+                    if entry.get("vendor") and not device["vendor"]:
+                        device["vendor"] = entry["vendor"]
+                        changed = True
+                    if entry.get("iface"):
+                        device["iface"] = entry["iface"]
+                    device["last_seen"] = max(device["last_seen"], entry["last_seen"])
+                self._inventory_dirty = True
+
+            for device in self._inventory.values():
+                fresh = now - device["last_seen"] <= LEAVE_AFTER_S
+                if fresh and not device["online"]:
+                    device["online"] = True
+                    changed = True
+                    if not baseline:
+                        joined.append(dict(device))
+                elif not fresh and device["online"]:
+                    device["online"] = False
+                    changed = True
+                    left.append(dict(device))
+            if self._prune_inventory(now):
+                self._inventory_dirty = True
+                changed = True
+            if changed:
+                self._version += 1
+
+        bus = get_event_bus()
+        for device in joined:
+            logger.info("[NetworkScanner] Dispositivo nuevo en la red: %s (%s)",
+                        device["ip"], device["mac"])
+            bus.publish(NETWORK_DEVICE_JOINED, {"device": device})
+        for device in left:
+            logger.info("[NetworkScanner] Dispositivo fuera de la red: %s (%s)",
+                        device["ip"], device["mac"])
+            bus.publish(NETWORK_DEVICE_LEFT, {"device": device})
+        self._resolve_pending(pending)
+
+    def _prune_inventory(self, now: float) -> bool:
+        """
+        Olvida los dispositivos fuera de la red más antiguos que INVENTORY_MAX_AGE_S
+        y, si aún se supera INVENTORY_MAX_DEVICES, los fuera de la red menos recientes.
+
+        Debe llamarse con self._lock adquirido.
+
+        Args:
+            now (float): Marca de tiempo actual (epoch).
+
+        Returns:
+            bool: True si se eliminó algún dispositivo.
+        """
+        forget = [mac for mac, d in self._inventory.items()
+                  if not d["online"] and now - d["last_seen"] > INVENTORY_MAX_AGE_S]
+        excess = len(self._inventory) - len(forget) - INVENTORY_MAX_DEVICES
+        if excess > 0:
+            offline = sorted((d["last_seen"], mac) for mac, d in self._inventory.items()
+                             if not d["online"] and mac not in forget)
+            forget.extend(mac for _, mac in offline[:excess])
+        for mac in forget:
+            del self._inventory[mac]
+        removed = len(forget)
+        if removed:
+            logger.info("[NetworkScanner] Inventario: %d dispositivos antiguos olvidados", removed)
+        return removed > 0
+
     @staticmethod
-    def _resolve_hostname(ip: str) -> str:
+    def _load_inventory() -> Dict[str, Dict]:
         """
-        Resuelve el hostname asociado a una dirección IP.
+        Carga el inventario persistido; todos los dispositivos empiezan offline.
+
+        Returns:
+            Dict[str, Dict]: MAC → dispositivo.
+        """
+        try:
+            with open(INVENTORY_FILE, "r") as f:
+                data = json.load(f)
+            inventory = {}
+            for mac, device in data.items():
+                if not isinstance(device, dict) or "ip" not in device:
+                    continue
+                inventory[mac] = {
+                    "mac":        mac,
+                    "ip":         device["ip"],
+                    "vendor":     device.get("vendor", ""),
+                    "hostname":   device.get("hostname", ""),
+                    "iface":      device.get("iface", ""),
+                    "first_seen": device.get("first_seen", 0.0),
+                    "last_seen":  device.get("last_seen", 0.0),
+                    "online":     False,
+                }
+            return inventory
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("[NetworkScanner] Inventario ilegible, se empieza de cero: %s", e)
+            return {}
+
+    def _save_inventory(self, force: bool = False) -> None:
+        """
+        Persiste el inventario de forma atómica, como mucho cada _INVENTORY_SAVE_S.
+
+        Args:
+            force (bool): Guarda aunque no haya pasado el intervalo.
+
+        Returns:
+            None
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._inventory_dirty:
+                return
+            if not force and now - self._inventory_saved < _INVENTORY_SAVE_S:
+                return
+            data = {
+                mac: {k: v for k, v in d.items() if k not in ("mac", "online")}
+                for mac, d in self._inventory.items()
+            }
+            self._inventory_dirty = False
+            self._inventory_saved = now
+        try:
+            INVENTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp = str(INVENTORY_FILE) + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, str(INVENTORY_FILE))
+        except Exception as e:
+            logger.error("[NetworkScanner] Error guardando inventario: %s", e)
+
+    # ── Resolución de hostnames ───────────────────────────────────────────────
+
+    def _resolve_pending(self, pending: list) -> None:
+        """
+        Encola la resolución inversa de los dispositivos sin entrada en caché.
+
+        Args:
+            pending (list): Pares (mac, ip) a resolver.
+
+        Returns:
+            None
+        """
+        if not pending or not self._running:
+            return
+        # Bajo _lock: el escaneo y el thread pasivo pueden llegar a la vez y
+        # un segundo pool rompería el límite de lookups en vuelo
+        with self._lock:
+            if self._resolver is None:
+                self._resolver = ThreadPoolExecutor(
+                    max_workers=_RESOLVE_WORKERS, thread_name_prefix="HostnameResolver"
+                )
+            if self._ptr_pool is None:
+                self._ptr_pool = ThreadPoolExecutor(
+                    max_workers=_RESOLVE_WORKERS, thread_name_prefix="PTRLookup"
+                )
+            resolver = self._resolver
+            self._resolving += len(pending)
+        for i, (mac, ip) in enumerate(pending):
+            try:
+                resolver.submit(self._resolve_one, mac, ip)
+            except RuntimeError:
+                # stop() cerró el pool entretanto: descontar lo no encolado
+                with self._lock:
+                    self._resolving = max(0, self._resolving - (len(pending) - i))
+                return
+
+    def _resolve_one(self, mac: str, ip: str) -> None:
+        """
+        Resuelve un dispositivo, lo guarda en caché y lo publica en la lista.
+
+        Args:
+            mac (str): MAC del dispositivo.
+            ip (str): IP del dispositivo.
+
+        Returns:
+            None
+        """
+        hostname = ""
+        try:
+            hostname = self._resolve_hostname(ip)
+            self._hostnames.put(mac, ip, hostname)
+        finally:
+            with self._lock:
+                if hostname:
+                    for i, d in enumerate(self._devices):
+                        if d["ip"] == ip and d["mac"] == mac:
+                            # Copia nueva: get_devices() comparte los dicts con la UI
+                            self._devices[i] = {**d, "hostname": hostname}
+                            self._version += 1
+                            break
+                    device = self._inventory.get(mac)
+                    if (device is not None and device["ip"] == ip
+                            and device["hostname"] != hostname):
+                        device["hostname"] = hostname
+                        self._inventory_dirty = True
+                        self._version += 1
+                self._resolving = max(0, self._resolving - 1)
+                done = self._resolving == 0
+            if done:
+                self._hostnames.save()
+
+    def _resolve_hostname(self, ip: str) -> str:
+        """
+        Resuelve el hostname asociado a una dirección IP con un tiempo máximo.
+
+        gethostbyaddr no admite timeout: se ejecuta en el pool acotado de
+        lookups y se abandona si no responde en _RESOLVE_TIMEOUT, liberando al
+        worker del resolver. Los lookups colgados nunca superan _RESOLVE_WORKERS
+        threads; si aún no habían empezado se cancelan.
 
         Args:
             ip (str): La dirección IP a resolver.
 
         Returns:
-            str: El hostname asociado a la IP, o cadena vacía si falla la resolución.
+            str: El hostname asociado a la IP, o cadena vacía si falla o vence el timeout.
 
         Raises:
-            Exception: Si ocurre un error durante la resolución.
+            None
         """
+        pool = self._ptr_pool
+        if pool is None:
+            return ""
         try:
-            return socket.gethostbyaddr(ip)[0]
+            future = pool.submit(socket.gethostbyaddr, ip)
+        except RuntimeError:
+            return ""   # pool cerrado por stop()
+        try:
+            return future.result(timeout=_RESOLVE_TIMEOUT)[0]
+        except FutureTimeout:
+            future.cancel()
+            return ""
         except Exception:
             return ""
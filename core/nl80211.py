@@ -0,0 +1,243 @@
+"""
+Cliente mínimo de nl80211 (generic netlink) sin dependencias externas.
+
+Solo implementa lo que necesita WiFiMonitor, sin privilegios de root:
+  - GET_INTERFACE → SSID de la interfaz conectada
+  - GET_STATION (dump) → BSSID del AP, señal y bitrate de transmisión
+
+Uso:
+    nl = Nl80211()                     # OSError si el kernel no expone nl80211
+    nl.interface_info(ifindex)         # {"ssid": "MiRed"}
+    nl.station_info(ifindex)           # {"bssid": "aa:bb:..", "signal_dbm": -52, "bitrate": "72.2 Mb/s"}
+    nl.close()
+"""
+import os
+import socket
+import struct
+import threading
+from typing import Dict, List, Optional
+
+NETLINK_GENERIC = 16
+
+_NLMSG_ERROR = 2
+_NLMSG_DONE  = 3
+_NLM_F_REQUEST = 0x001
+_NLM_F_ACK     = 0x004
+_NLM_F_DUMP    = 0x300
+
+_GENL_ID_CTRL          = 0x10
+_CTRL_CMD_GETFAMILY    = 3
+_CTRL_ATTR_FAMILY_ID   = 1
+_CTRL_ATTR_FAMILY_NAME = 2
+
+_NL80211_CMD_GET_INTERFACE = 5
+_NL80211_CMD_GET_STATION   = 17
+_NL80211_ATTR_IFINDEX      = 3
+_NL80211_ATTR_MAC          = 6
+_NL80211_ATTR_STA_INFO     = 21
+_NL80211_ATTR_SSID         = 52
+_NL80211_STA_INFO_SIGNAL     = 7
+_NL80211_STA_INFO_TX_BITRATE = 8
+_NL80211_RATE_INFO_BITRATE   = 1   # u16, unidades de 100 kbit/s
+_NL80211_RATE_INFO_BITRATE32 = 5   # u32, unidades de 100 kbit/s
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_GENLHDR  = struct.Struct("=BBH")
+_NLATTR   = struct.Struct("=HH")
+_RECV_BUF = 65536
+_TIMEOUT_S = 1.0
+
+
+def _align(n: int) -> int:
+    """Redondea a múltiplo de 4, como NLA_ALIGN/NLMSG_ALIGN."""
+    return (n + 3) & ~3
+
+
+def _attr(atype: int, payload: bytes) -> bytes:
+    """
+    Codifica un atributo netlink.
+
+    Args:
+        atype (int): Tipo de atributo.
+        payload (bytes): Contenido.
+
+    Returns:
+        bytes: Atributo con cabecera y relleno.
+    """
+    length = _NLATTR.size + len(payload)
+    return _NLATTR.pack(length, atype) + payload + b"\0" * (_align(length) - length)
+
+
+def _parse_attrs(data: bytes) -> Dict[int, bytes]:
+    """
+    Decodifica una secuencia de atributos netlink.
+
+    Args:
+        data (bytes): Atributos concatenados.
+
+    Returns:
+        Dict[int, bytes]: tipo (sin flags NESTED/BYTEORDER) → contenido.
+    """
+    attrs, offset = {}, 0
+    while offset + _NLATTR.size <= len(data):
+        length, atype = _NLATTR.unpack_from(data, offset)
+        if length < _NLATTR.size:
+            break
+        attrs[atype & 0x3FFF] = data[offset + _NLATTR.size: offset + length]
+        offset += _align(length)
+    return attrs
+
+
+class Nl80211:
+    """
+    Socket generic netlink resuelto a la familia nl80211.
+
+    Raises:
+        OSError: Si no se puede abrir el socket o el kernel no tiene nl80211.
+    """
+
+    def __init__(self):
+        """
+        Abre el socket y resuelve el id de la familia nl80211.
+
+        Raises:
+            OSError: Si netlink o nl80211 no están disponibles.
+        """
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC)
+        self._sock.settimeout(_TIMEOUT_S)
+        self._sock.bind((0, 0))
+        self._seq  = 0
+        self._lock = threading.Lock()
+        try:
+            replies = self._request(_GENL_ID_CTRL, _CTRL_CMD_GETFAMILY,
+                                    _attr(_CTRL_ATTR_FAMILY_NAME, b"nl80211\0"))
+            family = next((r[_CTRL_ATTR_FAMILY_ID] for r in replies
+                           if _CTRL_ATTR_FAMILY_ID in r), None)
+            if family is None:
+                raise OSError("familia nl80211 no encontrada")
+            self._family = struct.unpack("=H", family[:2])[0]
+        except Exception:
+            self._sock.close()
+            raise
+
+    def close(self) -> None:
+        """
+        Cierra el socket.
+
+        Returns:
+            None
+        """
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    # ── Consultas ─────────────────────────────────────────────────────────────
+
+    def interface_info(self, ifindex: int) -> Dict:
+        """
+        Devuelve el SSID de una interfaz (vacío si no está asociada).
+
+        Args:
+            ifindex (int): Índice de la interfaz.
+
+        Returns:
+            Dict: {"ssid": str}.
+
+        Raises:
+            OSError: Si la petición netlink falla.
+        """
+        replies = self._request(self._family, _NL80211_CMD_GET_INTERFACE,
+                                _attr(_NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)))
+        for attrs in replies:
+            ssid = attrs.get(_NL80211_ATTR_SSID)
+            if ssid:
+                return {"ssid": ssid.decode("utf-8", "replace")}
+        return {"ssid": ""}
+
+    def station_info(self, ifindex: int) -> Optional[Dict]:
+        """
+        Devuelve la estación asociada (el AP en modo cliente).
+
+        Args:
+            ifindex (int): Índice de la interfaz.
+
+        Returns:
+            Optional[Dict]: bssid, signal_dbm y bitrate; None si no hay asociación.
+
+        Raises:
+            OSError: Si la petición netlink falla.
+        """
+        replies = self._request(self._family, _NL80211_CMD_GET_STATION,
+                                _attr(_NL80211_ATTR_IFINDEX, struct.pack("=I", ifindex)),
+                                dump=True)
+        for attrs in replies:
+            if _NL80211_ATTR_STA_INFO not in attrs:
+                continue
+            info = _parse_attrs(attrs[_NL80211_ATTR_STA_INFO])
+            mac  = attrs.get(_NL80211_ATTR_MAC, b"")
+            result = {
+                "bssid":      ":".join(f"{b:02x}" for b in mac[:6]),
+                "signal_dbm": None,
+                "bitrate":    "",
+            }
+            if _NL80211_STA_INFO_SIGNAL in info:
+                result["signal_dbm"] = struct.unpack("=b", info[_NL80211_STA_INFO_SIGNAL][:1])[0]
+            if _NL80211_STA_INFO_TX_BITRATE in info:
+                rate = _parse_attrs(info[_NL80211_STA_INFO_TX_BITRATE])
+                units = None
+                if _NL80211_RATE_INFO_BITRATE32 in rate:
+                    units = struct.unpack("=I", rate[_NL80211_RATE_INFO_BITRATE32][:4])[0]
+                elif _NL80211_RATE_INFO_BITRATE in rate:
+                    units = struct.unpack("=H", rate[_NL80211_RATE_INFO_BITRATE][:2])[0]
+                if units:
+                    result["bitrate"] = f"{units / 10:g} Mb/s"
+            return result
+        return None
+
+    # ── Transporte ────────────────────────────────────────────────────────────
+
+    def _request(self, msg_type: int, cmd: int, attrs: bytes,
+                 dump: bool = False) -> List[Dict[int, bytes]]:
+        """
+        Envía una petición generic netlink y recoge todas las respuestas.
+
+        Args:
+            msg_type (int): Id de familia destino.
+            cmd (int): Comando genl.
+            attrs (bytes): Atributos ya codificados.
+            dump (bool): Petición de volcado (varias respuestas hasta NLMSG_DONE).
+
+        Returns:
+            List[Dict[int, bytes]]: Atributos de cada respuesta.
+
+        Raises:
+            OSError: Si el kernel devuelve error o vence el timeout.
+        """
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            flags = _NLM_F_REQUEST | (_NLM_F_DUMP if dump else _NLM_F_ACK)
+            payload = _GENLHDR.pack(cmd, 1, 0) + attrs
+            self._sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(payload),
+                                           msg_type, flags, seq, 0) + payload)
+            results = []
+            while True:
+                data = self._sock.recv(_RECV_BUF)
+                offset = 0
+                while offset + _NLMSGHDR.size <= len(data):
+                    length, mtype, _flags, mseq, _pid = _NLMSGHDR.unpack_from(data, offset)
+                    if length < _NLMSGHDR.size:
+                        return results
+                    body = data[offset + _NLMSGHDR.size: offset + length]
+                    offset += _align(length)
+                    if mseq != seq:
+                        continue
+                    if mtype == _NLMSG_DONE:
+                        return results
+                    if mtype == _NLMSG_ERROR:
+                        err = struct.unpack_from("=i", body)[0]
+                        if err:
+                            raise OSError(-err, os.strerror(-err))
+                        return results   # ACK
+                    results.append(_parse_attrs(body[_GENLHDR.size:]))
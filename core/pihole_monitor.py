@@ -3,16 +3,23 @@ Monitor de Pi-hole v6.
 Sondea la API REST de Pi-hole v6 cada POLL_INTERVAL_S segundos.
 Credenciales leídas desde .env: PIHOLE_HOST, PIHOLE_PORT, PIHOLE_PASSWORD.
 
-Sin dependencias nuevas — usa urllib de la stdlib.
+Sin dependencias nuevas — usa utils.http_client (http.client de la stdlib
+con conexión keep-alive).
+
+Además se ingiere la serie temporal de /api/history: recuentos reales por tramo
+de 10 min (consultas, bloqueadas, caché, reenviadas) más el máximo de clientes
+activos observado en cada tramo. DataCollectionService vacía los tramos
+cerrados con take_rollup() y los guarda (upsert por tramo) en la tabla
+pihole_metrics del histórico.
 """
-import json
 import os
 import threading
 import time
-import urllib.request
-import urllib.error
+from collections import deque
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+from utils.http_client import HttpClient, HttpError
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -57,13 +64,18 @@ PIHOLE_PASSWORD = os.environ.get("PIHOLE_PASSWORD", "")
 
 POLL_INTERVAL_S  = 60
 REQUEST_TIMEOUT  = 5
+REQUEST_RETRIES  = 1   # reintentos ante errores transitorios (red, 5xx)
 SESSION_VALIDITY = 1800  # segundos — renovar antes de que expire
+ROLLUP_MAX_SAMPLES = 1440  # tramos/muestras pendientes como máximo
+HISTORY_SLOT_S     = 600   # ancho de los tramos de /api/history (10 min)
 
 _EMPTY_STATS: Dict = {
     "status":          "unknown",
     "queries_today":   0,
     "blocked_today":   0,
     "percent_blocked": 0.0,
+    "cached_today":    0,
+    "forwarded_today": 0,
     "domains_blocked": 0,
     "unique_clients":  0,
     "reachable":       False,
@@ -98,6 +110,8 @@ class PiholeMonitor:
         Raises: 
             Ninguno
         """
+        self._http = HttpClient(f"http://{PIHOLE_HOST}:{PIHOLE_PORT}",
+                                timeout=REQUEST_TIMEOUT, retries=REQUEST_RETRIES)
         self._stats: Dict       = dict(_EMPTY_STATS)
         self._sid: Optional[str] = None
         self._sid_obtained: Optional[float] = None  # timestamp de cuando se obtuvo
@@ -107,6 +121,12 @@ class PiholeMonitor:
         self._stop_evt          = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
+        # Serie temporal pendiente de guardar en el histórico (take_rollup)
+        self._rollup_lock = threading.Lock()
+        self._rollup: deque = deque(maxlen=ROLLUP_MAX_SAMPLES)
+        self._last_slot_end: Optional[float] = None   # fin (epoch) del último tramo ingerido
+        self._clients_seen: deque = deque(maxlen=ROLLUP_MAX_SAMPLES)   # (epoch, activos)
+
         if not PIHOLE_HOST:
             logger.warning(
                 "[PiholeMonitor] PIHOLE_HOST no configurado en .env — monitor desactivado"
@@ -233,25 +253,18 @@ class PiholeMonitor:
             logger.debug("[PiholeMonitor] Sin contraseña configurada — intentando sin auth")
             return True
 
-        payload = json.dumps({"password": PIHOLE_PASSWORD}).encode("utf-8")
-        req = urllib.request.Request(
-            f"http://{PIHOLE_HOST}:{PIHOLE_PORT}/api/auth",
-            data=payload,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
         try:
-            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-                sid = data.get("session", {}).get("sid")
-                if sid:
-                    with self._sid_lock:
-                        self._sid         = sid
-                        self._sid_obtained = time.time()
-                    logger.info("[PiholeMonitor] Autenticación correcta (sid obtenido)")
-                    return True
-                logger.warning("[PiholeMonitor] Respuesta sin sid: %s", data)
-                return False
+            data = self._http.request_json(
+                "POST", "/api/auth", json_body={"password": PIHOLE_PASSWORD})
+            sid = data.get("session", {}).get("sid")
+            if sid:
+                with self._sid_lock:
+                    self._sid         = sid
+                    self._sid_obtained = time.time()
+                logger.info("[PiholeMonitor] Autenticación correcta (sid obtenido)")
+                return True
+            logger.warning("[PiholeMonitor] Respuesta sin sid: %s", data)
+            return False
         except Exception as e:
             logger.error("[PiholeMonitor] Error de autenticación: %s", e)
             return False
@@ -309,12 +322,7 @@ class PiholeMonitor:
         if not sid:
             return
         try:
-            req = urllib.request.Request(
-                f"http://{PIHOLE_HOST}:{PIHOLE_PORT}/api/auth",
-                headers={"sid": sid},
-                method="DELETE",
-            )
-            urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT)
+            self._http.request("DELETE", "/api/auth", headers={"sid": sid}, retries=0)
             logger.debug("[PiholeMonitor] Sesión cerrada correctamente")
         except Exception:
             pass
@@ -332,7 +340,7 @@ class PiholeMonitor:
             Ninguno
 
         Raises: 
-            Excepciones relacionadas con urllib.request y json.loads si la solicitud o el parseo falla.
+            Ninguno: los errores de red, HTTP o JSON se registran y marcan Pi-hole como no alcanzable.
         """
         # Si no estamos corriendo, no hacemos nada (evita fetch innecesarios al parar)
         if not self._running:
@@ -341,13 +349,7 @@ class PiholeMonitor:
             sid = self._get_sid()
             headers = {"sid": sid} if sid else {}
 
-            req = urllib.request.Request(
-                f"http://{PIHOLE_HOST}:{PIHOLE_PORT}/api/stats/summary",
-                headers=headers,
-                method="GET",
-            )
-            with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
+            data = self._http.request_json("GET", "/api/stats/summary", headers=headers)
 
             # Estructura de respuesta v6:
             # {"queries": {"total": X, "blocked": X, "percent_blocked": X, ...},
@@ -362,25 +364,28 @@ class PiholeMonitor:
                 "queries_today":   int(queries.get("total",            0)),
                 "blocked_today":   int(queries.get("blocked",          0)),
                 "percent_blocked": float(queries.get("percent_blocked", 0.0)),
+                "cached_today":    int(queries.get("cached",           0)),
+                "forwarded_today": int(queries.get("forwarded",        0)),
                 "domains_blocked": int(gravity.get("domains_being_blocked", 0)),
                 "unique_clients":  int(clients.get("active",           0)),
                 "reachable":       True,
             }
             with self._stats_lock:
                 self._stats = stats
+            self._record_sample(stats, headers)
             logger.debug(
                 "[PiholeMonitor] OK — %d queries, %.1f%% bloqueado",
                 stats["queries_today"], stats["percent_blocked"]
             )
 
-        except urllib.error.HTTPError as e:
-            if e.code == 401:
+        except HttpError as e:
+            if e.status == 401:
                 # Sesión expirada — forzar reautenticación en el próximo ciclo
                 logger.warning("[PiholeMonitor] Sesión expirada (401) — renovando")
                 with self._sid_lock:
                     self._sid = None
             else:
-                logger.warning("[PiholeMonitor] HTTP %d en /api/stats/summary", e.code)
+                logger.warning("[PiholeMonitor] HTTP %d en /api/stats/summary", e.status)
             with self._stats_lock:
                 self._stats = {**_EMPTY_STATS, "reachable": False}
 
@@ -389,6 +394,100 @@ class PiholeMonitor:
                 self._stats = {**_EMPTY_STATS, "reachable": False}
             logger.warning("[PiholeMonitor] Sin conexión con Pi-hole: %s", e)
 
+    def _record_sample(self, stats: Dict, headers: Dict) -> None:
+        """
+        Añade a la serie temporal pendiente los tramos de /api/history ya cerrados.
+
+        Los contadores del resumen cubren una ventana móvil de 24h que el GC de
+        FTL recorta cada pocos minutos, así que no sirven para sacar incrementos.
+        /api/history da en cambio los recuentos reales por tramo de 10 min; solo
+        se consulta cuando ha podido cerrarse un tramo nuevo desde el último
+        ingerido. Los clientes activos de cada sondeo se guardan aparte y cada
+        tramo lleva el máximo observado dentro de él (None si no se observó).
+
+        Args:
+            stats (Dict): Estadísticas recién leídas (reachable=True).
+            headers (Dict): Cabeceras de sesión para consultar /api/history.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        with self._rollup_lock:
+            self._clients_seen.append((now, stats["unique_clients"]))
+            last_end = self._last_slot_end
+        if last_end is not None and now < last_end + HISTORY_SLOT_S:
+            return   # todavía no se ha cerrado ningún tramo nuevo
+        try:
+            history = self._http.request_json("GET", "/api/history", headers=headers)
+        except Exception as e:
+            logger.warning("[PiholeMonitor] Error leyendo /api/history: %s", e)
+            return
+        slots = self._closed_slots(history.get("history") or [], now)
+        with self._rollup_lock:
+            for start, width, slot in slots:
+                if self._last_slot_end is not None and start + width <= self._last_slot_end:
+                    continue
+                seen = [c for t, c in self._clients_seen if start <= t < start + width]
+                self._rollup.append({
+                    "timestamp":  datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:%M:%S"),
+                    "interval_s": width,
+                    "queries":    int(slot.get("total", 0)),
+                    "blocked":    int(slot.get("blocked", 0)),
+                    "cached":     int(slot.get("cached", 0)),
+                    "forwarded":  int(slot.get("forwarded", 0)),
+                    "clients":    max(seen) if seen else None,
+                })
+                self._last_slot_end = start + width
+            if self._last_slot_end is not None:
+                while self._clients_seen and self._clients_seen[0][0] < self._last_slot_end:
+                    self._clients_seen.popleft()
+
+    @staticmethod
+    def _closed_slots(history: List[Dict], now: float) -> List[Tuple[float, float, Dict]]:
+        """
+        Filtra los tramos de /api/history que ya han terminado.
+
+        FTL marca cada tramo con su instante central y devuelve también tramos
+        futuros (vacíos) hasta el final de la hora; el ancho se deduce de la
+        separación entre tramos.
+
+        Args:
+            history (List[Dict]): Lista 'history' de la respuesta.
+            now (float): Instante actual (epoch).
+
+        Returns:
+            List[Tuple[float, float, Dict]]: (inicio epoch, ancho en s, tramo),
+                                             en orden cronológico.
+        """
+        entries = sorted((e for e in history if isinstance(e, dict) and "timestamp" in e),
+                         key=lambda e: e["timestamp"])
+        gaps = [b["timestamp"] - a["timestamp"] for a, b in zip(entries, entries[1:])]
+        width = float(min((g for g in gaps if g > 0), default=HISTORY_SLOT_S))
+        result = []
+        for entry in entries:
+            start = float(entry["timestamp"]) - width / 2
+            if start + width <= now:
+                result.append((start, width, entry))
+        return result
+
+    def take_rollup(self) -> List[Dict]:
+        """
+        Devuelve y vacía los tramos cerrados acumulados desde la última llamada.
+
+        Args:
+            Ninguno
+
+        Returns:
+            List[Dict]: Tramos con timestamp (inicio), interval_s, queries, blocked,
+                        cached, forwarded (recuentos del tramo) y clients
+                        (máximo observado o None).
+        """
+        with self._rollup_lock:
+            samples = list(self._rollup)
+            self._rollup.clear()
+        return samples
+
     # ── API pública ───────────────────────────────────────────────────────────
 
     def get_stats(self) -> Dict:
@@ -1,16 +1,41 @@
 """
 Monitor de procesos del sistema
+
+Mantiene una tabla incremental de procesos indexada por (pid, create_time):
+los objetos psutil.Process se reutilizan entre sondeos, de modo que
+cpu_percent() mide el delta real desde la muestra anterior, y los campos caros
+(cmdline, exe, username) se leen una sola vez por proceso. Las consultas de la
+UI (top-N y búsqueda) trabajan sobre la instantánea en caché, sin recorrer /proc.
+
+Para los procesos que más consumen se guarda además un histórico en ring
+buffers acotados (CPU, RSS, I/O, fds, threads), y la tabla permite agregar
+el coste de un subárbol padre/hijos (p. ej. homebridge y sus plugins).
 """
+import heapq
 import threading
+import time
 import psutil
-from typing import List, Dict, Optional
+from collections import deque
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from core.demand_registry import get_demand_registry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 PROCESS_POLL_INTERVAL = 10
 
+# Histórico por proceso: muestras por ring buffer (60 × 10s = 10 min)
+PROC_HISTORY_LEN = 60
+# Procesos con muestreo detallado por sondeo: top por CPU ∪ top por RSS
+PROC_HISTORY_TOP = 8
+# Máximo de históricos vivos (acota la memoria total)
+PROC_HISTORY_MAX_TRACKED = 32
+# PIDs raíz cuyo subárbol es todo el sistema: no se agregan en la vista árbol
+_TREE_EXCLUDED_ROOTS = (0, 1, 2)
+# Solo ProcessWindow consume la lista: sin lease el sondeo se detiene
+_DEMAND_KEY = "process_monitor"
+
 
 class ProcessMonitor:
     """
@@ -42,13 +67,24 @@ class ProcessMonitor:
         self.sort_by      = "cpu"   # cpu | memory | name | pid
         self.sort_reverse = True
         self.filter_type  = "all"   # all | user | system
+        self.view_mode    = "flat"  # flat | tree
 
         self._lock: threading.Lock      = threading.Lock()
         self._cached_processes: List[Dict] = []
+        # Tabla incremental: (pid, create_time) → {'proc': psutil.Process, campos...}
+        self._table: Dict[Tuple[int, float], Dict] = {}
+        self._keys_by_pid: Dict[int, Tuple[int, float]] = {}
+        self._poll_lock    = threading.Lock()   # serializa sondeo y refresh_now
+        self._polled       = False
+        self._current_user = None
+        # (pid, create_time) → deque[(ts, cpu, rss, io_bps, fds, threads)]
+        self._history: Dict[Tuple[int, float], deque] = {}
+        self._history_seen: Dict[Tuple[int, float], float] = {}
 
         self._running  = False
         self._stop_evt = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._demand   = get_demand_registry()
 
         self.start()
 
@@ -92,10 +128,17 @@ class ProcessMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._demand.wake(_DEMAND_KEY)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=6)
+        with self._poll_lock:
+            self._table.clear()
+            self._keys_by_pid.clear()
+            self._polled = False
         with self._lock:
             self._cached_processes = []
+            self._history.clear()
+            self._history_seen.clear()
         logger.info("[ProcessMonitor] Sondeo detenido")
     
     def is_running(self) -> bool:
@@ -129,6 +172,8 @@ class ProcessMonitor:
         """
         Ejecuta el bucle principal de sondeo en segundo plano.
 
+        Solo sondea mientras alguien tenga un lease sobre la fuente.
+
         Args: 
             None
 
@@ -138,11 +183,8 @@ class ProcessMonitor:
         Raises: 
             None
         """
-        self._do_poll()
-        while self._running:
-            self._stop_evt.wait(timeout=PROCESS_POLL_INTERVAL)
-            if self._stop_evt.is_set():
-                break
+        while not self._demand.wait(_DEMAND_KEY, self._stop_evt,
+                                    active_s=PROCESS_POLL_INTERVAL, idle_s=None):
             self._do_poll()
 
     def refresh_now(self) -> None:
@@ -176,59 +218,266 @@ class ProcessMonitor:
             Exception: Si ocurre un error durante el sondeo de procesos.
         """
         try:
-            processes = self.get_processes()
+            with self._poll_lock:
+                processes = self._refresh_table()
+                self._polled = True
             with self._lock:
                 self._cached_processes = processes
         except Exception as e:
             logger.error("[ProcessMonitor] Error en _do_poll: %s", e)
 
-    # ── API pública ───────────────────────────────────────────────────────────
+    def _refresh_table(self) -> List[Dict]:
+        """
+        Actualiza la tabla incremental y devuelve una instantánea de sus filas.
 
-    def get_processes(self, limit: int = 20) -> List[Dict]:
+        Los PIDs desaparecidos se eliminan, los nuevos se dan de alta leyendo
+        una sola vez sus campos estáticos, y los existentes solo refrescan
+        CPU y memoria. Un PID reutilizado por otro proceso se detecta por su
+        create_time y se trata como proceso nuevo.
+
+        Args:
+            Ninguno
+
+        Returns:
+            List[Dict]: Filas de la tabla (sin el objeto Process).
+
+        Raises:
+            Ninguno
         """
-        Obtiene una lista de procesos con su información, aplicando filtros según el tipo configurado.
+        if self._current_user is None:
+            self._current_user = psutil.Process().username()
+
+        pids = set(psutil.pids())
+        for pid in list(self._keys_by_pid):
+            if pid not in pids:
+                self._drop(pid)
+
+        for pid in pids:
+            key = self._keys_by_pid.get(pid)
+            if key is not None and not self._table[key]['proc'].is_running():
+                self._drop(pid)
+                key = None
+            if key is None:
+                entry = self._new_entry(pid)
+                if entry is None:
+                    continue
+                key = (pid, entry['create_time'])
+                self._keys_by_pid[pid] = key
+                self._table[key] = entry
+            else:
+                entry = self._table[key]
+            if not self._sample_entry(entry):
+                self._drop(pid)
+
+        self._sample_history()
+
+        return [
+            {k: v for k, v in entry.items() if k not in ('proc', 'io_prev')}
+            for entry in self._table.values()
+        ]
+
+    def _drop(self, pid: int) -> None:
+        """
+        Elimina un PID de la tabla y su histórico.
 
         Args:
-            limit (int): Número máximo de procesos a retornar. Por defecto, 20.
+            pid (int): PID a eliminar.
 
         Returns:
-            List[Dict]: Lista de diccionarios con información de procesos.
+            None
         """
-        processes = []
-        current_user = psutil.Process().username()
+        key = self._keys_by_pid.pop(pid, None)
+        if key is not None:
+            self._table.pop(key, None)
+            with self._lock:
+                self._history.pop(key, None)
+                self._history_seen.pop(key, None)
 
-        for proc in psutil.process_iter(
-            ['pid', 'name', 'username', 'cpu_percent', 'memory_percent', 'cmdline', 'exe']
-        ):
-            try:
-                pinfo = proc.info
+    def _sample_history(self) -> None:
+        """
+        Añade una muestra detallada al histórico de los procesos que más consumen.
 
-                if self.filter_type == "user" and pinfo['username'] != current_user:
-                    continue
-                if self.filter_type == "system" and pinfo['username'] == current_user:
-                    continue
+        Solo los PROC_HISTORY_TOP primeros por CPU y por RSS pagan las lecturas
+        extra (fds, threads, io); el resto del sistema no se toca. Si se supera
+        PROC_HISTORY_MAX_TRACKED se descartan los históricos más antiguos fuera del top.
+
+        Returns:
+            None
+        """
+        entries = list(self._table.items())
+        top = {k for k, _ in heapq.nlargest(PROC_HISTORY_TOP, entries, key=lambda kv: kv[1]['cpu'])}
+        top |= {k for k, _ in heapq.nlargest(PROC_HISTORY_TOP, entries, key=lambda kv: kv[1]['rss'])}
+
+        now = time.time()
+        samples = {key: self._sample_detail(self._table[key], now) for key in top}
+
+        with self._lock:
+            for key, sample in samples.items():
+                hist = self._history.get(key)
+                if hist is None:
+                    hist = self._history[key] = deque(maxlen=PROC_HISTORY_LEN)
+                hist.append(sample)
+                self._history_seen[key] = now
+
+            excess = len(self._history) - PROC_HISTORY_MAX_TRACKED
+            if excess > 0:
+                stale = sorted((k for k in self._history if k not in top),
+                               key=lambda k: self._history_seen[k])[:excess]
+                for key in stale:
+                    self._history.pop(key, None)
+                    self._history_seen.pop(key, None)
+
+    @staticmethod
+    def _sample_detail(entry: Dict, now: float) -> tuple:
+        """
+        Lee los campos caros de un proceso del top y devuelve la muestra del histórico.
+
+        Args:
+            entry (Dict): Entrada de la tabla.
+            now (float): Marca de tiempo de la muestra.
+
+        Returns:
+            tuple: (ts, cpu %, rss bytes, io bytes/s, fds, threads); None en lo no legible.
+        """
+        proc = entry['proc']
+        fds = threads = io_bps = None
+        try:
+            with proc.oneshot():
+                threads = proc.num_threads()
+                try:
+                    fds = proc.num_fds()
+                except psutil.AccessDenied:
+                    pass
+                try:
+                    io = proc.io_counters()
+                    io_total = io.read_bytes + io.write_bytes
+                    prev = entry.get('io_prev')
+                    if prev is not None and now > prev[0]:
+                        io_bps = max(0.0, (io_total - prev[1]) / (now - prev[0]))
+                    entry['io_prev'] = (now, io_total)
+                except (psutil.AccessDenied, AttributeError):
+                    pass
+        except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+            pass
+        return (now, entry['cpu'], entry['rss'], io_bps, fds, threads)
+
+    @staticmethod
+    def _new_entry(pid: int) -> Optional[Dict]:
+        """
+        Crea la entrada de un proceso nuevo leyendo sus campos estáticos una vez.
+
+        Args:
+            pid (int): PID del proceso.
+
+        Returns:
+            Optional[Dict]: Entrada de la tabla, o None si el proceso ya no existe.
+
+        Raises:
+            Ninguno
+        """
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                create_time = proc.create_time()
+                name        = proc.name() or 'N/A'
+                try:
+                    username = proc.username() or 'N/A'
+                except (psutil.AccessDenied, KeyError):
+                    username = 'N/A'
+                try:
+                    cmdline = proc.cmdline()
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    cmdline = []
+                try:
+                    exe = proc.exe()
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    exe = ''
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+        if cmdline:
+            display_name = ' '.join(cmdline[:2])
+        elif exe:
+            display_name = exe
+        else:
+            display_name = name
+
+        return {
+            'proc':         proc,
+            'pid':          pid,
+            'create_time':  create_time,
+            'name':         name,
+            'display_name': display_name,
+            'username':     username,
+            'ppid':         0,
+            'cpu':          0.0,
+            'memory':       0.0,
+            'rss':          0,
+        }
+
+    @staticmethod
+    def _sample_entry(entry: Dict) -> bool:
+        """
+        Refresca los campos dinámicos de una entrada.
+
+        La primera llamada a cpu_percent() de un Process devuelve 0.0; las
+        siguientes miden el uso desde la muestra anterior del mismo objeto.
+        El ppid se relee porque cambia al reparentar huérfanos.
+
+        Args:
+            entry (Dict): Entrada de la tabla.
+
+        Returns:
+            bool: False si el proceso ha terminado y hay que eliminarlo.
+
+        Raises:
+            Ninguno
+        """
+        proc = entry['proc']
+        try:
+            with proc.oneshot():
+                entry['cpu']    = proc.cpu_percent() or 0.0
+                entry['rss']    = proc.memory_info().rss
+                entry['memory'] = proc.memory_percent() or 0.0
+                entry['ppid']   = proc.ppid()
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return False
+        except psutil.AccessDenied:
+            pass
+        return True
 
-                cmdline = pinfo['cmdline']
-                exe     = pinfo['exe']
-                name    = pinfo['name'] or 'N/A'
-
-                if cmdline:
-                    display_name = ' '.join(cmdline[:2])
-                elif exe:
-                    display_name = exe
-                else:
-                    display_name = name
-
-                processes.append({
-                    'pid':          pinfo['pid'],
-                    'name':         name,
-                    'display_name': display_name,
-                    'username':     pinfo['username'] or 'N/A',
-                    'cpu':          pinfo['cpu_percent'] or 0.0,
-                    'memory':       pinfo['memory_percent'] or 0.0,
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
+    def _snapshot(self) -> List[Dict]:
+        """
+        Devuelve la instantánea de la tabla, sondeando una vez si aún no hay ninguna.
+
+        Returns:
+            List[Dict]: Filas de procesos en caché.
+        """
+        if not self._polled:
+            self._do_poll()
+        with self._lock:
+            return list(self._cached_processes)
+
+    def _select(self, processes: List[Dict], limit: int) -> List[Dict]:
+        """
+        Aplica el filtro de usuario y devuelve los `limit` primeros según la ordenación.
+
+        Usa heapq en lugar de ordenar la lista completa. En vista árbol CPU,
+        RAM y RSS de cada fila son la suma de su subárbol.
+
+        Args:
+            processes (List[Dict]): Filas candidatas.
+            limit (int): Número máximo de filas.
+
+        Returns:
+            List[Dict]: Filas seleccionadas y ordenadas.
+        """
+        if self.filter_type == "user":
+            processes = [p for p in processes if p['username'] == self._current_user]
+        elif self.filter_type == "system":
+            processes = [p for p in processes if p['username'] != self._current_user]
+        if self.view_mode == "tree":
+            processes = self._with_subtree_totals(processes)
 
         key_map = {
             'cpu':    lambda x: x['cpu'],
@@ -236,11 +485,85 @@ class ProcessMonitor:
             'name':   lambda x: x['name'].lower(),
             'pid':    lambda x: x['pid'],
         }
-        processes.sort(
-            key=key_map.get(self.sort_by, lambda x: x['cpu']),
-            reverse=self.sort_reverse
-        )
-        return processes[:limit]
+        key = key_map.get(self.sort_by, key_map['cpu'])
+        pick = heapq.nlargest if self.sort_reverse else heapq.nsmallest
+        return [dict(p) for p in pick(limit, processes, key=key)]
+
+    @staticmethod
+    def _subtree_totals(processes: List[Dict]) -> Dict[int, Tuple[float, float, int, int]]:
+        """
+        Suma CPU, RAM, RSS y número de procesos de cada subárbol padre/hijos.
+
+        Recorrido post-orden iterativo: cada nodo se visita una vez.
+
+        Args:
+            processes (List[Dict]): Filas con 'pid' y 'ppid'.
+
+        Returns:
+            Dict[int, Tuple[float, float, int, int]]: pid → (cpu, memory, rss, procesos).
+        """
+        by_pid   = {p['pid']: p for p in processes}
+        children: Dict[int, List[int]] = {}
+        for p in processes:
+            children.setdefault(p['ppid'], []).append(p['pid'])
+
+        totals: Dict[int, Tuple[float, float, int, int]] = {}
+        for root in by_pid:
+            if root in totals:
+                continue
+            stack = [(root, False)]
+            while stack:
+                pid, expanded = stack.pop()
+                if expanded:
+                    p = by_pid[pid]
+                    cpu, mem, rss, count = p['cpu'], p['memory'], p['rss'], 1
+                    for child in children.get(pid, ()):
+                        c = totals[child]
+                        cpu, mem, rss, count = cpu + c[0], mem + c[1], rss + c[2], count + c[3]
+                    totals[pid] = (cpu, mem, rss, count)
+                elif pid not in totals:
+                    stack.append((pid, True))
+                    stack.extend((c, False) for c in children.get(pid, ()) if c in by_pid)
+        return totals
+
+    def _with_subtree_totals(self, processes: List[Dict]) -> List[Dict]:
+        """
+        Sustituye CPU/RAM/RSS de cada fila por los totales de su subárbol.
+
+        El subárbol se calcula sobre la tabla completa, no solo sobre las filas
+        filtradas. Se excluyen init y kthreadd, cuyo subárbol es todo el sistema.
+
+        Args:
+            processes (List[Dict]): Filas a transformar.
+
+        Returns:
+            List[Dict]: Filas nuevas con 'tree_count' añadido.
+        """
+        with self._lock:
+            totals = self._subtree_totals(self._cached_processes)
+        rows = []
+        for p in processes:
+            t = totals.get(p['pid'])
+            if t is None or p['pid'] in _TREE_EXCLUDED_ROOTS:
+                continue
+            rows.append(dict(p, cpu=t[0], memory=t[1], rss=t[2], tree_count=t[3]))
+        return rows
+
+    # ── API pública ───────────────────────────────────────────────────────────
+
+    def get_processes(self, limit: int = 20) -> List[Dict]:
+        """
+        Obtiene una lista de procesos con su información, aplicando filtros según el tipo configurado.
+
+        Lee la tabla en caché; no recorre /proc.
+
+        Args:
+            limit (int): Número máximo de procesos a retornar. Por defecto, 20.
+
+        Returns:
+            List[Dict]: Lista de diccionarios con información de procesos.
+        """
+        return self._select(self._snapshot(), limit)
 
     def search_processes(self, query: str) -> List[Dict]:
         """
@@ -256,11 +579,51 @@ class ProcessMonitor:
             None
         """
         query = query.lower()
-        all_processes = self.get_processes(limit=1000)
-        return [
-            p for p in all_processes
-            if query in p['name'].lower() or query in p.get('display_name', '').lower()
+        matches = [
+            p for p in self._snapshot()
+            if query in p['name'].lower() or query in p['display_name'].lower()
         ]
+        return self._select(matches, 1000)
+
+    def get_process_history(self, pid: int) -> Dict:
+        """
+        Devuelve el histórico en caché de un PID, sin muestrear nada nuevo.
+
+        Solo hay histórico para procesos que han estado en el top por CPU o RSS.
+
+        Args:
+            pid (int): PID del proceso.
+
+        Returns:
+            Dict: Listas paralelas 'ts', 'cpu', 'rss', 'io_bps', 'fds' y 'threads'
+                  (None donde no se pudo leer); vacías si no hay histórico.
+
+        Raises:
+            None
+        """
+        key = self._keys_by_pid.get(pid)
+        with self._lock:
+            hist = list(self._history.get(key, ())) if key is not None else []
+        fields = ('ts', 'cpu', 'rss', 'io_bps', 'fds', 'threads')
+        return {name: [sample[i] for sample in hist] for i, name in enumerate(fields)}
+
+    def get_subtree_totals(self, pid: int) -> Dict:
+        """
+        Devuelve el coste agregado de un proceso y todos sus descendientes.
+
+        Args:
+            pid (int): PID raíz del subárbol.
+
+        Returns:
+            Dict: 'pid', 'cpu', 'memory', 'rss' y 'processes'; ceros si el PID no está en caché.
+
+        Raises:
+            None
+        """
+        with self._lock:
+            totals = self._subtree_totals(self._cached_processes)
+        cpu, mem, rss, count = totals.get(pid, (0.0, 0.0, 0, 0))
+        return {'pid': pid, 'cpu': cpu, 'memory': mem, 'rss': rss, 'processes': count}
 
     def kill_process(self, pid: int) -> tuple:
         """
@@ -375,6 +738,21 @@ class ProcessMonitor:
         self.sort_by      = column
         self.sort_reverse = reverse
 
+    def set_view_mode(self, mode: str):
+        """
+        Alterna entre lista plana y vista árbol (costes agregados por subárbol).
+
+        Args:
+            mode (str): 'flat' o 'tree'.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.view_mode = mode
+
     def set_filter(self, filter_type: str):
         """
         Establece el tipo de filtro para la visualización de procesos.
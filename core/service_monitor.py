@@ -1,15 +1,49 @@
 """
 Monitor de servicios systemd
+Publica 'services.changed' en el EventBus cuando cambia algún servicio.
+
+Con D-Bus disponible (jeepney) el estado llega por señales de systemd y no se
+forkea systemctl en cada sondeo; si no, se sondea con systemctl como siempre.
+Si la conexión al bus se cae, se sigue sondeando con systemctl mientras se
+reintenta D-Bus con backoff exponencial.
 """
+import os
 import subprocess
 import threading
-from typing import List, Dict, Optional
+import time
+from typing import Callable, List, Dict, Optional
+from core.demand_registry import get_demand_registry
+from core.event_bus import get_event_bus
+from core.events import SERVICES_CHANGED
+from core.journal_follower import JournalFollower
+from core.systemd_dbus import SystemdDBusBackend
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 # Intervalo de actualización del caché de servicios (segundos).
 SERVICES_POLL_INTERVAL = 10
+# Cadencia sin ningún lease (alertas, watchdog y badge registran los suyos).
+SERVICES_IDLE_POLL_INTERVAL = 120
+# Resincronización completa por D-Bus, por si se pierde alguna señal.
+SERVICES_DBUS_RESYNC_S = 300
+# Reintentos de conexión D-Bus tras un fallo (backoff exponencial).
+SERVICES_DBUS_RETRY_MIN_S = 10
+SERVICES_DBUS_RETRY_MAX_S = 600
+# Resultados de _run_dbus()
+_DBUS_STOPPED     = "stopped"      # se paró el monitor
+_DBUS_LOST        = "lost"         # estaba conectado y se perdió la conexión
+_DBUS_FAILED      = "failed"       # no se pudo conectar
+_DBUS_UNSUPPORTED = "unsupported"  # falta jeepney: no se reintenta
+_DEMAND_KEY = "service_monitor"
+# Directorios de ficheros de unidad: si cambia su mtime (paquete instalado,
+# daemon-reload tras editar una unidad) se recarga todo el caché de enabled.
+_UNIT_FILE_DIRS = (
+    "/etc/systemd/system",
+    "/run/systemd/system",
+    "/lib/systemd/system",
+    "/usr/lib/systemd/system",
+)
 
 
 class ServiceMonitor:
@@ -17,7 +51,8 @@ class ServiceMonitor:
     Monitoriza servicios systemd con caché en segundo plano.
 
     Args:
-        Ninguno
+        dbus_transport_factory (Callable, opcional): Transporte D-Bus alternativo
+            (ej. FakeSystemdTransport en tests).
 
     Returns:
         Ninguno
@@ -28,12 +63,13 @@ class ServiceMonitor:
         - filter_type: 'all' (all | active | inactive | failed)
     """
 
-    def __init__(self):
+    def __init__(self, dbus_transport_factory: Optional[Callable] = None):
         """
         Inicializa el monitor de servicios con configuración por defecto.
 
         Args:
-            Ninguno
+            dbus_transport_factory (Callable, opcional): Transporte D-Bus alternativo
+                (ej. FakeSystemdTransport en tests). Por defecto, el bus del sistema.
 
         Returns:
             Ninguno
@@ -52,10 +88,22 @@ class ServiceMonitor:
         self._cached_stats: Dict = {
             'total': 0, 'active': 0, 'inactive': 0, 'failed': 0, 'enabled': 0
         }
+        # Último estado publicado: name → (active, sub, enabled)
+        self._published_states: Dict[str, tuple] = {}
+        self._published_stats: Optional[Dict] = None
 
         self._running  = False
         self._stop_evt = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._demand   = get_demand_registry()
+        self._dbus_factory = dbus_transport_factory
+        self._backend: Optional[SystemdDBusBackend] = None
+
+        # Caché de list-unit-files: unit → estado ('enabled', 'disabled', 'static'...)
+        self._enabled_lock = threading.Lock()
+        self._unit_file_states: Optional[Dict[str, str]] = None
+        self._unit_dir_mtimes: tuple = ()
+        self._stale_units: set = set()
 
         self.start()
 
@@ -99,6 +147,7 @@ class ServiceMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._demand.wake(_DEMAND_KEY)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=6)
         with self._lock:
@@ -128,7 +177,7 @@ class ServiceMonitor:
             None
         """
         if self.sort_by == column:
-            self.sort_reverse = not self.sort_reverse
+            self.set_sort(column, reverse=not self.sort_reverse)
         else:
             self.set_sort(column, reverse=False)
         
@@ -136,6 +185,10 @@ class ServiceMonitor:
         """
         Ejecuta el bucle principal de sondeo en segundo plano.
 
+        Usa las señales de D-Bus mientras estén disponibles; si no se puede
+        conectar o la conexión se cae, sondea con systemctl y reintenta D-Bus
+        con backoff exponencial (SERVICES_DBUS_RETRY_MIN_S..MAX_S).
+
         Args: 
             Ninguno
 
@@ -145,12 +198,55 @@ class ServiceMonitor:
         Raises: 
             Ninguno
         """
-        self._do_poll()
-        while self._running:
-            self._stop_evt.wait(timeout=SERVICES_POLL_INTERVAL)
-            if self._stop_evt.is_set():
-                break
+        retry_s = SERVICES_DBUS_RETRY_MIN_S
+        next_dbus: Optional[float] = 0.0   # monotonic; None = no reintentar
+        while not self._stop_evt.is_set():
+            if next_dbus is not None and time.monotonic() >= next_dbus:
+                result = self._run_dbus()
+                if result == _DBUS_STOPPED:
+                    return
+                if result == _DBUS_UNSUPPORTED:
+                    next_dbus = None
+                else:
+                    if result == _DBUS_LOST:
+                        retry_s = SERVICES_DBUS_RETRY_MIN_S   # funcionaba: reintento rápido
+                    next_dbus = time.monotonic() + retry_s
+                    logger.info("[ServiceMonitor] Reintento D-Bus en %ds", retry_s)
+                    retry_s = min(retry_s * 2, SERVICES_DBUS_RETRY_MAX_S)
             self._do_poll()
+            if self._demand.wait(_DEMAND_KEY, self._stop_evt,
+                                 active_s=SERVICES_POLL_INTERVAL,
+                                 idle_s=SERVICES_IDLE_POLL_INTERVAL):
+                return
+
+    def _run_dbus(self) -> str:
+        """
+        Mantiene el caché con el backend D-Bus hasta que se pare el monitor.
+
+        Con D-Bus el coste es proporcional a los cambios, así que no depende
+        de los leases del DemandRegistry.
+
+        Args:
+            Ninguno
+
+        Returns:
+            str: _DBUS_STOPPED, _DBUS_LOST, _DBUS_FAILED o _DBUS_UNSUPPORTED.
+
+        Raises:
+            None
+        """
+        backend = SystemdDBusBackend(self._dbus_factory)
+        if not backend.connect():
+            return _DBUS_UNSUPPORTED if backend.unsupported else _DBUS_FAILED
+        self._backend = backend
+        logger.info("[ServiceMonitor] Usando señales D-Bus de systemd")
+        try:
+            backend.run(self._stop_evt, self._apply_services, SERVICES_DBUS_RESYNC_S)
+        except Exception as e:
+            logger.warning("[ServiceMonitor] Conexión D-Bus perdida (%s) — se usa systemctl", e)
+        finally:
+            self._backend = None
+        return _DBUS_STOPPED if self._stop_evt.is_set() else _DBUS_LOST
 
     def refresh_now(self) -> None:
         """
@@ -165,6 +261,10 @@ class ServiceMonitor:
         Raises: 
             Ninguno
         """
+        backend = self._backend
+        if backend is not None:
+            backend.request_resync()
+            return
         threading.Thread(
             target=self._do_poll, daemon=True, name="ServiceMonitor-ForceRefresh"
         ).start()
@@ -175,6 +275,8 @@ class ServiceMonitor:
         """
         Realiza un sondeo único de servicios y actualiza los cachés internos.
 
+        Publica 'services.changed' si cambia el estado de algún servicio o los totales.
+
         Args: 
             Ninguno
 
@@ -185,14 +287,55 @@ class ServiceMonitor:
             Exception: Si ocurre un error durante el sondeo o el cálculo de estadísticas.
         """
         try:
-            services = self._fetch_services()
-            stats    = self._compute_stats(services)
-            with self._lock:
-                self._cached_services = services
-                self._cached_stats    = stats
+            self._apply_services(self._fetch_services())
         except Exception as e:
             logger.error("[ServiceMonitor] Error en _do_poll: %s", e)
 
+    def _apply_services(self, services: List[Dict]) -> None:
+        """
+        Ordena una lista de servicios recién leída, actualiza los cachés y publica cambios.
+
+        Args:
+            services (List[Dict]): Servicios de systemctl o del backend D-Bus.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        stats = self._compute_stats(services)
+        with self._lock:
+            # Bajo _lock para no competir con set_sort()
+            services = self._sort_services(services)
+            self._cached_services = services
+            self._cached_stats    = stats
+        self._publish_changes(services, stats)
+
+    def _publish_changes(self, services: List[Dict], stats: Dict) -> None:
+        """
+        Compara con el último sondeo publicado y emite 'services.changed' si hay diferencias.
+
+        Args:
+            services (List[Dict]): Servicios recién leídos.
+            stats (Dict): Totales recién calculados.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        snapshot = {s['name']: (s['active'], s['sub'], s['enabled']) for s in services}
+        prev     = self._published_states
+        changed  = [name for name, state in snapshot.items() if prev.get(name) != state]
+        changed += [name for name in prev if name not in snapshot]
+        if not changed and stats == self._published_stats:
+            return
+        self._published_states = snapshot
+        self._published_stats  = dict(stats)
+        get_event_bus().publish(SERVICES_CHANGED, {"stats": dict(stats), "changed": changed})
+
     def _fetch_services(self) -> List[Dict]:
         """
         Obtiene la lista de servicios del sistema mediante una llamada a systemctl.
@@ -243,10 +386,25 @@ class ServiceMonitor:
         if not services:
             return []
 
-        enabled_set = self._fetch_enabled_batch([s['unit'] for s in services])
+        enabled_set = self._enabled_units()
         for s in services:
             s['enabled'] = s['unit'] in enabled_set
 
+        return services
+
+    def _sort_services(self, services: List[Dict]) -> List[Dict]:
+        """
+        Ordena los servicios según sort_by y sort_reverse.
+
+        Args:
+            services (List[Dict]): Lista de servicios.
+
+        Returns:
+            List[Dict]: La misma lista, ordenada.
+
+        Raises:
+            None
+        """
         if self.sort_by == "name":
             services.sort(key=lambda x: x['name'].lower(), reverse=self.sort_reverse)
         elif self.sort_by == "state":
@@ -257,6 +415,110 @@ class ServiceMonitor:
 
         return services
 
+    def _enabled_units(self) -> set:
+        """
+        Devuelve los servicios habilitados usando el caché de list-unit-files.
+
+        Recarga el caché entero si cambió el mtime de algún directorio de unidades
+        y vuelve a consultar con is-enabled solo las unidades invalidadas.
+
+        Args:
+            Ninguno
+
+        Returns:
+            set: Unidades de servicio habilitadas.
+
+        Raises:
+            None
+        """
+        mtimes = self._read_unit_dir_mtimes()
+        with self._enabled_lock:
+            if self._unit_file_states is None or mtimes != self._unit_dir_mtimes:
+                states = self._fetch_unit_file_states()
+                if states is not None:
+                    self._unit_file_states = states
+                    self._unit_dir_mtimes  = mtimes
+                    self._stale_units.clear()
+            stale = list(self._stale_units)
+            self._stale_units.clear()
+
+            if stale and self._unit_file_states is not None:
+                enabled = self._fetch_enabled_batch(stale)
+                for unit in stale:
+                    self._unit_file_states[unit] = "enabled" if unit in enabled else "disabled"
+
+            states = self._unit_file_states or {}
+            return {unit for unit, state in states.items() if state == "enabled"}
+
+    def _invalidate_enabled(self, name: str) -> None:
+        """
+        Marca una unidad para volver a consultar su estado enabled en el próximo sondeo.
+
+        Args:
+            name (str): Nombre del servicio (sin extensión .service).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        with self._enabled_lock:
+            self._stale_units.add(f"{name}.service")
+
+    @staticmethod
+    def _read_unit_dir_mtimes() -> tuple:
+        """
+        Lee el mtime de los directorios de ficheros de unidad.
+
+        Args:
+            Ninguno
+
+        Returns:
+            tuple: mtime por directorio (None si no existe).
+
+        Raises:
+            None
+        """
+        mtimes = []
+        for path in _UNIT_FILE_DIRS:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _fetch_unit_file_states(self) -> Optional[Dict[str, str]]:
+        """
+        Obtiene el estado de todos los ficheros de unidad de servicio con una sola llamada.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Optional[Dict[str, str]]: unit → estado, o None si systemctl falla.
+
+        Raises:
+            None
+        """
+        try:
+            result = subprocess.run(
+                ["systemctl", "list-unit-files", "--type=service", "--no-legend", "--no-pager"],
+                capture_output=True, text=True, timeout=20,
+            )
+        except Exception as e:
+            logger.warning("[ServiceMonitor] Error en list-unit-files: %s", e)
+            return None
+        if result.returncode != 0:
+            return None
+
+        states = {}
+        for line in result.stdout.strip().split('\n'):
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith('.service'):
+                states[parts[0]] = parts[1]
+        return states
+
     def _fetch_enabled_batch(self, units: List[str]) -> set:
         """
         Obtiene el conjunto de servicios habilitados a partir de una lista de unidades.
@@ -435,6 +697,7 @@ class ServiceMonitor:
         """
         ok, msg = self._run_systemctl("enable", name, sudo=False)
         if ok:
+            self._invalidate_enabled(name)
             self.refresh_now()
         return ok, msg
 
@@ -453,6 +716,7 @@ class ServiceMonitor:
         """
         ok, msg = self._run_systemctl("disable", name, sudo=False)
         if ok:
+            self._invalidate_enabled(name)
             self.refresh_now()
         return ok, msg
 
@@ -508,11 +772,38 @@ class ServiceMonitor:
         except Exception as e:
             return f"Error: {str(e)}"
 
+    def follow_logs(self, name: str, lines: int = 50, priority: Optional[str] = None,
+                    cursor: Optional[str] = None) -> JournalFollower:
+        """
+        Abre un seguidor en streaming del journal de un servicio.
+
+        Pensado para vistas de logs en vivo: un solo journalctl -f por vista en
+        lugar de relanzar get_logs() en cada refresco. El llamante debe llamar
+        a stop() sobre el seguidor al cerrar la vista.
+
+        Args:
+            name (str): Nombre del servicio (sin extensión .service).
+            lines (int): Entradas históricas a cargar al empezar (por defecto, 50).
+            priority (str, opcional): Prioridad máxima a mostrar (ej. 'warning').
+            cursor (str, opcional): Reanudar justo después de este cursor.
+
+        Returns:
+            JournalFollower: Seguidor ya arrancado.
+
+        Raises:
+            ValueError: Si la prioridad no es válida.
+        """
+        return JournalFollower(name, lines=lines, priority=priority, cursor=cursor).start()
+
     # ── Configuración de vista ────────────────────────────────────────────────
 
     def set_sort(self, column: str, reverse: bool = False) -> None:
         """
-        Establece el criterio de ordenación de la lista de servicios.
+        Establece el criterio de ordenación y reordena el caché al momento.
+
+        Con el backend D-Bus el caché solo se reconstruye ante señales de
+        systemd, así que esperar a la siguiente lectura dejaría la vista sin
+        reordenar durante minutos.
 
         Args:
             column (str): Columna para ordenar ('name', 'state')
@@ -524,8 +815,10 @@ class ServiceMonitor:
         Raises:
             None
         """
-        self.sort_by      = column
-        self.sort_reverse = reverse
+        with self._lock:
+            self.sort_by      = column
+            self.sort_reverse = reverse
+            self._cached_services = self._sort_services(list(self._cached_services))
 
     def set_filter(self, filter_type: str) -> None:
         """
@@ -19,6 +19,7 @@ from utils.logger import get_logger
 from config.settings import SERVICE_WATCHDOG_INTERVAL, SERVICE_WATCHDOG_THRESHOLD
 from config.local_settings_io import get_param, update_params
 from core.service_monitor import ServiceMonitor
+from core.demand_registry import get_demand_registry
 
 logger = get_logger(__name__)
 
@@ -81,6 +82,8 @@ class ServiceWatchdog:
         self._stop_event.clear()
         self._thread = threading.Thread(target=self._watch_loop, daemon=True)
         self._thread.start()
+        # El watchdog lee get_services() cada _interval: no necesita más cadencia
+        get_demand_registry().acquire("service_monitor", "service_watchdog", self._interval)
         logger.info("[ServiceWatchdog] Iniciado: %d críticos, thresh %d, poll %ds",
                     len(self._critical_services), self._threshold, self._interval)
 
@@ -101,6 +104,7 @@ class ServiceWatchdog:
         self._stop_event.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5)
+        get_demand_registry().release("service_monitor", "service_watchdog")
         self._persist_state()
         logger.info("[ServiceWatchdog] Detenido")
     
@@ -0,0 +1,328 @@
+"""
+Recolector SMART/NVMe en segundo plano
+
+Ejecuta smartctl a un ritmo lento (minutos) en su propio thread y guarda los
+atributos ya parseados con su marca de tiempo. Los lectores (DiskWindow,
+DataCollectionService) reciben el último resultado al instante, sin forkear
+smartctl ni bloquear el thread de Tk.
+
+La temperatura entre ejecuciones se lee del hwmon del NVMe en sysfs, que no
+requiere fork; si no existe se usa la del último smartctl.
+
+Sin controladores NVMe o sin smartctl instalado el recolector no arranca:
+get() devuelve un resultado vacío (available=False) y nunca se invoca sudo.
+"""
+import glob
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Intervalo entre ejecuciones de smartctl (segundos)
+SMART_POLL_INTERVAL = 300
+# Un resultado más antiguo que esto se marca como 'stale'
+SMART_TTL = SMART_POLL_INTERVAL * 3
+_SMARTCTL_TIMEOUT = 10
+_DEFAULT_DEVICE = "nvme0"
+# smartctl suele vivir en sbin, fuera del PATH de un usuario normal
+_SMARTCTL_SEARCH_PATH = os.pathsep.join(
+    [os.environ.get("PATH", ""), "/usr/local/sbin", "/usr/sbin", "/sbin"]
+)
+
+
+def _empty_result(device: str) -> Dict:
+    """
+    Resultado SMART vacío (dispositivo no disponible).
+
+    Args:
+        device (str): Nombre del controlador NVMe.
+
+    Returns:
+        Dict: Resultado con todos los atributos a None.
+    """
+    return {
+        "device":           device,
+        "temperature":      None,
+        "power_on_hours":   None,
+        "power_cycles":     None,
+        "unsafe_shutdowns": None,
+        "media_errors":     None,
+        "data_written_tb":  None,
+        "data_read_tb":     None,
+        "percentage_used":  None,
+        "available":        False,
+        "timestamp":        None,
+    }
+
+
+class SmartCollector:
+    """
+    Recolecta SMART de los controladores NVMe en segundo plano y cachea el resultado.
+
+    Args:
+        interval_s (float): Segundos entre ejecuciones de smartctl.
+    """
+
+    def __init__(self, interval_s: float = SMART_POLL_INTERVAL):
+        """
+        Inicializa el recolector sin lanzar el thread.
+
+        Args:
+            interval_s (float): Segundos entre ejecuciones de smartctl.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._interval_s = interval_s
+        self._devices    = self._discover_devices()
+        self._lock       = threading.Lock()
+        self._cache: Dict[str, Dict] = {d: _empty_result(d) for d in self._devices}
+        self._running    = False
+        self._stop_evt   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ── Ciclo de vida ─────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """
+        Inicia la recolección periódica en segundo plano.
+
+        Returns:
+            None
+        """
+        if self._running:
+            return
+        if not self._devices:
+            logger.info("[SmartCollector] Sin controladores NVMe: recolección desactivada")
+            return
+        if shutil.which("smartctl", path=_SMARTCTL_SEARCH_PATH) is None:
+            logger.info("[SmartCollector] smartctl no instalado: recolección desactivada")
+            return
+        self._running = True
+        self._stop_evt.clear()
+        self._thread = threading.Thread(
+            target=self._collect_loop, daemon=True, name="SmartCollector"
+        )
+        self._thread.start()
+        logger.info("[SmartCollector] Iniciado (cada %ds, dispositivos: %s)",
+                    self._interval_s, ", ".join(self._devices))
+
+    def stop(self) -> None:
+        """
+        Detiene la recolección.
+
+        Returns:
+            None
+        """
+        self._running = False
+        self._stop_evt.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=_SMARTCTL_TIMEOUT + 2)
+        logger.info("[SmartCollector] Detenido")
+
+    def refresh_now(self) -> None:
+        """
+        Lanza una recolección inmediata en background (no-op si está desactivado).
+
+        Returns:
+            None
+        """
+        if not self._running:
+            return
+        threading.Thread(
+            target=self._collect_all, daemon=True, name="SmartCollector-Refresh"
+        ).start()
+
+    def _collect_loop(self) -> None:
+        """
+        Recolecta al arrancar y después cada interval_s segundos.
+
+        Returns:
+            None
+        """
+        self._collect_all()
+        while not self._stop_evt.wait(timeout=self._interval_s):
+            self._collect_all()
+
+    # ── Lectura ───────────────────────────────────────────────────────────────
+
+    @property
+    def devices(self) -> List[str]:
+        """
+        Controladores NVMe detectados.
+
+        Returns:
+            List[str]: Nombres como 'nvme0'; vacía si no hay ninguno.
+        """
+        return list(self._devices)
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indica si la recolección periódica está en marcha.
+
+        Returns:
+            bool: False si no hay NVMe, falta smartctl o no se ha iniciado.
+        """
+        return self._running
+
+    def get(self, device: Optional[str] = None) -> Dict:
+        """
+        Devuelve el último resultado SMART cacheado, sin bloquear.
+
+        Args:
+            device (str, opcional): Controlador NVMe; por defecto el primero.
+
+        Returns:
+            Dict: Atributos SMART más 'timestamp', 'age_s' y 'stale'.
+        """
+        device = device or self._default_device()
+        with self._lock:
+            result = dict(self._cache.get(device) or _empty_result(device))
+        ts = result.get("timestamp")
+        result["age_s"] = time.time() - ts if ts else None
+        result["stale"] = ts is None or result["age_s"] > SMART_TTL
+        return result
+
+    def get_temperature(self, device: Optional[str] = None) -> float:
+        """
+        Temperatura actual del NVMe: sysfs si existe, si no la del último smartctl.
+
+        Args:
+            device (str, opcional): Controlador NVMe; por defecto el primero.
+
+        Returns:
+            float: Temperatura en °C o 0.0 si no se conoce.
+        """
+        device = device or self._default_device()
+        if device not in self._devices:
+            return 0.0
+        temp = self._read_hwmon_temp(device)
+        if temp is not None:
+            return temp
+        with self._lock:
+            cached = self._cache.get(device, {}).get("temperature")
+        return float(cached) if cached is not None else 0.0
+
+    # ── Internos ──────────────────────────────────────────────────────────────
+
+    def _default_device(self) -> str:
+        """
+        Controlador por defecto para las lecturas.
+
+        Returns:
+            str: El primero detectado, o 'nvme0' (sin datos) si no hay ninguno.
+        """
+        return self._devices[0] if self._devices else _DEFAULT_DEVICE
+
+    @staticmethod
+    def _discover_devices() -> List[str]:
+        """
+        Detecta los controladores NVMe presentes.
+
+        Returns:
+            List[str]: Nombres de controlador; vacía si no se detecta ninguno.
+        """
+        return sorted(os.path.basename(p) for p in glob.glob("/sys/class/nvme/nvme*"))
+
+    @staticmethod
+    def _read_hwmon_temp(device: str) -> Optional[float]:
+        """
+        Lee la temperatura compuesta del NVMe desde hwmon en sysfs.
+
+        Args:
+            device (str): Controlador NVMe.
+
+        Returns:
+            Optional[float]: °C, o None si no hay sensor.
+        """
+        patterns = (
+            f"/sys/class/nvme/{device}/hwmon*/temp1_input",
+            f"/sys/class/nvme/{device}/device/hwmon/hwmon*/temp1_input",
+        )
+        for pattern in patterns:
+            for path in glob.glob(pattern):
+                try:
+                    with open(path) as f:
+                        return int(f.read().strip()) / 1000.0
+                except (OSError, ValueError):
+                    continue
+        return None
+
+    def _collect_all(self) -> None:
+        """
+        Ejecuta smartctl en todos los dispositivos y actualiza el caché.
+
+        Returns:
+            None
+        """
+        for device in self._devices:
+            if self._stop_evt.is_set():
+                return
+            result = self._collect(device)
+            with self._lock:
+                if result["available"] or not self._cache[device]["available"]:
+                    self._cache[device] = result
+                # Si falla una lectura se conserva la anterior; 'stale' la delatará
+
+    @staticmethod
+    def _collect(device: str) -> Dict:
+        """
+        Ejecuta smartctl sobre un dispositivo y parsea los atributos NVMe.
+
+        Args:
+            device (str): Controlador NVMe.
+
+        Returns:
+            Dict: Resultado SMART; available=False si no se pudo leer.
+        """
+        result = _empty_result(device)
+        try:
+            r = subprocess.run(
+                ["sudo", "smartctl", "-a", "--json", f"/dev/{device}"],
+                capture_output=True, text=True, timeout=_SMARTCTL_TIMEOUT
+            )
+            # smartctl devuelve 0 o bitmask de warnings no fatales (2, 4, 6...)
+            # Solo falla si el bit 0 o bit 1 está activo (error real)
+            if r.returncode & 0b00000011:
+                return result
+
+            data  = json.loads(r.stdout)
+            attrs = data.get("nvme_smart_health_information_log", {})
+
+            result["temperature"]      = data.get("temperature", {}).get("current",
+                                                                        attrs.get("temperature"))
+            result["power_on_hours"]   = attrs.get("power_on_hours")
+            result["power_cycles"]     = attrs.get("power_cycles")
+            result["unsafe_shutdowns"] = attrs.get("unsafe_shutdowns")
+            result["media_errors"]     = attrs.get("media_errors")
+            result["percentage_used"]  = attrs.get("percentage_used")
+
+            # data_units_written/read vienen en unidades de 512.000 bytes
+            dw = attrs.get("data_units_written")
+            dr = attrs.get("data_units_read")
+            if dw is not None:
+                result["data_written_tb"] = round(dw * 512_000 / (1024 ** 4), 2)
+            if dr is not None:
+                result["data_read_tb"]    = round(dr * 512_000 / (1024 ** 4), 2)
+
+            result["available"] = True
+            result["timestamp"] = time.time()
+
+        except FileNotFoundError:
+            pass   # smartctl no instalado
+        except subprocess.TimeoutExpired:
+            logger.warning("[SmartCollector] Timeout leyendo SMART de %s", device)
+        except Exception as e:
+            logger.debug("[SmartCollector] Error leyendo SMART de %s: %s", device, e)
+
+        return result
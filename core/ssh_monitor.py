@@ -1,17 +1,30 @@
 """
 Monitor de sesiones SSH.
-Recopila sesiones activas via `who` e historial via `last`.
-Corre en thread daemon con refresco cada 30 segundos.
+Lee las sesiones activas de utmp y el historial de wtmp directamente
+(core.utmp_reader), sin forkear `who` ni `last`. wtmp se lee de forma
+incremental: solo se decodifican los registros añadidos desde la última vez.
+
+Mientras SSHWindow está abierta el thread comprueba cada segundo si utmp o
+wtmp han cambiado (inotify, o mtime si no hay inotify) y cada 30 segundos
+relee utmp por seguridad. Si los ficheros no existen se usan `who` y `last`.
 """
 import subprocess
 import threading
+import time
 from datetime import datetime
+from typing import List, Optional
+from core.demand_registry import get_demand_registry
+from core.file_watcher import FileWatcher
+from core.utmp_reader import UTMP_PATH, LoginIndex, WtmpReader, read_utmp
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-_POLL_INTERVAL = 30   # segundos
-_HISTORY_LINES = 50   # entradas de `last`
+_POLL_INTERVAL  = 30    # segundos — relectura completa de seguridad
+_WATCH_INTERVAL = 1.0   # segundos — comprobación de cambios en utmp/wtmp
+_DEMAND_KEY     = "ssh_monitor"   # sin lease no se leen utmp/wtmp
+_HISTORY_LINES  = 50    # entradas del historial
+_INDEX_MAX      = 5000  # sesiones conservadas en el índice de logins
 
 
 def _run(cmd: list) -> str:
@@ -144,10 +157,18 @@ class SSHMonitor:
         self._stop_evt = threading.Event()
         self._lock     = threading.Lock()
         self._thread   = None
+        self._demand   = get_demand_registry()
 
-        self._sessions: list = []   # who
-        self._history:  list = []   # last
+        self._sessions: list = []   # utmp / who
+        self._history:  list = []   # wtmp / last
         self._last_update: str = ""
+        self._version = 0           # sube cuando cambian sesiones o historial
+
+        # Lectura nativa; se abre en el thread al primer sondeo
+        self._wtmp: Optional[WtmpReader] = None
+        self._watcher: Optional[FileWatcher] = None
+        self._index = LoginIndex(maxlen=_INDEX_MAX)
+        self._last_full = 0.0
 
     # ── Ciclo de vida ─────────────────────────────────────────────────────────
 
@@ -190,12 +211,15 @@ class SSHMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._demand.wake(_DEMAND_KEY)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=6)
+        self._close_sources()
         with self._lock:
             self._sessions=[]
             self._history=[]
             self._last_update=""
+            self._index.clear()
         logger.info("[SSHMonitor] Servicio detenido")
         
     def is_running(self) -> bool:
@@ -228,10 +252,67 @@ class SSHMonitor:
         Raises:
             Ninguno
         """
-        self._poll()   # primera lectura inmediata
-        while not self._stop_evt.wait(_POLL_INTERVAL):
+        while not self._demand.wait(_DEMAND_KEY, self._stop_evt,
+                                    active_s=_WATCH_INTERVAL, idle_s=None):
+            self._check()
+
+    def _check(self):
+        """
+        Sondea solo si utmp/wtmp cambiaron o si toca la relectura de seguridad.
+
+        Args: Ninguno
+
+        Returns: Ninguno
+
+        Raises: Ninguno
+        """
+        if self._wtmp is None:
+            self._open_sources()
+        changed = self._watcher.changes() if self._watcher else set()
+        if changed or time.monotonic() - self._last_full >= _POLL_INTERVAL:
+            self._last_full = time.monotonic()
             self._poll()
 
+    def _open_sources(self):
+        """
+        Prepara el lector de wtmp (incluida la rotación anterior) y el watcher.
+
+        Args: Ninguno
+
+        Returns: Ninguno
+
+        Raises: Ninguno
+        """
+        self._wtmp = WtmpReader()
+        paths = [UTMP_PATH]
+        if self._wtmp.exists():
+            paths.append(self._wtmp.path)
+            # El mes anterior (logrotate) completa el índice de logins
+            rotated = WtmpReader(self._wtmp.path + ".1")
+            if rotated.exists():
+                records = rotated.read_new()
+                with self._lock:
+                    self._index.feed(records)
+        self._watcher = FileWatcher(paths)
+        logger.debug("[SSHMonitor] Vigilando %s (%s)", ", ".join(paths),
+                     "inotify" if self._watcher.uses_inotify else "mtime")
+
+    def _close_sources(self):
+        """
+        Cierra el watcher y olvida el offset de wtmp.
+
+        Args: Ninguno
+
+        Returns: Ninguno
+
+        Raises: Ninguno
+        """
+        if self._watcher is not None:
+            self._watcher.close()
+        self._watcher = None
+        self._wtmp = None
+        self._last_full = 0.0
+
     def _poll(self):
         """
         Realiza un ciclo de polling completo para obtener información de sesiones activas y historial.
@@ -243,14 +324,24 @@ class SSHMonitor:
         Raises: Exception - Si ocurre un error durante la ejecución, se registra en el log de errores.
         """
         try:
-            who_raw  = _run(["who"])
-            last_raw = _run(["last", "-n", str(_HISTORY_LINES), "--time-format", "iso"])
+            sessions = read_utmp()
+            if sessions is None:
+                sessions = _parse_who(_run(["who"]))
 
-            sessions = _parse_who(who_raw)
-            history  = _parse_last(last_raw)
-            ts       = datetime.now().strftime("%H:%M:%S")
+            if self._wtmp is not None and self._wtmp.exists():
+                new_records = self._wtmp.read_new()
+                with self._lock:
+                    self._index.feed(new_records)
+                    history = self._index.recent(_HISTORY_LINES)
+            else:
+                last_raw = _run(["last", "-n", str(_HISTORY_LINES), "--time-format", "iso"])
+                history  = _parse_last(last_raw)
+
+            ts = datetime.now().strftime("%H:%M:%S")
 
             with self._lock:
+                if sessions != self._sessions or history != self._history:
+                    self._version += 1
                 self._sessions     = sessions
                 self._history      = history
                 self._last_update  = ts
@@ -331,14 +422,40 @@ class SSHMonitor:
         """
         acquired = self._lock.acquire(blocking=False)
         if not acquired:
-            return {"sessions": [], "history": [], "last_update": ""}
+            return {"sessions": [], "history": [], "last_update": "", "version": -1}
         try:
             return {
                 "sessions":    list(self._sessions),
                 "history":     list(self._history),
                 "last_update": self._last_update,
+                "version":     self._version,
             }
         finally:
             self._lock.release()
 
+    def search_history(self, user: Optional[str] = None, ip: Optional[str] = None,
+                       since: Optional[float] = None, until: Optional[float] = None,
+                       limit: int = 500) -> List[dict]:
+        """
+        Busca en el índice de logins construido desde wtmp (y wtmp.1).
+
+        Args:
+            user (str, opcional): Usuario exacto.
+            ip (str, opcional): Prefijo del host/IP de origen.
+            since (float, opcional): Login a partir de este epoch.
+            until (float, opcional): Login anterior a este epoch.
+            limit (int): Número máximo de resultados.
+
+        Returns:
+            list[dict]: Entradas con "user", "tty", "ip", "time_info",
+                        "login_ts" y "logout_ts", más recientes primero.
+                        Vacío si wtmp no se puede leer.
+
+        Raises:
+            Ninguno
+        """
+        with self._lock:
+            return self._index.search(user=user, ip=ip, since=since,
+                                      until=until, limit=limit)
+
 
@@ -1,19 +1,35 @@
 """
 Monitor del sistema
 Monitor centralizado de métricas CPU, RAM, temperatura y uptime con histórico para UI.
+Incluye uso por núcleo, frecuencia cpufreq y flags de throttling/sub-voltaje.
 Thread background no-bloqueante, thread-safe con lock.
+Publica 'system.sample' en el EventBus cuando algún valor supera su deadband.
 """
 import time
 import threading
 import psutil
 from collections import deque
-from typing import Dict
+from typing import Dict, List
 from config.settings import HISTORY, UPDATE_MS, COLORS
+from core.event_bus import get_event_bus
+from core.events import SYSTEM_SAMPLE, DeltaFilter
 from utils.system_utils import SystemUtils
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Sin get_throttled en sysfs hay que forkear vcgencmd: se lee cada N muestras
+_THROTTLE_VCGENCMD_EVERY = 15
+
+# Zonas muertas de 'system.sample': variaciones menores no se publican
+_SAMPLE_DEADBANDS = {
+    'cpu':          1.0,    # %
+    'ram':          0.5,    # %
+    'temp':         0.5,    # °C
+    'cpu_freq_mhz': 50.0,   # MHz
+}
+# Claves que se publican en cuanto cambian
+_SAMPLE_KEYS = ('throttled', 'uptime_str')
 
 
 class SystemMonitor:
@@ -40,11 +56,20 @@ class SystemMonitor:
         self._cpu_hist  = deque(maxlen=HISTORY)
         self._ram_hist  = deque(maxlen=HISTORY)
         self._temp_hist = deque(maxlen=HISTORY)
+        self._cores_hist = deque(maxlen=HISTORY)
+
+        # Min/max de cpufreq son estáticos: se leen una sola vez
+        self._freq_policies   = SystemUtils.get_cpufreq_policies()
+        self._throttle_sysfs  = SystemUtils.has_throttled_sysfs()
+        self._throttle_tick   = 0
+        self._throttled       = None
+        self._delta           = DeltaFilter(_SAMPLE_DEADBANDS, _SAMPLE_KEYS)
 
         self._cache_lock = threading.Lock()
         self._cached: Dict = {
             'cpu': 0.0, 'ram': 0.0, 'ram_used': 0,
             'temp': 0.0, 'uptime_str': '--',
+            'cpu_cores': [], 'cpu_freq_mhz': 0.0, 'throttle_flags': {},
         }
 
         self._running    = False
@@ -96,7 +121,8 @@ class SystemMonitor:
         self._cached = {
             'cpu': 0.0, 'ram': 0.0, 'temp': 0.0,
             'disk_usage': 0.0, 'disk_write_mb': 0.0, 'disk_read_mb': 0.0,
-            'uptime_str': '--',
+            'uptime_str': '--', 'cpu_cores': [], 'cpu_freq_mhz': 0.0,
+            'throttle_flags': {},
         }
         logger.info("[SystemMonitor] Sondeo detenido")
     
@@ -143,8 +169,10 @@ class SystemMonitor:
             Ninguno, las excepciones se manejan silenciosamente.
         """
         try:
-            cpu  = psutil.cpu_percent()
-            vm   = psutil.virtual_memory()
+            # Una sola lectura de /proc/stat: el agregado es la media por núcleo
+            cores = psutil.cpu_percent(percpu=True)
+            cpu   = sum(cores) / len(cores) if cores else 0.0
+            vm    = psutil.virtual_memory()
             temp = self._system_utils.get_cpu_temp()
 
             with open("/proc/uptime") as f:
@@ -155,13 +183,24 @@ class SystemMonitor:
             uptime_str = (f"⏱ {days}d {hours}h" if days > 0
                           else f"⏱ {hours}h {minutes}m")
 
+            core_freqs = self._read_core_freqs(len(cores))
+            freqs      = [f for f in core_freqs if f > 0]
+            throttled  = self._read_throttled()
+
             stats = {
-                'cpu':        cpu,
-                'ram':        vm.percent,
-                'ram_used':   vm.used,
-                'temp':       temp,
-                'uptime_s':   uptime_s,
-                'uptime_str': uptime_str,
+                'cpu':              cpu,
+                'cpu_cores':        cores,
+                'cpu_core_freqs':   core_freqs,
+                'cpu_freq_mhz':     max(freqs) if freqs else 0.0,
+                'cpu_freq_min_mhz': min((p['min_mhz'] for p in self._freq_policies), default=0.0),
+                'cpu_freq_max_mhz': max((p['max_mhz'] for p in self._freq_policies), default=0.0),
+                'throttled':        throttled,
+                'throttle_flags':   SystemUtils.decode_throttled(throttled),
+                'ram':              vm.percent,
+                'ram_used':         vm.used,
+                'temp':             temp,
+                'uptime_s':         uptime_s,
+                'uptime_str':       uptime_str,
             }
 
             with self._cache_lock:
@@ -169,9 +208,53 @@ class SystemMonitor:
 
             self.update_history(stats)
 
+            changed = self._delta.changes(stats)
+            if changed:
+                get_event_bus().publish(SYSTEM_SAMPLE, {"stats": dict(stats), "changed": changed})
+
         except Exception as e:
             logger.error("[SystemMonitor] Error en _do_poll: %s", e)
 
+    def _read_core_freqs(self, n_cores: int) -> List[float]:
+        """
+        Lee la frecuencia actual de cada núcleo en MHz.
+
+        Se abre un único scaling_cur_freq por política cpufreq y se reparte
+        entre los núcleos que gobierna.
+
+        Args:
+            n_cores (int): Número de núcleos reportados por psutil.
+
+        Returns:
+            List[float]: Frecuencia por núcleo (0.0 si no se conoce).
+        """
+        freqs = [0.0] * n_cores
+        for policy in self._freq_policies:
+            khz = SystemUtils.read_sysfs_int(policy['path'] + "/scaling_cur_freq")
+            if khz is None:
+                continue
+            for core in policy['cores']:
+                if core < n_cores:
+                    freqs[core] = khz / 1000.0
+        return freqs
+
+    def _read_throttled(self):
+        """
+        Devuelve la máscara de throttling, limitando los forks de vcgencmd.
+
+        Con sysfs disponible se lee en cada muestra; si no, se refresca cada
+        _THROTTLE_VCGENCMD_EVERY muestras y se reutiliza el último valor.
+
+        Returns:
+            Optional[int]: Máscara get_throttled o None si no está disponible.
+        """
+        if self._throttle_sysfs:
+            return SystemUtils.get_throttled()
+        if self._throttle_tick % _THROTTLE_VCGENCMD_EVERY == 0:
+            self._throttled = SystemUtils.get_throttled()
+        self._throttle_tick += 1
+        return self._throttled
+
     def get_current_stats(self) -> Dict:
         """
         Obtiene las estadísticas actuales del sistema.
@@ -181,7 +264,8 @@ class SystemMonitor:
 
         Returns:
             Dict: Un diccionario con las estadísticas actuales del sistema, 
-                  incluyendo 'cpu', 'ram', 'ram_used', 'temp' y 'uptime_str'.
+                  incluyendo 'cpu', 'cpu_cores', 'cpu_freq_mhz', 'throttle_flags',
+                  'ram', 'ram_used', 'temp' y 'uptime_str'.
 
         Raises:
             Ninguno
@@ -189,6 +273,7 @@ class SystemMonitor:
         if not self._running:
             return {
                 'cpu': 0.0, 'ram': 0.0, 'temp': 0.0, 'uptime_str': '--',
+                'cpu_cores': [], 'cpu_freq_mhz': 0.0, 'throttle_flags': {},
             }
         with self._cache_lock:
             return dict(self._cached)
@@ -211,6 +296,7 @@ class SystemMonitor:
         self._cpu_hist.append(stats['cpu'])
         self._ram_hist.append(stats['ram'])
         self._temp_hist.append(stats['temp'])
+        self._cores_hist.append(list(stats.get('cpu_cores', [])))
 
     def get_history(self) -> Dict:
         """
@@ -220,7 +306,8 @@ class SystemMonitor:
             Ninguno
 
         Returns:
-            Dict: Un diccionario con claves 'cpu', 'ram', 'temp' y valores correspondientes a listas de históricos.
+            Dict: Un diccionario con claves 'cpu', 'ram', 'temp' y 'cpu_cores' (lista de
+                  muestras, cada una con el uso de cada núcleo).
 
         Raises:
             Ninguno
@@ -229,6 +316,7 @@ class SystemMonitor:
             'cpu':  list(self._cpu_hist),
             'ram':  list(self._ram_hist),
             'temp': list(self._temp_hist),
+            'cpu_cores': list(self._cores_hist),
         }
 
     @staticmethod
@@ -0,0 +1,543 @@
+"""
+Backend D-Bus de systemd para ServiceMonitor.
+
+En lugar de forkear `systemctl list-units` + `systemctl is-enabled` en cada
+sondeo, habla con org.freedesktop.systemd1 por el bus del sistema:
+  - ListUnits + ListUnitFiles una vez al conectar (y en resincronizaciones)
+  - Señales PropertiesChanged de cada unidad para actualizaciones incrementales
+  - UnitNew/UnitRemoved/Reloading → resincronización completa
+  - UnitFilesChanged → recarga solo el estado enabled/disabled
+
+Usa `jeepney` (D-Bus puro Python, sin main loop de GLib). Si no está instalado
+o el bus no responde, ServiceMonitor sigue con el parser de systemctl.
+
+El transporte es intercambiable: FakeSystemdTransport simula el servicio
+systemd en memoria para tests, sin bus real:
+
+    fake = FakeSystemdTransport()
+    fake.add_unit("nginx", active="active", sub="running", enabled=True)
+    monitor = ServiceMonitor(dbus_transport_factory=lambda: fake)
+    fake.set_state("nginx", "failed", "failed")   # llega como PropertiesChanged
+"""
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SYSTEMD_BUS   = "org.freedesktop.systemd1"
+_SYSTEMD_PATH  = "/org/freedesktop/systemd1"
+_MANAGER_IFACE = "org.freedesktop.systemd1.Manager"
+_UNIT_IFACE    = "org.freedesktop.systemd1.Unit"
+_PROPS_IFACE   = "org.freedesktop.DBus.Properties"
+_UNIT_PATH_NS  = "/org/freedesktop/systemd1/unit"
+
+# Señales agrupadas: se notifica tras este silencio o, como mucho, tras este retraso
+_SIGNAL_QUIET_S = 0.25
+_SIGNAL_MAX_DELAY_S = 1.0
+
+# Tipos de señal normalizados que devuelven los transportes
+SIGNAL_PROPS      = "props"       # (SIGNAL_PROPS, object_path, {prop: valor})
+SIGNAL_RESYNC     = "resync"      # (SIGNAL_RESYNC,)
+SIGNAL_UNIT_FILES = "unit_files"  # (SIGNAL_UNIT_FILES,)
+
+
+def unit_object_path(unit: str) -> str:
+    """
+    Construye la ruta de objeto D-Bus de una unidad, con el escape de systemd.
+
+    Args:
+        unit (str): Nombre completo de la unidad (ej. 'nginx.service').
+
+    Returns:
+        str: Ruta como '/org/freedesktop/systemd1/unit/nginx_2eservice'.
+    """
+    escaped = "".join(
+        c if (c.isascii() and c.isalnum()) else "_%02x" % ord(c)
+        for c in unit
+    )
+    return f"{_UNIT_PATH_NS}/{escaped}"
+
+
+# ── Transporte real (jeepney) ─────────────────────────────────────────────────
+
+class _JeepneyTransport:
+    """
+    Conexión bloqueante al bus del sistema mediante jeepney.
+
+    Raises:
+        ImportError: Si jeepney no está instalado.
+        OSError: Si no se puede abrir el bus del sistema.
+    """
+
+    def __init__(self):
+        """
+        Abre la conexión al bus del sistema.
+
+        Raises:
+            ImportError: Si jeepney no está instalado.
+            OSError: Si el bus no está disponible.
+        """
+        from jeepney import DBusAddress, MatchRule, HeaderFields, new_method_call
+        from jeepney.bus_messages import message_bus
+        from jeepney.io.blocking import open_dbus_connection
+
+        self._new_method_call = new_method_call
+        self._MatchRule       = MatchRule
+        self._HeaderFields    = HeaderFields
+        self._message_bus     = message_bus
+        self._manager = DBusAddress(_SYSTEMD_PATH, bus_name=_SYSTEMD_BUS,
+                                    interface=_MANAGER_IFACE)
+        self._conn  = open_dbus_connection(bus="SYSTEM")
+        self._queue = None
+        self._filters = []
+
+    def _call(self, method: str):
+        """
+        Llama a un método del Manager y devuelve el primer valor de la respuesta.
+
+        Args:
+            method (str): Nombre del método.
+
+        Returns:
+            El cuerpo de la respuesta (primer elemento), o None si no tiene.
+        """
+        reply = self._conn.send_and_get_reply(
+            self._new_method_call(self._manager, method), timeout=10)
+        return reply.body[0] if reply.body else None
+
+    def list_units(self) -> List[tuple]:
+        """
+        Devuelve las tuplas de ListUnits (name, description, load, active, sub, ..., path, ...).
+
+        Returns:
+            List[tuple]: Unidades cargadas.
+        """
+        return self._call("ListUnits")
+
+    def list_unit_files(self) -> List[Tuple[str, str]]:
+        """
+        Devuelve las tuplas (ruta, estado) de ListUnitFiles.
+
+        Returns:
+            List[Tuple[str, str]]: Ficheros de unidad y su estado enabled/disabled/...
+        """
+        return self._call("ListUnitFiles")
+
+    def subscribe(self) -> None:
+        """
+        Activa la emisión de señales y registra las reglas de coincidencia.
+
+        Returns:
+            None
+        """
+        from collections import deque
+
+        self._call("Subscribe")
+        props_rule = self._MatchRule(
+            type="signal", interface=_PROPS_IFACE, member="PropertiesChanged",
+            path_namespace=_UNIT_PATH_NS)
+        props_rule.add_arg_condition(0, _UNIT_IFACE)
+        manager_rule = self._MatchRule(
+            type="signal", interface=_MANAGER_IFACE, path=_SYSTEMD_PATH)
+
+        self._queue = deque()
+        for rule in (props_rule, manager_rule):
+            self._conn.send_and_get_reply(self._message_bus.AddMatch(rule), timeout=5)
+            self._filters.append(self._conn.filter(rule, queue=self._queue, bufsize=4096))
+
+    def recv_signal(self, timeout: float) -> Optional[tuple]:
+        """
+        Espera la siguiente señal relevante y la normaliza.
+
+        Args:
+            timeout (float): Segundos máximos de espera.
+
+        Returns:
+            Optional[tuple]: Señal normalizada (SIGNAL_*), o None si vence el timeout
+                             o la señal no interesa.
+        """
+        try:
+            msg = self._conn.recv_until_filtered(self._queue, timeout=timeout)
+        except TimeoutError:
+            return None
+        fields = msg.header.fields
+        member = fields.get(self._HeaderFields.member)
+        if member == "PropertiesChanged":
+            _iface, changed, _invalidated = msg.body
+            return (SIGNAL_PROPS, fields.get(self._HeaderFields.path),
+                    {k: v[1] for k, v in changed.items()})
+        if member == "UnitFilesChanged":
+            return (SIGNAL_UNIT_FILES,)
+        if member in ("UnitNew", "UnitRemoved", "Reloading"):
+            return (SIGNAL_RESYNC,)
+        return None
+
+    def close(self) -> None:
+        """
+        Cierra la conexión al bus.
+
+        Returns:
+            None
+        """
+        for handle in self._filters:
+            try:
+                handle.close()
+            except Exception:
+                pass
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+
+
+# ── Transporte falso para tests ───────────────────────────────────────────────
+
+class FakeSystemdTransport:
+    """
+    Servicio systemd simulado en memoria con la misma interfaz que el transporte real.
+
+    Los cambios hechos con add_unit/remove_unit/set_state/set_enabled se
+    entregan como señales, igual que las emitiría systemd. drop() simula una
+    caída de la conexión y reachable=False un bus que rechaza conexiones.
+    """
+
+    def __init__(self):
+        """
+        Crea un systemd vacío.
+        """
+        self._lock    = threading.Lock()
+        self._units: Dict[str, Dict] = {}
+        self._signals: "queue.Queue[tuple]" = queue.Queue()
+        self.subscribed = False
+        self.closed     = False
+        self.reachable  = True
+        self._dropped   = False
+
+    def add_unit(self, name: str, active: str = "active", sub: str = "running",
+                 load: str = "loaded", description: str = "", enabled: bool = False) -> None:
+        """
+        Añade (o sustituye) un servicio y emite UnitNew.
+
+        Args:
+            name (str): Nombre sin '.service'.
+            active (str): ActiveState.
+            sub (str): SubState.
+            load (str): LoadState.
+            description (str): Descripción.
+            enabled (bool): Estado del fichero de unidad.
+        """
+        with self._lock:
+            self._units[name] = {"active": active, "sub": sub, "load": load,
+                                 "description": description, "enabled": enabled}
+        self._signals.put((SIGNAL_RESYNC,))
+
+    def remove_unit(self, name: str) -> None:
+        """
+        Elimina un servicio y emite UnitRemoved.
+
+        Args:
+            name (str): Nombre sin '.service'.
+        """
+        with self._lock:
+            self._units.pop(name, None)
+        self._signals.put((SIGNAL_RESYNC,))
+
+    def set_state(self, name: str, active: str, sub: str) -> None:
+        """
+        Cambia el estado de un servicio y emite PropertiesChanged.
+
+        Args:
+            name (str): Nombre sin '.service'.
+            active (str): Nuevo ActiveState.
+            sub (str): Nuevo SubState.
+        """
+        with self._lock:
+            self._units[name].update(active=active, sub=sub)
+        self._signals.put((SIGNAL_PROPS, unit_object_path(f"{name}.service"),
+                           {"ActiveState": active, "SubState": sub}))
+
+    def set_enabled(self, name: str, enabled: bool) -> None:
+        """
+        Cambia el estado enabled de un servicio y emite UnitFilesChanged.
+
+        Args:
+            name (str): Nombre sin '.service'.
+            enabled (bool): Nuevo estado.
+        """
+        with self._lock:
+            self._units[name]["enabled"] = enabled
+        self._signals.put((SIGNAL_UNIT_FILES,))
+
+    def list_units(self) -> List[tuple]:
+        """
+        Devuelve las unidades con el formato de ListUnits.
+        """
+        with self._lock:
+            return [
+                (f"{n}.service", u["description"], u["load"], u["active"], u["sub"], "",
+                 unit_object_path(f"{n}.service"), 0, "", "/")
+                for n, u in self._units.items()
+            ]
+
+    def list_unit_files(self) -> List[Tuple[str, str]]:
+        """
+        Devuelve los ficheros de unidad con el formato de ListUnitFiles.
+        """
+        with self._lock:
+            return [
+                (f"/lib/systemd/system/{n}.service", "enabled" if u["enabled"] else "disabled")
+                for n, u in self._units.items()
+            ]
+
+    def drop(self) -> None:
+        """
+        Simula la caída de la conexión: el siguiente recv_signal falla.
+        """
+        self._dropped = True
+        self._signals.put((SIGNAL_RESYNC,))   # despierta al lector
+
+    def subscribe(self) -> None:
+        """
+        Marca la suscripción a señales.
+
+        Raises:
+            ConnectionRefusedError: Si reachable es False.
+        """
+        if not self.reachable:
+            raise ConnectionRefusedError("bus no disponible")
+        self._dropped   = False
+        self.closed     = False
+        self.subscribed = True
+
+    def recv_signal(self, timeout: float) -> Optional[tuple]:
+        """
+        Devuelve la siguiente señal pendiente o None tras el timeout.
+
+        Raises:
+            ConnectionResetError: Tras drop(), como el transporte real.
+        """
+        if self._dropped:
+            raise ConnectionResetError("conexión D-Bus cerrada")
+        try:
+            return self._signals.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        """
+        Marca el transporte como cerrado.
+        """
+        self.closed = True
+
+
+# ── Backend ───────────────────────────────────────────────────────────────────
+
+class SystemdDBusBackend:
+    """
+    Mantiene el estado de los servicios systemd a partir de D-Bus.
+
+    Args:
+        transport_factory (Callable, opcional): Crea el transporte; por defecto jeepney.
+    """
+
+    def __init__(self, transport_factory: Optional[Callable] = None):
+        """
+        Prepara el backend sin conectar todavía.
+
+        Args:
+            transport_factory (Callable, opcional): Crea el transporte; por defecto jeepney.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._factory   = transport_factory or _JeepneyTransport
+        self._transport = None
+        self.unsupported = False   # True si falta jeepney: no tiene sentido reintentar
+        self._lock      = threading.Lock()
+        self._services: Dict[str, Dict] = {}   # unit → servicio
+        self._paths: Dict[str, str] = {}       # object path → unit
+        self._enabled: set = set()
+        self._resync_evt = threading.Event()
+
+    def connect(self) -> bool:
+        """
+        Abre el transporte, se suscribe a señales y carga el estado inicial.
+
+        Returns:
+            bool: True si el backend está listo; False para usar el fallback.
+
+        Raises:
+            None
+        """
+        try:
+            self._transport = self._factory()
+            self._transport.subscribe()
+            self._load_unit_files()
+            self._load_units()
+            return True
+        except ImportError:
+            self.unsupported = True
+            logger.info("[SystemdDBus] jeepney no instalado — se usa systemctl")
+        except Exception as e:
+            logger.warning("[SystemdDBus] D-Bus no disponible (%s) — se usa systemctl", e)
+        self.close()
+        return False
+
+    def close(self) -> None:
+        """
+        Cierra el transporte si está abierto.
+
+        Returns:
+            None
+        """
+        if self._transport is not None:
+            try:
+                self._transport.close()
+            except Exception:
+                pass
+            self._transport = None
+
+    def request_resync(self) -> None:
+        """
+        Pide una resincronización completa en la próxima vuelta del bucle.
+
+        Returns:
+            None
+        """
+        self._resync_evt.set()
+
+    def services(self) -> List[Dict]:
+        """
+        Devuelve una copia de los servicios conocidos.
+
+        Returns:
+            List[Dict]: Servicios con el mismo formato que el parser de systemctl.
+        """
+        with self._lock:
+            return [dict(s) for s in self._services.values()]
+
+    def run(self, stop_evt: threading.Event, on_update: Callable[[List[Dict]], None],
+            resync_s: float) -> None:
+        """
+        Procesa señales hasta que se pida parar, notificando los cambios agrupados.
+
+        Se ejecuta en el thread del monitor: todo el I/O de D-Bus ocurre aquí.
+
+        Args:
+            stop_evt (threading.Event): Evento de parada del monitor.
+            on_update (Callable): Recibe la lista completa de servicios tras cada cambio.
+            resync_s (float): Resincronización completa periódica, como red de seguridad.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: Si el transporte falla; el monitor vuelve entonces a systemctl.
+        """
+        on_update(self.services())
+        last_sync = time.monotonic()
+        dirty_since = None
+        try:
+            while not stop_evt.is_set():
+                signal = self._transport.recv_signal(timeout=_SIGNAL_QUIET_S)
+                now = time.monotonic()
+
+                if signal is not None:
+                    if self._apply_signal(signal) and dirty_since is None:
+                        dirty_since = now
+
+                if self._resync_evt.is_set() or now - last_sync >= resync_s:
+                    self._resync_evt.clear()
+                    self._load_unit_files()
+                    self._load_units()
+                    last_sync = now
+                    dirty_since = dirty_since or now
+
+                if dirty_since is not None and (
+                        signal is None or now - dirty_since >= _SIGNAL_MAX_DELAY_S):
+                    dirty_since = None
+                    on_update(self.services())
+        finally:
+            self.close()
+
+    # ── Internos ──────────────────────────────────────────────────────────────
+
+    def _apply_signal(self, signal: tuple) -> bool:
+        """
+        Aplica una señal normalizada al estado.
+
+        Args:
+            signal (tuple): Señal SIGNAL_*.
+
+        Returns:
+            bool: True si el estado visible ha cambiado.
+        """
+        kind = signal[0]
+        if kind == SIGNAL_RESYNC:
+            self._resync_evt.set()
+            return False
+        if kind == SIGNAL_UNIT_FILES:
+            self._load_unit_files()
+            return True
+
+        _, path, props = signal
+        with self._lock:
+            unit = self._paths.get(path)
+            if unit is None:
+                return False
+            svc = self._services[unit]
+            before = (svc['load'], svc['active'], svc['sub'])
+            svc['load']   = props.get("LoadState",   svc['load'])
+            svc['active'] = props.get("ActiveState", svc['active'])
+            svc['sub']    = props.get("SubState",    svc['sub'])
+            return before != (svc['load'], svc['active'], svc['sub'])
+
+    def _load_units(self) -> None:
+        """
+        Recarga la lista de servicios con ListUnits.
+
+        Returns:
+            None
+        """
+        services, paths = {}, {}
+        for row in self._transport.list_units():
+            unit, description, load, active, sub = row[0], row[1], row[2], row[3], row[4]
+            if not unit.endswith(".service"):
+                continue
+            services[unit] = {
+                'name':        unit[:-len(".service")],
+                'unit':        unit,
+                'load':        load,
+                'active':      active,
+                'sub':         sub,
+                'description': description,
+                'enabled':     unit in self._enabled,
+            }
+            paths[row[6]] = unit
+        with self._lock:
+            self._services = services
+            self._paths    = paths
+
+    def _load_unit_files(self) -> None:
+        """
+        Recarga el conjunto de servicios habilitados con ListUnitFiles.
+
+        Returns:
+            None
+        """
+        enabled = {
+            os.path.basename(path)
+            for path, state in self._transport.list_unit_files()
+            if state == "enabled" and path.endswith(".service")
+        }
+        with self._lock:
+            self._enabled = enabled
+            for unit, svc in self._services.items():
+                svc['enabled'] = unit in enabled
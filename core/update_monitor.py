@@ -1,24 +1,34 @@
 """
 Monitor de actualizaciones del sistema.
-Verifica paquetes pendientes via 'apt list --upgradable' con caché de 12h y lock thread-safe.
-Ejecuta 'sudo apt update' solo cuando necesario (force o timeout caché).
+Un thread propio refresca el estado de apt ('apt-get update' + 'apt list --upgradable')
+con progreso, y guarda el inventario de paquetes actualizables con sus versiones.
+Los consumidores (badges, DataCollection, UpdatesWindow) solo leen el caché: nunca
+ejecutan apt en su hilo. El refresco real ocurre al arrancar (main.py), cuando el
+usuario pulsa "Buscar" o cuando caduca el caché de 12h.
 """
+import os
 import subprocess
 import time
 import threading
-from typing import Dict
+from typing import Dict, List, Optional
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_APT_UPDATE_TIMEOUT = 120
+_APT_LIST_TIMEOUT   = 30
+# apt en inglés para poder parsear su salida
+_APT_ENV = dict(os.environ, LC_ALL="C", LANG="C")
+
 
 class UpdateMonitor:
     """
     Inicializa el monitor de actualizaciones.
 
-    Configura el estado de ejecución, un bloqueo para acceso concurrente, 
-    una caché inicial con estado desconocido y un intervalo de comprobación 
-    de 12 horas. No inicia hilos automáticos; requiere llamada explícita a start().
+    Configura el estado de ejecución, un bloqueo para acceso concurrente,
+    una caché inicial con estado desconocido y un intervalo de comprobación
+    de 12 horas. Lanza el thread de refresco, que espera a que se le pida
+    un refresco o a que caduque el caché.
     """
 
     def __init__(self):
@@ -26,51 +36,81 @@ class UpdateMonitor:
         Inicializa el monitor de actualizaciones.
 
         Configura el estado de ejecución, bloqueo de acceso, caché inicial de resultado desconocido,
-        timestamp actual y un intervalo de comprobación de 12 horas. No inicia hilos automáticos,
-        requiere llamada explícita a start() para comenzar la monitorización.
+        timestamp actual y un intervalo de comprobación de 12 horas, y arranca el thread de refresco.
         """
-        self._running = True
+        self._running = False
         self._lock          = threading.Lock()
         # Inicializar con tiempo actual para que la caché sea válida desde el inicio
         # Solo ejecuta apt update real cuando: arranque (main.py) o usuario pulsa "Buscar"
         self._last_check_time = time.time()
         self._cached_result = {"pending": 0, "status": "Unknown", "message": "No comprobado"}
+        self._packages: List[Dict] = []
+        self._progress: Dict = {"running": False, "stage": "", "percent": 0.0, "message": ""}
         self._check_interval = 43200  # 12 horas en segundos
 
+        self._stop_evt    = threading.Event()
+        self._refresh_evt = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._apt_proc: Optional[subprocess.Popen] = None
+
+        self.start()
+
     # ── Ciclo de vida ─────────────────────────────────────────────────────────
 
     def start(self) -> None:
         """
-        Inicia el servicio de monitoreo de actualizaciones.
+        Inicia el servicio de monitoreo de actualizaciones y su thread de refresco.
 
-        Args: 
+        Args:
             None
 
-        Returns: 
+        Returns:
             None
 
-        Raises: 
+        Raises:
             None
         """
+        if self._running:
+            return
         self._running = True
+        self._stop_evt.clear()
+        self._refresh_evt.clear()
+        self._thread = threading.Thread(
+            target=self._job_loop, daemon=True, name="UpdateMonitorJob"
+        )
+        self._thread.start()
         logger.info("[UpdateMonitor] Iniciado")
 
     def stop(self) -> None:
         """
         Detiene el servicio de monitoreo de actualizaciones.
 
-        Args: 
+        Un refresco en curso se interrumpe matando su 'apt-get update'.
+
+        Args:
             None
 
-        Returns: 
+        Returns:
             None
 
-        Raises: 
+        Raises:
             None
         """
         self._running = False
+        self._stop_evt.set()
+        self._refresh_evt.set()
+        proc = self._apt_proc
+        if proc and proc.poll() is None:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
         with self._lock:
             self._cached_result = {"pending": 0, "status": "Unknown", "message": "Servicio parado"}
+            self._packages = []
+            self._progress = {"running": False, "stage": "", "percent": 0.0, "message": ""}
         logger.info("[UpdateMonitor] Detenido")
 
     def is_running(self) -> bool:
@@ -92,10 +132,11 @@ class UpdateMonitor:
 
     def check_updates(self, force=False) -> Dict:
         """
-        Verifica actualizaciones pendientes del sistema con un mecanismo de caché.
+        Devuelve el estado de actualizaciones cacheado sin bloquear.
 
         Args:
-            force (bool): Si True, ignora la caché y los intervalos de actualización, ejecutando 'apt update' inmediatamente.
+            force (bool): Si True, pide además un refresco inmediato en segundo plano
+                          ('apt update' + inventario); el resultado llegará al caché.
 
         Returns:
             Dict: Un diccionario con el número de paquetes actualizables, el estado de la actualización y un mensaje descriptivo.
@@ -106,40 +147,119 @@ class UpdateMonitor:
         if not self._running:
             logger.warning("[UpdateMonitor] check_updates() ignorado — servicio parado")
             return {"pending": 0, "status": "Stopped", "message": "Servicio parado"}
+        if force:
+            self.refresh()
+        with self._lock:
+            return dict(self._cached_result)
+
+    def refresh(self) -> None:
+        """
+        Pide un refresco de apt en el thread del monitor. No bloquea.
+
+        El progreso pasa a 'running' en el acto, para que quien pida el refresco
+        no confunda el caché anterior con el resultado nuevo.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if not self._running:
+            return
+        with self._lock:
+            if not self._progress["running"]:
+                self._progress = {"running": True, "stage": "en cola",
+                                  "percent": 0.0, "message": "Esperando"}
+        self._refresh_evt.set()
+
+    def get_packages(self) -> List[Dict]:
+        """
+        Devuelve el inventario cacheado de paquetes actualizables.
+
+        Returns:
+            List[Dict]: name, suite, version (candidata), current (instalada) y arch.
+        """
+        with self._lock:
+            return [dict(p) for p in self._packages]
+
+    def get_progress(self) -> Dict:
+        """
+        Devuelve el progreso del refresco en curso.
+
+        Returns:
+            Dict: running (bool), stage (str), percent (0-100) y message (str).
+        """
+        with self._lock:
+            return dict(self._progress)
+
+    def is_refreshing(self) -> bool:
+        """
+        Indica si hay un refresco de apt en curso.
+
+        Returns:
+            bool: True mientras el thread ejecuta apt.
+        """
+        with self._lock:
+            return self._progress["running"]
+
+    # ── Thread de refresco ────────────────────────────────────────────────────
+
+    def _job_loop(self) -> None:
+        """
+        Espera peticiones de refresco o la caducidad del caché y ejecuta el refresco.
+
+        Returns:
+            None
+        """
+        while not self._stop_evt.is_set():
+            with self._lock:
+                due_in = self._last_check_time + self._check_interval - time.time()
+            self._refresh_evt.wait(timeout=max(due_in, 0))
+            if self._stop_evt.is_set():
+                break
+            self._refresh_evt.clear()
+            self._run_refresh()
+
+    def _set_progress(self, running: bool, stage: str = "", percent: float = 0.0,
+                      message: str = "") -> None:
+        """
+        Publica el progreso del refresco.
 
-        current_time = time.time()
+        Args:
+            running (bool): Si hay refresco en curso.
+            stage (str): Fase actual ('apt update', 'inventario').
+            percent (float): Porcentaje de la fase.
+            message (str): Texto descriptivo.
+
+        Returns:
+            None
+        """
         with self._lock:
-            cached = dict(self._cached_result)
-            last   = self._last_check_time
+            self._progress = {"running": running, "stage": stage,
+                              "percent": percent, "message": message}
 
-        # Devolver caché si no ha pasado el intervalo y no se fuerza
-        if not force and (current_time - last) < self._check_interval:
-            logger.debug("[UpdateMonitor] Devolviendo resultado en caché")
-            return cached
+    def _run_refresh(self) -> None:
+        """
+        Ejecuta 'apt-get update' con progreso y reconstruye el inventario.
 
+        Returns:
+            None
+        """
+        started = time.time()
         try:
             logger.info("[UpdateMonitor] Ejecutando búsqueda real de actualizaciones (apt update)...")
+            self._set_progress(True, "apt update", 0.0, "Actualizando índices")
+            self._apt_update()
+            if self._stop_evt.is_set():
+                return
 
-            result = subprocess.run(
-                ["sudo", "apt", "update"],
-                capture_output=True,
-                timeout=60
-            )
-            if result.returncode != 0:
-                logger.warning("[UpdateMonitor] apt update retornó código %d", result.returncode)
-
-            # Usar apt list --upgradable — más fiable que apt-get -s upgrade
-            # ya que detecta actualizaciones desde oldstable y otros casos edge.
-            # grep -vc excluye la línea de cabecera "Listando... Hecho".
-            # CalledProcessError cuando count==0 (grep -v devuelve 1) — se captura.
-            cmd = "apt list --upgradable 2>/dev/null | grep -vc '^Listando'"
-            try:
-                output = subprocess.check_output(cmd, shell=True).decode().strip()
-                count = int(output) if output else 0
-            except subprocess.CalledProcessError as e:
-                # grep -v devuelve código 1 si no hay líneas que no coincidan
-                output = e.output.decode().strip() if e.output else "0"
-                count = int(output) if output else 0
+            self._set_progress(True, "inventario", 100.0, "Leyendo paquetes actualizables")
+            packages = self._list_upgradable()
+            count = len(packages)
 
             if count > 0:
                 logger.info("[UpdateMonitor] %d paquetes pendientes de actualización", count)
@@ -153,19 +273,120 @@ class UpdateMonitor:
             }
             with self._lock:
                 self._cached_result   = new_result
-                self._last_check_time = current_time
-            return new_result
+                self._packages        = packages
+                self._last_check_time = started
 
         except subprocess.TimeoutExpired:
-            logger.error("[UpdateMonitor] check_updates: timeout ejecutando apt update (>60s)")
-            return {"pending": 0, "status": "Error", "message": "Timeout ejecutando apt update"}
+            logger.error("[UpdateMonitor] timeout ejecutando apt")
+            self._store_error("Timeout ejecutando apt update", started)
         except FileNotFoundError:
-            logger.error("[UpdateMonitor] check_updates: apt no encontrado en el sistema")
-            return {"pending": 0, "status": "Error", "message": "apt no encontrado"}
-        except ValueError as e:
-            logger.error("[UpdateMonitor] check_updates: error parseando resultado: %s", e)
-            return {"pending": 0, "status": "Error", "message": str(e)}
+            logger.error("[UpdateMonitor] apt no encontrado en el sistema")
+            self._store_error("apt no encontrado", started)
         except Exception as e:
-            logger.error("[UpdateMonitor] check_updates: error inesperado: %s", e)
-            return {"pending": 0, "status": "Error", "message": str(e)}
+            logger.error("[UpdateMonitor] error inesperado en el refresco: %s", e)
+            self._store_error(str(e), started)
+        finally:
+            self._set_progress(False)
+
+    def _store_error(self, message: str, started: float) -> None:
+        """
+        Guarda un error de refresco en el caché, conservando el inventario anterior.
 
+        Args:
+            message (str): Descripción del error.
+            started (float): Momento del intento (no se reintenta hasta el próximo intervalo).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._cached_result = {"pending": len(self._packages), "status": "Error",
+                                   "message": message}
+            self._last_check_time = started
+
+    def _apt_update(self) -> None:
+        """
+        Ejecuta 'apt-get update' leyendo su progreso por APT::Status-Fd.
+
+        Returns:
+            None
+
+        Raises:
+            subprocess.TimeoutExpired: Si tarda más de _APT_UPDATE_TIMEOUT.
+            FileNotFoundError: Si apt-get no existe.
+        """
+        proc = subprocess.Popen(
+            ["sudo", "apt-get", "-o", "APT::Status-Fd=1", "update"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=_APT_ENV,
+        )
+        self._apt_proc = proc
+        timed_out = threading.Event()
+
+        def _on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(_APT_UPDATE_TIMEOUT, _on_timeout)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                # dlstatus:<n>:<porcentaje>:<mensaje>
+                if line.startswith("dlstatus:"):
+                    parts = line.rstrip("\n").split(":", 3)
+                    if len(parts) == 4:
+                        try:
+                            percent = float(parts[2])
+                        except ValueError:
+                            percent = 0.0
+                        self._set_progress(True, "apt update", percent, parts[3])
+            proc.wait()
+        finally:
+            timer.cancel()
+            self._apt_proc = None
+        if self._stop_evt.is_set():
+            return
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(proc.args, _APT_UPDATE_TIMEOUT)
+        if proc.returncode != 0:
+            logger.warning("[UpdateMonitor] apt update retornó código %d", proc.returncode)
+
+    @staticmethod
+    def _list_upgradable() -> List[Dict]:
+        """
+        Parsea 'apt list --upgradable' en un inventario de paquetes.
+
+        Usa apt list y no apt-get -s upgrade porque detecta también
+        actualizaciones desde oldstable y otros casos edge.
+
+        Returns:
+            List[Dict]: name, suite, version, current y arch por paquete.
+
+        Raises:
+            subprocess.TimeoutExpired: Si apt tarda más de _APT_LIST_TIMEOUT.
+        """
+        result = subprocess.run(
+            ["apt", "list", "--upgradable"],
+            capture_output=True, text=True, timeout=_APT_LIST_TIMEOUT, env=_APT_ENV,
+        )
+        packages = []
+        for line in result.stdout.splitlines():
+            # nombre/suite versión arch [upgradable from: versión_actual]
+            if "/" not in line or line.startswith("Listing"):
+                continue
+            head, _, rest = line.partition(" ")
+            name, _, suite = head.partition("/")
+            fields = rest.split()
+            if len(fields) < 2:
+                continue
+            current = ""
+            if "from:" in rest:
+                current = rest.split("from:", 1)[1].strip().rstrip("]").strip()
+            packages.append({
+                "name":    name,
+                "suite":   suite,
+                "version": fields[0],
+                "arch":    fields[1],
+                "current": current,
+            })
+        packages.sort(key=lambda p: p["name"])
+        return packages
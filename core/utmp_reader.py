@@ -0,0 +1,419 @@
+"""
+Lector nativo de utmp/wtmp (registros 'struct utmp' de tamaño fijo).
+
+  - read_utmp()  → sesiones activas desde /var/run/utmp (lo que muestra `who`)
+  - WtmpReader   → registros nuevos de /var/log/wtmp desde el último offset leído
+  - LoginIndex   → reconstruye sesiones (login/logout/crash/down) como `last`
+
+Layout de glibc en Linux (384 bytes, igual en 32 y 64 bits porque ut_tv y
+ut_session son de 32 bits por compatibilidad):
+  short ut_type; pid_t ut_pid; char ut_line[32]; char ut_id[4];
+  char ut_user[32]; char ut_host[256]; struct { short, short } ut_exit;
+  int32 ut_session; struct { int32 sec, usec } ut_tv; int32 ut_addr_v6[4];
+  char __unused[20];
+"""
+import os
+import struct
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+UTMP_PATH = "/var/run/utmp"
+WTMP_PATH = "/var/log/wtmp"
+
+_UTMP = struct.Struct("=hxxi32s4s32s256shhiii4i20x")
+RECORD_SIZE = _UTMP.size
+
+RUN_LVL      = 1
+BOOT_TIME    = 2
+USER_PROCESS = 7
+DEAD_PROCESS = 8
+
+# Bloque máximo por lectura de wtmp (registros enteros)
+_READ_CHUNK = RECORD_SIZE * 1024
+
+
+def _cstr(raw: bytes) -> str:
+    """
+    Convierte un campo char[] terminado en NUL a str.
+
+    Args:
+        raw (bytes): Campo del registro.
+
+    Returns:
+        str: Texto hasta el primer NUL.
+    """
+    return raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+def parse_records(data: bytes) -> List[Dict]:
+    """
+    Decodifica registros utmp completos.
+
+    Args:
+        data (bytes): Múltiplo de RECORD_SIZE bytes (el resto se ignora).
+
+    Returns:
+        List[Dict]: type, pid, line, user, host y ts (epoch en segundos).
+    """
+    records = []
+    for offset in range(0, len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+        (ut_type, pid, line, _id, user, host,
+         _term, _exit, _session, sec, usec, *_addr) = _UTMP.unpack_from(data, offset)
+        records.append({
+            "type": ut_type,
+            "pid":  pid,
+            "line": _cstr(line),
+            "user": _cstr(user),
+            "host": _cstr(host),
+            "ts":   sec + usec / 1_000_000,
+        })
+    return records
+
+
+def read_utmp(path: str = UTMP_PATH) -> Optional[List[Dict]]:
+    """
+    Lee las sesiones de usuario activas desde utmp.
+
+    utmp es pequeño y se reescribe en sitio (los huecos se reutilizan), así
+    que se relee entero cuando cambia.
+
+    Args:
+        path (str): Ruta del fichero utmp.
+
+    Returns:
+        Optional[List[Dict]]: Sesiones con user, tty, date, time e ip (mismo
+                              formato que el parser de `who`), o None si el
+                              fichero no existe.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    sessions = []
+    for rec in parse_records(data):
+        if rec["type"] != USER_PROCESS or not rec["user"]:
+            continue
+        started = datetime.fromtimestamp(rec["ts"])
+        sessions.append({
+            "user": rec["user"],
+            "tty":  rec["line"],
+            "date": started.strftime("%Y-%m-%d"),
+            "time": started.strftime("%H:%M"),
+            "ip":   rec["host"],
+        })
+    return sessions
+
+
+class WtmpReader:
+    """
+    Lee wtmp de forma incremental: solo decodifica los registros añadidos.
+
+    Recuerda el offset y el inodo; si el fichero rota (inodo nuevo) o se
+    trunca, vuelve a empezar desde el principio del fichero actual.
+
+    Args:
+        path (str): Ruta del fichero wtmp.
+    """
+
+    def __init__(self, path: str = WTMP_PATH):
+        """
+        Inicializa el lector en el offset 0.
+
+        Args:
+            path (str): Ruta del fichero wtmp.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._path   = path
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    @property
+    def path(self) -> str:
+        """
+        Ruta del fichero leído.
+
+        Returns:
+            str: Ruta de wtmp.
+        """
+        return self._path
+
+    def exists(self) -> bool:
+        """
+        Indica si el fichero existe y se puede leer.
+
+        Returns:
+            bool: True si es legible.
+        """
+        return os.access(self._path, os.R_OK)
+
+    def read_new(self) -> List[Dict]:
+        """
+        Devuelve los registros añadidos desde la última llamada.
+
+        Returns:
+            List[Dict]: Registros decodificados (ver parse_records).
+        """
+        try:
+            with open(self._path, "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_ino != self._inode or st.st_size < self._offset:
+                    if self._inode is not None:
+                        logger.debug("[WtmpReader] %s rotado o truncado, releyendo", self._path)
+                    self._inode  = st.st_ino
+                    self._offset = 0
+                f.seek(self._offset)
+                records = []
+                while True:
+                    # Solo registros completos: uno a medio escribir se lee la próxima vez
+                    available = (st.st_size - self._offset) // RECORD_SIZE * RECORD_SIZE
+                    if available <= 0:
+                        break
+                    data = f.read(min(available, _READ_CHUNK))
+                    usable = len(data) // RECORD_SIZE * RECORD_SIZE
+                    if usable == 0:
+                        break
+                    records.extend(parse_records(data[:usable]))
+                    self._offset += usable
+                    f.seek(self._offset)
+                return records
+        except OSError as e:
+            logger.debug("[WtmpReader] No se pudo leer %s: %s", self._path, e)
+            return []
+
+
+def _fmt_duration(seconds: float) -> str:
+    """
+    Duración en el formato de `last`: (HH:MM) o (D+HH:MM).
+
+    Args:
+        seconds (float): Duración en segundos.
+
+    Returns:
+        str: Duración formateada.
+    """
+    minutes = max(0, int(seconds // 60))
+    days, minutes = divmod(minutes, 1440)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}+{hours:02d}:{minutes:02d}"
+    return f"{hours:02d}:{minutes:02d}"
+
+
+class LoginIndex:
+    """
+    Índice de sesiones reconstruido a partir de registros de wtmp.
+
+    Empareja cada USER_PROCESS con su DEAD_PROCESS por terminal, y cierra
+    las sesiones abiertas como 'down' (apagado) o 'crash' (arranque sin
+    apagado previo), igual que `last`.
+
+    Args:
+        maxlen (int): Sesiones máximas conservadas (las más antiguas se descartan).
+    """
+
+    def __init__(self, maxlen: int = 5000):
+        """
+        Inicializa el índice vacío.
+
+        Args:
+            maxlen (int): Sesiones máximas conservadas.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._sessions: deque = deque(maxlen=maxlen)
+        self._open: Dict[str, Dict] = {}
+
+    def __len__(self) -> int:
+        """
+        Número de sesiones indexadas.
+
+        Returns:
+            int: Sesiones en el índice.
+        """
+        return len(self._sessions)
+
+    def clear(self) -> None:
+        """
+        Vacía el índice.
+
+        Returns:
+            None
+        """
+        self._sessions.clear()
+        self._open.clear()
+
+    def feed(self, records: List[Dict]) -> bool:
+        """
+        Incorpora registros nuevos de wtmp al índice.
+
+        Args:
+            records (List[Dict]): Registros de WtmpReader.read_new().
+
+        Returns:
+            bool: True si alguna sesión se abrió o se cerró.
+        """
+        changed = False
+        for rec in records:
+            rtype = rec["type"]
+            if rtype == USER_PROCESS and rec["user"]:
+                previous = self._open.pop(rec["line"], None)
+                if previous is not None:
+                    self._close(previous, rec["ts"], "gone")
+                session = {
+                    "user":   rec["user"],
+                    "tty":    rec["line"],
+                    "ip":     rec["host"],
+                    "login":  rec["ts"],
+                    "logout": None,
+                    "end":    "",
+                }
+                self._sessions.append(session)
+                self._open[rec["line"]] = session
+                changed = True
+            elif rtype == DEAD_PROCESS:
+                session = self._open.pop(rec["line"], None)
+                if session is not None:
+                    self._close(session, rec["ts"], "logout")
+                    changed = True
+            elif rtype == RUN_LVL and rec["user"] == "shutdown":
+                changed |= self._close_all(rec["ts"], "down")
+            elif rtype == BOOT_TIME:
+                changed |= self._close_all(rec["ts"], "crash")
+        return changed
+
+    def recent(self, limit: int) -> List[Dict]:
+        """
+        Sesiones más recientes primero, en el formato del historial de SSHMonitor.
+
+        Args:
+            limit (int): Número máximo de entradas.
+
+        Returns:
+            List[Dict]: user, tty, ip, time_info, login_ts y logout_ts.
+        """
+        entries = []
+        for session in reversed(self._sessions):
+            if len(entries) >= limit:
+                break
+            entries.append(self._entry(session))
+        return entries
+
+    def search(self, user: Optional[str] = None, ip: Optional[str] = None,
+               since: Optional[float] = None, until: Optional[float] = None,
+               limit: int = 500) -> List[Dict]:
+        """
+        Busca sesiones por usuario, IP de origen y rango de login.
+
+        Args:
+            user (str, opcional): Usuario exacto.
+            ip (str, opcional): Prefijo del host/IP de origen.
+            since (float, opcional): Login a partir de este epoch.
+            until (float, opcional): Login anterior a este epoch.
+            limit (int): Número máximo de resultados.
+
+        Returns:
+            List[Dict]: Entradas como en recent(), más recientes primero.
+        """
+        results = []
+        for session in reversed(self._sessions):
+            if until is not None and session["login"] >= until:
+                continue
+            if since is not None and session["login"] < since:
+                break
+            if user and session["user"] != user:
+                continue
+            if ip and not session["ip"].startswith(ip):
+                continue
+            results.append(self._entry(session))
+            if len(results) >= limit:
+                break
+        return results
+
+    # ── Internos ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _close(session: Dict, ts: float, end: str) -> None:
+        """
+        Marca una sesión como cerrada.
+
+        Args:
+            session (Dict): Sesión abierta.
+            ts (float): Momento del cierre.
+            end (str): 'logout', 'down', 'crash' o 'gone'.
+
+        Returns:
+            None
+        """
+        session["logout"] = ts
+        session["end"]    = end
+
+    def _close_all(self, ts: float, end: str) -> bool:
+        """
+        Cierra todas las sesiones abiertas (apagado o arranque).
+
+        Args:
+            ts (float): Momento del cierre.
+            end (str): 'down' o 'crash'.
+
+        Returns:
+            bool: True si había sesiones abiertas.
+        """
+        if not self._open:
+            return False
+        for session in self._open.values():
+            self._close(session, ts, end)
+        self._open.clear()
+        return True
+
+    @staticmethod
+    def _entry(session: Dict) -> Dict:
+        """
+        Convierte una sesión en una entrada de historial con time_info al estilo `last`.
+
+        El inicio lleva siempre la fecha ('YYYY-MM-DD HH:MM'); el fin solo si
+        cae en otro día.
+
+        Args:
+            session (Dict): Sesión del índice.
+
+        Returns:
+            Dict: user, tty, ip, time_info, login_ts y logout_ts.
+        """
+        login = datetime.fromtimestamp(session["login"])
+        start = login.strftime("%Y-%m-%d %H:%M")
+        logout = session["logout"]
+        if logout is None:
+            time_info = f"{start}   still logged in"
+        else:
+            duration = _fmt_duration(logout - session["login"])
+            if session["end"] == "logout":
+                out = datetime.fromtimestamp(logout)
+                # Fecha también en el fin si la sesión cruza la medianoche
+                end = out.strftime("%H:%M" if out.date() == login.date() else "%Y-%m-%d %H:%M")
+                time_info = f"{start} - {end}  ({duration})"
+            elif session["end"] == "gone":
+                time_info = f"{start} - gone - no logout"
+            else:
+                time_info = f"{start} - {session['end']}  ({duration})"
+        return {
+            "user":      session["user"],
+            "tty":       session["tty"],
+            "ip":        session["ip"],
+            "time_info": time_info,
+            "login_ts":  session["login"],
+            "logout_ts": logout,
+        }
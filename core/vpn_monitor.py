@@ -2,12 +2,25 @@
 Monitor de estado de VPN dual (OpenVPN + WireGuard).
 
 Monitoriza simultáneamente las interfaces tun0 (OpenVPN) y wg0 (WireGuard).
-Sin dependencias nuevas — usa subprocess con comandos estándar.
+Sin dependencias nuevas: el estado del enlace se lee de /sys/class/net/<iface>
+(flags, operstate, carrier) y la IPv4 con un ioctl SIOCGIFADDR, sin forkear.
+
+Un socket RTNETLINK suscrito a los grupos de enlace y direcciones IPv4 despierta
+el thread en cuanto cambia una interfaz, así una VPN que sube o cae se publica
+en milisegundos. El sondeo periódico queda como red de seguridad.
+Publica 'vpn.state_changed' en el EventBus cuando alguna VPN cambia de estado o IP.
 """
+import fcntl
+import os
+import select
+import socket
+import struct
 import subprocess
 import threading
 import time
 from typing import Optional
+from core.event_bus import get_event_bus
+from core.events import VPN_STATE_CHANGED
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -18,8 +31,20 @@ VPN_INTERFACES = {
     "wireguard": "wg0",
 }
 
-# Intervalo de sondeo (segundos)
+# Intervalo de sondeo sin eventos netlink (segundos)
 CHECK_INTERVAL = 10
+# Con eventos netlink el sondeo solo es red de seguridad
+SAFETY_INTERVAL = 60
+
+_SYS_NET = "/sys/class/net"
+_IFF_UP = 0x1
+_SIOCGIFADDR = 0x8915
+
+_NETLINK_ROUTE      = 0
+_RTMGRP_LINK        = 0x1
+_RTMGRP_IPV4_IFADDR = 0x10
+# Trozo máximo de espera en select() para atender stop() a tiempo
+_SELECT_SLICE = 1.0
 
 
 class VpnMonitor:
@@ -65,8 +90,8 @@ class VpnMonitor:
             target=self._loop, daemon=True, name="VpnMonitor"
         )
         self._thread.start()
-        logger.info("[VpnMonitor] Sondeo iniciado (cada %ds) — interfaces: %s",
-                    CHECK_INTERVAL, list(VPN_INTERFACES.values()))
+        logger.info("[VpnMonitor] Servicio iniciado — interfaces: %s",
+                    list(VPN_INTERFACES.values()))
 
     def stop(self) -> None:
         """
@@ -83,6 +108,7 @@ class VpnMonitor:
             for key in self._state:
                 self._state[key]["connected"] = False
                 self._state[key]["ip"]        = ""
+        self._publish_state(list(VPN_INTERFACES))
         logger.info("[VpnMonitor] Servicio detenido")
 
     def is_running(self) -> bool:
@@ -100,19 +126,85 @@ class VpnMonitor:
         """
         Bucle principal del thread de sondeo.
 
-        Sondea ambas interfaces en cada iteración.
+        Con RTNETLINK espera eventos de enlace/dirección y sondea al recibirlos;
+        además sondea cada SAFETY_INTERVAL. Sin netlink sondea cada CHECK_INTERVAL.
 
         Returns:
             None
         """
-        while self._running:
+        sock = self._open_netlink()
+        interval = SAFETY_INTERVAL if sock else CHECK_INTERVAL
+        next_poll = 0.0
+        try:
+            while self._running and not self._stop_evt.is_set():
+                now = time.monotonic()
+                if now >= next_poll:
+                    try:
+                        self._poll()
+                    except Exception as e:
+                        logger.error("[VpnMonitor] Error en _loop: %s", e)
+                    next_poll = now + interval
+                    continue
+                timeout = next_poll - now
+                if sock is None:
+                    self._stop_evt.wait(timeout=timeout)
+                    continue
+                try:
+                    readable, _, _ = select.select([sock], [], [], min(timeout, _SELECT_SLICE))
+                except (OSError, ValueError):
+                    readable = []
+                if readable and self._drain_netlink(sock):
+                    # Sondeo inmediato; el siguiente de seguridad se reprograma
+                    next_poll = 0.0
+        finally:
+            if sock is not None:
+                sock.close()
+
+    @staticmethod
+    def _open_netlink() -> Optional[socket.socket]:
+        """
+        Abre un socket RTNETLINK suscrito a cambios de enlace y de direcciones IPv4.
+
+        Returns:
+            Optional[socket.socket]: Socket no bloqueante, o None si no está disponible.
+        """
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_ROUTE)
+            sock.bind((0, _RTMGRP_LINK | _RTMGRP_IPV4_IFADDR))
+            sock.setblocking(False)
+            logger.debug("[VpnMonitor] Escuchando eventos RTNETLINK")
+            return sock
+        except (OSError, AttributeError) as e:
+            logger.info("[VpnMonitor] RTNETLINK no disponible (%s), sondeo cada %ds",
+                        e, CHECK_INTERVAL)
+            return None
+
+    @staticmethod
+    def _drain_netlink(sock: socket.socket) -> bool:
+        """
+        Vacía los mensajes pendientes del socket RTNETLINK.
+
+        No se parsean: con solo dos interfaces releer su estado en sysfs es
+        más barato que filtrar cada mensaje.
+
+        Args:
+            sock (socket.socket): Socket RTNETLINK.
+
+        Returns:
+            bool: True si se recibió al menos un mensaje.
+        """
+        received = False
+        while True:
             try:
-                self._poll()
-            except Exception as e:
-                logger.error("[VpnMonitor] Error en _loop: %s", e)
-            self._stop_evt.wait(timeout=CHECK_INTERVAL)
-            if self._stop_evt.is_set():
+                if not sock.recv(65536):
+                    break
+                received = True
+            except BlockingIOError:
                 break
+            except OSError:
+                # ENOBUFS: se perdieron eventos, sondear igualmente
+                return True
+        return received
 
     def _poll(self) -> None:
         """
@@ -130,12 +222,115 @@ class VpnMonitor:
                 "interface": iface,
             }
         with self._lock:
+            old_state   = self._state
             self._state = new_state
+        changed = [key for key, vpn in new_state.items() if old_state.get(key) != vpn]
+        if changed:
+            self._publish_state(changed)
+
+    def _publish_state(self, changed: list) -> None:
+        """
+        Publica 'vpn.state_changed' con una copia del estado actual.
+
+        Args:
+            changed (list): Claves de VPN cuyo estado ha cambiado.
+
+        Returns:
+            None
+        """
+        get_event_bus().publish(VPN_STATE_CHANGED, {
+            "state":   self.get_status(),
+            "changed": changed,
+            "offline": self.get_offline_count(),
+        })
 
     def _check_interface(self, iface: str) -> tuple[bool, str]:
         """
         Comprueba si una interfaz de red está activa y obtiene su IPv4.
 
+        Lee el estado de sysfs y la IP por ioctl; si /sys/class/net no existe
+        recurre a `ip addr`.
+
+        Args:
+            iface (str): Nombre de la interfaz de red a comprobar.
+
+        Returns:
+            tuple[bool, str]: (conectada, ip). ip vacío si no hay IP asignada.
+        """
+        if not os.path.isdir(_SYS_NET):
+            return self._check_interface_ip(iface)
+        if not self._link_up(iface):
+            return False, ""
+        ip = self._read_ipv4(iface)
+        return bool(ip), ip
+
+    @staticmethod
+    def _read_sysfs(iface: str, name: str) -> str:
+        """
+        Lee un atributo de /sys/class/net/<iface>.
+
+        Args:
+            iface (str): Nombre de la interfaz.
+            name (str): Atributo ('flags', 'operstate', 'carrier').
+
+        Returns:
+            str: Contenido, o cadena vacía si no existe o no es legible
+                 (carrier da EINVAL con la interfaz bajada).
+        """
+        try:
+            with open(os.path.join(_SYS_NET, iface, name), "r") as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def _link_up(self, iface: str) -> bool:
+        """
+        Indica si el enlace de la interfaz está levantado según sysfs.
+
+        tun y wg no tienen detección de portadora: su operstate es 'unknown'
+        estando activos, así que cuentan IFF_UP y carrier.
+
+        Args:
+            iface (str): Nombre de la interfaz.
+
+        Returns:
+            bool: True si existe, está UP, con carrier y operstate no 'down'.
+        """
+        flags = self._read_sysfs(iface, "flags")
+        if not flags:
+            return False
+        try:
+            if not int(flags, 16) & _IFF_UP:
+                return False
+        except ValueError:
+            return False
+        if self._read_sysfs(iface, "operstate") in ("down", "lowerlayerdown", "notpresent"):
+            return False
+        return self._read_sysfs(iface, "carrier") == "1"
+
+    @staticmethod
+    def _read_ipv4(iface: str) -> str:
+        """
+        Obtiene la IPv4 principal de una interfaz con ioctl(SIOCGIFADDR).
+
+        Args:
+            iface (str): Nombre de la interfaz.
+
+        Returns:
+            str: IP, o cadena vacía si no tiene IPv4.
+        """
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                ifreq = struct.pack("256s", iface[:15].encode())
+                res = fcntl.ioctl(s.fileno(), _SIOCGIFADDR, ifreq)
+            return socket.inet_ntoa(res[20:24])
+        except OSError:
+            return ""
+
+    def _check_interface_ip(self, iface: str) -> tuple[bool, str]:
+        """
+        Fallback: comprueba la interfaz con `ip addr show`.
+
         Args:
             iface (str): Nombre de la interfaz de red a comprobar.
 
@@ -6,6 +6,13 @@ Flujo:
   2. Thread daemon hace fetch cada INTERVAL_MINUTES y bajo demanda (fetch_now)
   3. get_stats() devuelve caché — nunca bloquea la UI
 
+Caché en disco (data/weather_cache.json):
+  - Respuestas crudas por (endpoint, lat, lon) y geocoding por nombre, con TTL
+  - Stale-while-revalidate: lo cacheado se publica al instante (arranque,
+    cambio de ciudad) y, si ha caducado, se revalida en segundo plano
+  - Forecast y calidad del aire se piden en paralelo
+  - Los favoritos se precalientan en background para cambiar de ciudad sin esperas
+
 Favoritos:
   - add_favorite(city)    → añade ciudad a la lista (respeta max_favorites)
   - remove_favorite(city) → elimina ciudad de la lista
@@ -17,14 +24,17 @@ Arquitectura:
   - core/ — cero imports tkinter/ctk
   - get_stats() acquire(blocking=False) — nunca bloquea
 """
+import json
+import os
 import threading
 import time
-import json
-from typing import Optional, List
-import urllib.request
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime, date
 from config.local_settings_io import update_params, read
+from config.settings import DATA_DIR
+from utils.http_client import HttpClient
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -36,6 +46,15 @@ GEOCODING_URL     = "https://geocoding-api.open-meteo.com/v1/search"
 WEATHER_URL       = "https://api.open-meteo.com/v1/forecast"
 AIR_QUALITY_URL   = "https://air-quality-api.open-meteo.com/v1/air-quality"
 DEFAULT_MAX_FAVORITES = 5
+REQUEST_TIMEOUT   = 10
+AQ_TIMEOUT        = 8
+REQUEST_RETRIES   = 2
+
+CACHE_FILE        = DATA_DIR / "weather_cache.json"
+FORECAST_TTL_S    = INTERVAL_MINUTES * 60 - 60   # el ciclo horario siempre revalida
+AQ_TTL_S          = FORECAST_TTL_S
+GEOCODE_TTL_S     = 30 * 86400
+CACHE_MAX_STALE_S = 7 * 86400   # respuestas más viejas ni se muestran ni se guardan
 
 # Códigos WMO → descripción + icono emoji
 _WMO_CODES = {
@@ -80,6 +99,116 @@ def _wmo_label(code: int) -> tuple:
     return _WMO_CODES.get(code, ("Desconocido", "❓"))
 
 
+class _ResponseCache:
+    """
+    Caché persistente de respuestas JSON crudas de Open-Meteo.
+
+    Cada entrada guarda el momento de la descarga; get() devuelve también la
+    edad para que el llamador decida si la sirve tal cual o la revalida.
+
+    Args:
+        path (Path): Fichero JSON del caché.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Carga el caché desde disco, descartando entradas demasiado viejas.
+
+        Args:
+            path (Path): Fichero JSON del caché.
+
+        Returns:
+            None
+        """
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        # Serializa save(): un solo .tmp y el último en escribir lleva la foto más nueva
+        self._save_lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+        try:
+            with open(self._path, "r") as f:
+                data = json.load(f)
+            now = time.time()
+            self._entries = {
+                k: v for k, v in data.items()
+                if isinstance(v, dict) and now - v.get("ts", 0) < CACHE_MAX_STALE_S
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("[WeatherService] Caché ilegible: %s", e)
+
+    @staticmethod
+    def key(endpoint: str, lat: float, lon: float) -> str:
+        """Clave del caché para un endpoint y unas coordenadas."""
+        return f"{endpoint}|{float(lat):.4f}|{float(lon):.4f}"
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Devuelve una respuesta cacheada y su edad.
+
+        Args:
+            key (str): Clave del caché.
+
+        Returns:
+            Optional[Tuple[Any, float]]: (respuesta, segundos desde la descarga), o None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = max(0.0, time.time() - entry["ts"])
+        if age >= CACHE_MAX_STALE_S:
+            return None
+        return entry["data"], age
+
+    def put(self, key: str, data: Any) -> None:
+        """
+        Guarda una respuesta recién descargada.
+
+        Args:
+            key (str): Clave del caché.
+            data (Any): Respuesta JSON decodificada.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries[key] = {"ts": time.time(), "data": data}
+            self._dirty = True
+
+    def save(self) -> None:
+        """
+        Persiste el caché de forma atómica si hubo cambios.
+
+        Varios threads (descarga, favoritos, geocoding) pueden guardar a la vez:
+        la escritura va bajo _save_lock y la foto se toma ya dentro de él, así
+        no se pisan el .tmp ni se deja en disco una versión anterior.
+
+        Returns:
+            None
+        """
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                now = time.time()
+                data = {k: v for k, v in self._entries.items()
+                        if now - v["ts"] < CACHE_MAX_STALE_S}
+                self._dirty = False
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = str(self._path) + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp, str(self._path))
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                logger.error("[WeatherService] Error guardando caché: %s", e)
+
+
 class WeatherService:
     """
     Servicio meteorológico thread-safe con cache y actualización periódica.
@@ -112,6 +241,7 @@ class WeatherService:
         Raises:
             Ninguno
         """
+        self._http        = HttpClient(timeout=REQUEST_TIMEOUT, retries=REQUEST_RETRIES)
         self._lock        = threading.Lock()
         self._stop_evt    = threading.Event()
         self._thread: Optional[threading.Thread] = None
@@ -124,6 +254,12 @@ class WeatherService:
         self._stats       = {}
         self._error       = ""
         self._last_update = None
+        self._version     = 0   # aumenta con cada publicación de stats
+
+        # Caché de respuestas en disco y revalidaciones en curso por ubicación
+        self._cache       = _ResponseCache(CACHE_FILE)
+        self._inflight: set = set()
+        self._inflight_lock = threading.Lock()
 
         # Favoritos
         self._favorites: List[str] = []
@@ -221,7 +357,9 @@ class WeatherService:
             self._error = ""
 
         self._persist_location(result["city"], result["lat"], result["lon"])
-        self._fetch_weather()
+        # Pintar al instante desde caché; si falta o ha caducado, revalidar en background
+        if not self._publish_cached(result["city"], result["lat"], result["lon"]):
+            self.fetch_now(force=False)
         return result
 
     def get_stats(self) -> dict:
@@ -241,6 +379,15 @@ class WeatherService:
                 self._lock.release()
         return {}
 
+    def get_version(self) -> int:
+        """
+        Contador que aumenta cada vez que se publican stats nuevas (caché o red).
+
+        Returns:
+            int: Versión actual.
+        """
+        return self._version
+
     def get_city(self) -> str:
         """
         Obtiene la ciudad activa actual.
@@ -250,20 +397,21 @@ class WeatherService:
         """
         return self._city
 
-    def fetch_now(self) -> None:
+    def fetch_now(self, force: bool = True) -> None:
         """
         Fuerza la actualización inmediata de la información meteorológica en un hilo en segundo plano.
 
         No bloquea la ejecución del llamador.
 
-        Args: Ninguno
+        Args:
+            force (bool): Descargar aunque el caché siga vigente (botón Actualizar).
 
         Returns: Ninguno
 
         Raises: Ninguno
         """
         threading.Thread(
-            target=self._fetch_weather, daemon=True, name="WeatherFetch"
+            target=self._fetch_weather, args=(force,), daemon=True, name="WeatherFetch"
         ).start()
 
     # ── API pública — favoritos ───────────────────────────────────────────────
@@ -327,6 +475,8 @@ class WeatherService:
 
         self._persist_favorites(favorites_copy, self._max_favorites)
         logger.info("[WeatherService] Favorito añadido: %s", city)
+        threading.Thread(target=self._prewarm_favorites, args=([city],),
+                         daemon=True, name="WeatherPrewarm").start()
         return {"ok": True}
 
     def remove_favorite(self, city: str) -> None:
@@ -391,10 +541,30 @@ class WeatherService:
         """
         if self._lat is not None:
             self._fetch_weather()
+        self._prewarm_favorites()
 
         while not self._stop_evt.wait(timeout=INTERVAL_MINUTES * 60):
             if self._lat is not None:
                 self._fetch_weather()
+            self._prewarm_favorites()
+
+    def _prewarm_favorites(self, cities: Optional[List[str]] = None) -> None:
+        """
+        Descarga al caché los favoritos cuya previsión falta o ha caducado.
+
+        Args:
+            cities (List[str], opcional): Ciudades a precalentar; por defecto todos los favoritos.
+
+        Returns:
+            Ninguno
+        """
+        for city in (self.get_favorites() if cities is None else cities):
+            if self._stop_evt.is_set():
+                return
+            geo = self._geocode(city)
+            if not geo["ok"] or self._cache_fresh(geo["lat"], geo["lon"]):
+                continue
+            self._download(geo["lat"], geo["lon"])
 
     # ── Geocoding ─────────────────────────────────────────────────────────────
 
@@ -409,43 +579,53 @@ class WeatherService:
             dict: Diccionario con claves "ok", "city", "lat", "lon", "country" y valores correspondientes.
 
         Raises:
-            Excepciones relacionadas con urllib.request.urlopen si la solicitud falla.
+            Ninguno: los errores de conexión se devuelven con "ok": False.
         """
+        cache_key = f"geocode|{city.lower()}"
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached[1] < GEOCODE_TTL_S:
+            return dict(cached[0])
+
         try:
-            params = urllib.parse.urlencode({
+            data = self._http.request_json("GET", GEOCODING_URL, params={
                 "name":     city,
                 "count":    1,
                 "language": "es",
                 "format":   "json",
             })
-            url = f"{GEOCODING_URL}?{params}"
-            with urllib.request.urlopen(url, timeout=10) as resp:
-                data = json.loads(resp.read().decode())
 
             results = data.get("results")
             if not results:
                 return {"ok": False, "error": f"Ciudad '{city}' no encontrada"}
 
             r = results[0]
-            return {
+            result = {
                 "ok":      True,
                 "city":    f"{r['name']}, {r.get('country', '')}",
                 "lat":     r["latitude"],
                 "lon":     r["longitude"],
                 "country": r.get("country", ""),
             }
+            self._cache.put(cache_key, result)
+            self._cache.save()
+            return result
         except Exception as e:
             logger.error("[WeatherService] Geocoding error: %s", e)
             return {"ok": False, "error": f"Error de conexión: {e}"}
 
     # ── Fetch meteorológico ───────────────────────────────────────────────────
 
-    def _fetch_weather(self) -> None:
+    def _fetch_weather(self, force: bool = False) -> None:
         """
-        Consulta Open-Meteo forecast y air quality, actualizando caché de manera thread-safe.
+        Publica la previsión de la ciudad activa con stale-while-revalidate.
+
+        Primero publica lo que haya en caché; si falta o ha caducado, descarga
+        forecast y calidad del aire en paralelo y vuelve a publicar. Con force
+        no se publica el caché: la siguiente versión es ya la de la red (o el
+        error), que es la que espera el botón Actualizar.
 
         Args:
-            Ninguno
+            force (bool): Descargar aunque el caché siga vigente.
 
         Returns:
             Ninguno
@@ -461,6 +641,221 @@ class WeatherService:
         if lat is None or lon is None:
             return
 
+        if not force and self._publish_cached(city, lat, lon):
+            return
+
+        loc = (float(lat), float(lon))
+        with self._inflight_lock:
+            if loc in self._inflight:
+                return   # ya hay una revalidación de esta ubicación en curso
+            self._inflight.add(loc)
+        try:
+            data, aq_data, err = self._download(lat, lon)
+        finally:
+            with self._inflight_lock:
+                self._inflight.discard(loc)
+
+        if data is None:
+            self._set_error(f"Error de conexión: {err}", lat, lon)
+            return
+
+        if aq_data is None:
+            cached_aq = self._cache.get(_ResponseCache.key("air_quality", lat, lon))
+            aq_data = cached_aq[0] if cached_aq else None
+        try:
+            stats = self._build_stats(city, lat, lon, data, aq_data, time.time())
+        except Exception as e:
+            logger.error("[WeatherService] Respuesta de previsión inválida: %s", e)
+            self._set_error("Respuesta de previsión inválida", lat, lon)
+            return
+        if self._set_stats(stats, lat, lon):
+            logger.info("[WeatherService] Actualizado: %s %.1f°C %s",
+                        city, stats["temp"], stats["weather_desc"])
+
+    def _forecast_params(self, lat: float, lon: float) -> Dict:
+        """
+        Parámetros de la petición de previsión de Open-Meteo.
+
+        Args:
+            lat (float): Latitud.
+            lon (float): Longitud.
+
+        Returns:
+            Dict: Query string de /v1/forecast.
+        """
+        return {
+            "latitude":  lat,
+            "longitude": lon,
+            "current":   ",".join([
+                "temperature_2m",
+                "apparent_temperature",
+                "relative_humidity_2m",
+                "wind_speed_10m",
+                "wind_direction_10m",
+                "precipitation",
+                "weather_code",
+                "uv_index",
+            ]),
+            "hourly":    ",".join([
+                "temperature_2m",
+                "precipitation_probability",
+                "weather_code",
+            ]),
+            "daily":     ",".join([
+                "weather_code",
+                "temperature_2m_max",
+                "temperature_2m_min",
+                "precipitation_probability_max",
+                "sunrise",
+                "sunset",
+            ]),
+            "forecast_days":   14,
+            "timezone":        "auto",
+            "wind_speed_unit": "kmh",
+        }
+
+    def _download(self, lat: float, lon: float) -> Tuple[Optional[Dict], Optional[Dict], str]:
+        """
+        Descarga en paralelo la previsión y la calidad del aire y las guarda en caché.
+
+        Args:
+            lat (float): Latitud.
+            lon (float): Longitud.
+
+        Returns:
+            Tuple[Optional[Dict], Optional[Dict], str]: (forecast, air_quality, error);
+            None en la respuesta que falle y el error de la previsión ("" si no falló).
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="WeatherFetch") as pool:
+            forecast_fut = pool.submit(
+                self._http.request_json, "GET", WEATHER_URL,
+                params=self._forecast_params(lat, lon))
+            aq_fut = pool.submit(
+                self._http.request_json, "GET", AIR_QUALITY_URL, params={
+                    "latitude":  lat,
+                    "longitude": lon,
+                    "current":   "pm2_5,pm10,european_aqi",
+                    "timezone":  "auto",
+                }, timeout=AQ_TIMEOUT)
+
+            err = ""
+            try:
+                data = forecast_fut.result()
+            except Exception as e:
+                logger.error("[WeatherService] Fetch error: %s", e)
+                data, err = None, str(e)
+            try:
+                aq_data = aq_fut.result()
+            except Exception as aq_err:
+                logger.debug("[WeatherService] AQI no disponible: %s", aq_err)
+                aq_data = None
+
+        if data is not None:
+            self._cache.put(_ResponseCache.key("forecast", lat, lon), data)
+        if aq_data is not None:
+            self._cache.put(_ResponseCache.key("air_quality", lat, lon), aq_data)
+        self._cache.save()
+        return data, aq_data, err
+
+    def _cache_fresh(self, lat: float, lon: float) -> bool:
+        """
+        Indica si forecast y calidad del aire de una ubicación siguen dentro de su TTL.
+
+        Args:
+            lat (float): Latitud.
+            lon (float): Longitud.
+
+        Returns:
+            bool: True si ninguna de las dos respuestas necesita revalidarse.
+        """
+        forecast = self._cache.get(_ResponseCache.key("forecast", lat, lon))
+        aq = self._cache.get(_ResponseCache.key("air_quality", lat, lon))
+        return (forecast is not None and forecast[1] < FORECAST_TTL_S
+                and aq is not None and aq[1] < AQ_TTL_S)
+
+    def _publish_cached(self, city: str, lat: float, lon: float) -> bool:
+        """
+        Publica la previsión cacheada de una ubicación, aunque haya caducado.
+
+        Args:
+            city (str): Nombre de la ciudad.
+            lat (float): Latitud.
+            lon (float): Longitud.
+
+        Returns:
+            bool: True si el caché estaba vigente (no hace falta revalidar).
+        """
+        forecast = self._cache.get(_ResponseCache.key("forecast", lat, lon))
+        if forecast is None:
+            return False
+        data, age = forecast
+        aq = self._cache.get(_ResponseCache.key("air_quality", lat, lon))
+        try:
+            stats = self._build_stats(city, lat, lon, data, aq[0] if aq else None,
+                                      time.time() - age)
+        except Exception as e:
+            logger.warning("[WeatherService] Entrada de caché inválida: %s", e)
+            return False
+        self._set_stats(stats, lat, lon)
+        return self._cache_fresh(lat, lon)
+
+    def _set_stats(self, stats: Dict, lat: float, lon: float) -> bool:
+        """
+        Publica unas stats si siguen correspondiendo a la ubicación activa.
+
+        Args:
+            stats (Dict): Stats construidas por _build_stats().
+            lat (float): Latitud para la que se construyeron.
+            lon (float): Longitud para la que se construyeron.
+
+        Returns:
+            bool: True si se publicaron (la ciudad no cambió entretanto).
+        """
+        with self._lock:
+            if (self._lat, self._lon) != (lat, lon):
+                return False
+            self._stats = stats
+            self._last_update = stats["last_update"]
+            self._error = ""
+            self._version += 1
+        return True
+
+    def _set_error(self, error: str, lat: float, lon: float) -> bool:
+        """
+        Publica un error de descarga si sigue correspondiendo a la ubicación activa.
+
+        Args:
+            error (str): Mensaje de error.
+            lat (float): Latitud cuya descarga falló.
+            lon (float): Longitud cuya descarga falló.
+
+        Returns:
+            bool: True si se publicó (la ciudad no cambió entretanto).
+        """
+        with self._lock:
+            if (self._lat, self._lon) != (lat, lon):
+                return False
+            self._error = error
+            self._stats = {**self._stats, "error": error}
+            self._version += 1
+        return True
+
+    def _build_stats(self, city: str, lat: float, lon: float, data: Dict,
+                     aq_data: Optional[Dict], fetched_ts: float) -> Dict:
+        """
+        Construye el dict de get_stats() a partir de las respuestas crudas.
+
+        Args:
+            city (str): Nombre de la ciudad.
+            lat (float): Latitud.
+            lon (float): Longitud.
+            data (Dict): Respuesta de /v1/forecast.
+            aq_data (Optional[Dict]): Respuesta de calidad del aire, o None.
+            fetched_ts (float): Momento (epoch) de la descarga de la previsión.
+
+        Returns:
+            Dict: Métricas actuales, previsión horaria y diaria y calidad del aire.
+        """
         def _hhmm(val: str) -> str:
             """
             Extrae HH:MM de timestamp ISO (privado, helper para sunrise/sunset).
@@ -476,176 +871,112 @@ class WeatherService:
             except Exception:
                 return "--"
 
-        try:
-            params = urllib.parse.urlencode({
-                "latitude":  lat,
-                "longitude": lon,
-                "current":   ",".join([
-                    "temperature_2m",
-                    "apparent_temperature",
-                    "relative_humidity_2m",
-                    "wind_speed_10m",
-                    "wind_direction_10m",
-                    "precipitation",
-                    "weather_code",
-                    "uv_index",
-                ]),
-                "hourly":    ",".join([
-                    "temperature_2m",
-                    "precipitation_probability",
-                    "weather_code",
-                ]),
-                "daily":     ",".join([
-                    "weather_code",
-                    "temperature_2m_max",
-                    "temperature_2m_min",
-                    "precipitation_probability_max",
-                    "sunrise",
-                    "sunset",
-                ]),
-                "forecast_days":   14,
-                "timezone":        "auto",
-                "wind_speed_unit": "kmh",
-            })
-            url = f"{WEATHER_URL}?{params}"
-
-            with urllib.request.urlopen(url, timeout=10) as resp:
-                data = json.loads(resp.read().decode())
+        cur  = data.get("current", {})
+        code = cur.get("weather_code", 0)
+        desc, icon = _wmo_label(code)
 
-            cur  = data.get("current", {})
-            code = cur.get("weather_code", 0)
-            desc, icon = _wmo_label(code)
+        # Previsión horaria próximas 12h
+        hourly   = data.get("hourly", {})
+        h_times  = hourly.get("time", [])
+        h_temps  = hourly.get("temperature_2m", [])
+        h_precip = hourly.get("precipitation_probability", [])
+        h_codes  = hourly.get("weather_code", [])
 
-            # Previsión horaria próximas 12h
-            hourly   = data.get("hourly", {})
-            h_times  = hourly.get("time", [])
-            h_temps  = hourly.get("temperature_2m", [])
-            h_precip = hourly.get("precipitation_probability", [])
-            h_codes  = hourly.get("weather_code", [])
+        now_str = datetime.now().strftime("%Y-%m-%dT%H:00")
+        try:
+            start_idx = h_times.index(now_str)
+        except ValueError:
+            start_idx = 0
+
+        forecast = []
+        for i in range(start_idx, min(start_idx + 12, len(h_times))):
+            h_code = h_codes[i] if i < len(h_codes) else 0
+            _, h_icon = _wmo_label(h_code)
+            forecast.append({
+                "hour":         h_times[i][11:16],
+                "temp":         h_temps[i] if i < len(h_temps) else "--",
+                "precip_prob":  h_precip[i] if i < len(h_precip) else 0,
+                "weather_code": h_code,
+                "weather_icon": h_icon,
+            })
 
-            now_str = datetime.now().strftime("%Y-%m-%dT%H:00")
-            try:
-                start_idx = h_times.index(now_str)
-            except ValueError:
-                start_idx = 0
-
-            forecast = []
-            for i in range(start_idx, min(start_idx + 12, len(h_times))):
-                h_code = h_codes[i] if i < len(h_codes) else 0
-                _, h_icon = _wmo_label(h_code)
-                forecast.append({
-                    "hour":         h_times[i][11:16],
-                    "temp":         h_temps[i] if i < len(h_temps) else "--",
-                    "precip_prob":  h_precip[i] if i < len(h_precip) else 0,
-                    "weather_code": h_code,
-                    "weather_icon": h_icon,
-                })
-
-            # Hourly agrupado por fecha
-            hourly_by_date = {}
-            for i, t in enumerate(h_times):
-                date_key = t[:10]
-                h_code = h_codes[i] if i < len(h_codes) else 0
-                _, h_icon = _wmo_label(h_code)
-                hourly_by_date.setdefault(date_key, []).append({
-                    "hour":         t[11:16],
-                    "temp":         h_temps[i] if i < len(h_temps) else "--",
-                    "precip_prob":  h_precip[i] if i < len(h_precip) else 0,
-                    "weather_code": h_code,
-                    "weather_icon": h_icon,
-                })
-
-            # Daily 14 días
-            daily = data.get("daily", {})
-            d_times = daily.get("time", [])
-            d_codes = daily.get("weather_code", [])
-            d_max = daily.get("temperature_2m_max", [])
-            d_min = daily.get("temperature_2m_min", [])
-            d_precip = daily.get("precipitation_probability_max", [])
-            d_sunrise = daily.get("sunrise", [])
-            d_sunset = daily.get("sunset", [])
-
-            _DAY_NAMES = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
-            forecast_daily = []
-            for i in range(min(14, len(d_times))):
-                d_code = d_codes[i] if i < len(d_codes) else 0
-                _, d_icon = _wmo_label(d_code)
-                try:
-                    d = date.fromisoformat(d_times[i])
-                    label = "Hoy" if i == 0 else _DAY_NAMES[d.weekday()]
-                    date_str = d.strftime("%d/%m")
-                except:
-                    label = d_times[i]
-                    date_str = ""
-                forecast_daily.append({
-                    "label":        label,
-                    "date":         date_str,
-                    "date_iso":     d_times[i],
-                    "temp_max":     d_max[i] if i < len(d_max) else "--",
-                    "temp_min":     d_min[i] if i < len(d_min) else "--",
-                    "precip_prob":  d_precip[i] if i < len(d_precip) else 0,
-                    "sunrise":      _hhmm(d_sunrise[i]) if i < len(d_sunrise) else "--",
-                    "sunset":       _hhmm(d_sunset[i]) if i < len(d_sunset) else "--",
-                    "weather_code": d_code,
-                    "weather_icon": d_icon,
-                })
-
-            stats = {
-                "city":         city,
-                "lat":          lat,
-                "lon":          lon,
-                "error":        "",
-                "last_update":  datetime.now().strftime("%H:%M"),
-                "temp":         cur.get("temperature_2m", "--"),
-                "feels_like":   cur.get("apparent_temperature", "--"),
-                "humidity":     cur.get("relative_humidity_2m", "--"),
-                "wind_speed":   cur.get("wind_speed_10m", "--"),
-                "wind_dir":     cur.get("wind_direction_10m", "--"),
-                "precip":       cur.get("precipitation", "--"),
-                "weather_code": code,
-                "weather_desc": desc,
-                "weather_icon": icon,
-                "uv_index":     cur.get("uv_index", "--"),
-                "sunrise":      _hhmm(d_sunrise[0]) if d_sunrise else "--",
-                "sunset":       _hhmm(d_sunset[0]) if d_sunset else "--",
-                "forecast":     forecast,
-                "forecast_daily": forecast_daily,
-                "hourly_by_date": hourly_by_date,
-            }
+        # Hourly agrupado por fecha
+        hourly_by_date = {}
+        for i, t in enumerate(h_times):
+            date_key = t[:10]
+            h_code = h_codes[i] if i < len(h_codes) else 0
+            _, h_icon = _wmo_label(h_code)
+            hourly_by_date.setdefault(date_key, []).append({
+                "hour":         t[11:16],
+                "temp":         h_temps[i] if i < len(h_temps) else "--",
+                "precip_prob":  h_precip[i] if i < len(h_precip) else 0,
+                "weather_code": h_code,
+                "weather_icon": h_icon,
+            })
 
-            # Calidad del aire (independiente)
+        # Daily 14 días
+        daily = data.get("daily", {})
+        d_times = daily.get("time", [])
+        d_codes = daily.get("weather_code", [])
+        d_max = daily.get("temperature_2m_max", [])
+        d_min = daily.get("temperature_2m_min", [])
+        d_precip = daily.get("precipitation_probability_max", [])
+        d_sunrise = daily.get("sunrise", [])
+        d_sunset = daily.get("sunset", [])
+
+        _DAY_NAMES = ["Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom"]
+        forecast_daily = []
+        for i in range(min(14, len(d_times))):
+            d_code = d_codes[i] if i < len(d_codes) else 0
+            _, d_icon = _wmo_label(d_code)
             try:
-                aq_params = urllib.parse.urlencode({
-                    "latitude":  lat,
-                    "longitude": lon,
-                    "current":   "pm2_5,pm10,european_aqi",
-                    "timezone":  "auto",
-                })
-                aq_url = f"{AIR_QUALITY_URL}?{aq_params}"
-                with urllib.request.urlopen(aq_url, timeout=8) as aq_resp:
-                    aq_data = json.loads(aq_resp.read().decode())
-                aq_cur = aq_data.get("current", {})
-                stats["aqi"] = aq_cur.get("european_aqi", "--")
-                stats["pm2_5"] = aq_cur.get("pm2_5", "--")
-                stats["pm10"] = aq_cur.get("pm10", "--")
-            except Exception as aq_err:
-                logger.debug("[WeatherService] AQI no disponible: %s", aq_err)
-                stats["aqi"] = "--"
-                stats["pm2_5"] = "--"
-                stats["pm10"] = "--"
-
-            with self._lock:
-                self._stats = stats
-                self._last_update = stats["last_update"]
-                self._error = ""
-
-            logger.info("[WeatherService] Actualizado: %s %.1f°C %s", city, stats["temp"], desc)
+                d = date.fromisoformat(d_times[i])
+                label = "Hoy" if i == 0 else _DAY_NAMES[d.weekday()]
+                date_str = d.strftime("%d/%m")
+            except:
+                label = d_times[i]
+                date_str = ""
+            forecast_daily.append({
+                "label":        label,
+                "date":         date_str,
+                "date_iso":     d_times[i],
+                "temp_max":     d_max[i] if i < len(d_max) else "--",
+                "temp_min":     d_min[i] if i < len(d_min) else "--",
+                "precip_prob":  d_precip[i] if i < len(d_precip) else 0,
+                "sunrise":      _hhmm(d_sunrise[i]) if i < len(d_sunrise) else "--",
+                "sunset":       _hhmm(d_sunset[i]) if i < len(d_sunset) else "--",
+                "weather_code": d_code,
+                "weather_icon": d_icon,
+            })
 
-        except Exception as e:
-            logger.error("[WeatherService] Fetch error: %s", e)
-            with self._lock:
-                self._error = f"Error de conexión: {e}"
-                self._stats["error"] = self._error
+        stats = {
+            "city":         city,
+            "lat":          lat,
+            "lon":          lon,
+            "error":        "",
+            "last_update":  datetime.fromtimestamp(fetched_ts).strftime("%H:%M"),
+            "temp":         cur.get("temperature_2m", "--"),
+            "feels_like":   cur.get("apparent_temperature", "--"),
+            "humidity":     cur.get("relative_humidity_2m", "--"),
+            "wind_speed":   cur.get("wind_speed_10m", "--"),
+            "wind_dir":     cur.get("wind_direction_10m", "--"),
+            "precip":       cur.get("precipitation", "--"),
+            "weather_code": code,
+            "weather_desc": desc,
+            "weather_icon": icon,
+            "uv_index":     cur.get("uv_index", "--"),
+            "sunrise":      _hhmm(d_sunrise[0]) if d_sunrise else "--",
+            "sunset":       _hhmm(d_sunset[0]) if d_sunset else "--",
+            "forecast":     forecast,
+            "forecast_daily": forecast_daily,
+            "hourly_by_date": hourly_by_date,
+        }
+
+        aq_cur = (aq_data or {}).get("current", {})
+        stats["aqi"]   = aq_cur.get("european_aqi", "--")
+        stats["pm2_5"] = aq_cur.get("pm2_5", "--")
+        stats["pm10"]  = aq_cur.get("pm10", "--")
+        return stats
 
     # ── Persistencia ─────────────────────────────────────────────────────────
 
@@ -1,23 +1,47 @@
 """
 Monitor de conexión WiFi profesional.
-Recopila SSID, señal (dBm), calidad link, bitrate, ruido, tráfico RX/TX Mbps.
-Thread daemon cada 5s, históricos, cambio interfaz en caliente, persistencia.
-Fallback ip/iwconfig/ifconfig.
+Recopila SSID, BSSID, señal (dBm), calidad link, bitrate, ruido, tráfico RX/TX Mbps.
+Thread daemon cada 5s mientras alguien consume los datos, históricos, cambio
+interfaz en caliente, persistencia.
+
+Fuentes, sin forkear procesos en el camino normal:
+  - señal, calidad y ruido → /proc/net/wireless
+  - SSID, BSSID y bitrate  → nl80211 (core.nl80211, generic netlink)
+  - tráfico y estado link  → /sys/class/net/<iface>
+Si nl80211 o /proc/net/wireless no están disponibles se usan iwconfig / iw.
+
+Con la ventana WiFi abierta la señal se muestrea cada 0.5s (histórico rápido
+para diagnosticar roaming); el resto de datos mantiene el ritmo de 5s.
 """
+import os
 import re
+import socket
 import subprocess
 import threading
+import time
 from collections import deque
-from typing import Optional
+from typing import Dict, Optional
 from config.settings import HISTORY
 from datetime import datetime
+from core.demand_registry import get_demand_registry
+from core.nl80211 import Nl80211
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 _POLL_INTERVAL = 5    # segundos
+_DEMAND_KEY    = "wifi_monitor"   # sin lease el sondeo se detiene
 _IFACE_DEFAULT = "wlan0"
 
+# Muestreo rápido de señal (solo /proc/net/wireless, sin fork ni netlink)
+_SIGNAL_SAMPLE_S     = 0.5
+_SIGNAL_FAST_HISTORY = 240        # 2 minutos a 0.5s
+
+_PROC_WIRELESS = "/proc/net/wireless"
+_SYS_NET       = "/sys/class/net"
+# Escala de calidad de wireless extensions (la que muestra iwconfig como x/70)
+_WEXT_QUALITY_MAX = 70
+
 # Umbrales de señal (dBm)
 WIFI_SIGNAL_GOOD = -60
 WIFI_SIGNAL_WARN = -75
@@ -61,6 +85,7 @@ def _parse_iwconfig(raw: str) -> dict:
     """
     data = {
         "ssid":              "",
+        "bssid":             "",
         "signal_dbm":        None,
         "link_quality":      None,
         "link_quality_max":  None,
@@ -72,6 +97,10 @@ def _parse_iwconfig(raw: str) -> dict:
     if m:
         data["ssid"] = m.group(1)
 
+    m = re.search(r'Access Point:\s*([0-9A-Fa-f:]{17})', raw)
+    if m:
+        data["bssid"] = m.group(1).lower()
+
     m = re.search(r'Link Quality=(\d+)/(\d+)', raw)
     if m:
         data["link_quality"]     = int(m.group(1))
@@ -100,17 +129,21 @@ def _parse_iw_link(raw: str) -> dict:
         raw (str): Salida cruda del comando `iw dev <iface> link`.
 
     Returns:
-        dict: Diccionario con los campos "ssid", "signal_dbm" y "bitrate".
+        dict: Diccionario con los campos "ssid", "bssid", "signal_dbm" y "bitrate".
 
     Raises:
         None
     """
-    data = {"ssid": "", "signal_dbm": None, "bitrate": ""}
+    data = {"ssid": "", "bssid": "", "signal_dbm": None, "bitrate": ""}
 
     m = re.search(r'SSID:\s*(.+)', raw)
     if m:
         data["ssid"] = m.group(1).strip()
 
+    m = re.search(r'Connected to\s+([0-9A-Fa-f:]{17})', raw)
+    if m:
+        data["bssid"] = m.group(1).lower()
+
     m = re.search(r'signal:\s*(-?\d+)', raw)
     if m:
         data["signal_dbm"] = int(m.group(1))
@@ -122,6 +155,81 @@ def _parse_iw_link(raw: str) -> dict:
     return data
 
 
+def _wext_number(field: str) -> Optional[int]:
+    """
+    Convierte un campo numérico de /proc/net/wireless ('54.', '-56.') a entero.
+
+    Args:
+        field (str): Campo tal cual aparece en el fichero.
+
+    Returns:
+        Optional[int]: Valor entero o None si no es numérico.
+    """
+    try:
+        return int(float(field.rstrip(".")))
+    except ValueError:
+        return None
+
+
+def _read_proc_wireless(iface: str) -> Optional[Dict]:
+    """
+    Lee calidad, señal y ruido de una interfaz desde /proc/net/wireless.
+
+    Formato de cada línea: 'wlan0: 0000   54.  -56.  -256  ...'
+    (estado, calidad, nivel de señal en dBm, ruido en dBm).
+
+    Args:
+        iface (str): Nombre de la interfaz.
+
+    Returns:
+        Optional[Dict]: link_quality, link_quality_max, signal_dbm y noise_dbm;
+                        None si el fichero o la interfaz no existen.
+    """
+    try:
+        with open(_PROC_WIRELESS, "r") as f:
+            for line in f:
+                name, sep, rest = line.partition(":")
+                if not sep or name.strip() != iface:
+                    continue
+                fields = rest.split()
+                if len(fields) < 4:
+                    return None
+                quality = _wext_number(fields[1])
+                level   = _wext_number(fields[2])
+                noise   = _wext_number(fields[3])
+                # Drivers antiguos dan el nivel como u8 (200 → -56 dBm)
+                if level is not None and level > 63:
+                    level -= 256
+                return {
+                    "link_quality":     quality,
+                    "link_quality_max": _WEXT_QUALITY_MAX,
+                    "signal_dbm":       level if level else None,
+                    # -256 (o 0) significa que el driver no informa ruido
+                    "noise_dbm":        noise if noise is not None and -256 < noise < 0 else None,
+                }
+    except OSError:
+        pass
+    return None
+
+
+def _read_sysfs(iface: str, name: str) -> str:
+    """
+    Lee un atributo de /sys/class/net/<iface>.
+
+    Args:
+        iface (str): Nombre de la interfaz.
+        name (str): Ruta relativa del atributo (p.ej. 'operstate', 'statistics/rx_bytes').
+
+    Returns:
+        str: Contenido sin espacios, o cadena vacía si no existe.
+    """
+    try:
+        with open(os.path.join(_SYS_NET, iface, name), "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
 class WiFiMonitor:
     """
     Monitor de WiFi que proporciona información en tiempo real y históricos de tráfico.
@@ -147,30 +255,34 @@ class WiFiMonitor:
         self._stop_evt = threading.Event()
         self._lock     = threading.Lock()
         self._thread   = None
+        self._demand   = get_demand_registry()
 
         # Estado actual
-        self._info: dict = {
-            "ssid":              "",
-            "signal_dbm":        None,
-            "link_quality":      None,
-            "link_quality_max":  None,
-            "bitrate":           "",
-            "noise_dbm":         None,
-            "connected":         False,
-        }
+        self._info: dict = self._empty_info()
 
         # Tráfico
         self._prev_rx: Optional[int] = None
         self._prev_tx: Optional[int] = None
+        self._prev_ts: float = 0.0
         self._rx_mbps: float = 0.0
         self._tx_mbps: float = 0.0
 
         # Históricos
         self._signal_hist = deque(maxlen=HISTORY)
+        self._signal_fast = deque(maxlen=_SIGNAL_FAST_HISTORY)
         self._rx_hist     = deque(maxlen=HISTORY)
         self._tx_hist     = deque(maxlen=HISTORY)
 
         self._last_update: str = ""
+        self._last_full: float = 0.0
+        # Con /proc/net/wireless la señal se muestrea cada 0.5s y esa es la
+        # única fuente del histórico rápido; el poll completo no lo alimenta
+        self._fast_signal = os.path.exists(_PROC_WIRELESS)
+        self._operstate: Optional[str] = None
+
+        # nl80211: se abre al primer poll; si el kernel no lo ofrece, iwconfig/iw
+        self._nl: Optional[Nl80211] = None
+        self._nl_unavailable = False
 
     # ── Ciclo de vida ─────────────────────────────────────────────────────────
 
@@ -212,8 +324,10 @@ class WiFiMonitor:
         """
         self._running = False
         self._stop_evt.set()
+        self._demand.wake(_DEMAND_KEY)
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=6)
+        self._close_netlink()
         with self._lock:
             self._info = {}
         logger.info("[WiFiMonitor] Servicio detenido")
@@ -233,19 +347,42 @@ class WiFiMonitor:
         """
         return self._running
 
-    def get_signal_history(self) -> list:
+    def get_signal_history(self, fast: bool = False) -> list:
         """
         Obtiene el histórico de señal de WiFi en dBm de los últimos puntos registrados.
 
         Args:
-            No requiere parámetros.
+            fast (bool): True para el histórico muestreado cada 0.5s con la
+                         ventana abierta (diagnóstico de roaming). Sin
+                         /proc/net/wireless se devuelve el histórico normal.
 
         Returns:
             list: Lista de valores de señal de WiFi en dBm.
         """
         with self._lock:
+            if fast and self._fast_signal:
+                return list(self._signal_fast)
             return list(self._signal_hist)
 
+    @staticmethod
+    def _empty_info() -> dict:
+        """
+        Estado de conexión vacío.
+
+        Returns:
+            dict: Todos los campos de conexión sin valor.
+        """
+        return {
+            "ssid":              "",
+            "bssid":             "",
+            "signal_dbm":        None,
+            "link_quality":      None,
+            "link_quality_max":  None,
+            "bitrate":           "",
+            "noise_dbm":         None,
+            "connected":         False,
+        }
+
     # ── Cambio de interfaz en caliente ────────────────────────────────────────
 
     def set_interface(self, iface: str) -> None:
@@ -268,20 +405,16 @@ class WiFiMonitor:
             self._rx_mbps  = 0.0
             self._tx_mbps  = 0.0
             self._signal_hist.clear()
+            self._signal_fast.clear()
             self._rx_hist.clear()
             self._tx_hist.clear()
-            self._info = {
-                "ssid":             "",
-                "signal_dbm":       None,
-                "link_quality":     None,
-                "link_quality_max": None,
-                "bitrate":          "",
-                "noise_dbm":        None,
-                "connected":        False,
-            }
+            self._info = self._empty_info()
             self._last_update = ""
+            self._last_full   = 0.0
+            self._operstate   = None
 
         self._persist_interface(iface)
+        self._demand.wake(_DEMAND_KEY)
         logger.info("[WiFiMonitor] Interfaz cambiada a: %s", iface)
 
     # ── Interfaces disponibles ────────────────────────────────────────────────
@@ -357,6 +490,10 @@ class WiFiMonitor:
         """
         Ejecuta el bucle de polling del monitor de WiFi.
 
+        Con /proc/net/wireless disponible el thread despierta cada 0.5s mientras
+        la ventana está abierta: cada tick muestrea la señal y cada 5s (o cuando
+        cambia el operstate de la interfaz) hace además el poll completo.
+
         Args:
             None
 
@@ -366,9 +503,49 @@ class WiFiMonitor:
         Raises:
             None
         """
-        self._poll()
-        while not self._stop_evt.wait(_POLL_INTERVAL):
-            self._poll()
+        active_s = _SIGNAL_SAMPLE_S if self._fast_signal else _POLL_INTERVAL
+        while not self._demand.wait(_DEMAND_KEY, self._stop_evt,
+                                    active_s=active_s, idle_s=None):
+            if not self._fast_signal:
+                self._poll()
+                continue
+            changed = self._sample_signal()
+            due = time.monotonic() - self._last_full >= _POLL_INTERVAL - 0.05
+            if changed or due:
+                self._last_full = time.monotonic()
+                self._poll()
+
+    def _sample_signal(self) -> bool:
+        """
+        Muestreo rápido: actualiza señal, calidad y ruido desde /proc/net/wireless.
+
+        Args:
+            None
+
+        Returns:
+            bool: True si el operstate de la interfaz cambió desde la última
+                  muestra y hace falta un poll completo.
+
+        Raises:
+            None
+        """
+        with self._lock:
+            iface     = self._iface
+            connected = self._info.get("connected", False)
+        operstate = _read_sysfs(iface, "operstate")
+        changed = bool(operstate) and operstate != self._operstate
+        if operstate:
+            self._operstate = operstate
+        wireless = _read_proc_wireless(iface)
+        if changed or wireless is None or not connected:
+            return changed
+        with self._lock:
+            if self._iface != iface or not self._info:
+                return False
+            self._info.update(wireless)
+            if wireless["signal_dbm"] is not None:
+                self._signal_fast.append(wireless["signal_dbm"])
+        return False
 
     def _poll(self):
         """
@@ -387,26 +564,16 @@ class WiFiMonitor:
             # Capturar interfaz actual bajo lock para evitar race con set_interface
             with self._lock:
                 iface = self._iface
+                prev  = dict(self._info)
 
-            # ── Señal via iwconfig ─────────────────────────────────────────────
-            iwconfig_raw = _run(["iwconfig", iface])
-            iw_data      = _parse_iwconfig(iwconfig_raw)
-
-            # Fallback a `iw dev link` si iwconfig no devuelve SSID
-            if not iw_data["ssid"]:
-                iw_link_raw = _run(["iw", "dev", iface, "link"])
-                iw_link     = _parse_iw_link(iw_link_raw)
-                if iw_link["ssid"]:
-                    iw_data["ssid"] = iw_link["ssid"]
-                if iw_data["signal_dbm"] is None:
-                    iw_data["signal_dbm"] = iw_link["signal_dbm"]
-                if not iw_data["bitrate"]:
-                    iw_data["bitrate"] = iw_link["bitrate"]
+            iw_data = self._read_native(iface)
+            if iw_data is None:
+                iw_data = self._read_legacy(iface)
 
             connected = bool(iw_data["ssid"])
 
-            # ── Tráfico via /proc/net/dev ──────────────────────────────────────
-            rx_bytes, tx_bytes = self._read_proc_net_dev(iface)
+            # ── Tráfico via sysfs ─────────────────────────────────────────────
+            rx_bytes, tx_bytes = self._read_traffic(iface)
             rx_mbps, tx_mbps  = self._calc_speed(rx_bytes, tx_bytes)
 
             ts = datetime.now().strftime("%H:%M:%S")
@@ -425,6 +592,12 @@ class WiFiMonitor:
                 self._rx_hist.append(rx_mbps)
                 self._tx_hist.append(tx_mbps)
 
+            if (connected and prev.get("bssid") and iw_data["bssid"]
+                    and prev["bssid"] != iw_data["bssid"]):
+                logger.info("[WiFiMonitor] Roaming en %s: %s → %s (%s dBm)",
+                            iw_data["ssid"], prev["bssid"], iw_data["bssid"],
+                            iw_data["signal_dbm"])
+
             logger.debug(
                 "[WiFiMonitor] Poll: ssid=%s signal=%s dBm rx=%.2f tx=%.2f Mb/s",
                 iw_data['ssid'], iw_data['signal_dbm'], rx_mbps, tx_mbps,
@@ -433,6 +606,113 @@ class WiFiMonitor:
         except Exception as e:
             logger.error("[WiFiMonitor] Error en poll: %s", e)
 
+    def _read_native(self, iface: str) -> Optional[dict]:
+        """
+        Lee el estado WiFi desde /proc/net/wireless y nl80211, sin forkear.
+
+        Args:
+            iface (str): Nombre de la interfaz.
+
+        Returns:
+            Optional[dict]: Mismos campos que _parse_iwconfig más bssid, o None
+                            si alguna de las dos fuentes no está disponible.
+        """
+        wireless = _read_proc_wireless(iface)
+        nl = self._netlink()
+        if wireless is None or nl is None:
+            return None
+        try:
+            ifindex = socket.if_nametoindex(iface)
+            ssid    = nl.interface_info(ifindex)["ssid"]
+            station = nl.station_info(ifindex) if ssid else None
+        except OSError as e:
+            # Se reabre en el siguiente poll; este usa iwconfig/iw
+            logger.warning("[WiFiMonitor] Error consultando nl80211 en %s: %s", iface, e)
+            self._close_netlink()
+            return None
+
+        station = station or {}
+        signal  = wireless["signal_dbm"]
+        if signal is None:
+            signal = station.get("signal_dbm")
+        return {
+            **wireless,
+            "ssid":       ssid,
+            "bssid":      station.get("bssid", ""),
+            "signal_dbm": signal if ssid else None,
+            "bitrate":    station.get("bitrate", ""),
+        }
+
+    @staticmethod
+    def _read_legacy(iface: str) -> dict:
+        """
+        Lee el estado WiFi con iwconfig y, si no da SSID, con `iw dev link`.
+
+        Args:
+            iface (str): Nombre de la interfaz.
+
+        Returns:
+            dict: Campos de _parse_iwconfig.
+        """
+        iwconfig_raw = _run(["iwconfig", iface])
+        iw_data      = _parse_iwconfig(iwconfig_raw)
+
+        # Fallback a `iw dev link` si iwconfig no devuelve SSID
+        if not iw_data["ssid"]:
+            iw_link_raw = _run(["iw", "dev", iface, "link"])
+            iw_link     = _parse_iw_link(iw_link_raw)
+            if iw_link["ssid"]:
+                iw_data["ssid"] = iw_link["ssid"]
+            if not iw_data["bssid"]:
+                iw_data["bssid"] = iw_link["bssid"]
+            if iw_data["signal_dbm"] is None:
+                iw_data["signal_dbm"] = iw_link["signal_dbm"]
+            if not iw_data["bitrate"]:
+                iw_data["bitrate"] = iw_link["bitrate"]
+        return iw_data
+
+    def _netlink(self) -> Optional[Nl80211]:
+        """
+        Devuelve el cliente nl80211, abriéndolo la primera vez.
+
+        Returns:
+            Optional[Nl80211]: Cliente, o None si el kernel no ofrece nl80211.
+        """
+        if self._nl is None and not self._nl_unavailable:
+            try:
+                self._nl = Nl80211()
+            except OSError as e:
+                self._nl_unavailable = True
+                logger.info("[WiFiMonitor] nl80211 no disponible (%s), usando iwconfig/iw", e)
+        return self._nl
+
+    def _close_netlink(self) -> None:
+        """
+        Cierra el socket nl80211 si está abierto.
+
+        Returns:
+            None
+        """
+        nl, self._nl = self._nl, None
+        if nl is not None:
+            nl.close()
+
+    def _read_traffic(self, iface: str) -> tuple:
+        """
+        Lee bytes RX/TX desde /sys/class/net/<iface>/statistics.
+
+        Args:
+            iface (str): Nombre de la interfaz de red.
+
+        Returns:
+            tuple[int, int]: Tupla con bytes recibidos y transmitidos.
+        """
+        rx = _read_sysfs(iface, "statistics/rx_bytes")
+        tx = _read_sysfs(iface, "statistics/tx_bytes")
+        if rx.isdigit() and tx.isdigit():
+            return int(rx), int(tx)
+        return self._read_proc_net_dev(iface)
+
     def _read_proc_net_dev(self, iface: str) -> tuple:
         """
         Lee bytes RX/TX desde /proc/net/dev para una interfaz de red específica.
@@ -449,9 +729,10 @@ class WiFiMonitor:
         try:
             with open("/proc/net/dev", "r") as f:
                 for line in f:
-                    if iface in line:
-                        parts = line.split()
-                        return int(parts[1]), int(parts[9])
+                    name, sep, rest = line.partition(":")
+                    if sep and name.strip() == iface:
+                        parts = rest.split()
+                        return int(parts[0]), int(parts[8])
         except Exception as e:
             logger.warning("[WiFiMonitor] Error leyendo /proc/net/dev: %s", e)
         return 0, 0
@@ -472,15 +753,19 @@ class WiFiMonitor:
         """
         rx_mbps = 0.0
         tx_mbps = 0.0
+        now     = time.monotonic()
 
         if self._prev_rx is not None and self._prev_tx is not None:
             delta_rx = max(0, rx - self._prev_rx)
             delta_tx = max(0, tx - self._prev_tx)
-            rx_mbps = (delta_rx / _POLL_INTERVAL) / 1_048_576
-            tx_mbps = (delta_tx / _POLL_INTERVAL) / 1_048_576
+            # Tras una pausa sin demanda el intervalo real puede ser mucho mayor
+            elapsed  = max(now - self._prev_ts, 1e-3)
+            rx_mbps = (delta_rx / elapsed) / 1_048_576
+            tx_mbps = (delta_tx / elapsed) / 1_048_576
 
         self._prev_rx = rx
         self._prev_tx = tx
+        self._prev_ts = now
         return rx_mbps, tx_mbps
 
     # ── Acceso a datos ────────────────────────────────────────────────────────
@@ -5,7 +5,6 @@ Punto de entrada principal
 """
 import sys
 import os
-import threading
 import customtkinter as ctk
 from config import DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, UPDATE_MS
 from core import (SystemMonitor, FanController, NetworkMonitor, FanAutoService, DiskMonitor, ProcessMonitor,
@@ -20,6 +19,7 @@ from core.i2c_monitor import I2CMonitor
 from core.gpio_monitor import OP_LIBRE
 from core.service_watchdog import ServiceWatchdog
 from ui.main_window import MainWindow
+from utils.http_client import close_idle_connections
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # ── Filtro de excepciones ignoradas ──────────────────────────────────────────
@@ -100,7 +100,8 @@ def main():
         network_monitor=network_monitor,
         disk_monitor=disk_monitor,
         update_monitor=update_monitor,
-        interval_minutes=5
+        interval_minutes=5,
+        pihole_monitor=pihole_monitor,
     )
 
     alert_service = AlertService(
@@ -167,12 +168,8 @@ def main():
     # Para los servicios configurados como False en services.json
     registry.apply_config()
 
-    # ── Comprobación inicial de actualizaciones en background ─────────────────
-    threading.Thread(
-        target=lambda: update_monitor.check_updates(force=True),
-        daemon=True,
-        name="UpdateCheck-Startup"
-    ).start()
+    # ── Comprobación inicial de actualizaciones (thread propio del monitor) ──
+    update_monitor.refresh()
 
     # ── Cleanup centralizado ──────────────────────────────────────────────────
     _cleaned = False
@@ -211,8 +208,10 @@ def main():
         wifi_monitor.stop()
         weather_service.stop()
         i2c_monitor.stop()
+        network_scanner.stop()
         gpio_monitor.stop()
         service_watchdog.stop()
+        close_idle_connections()
 
     # ── Crear interfaz ────────────────────────────────────────────────────────
     app = MainWindow(root, registry=registry, update_interval=UPDATE_MS)
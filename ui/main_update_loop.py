@@ -6,8 +6,15 @@ Gestiona tres ciclos independientes:
   - Badges del menu: cada update_interval ms via root.after
   - Eventos del bus: procesa eventos publicados desde threads secundarios
 
+Los badges de sistema, servicios y VPN no sondean: se repintan al recibir
+'system.sample', 'services.changed' y 'vpn.state_changed'.
+
 Ambos ciclos leen exclusivamente caches de los monitores — nunca bloquean la UI.
 
+Con el perfil de ahorro activo (pantalla atenuada/apagada) el reloj se suspende y
+los badges se refrescan IDLE_STRETCH veces más despacio; la actividad del usuario
+los reanuda al instante.
+
 Uso en MainWindow:
     self._update_loop = UpdateLoop(
         root=self.root,
@@ -22,13 +29,19 @@ Uso en MainWindow:
     # Al salir, antes de root.destroy():
     self._update_loop.stop()
 """
+import threading
 from datetime import datetime
 from config.settings import COLORS
 from core.event_bus import get_event_bus
+from core.events import SYSTEM_SAMPLE, SERVICES_CHANGED, VPN_STATE_CHANGED
+from core.demand_registry import get_demand_registry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Cadencia mínima de ServiceMonitor para el badge de servicios caídos
+_SERVICES_BADGE_LEASE_S = 30
+
 
 class UpdateLoop:
     """
@@ -71,6 +84,7 @@ class UpdateLoop:
         self._running         = False
         self._clock_after_id  = None
         self._badges_after_id = None
+        self._demand          = get_demand_registry()
 
     # ── Arranque / parada ─────────────────────────────────────────────────────
 
@@ -88,6 +102,13 @@ class UpdateLoop:
             None
         """
         self._running = True
+        self._demand.acquire("service_monitor", "main_badges", _SERVICES_BADGE_LEASE_S)
+        self._demand.add_idle_listener(self._on_idle_changed)
+        bus = get_event_bus()
+        bus.subscribe(SYSTEM_SAMPLE,     self._on_system_sample)
+        bus.subscribe(SERVICES_CHANGED,  self._on_services_changed)
+        bus.subscribe(VPN_STATE_CHANGED, self._on_vpn_changed)
+        self._prime_event_badges()
         self._tick_clock()
         self._update_badges()
 
@@ -105,19 +126,99 @@ class UpdateLoop:
             None
         """
         self._running = False
+        self._demand.release("service_monitor", "main_badges")
+        self._demand.remove_idle_listener(self._on_idle_changed)
+        bus = get_event_bus()
+        bus.unsubscribe(SYSTEM_SAMPLE,     self._on_system_sample)
+        bus.unsubscribe(SERVICES_CHANGED,  self._on_services_changed)
+        bus.unsubscribe(VPN_STATE_CHANGED, self._on_vpn_changed)
+        self._cancel_clock()
+        self._cancel_badges()
+        logger.debug("[UpdateLoop] Detenido")
+
+    def _cancel_clock(self) -> None:
+        """
+        Cancela el callback pendiente del reloj, si lo hay.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
         if self._clock_after_id is not None:
             try:
                 self._root.after_cancel(self._clock_after_id)
             except Exception:
                 pass
             self._clock_after_id = None
+
+    def _cancel_badges(self) -> None:
+        """
+        Cancela el callback pendiente de los badges, si lo hay.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
         if self._badges_after_id is not None:
             try:
                 self._root.after_cancel(self._badges_after_id)
             except Exception:
                 pass
             self._badges_after_id = None
-        logger.debug("[UpdateLoop] Detenido")
+
+    # ── Perfil de ahorro ──────────────────────────────────────────────────────
+
+    def _on_idle_changed(self, idle: bool) -> None:
+        """
+        Reanuda reloj y badges al instante cuando se sale del perfil de ahorro.
+
+        Al entrar en el perfil no hace nada: los propios ciclos se suspenden o se
+        estiran en su siguiente tick. Solo se toca Tk desde el thread principal;
+        si el cambio llega desde otro thread, el siguiente tick de badges reanuda.
+
+        Args:
+            idle (bool): Nuevo estado del perfil de ahorro.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if idle or not self._running:
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self._resume()
+
+    def _resume(self) -> None:
+        """
+        Relanza el reloj y fuerza un refresco inmediato de los badges.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._cancel_clock()
+        self._cancel_badges()
+        self._uptime_tick = 0
+        self._tick_clock()
+        self._update_badges()
 
     # ── Loop de reloj / uptime ────────────────────────────────────────────────
 
@@ -136,6 +237,10 @@ class UpdateLoop:
         """
         if not self._running:
             return
+        if self._demand.is_idle():
+            # Nadie mira el reloj con la pantalla oscura: se suspende hasta _resume()
+            self._clock_after_id = None
+            return
         self._clock_label.configure(text=datetime.now().strftime("%H:%M:%S"))
         self._uptime_tick += 1
         if self._uptime_tick == 1 or self._uptime_tick >= 60:
@@ -165,18 +270,20 @@ class UpdateLoop:
         """
         if not self._running:
             return
+        if self._clock_after_id is None and not self._demand.is_idle():
+            # Salida del perfil detectada fuera del thread de Tk
+            self._tick_clock()
         get_event_bus().process_events()
 
         self._update_misc_badges()
-        self._update_service_badge()
-        self._update_system_badges()
         self._update_weather_badge()
         self._update_watchdog_badge()
-        self._badges_after_id = self._root.after(self._update_interval, self._update_badges)
+        self._badges_after_id = self._root.after(
+            self._demand.refresh_ms(self._update_interval), self._update_badges)
 
     def _update_misc_badges(self) -> None:
         """
-        Actualiza los badges misceláneos de actualizaciones, Homebridge, Pi-hole y VPN.
+        Actualiza los badges misceláneos de actualizaciones, Homebridge y Pi-hole.
 
         Args:
             Ninguno
@@ -211,32 +318,81 @@ class UpdateLoop:
         except Exception as e:
             logger.warning("[UpdateLoop] badge 'pihole_offline' error: %s", e)
 
-        try:
-            bm.update("vpn_offline",
-                      self._monitors["vpn_monitor"].get_offline_count())
-        except Exception as e:
-            logger.warning("[UpdateLoop] badge 'vpn_offline' error: %s", e)
+    # ── Badges dirigidos por eventos ──────────────────────────────────────────
 
-    def _update_service_badge(self) -> None:
+    def _prime_event_badges(self) -> None:
         """
-        Actualiza el distintivo de servicios fallidos desde el monitor de servicios.
+        Pinta una vez los badges dirigidos por eventos con el estado en caché.
 
-        Args: 
+        Los eventos solo llegan cuando algo cambia, así que sin esta primera
+        lectura los badges quedarían vacíos hasta el primer cambio.
+
+        Args:
             Ninguno
 
-        Returns: 
+        Returns:
             Ninguno
 
-        Raises: 
-            Excepción genérica en caso de error durante la actualización del distintivo.
+        Raises:
+            Ninguno
         """
-        bm = self._badge_mgr
         try:
-            stats  = self._monitors["service_monitor"].get_stats()
-            failed = stats.get('failed', 0)
-            bm.update("services", failed)
+            self._update_system_badges(self._monitors["system_monitor"].get_current_stats())
+        except Exception as e:
+            logger.warning("[UpdateLoop] badge 'system' error: %s", e)
+        try:
+            self._on_services_changed({"stats": self._monitors["service_monitor"].get_stats()})
         except Exception as e:
             logger.warning("[UpdateLoop] badge 'services' error: %s", e)
+        try:
+            self._on_vpn_changed({"offline": self._monitors["vpn_monitor"].get_offline_count()})
+        except Exception as e:
+            logger.warning("[UpdateLoop] badge 'vpn_offline' error: %s", e)
+
+    def _on_system_sample(self, data: dict) -> None:
+        """
+        Repinta los badges de sistema al recibir 'system.sample'.
+
+        Args:
+            data (dict): Payload del evento con 'stats' y 'changed'.
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        self._update_system_badges(data["stats"])
+
+    def _on_services_changed(self, data: dict) -> None:
+        """
+        Actualiza el distintivo de servicios fallidos al recibir 'services.changed'.
+
+        Args:
+            data (dict): Payload del evento con 'stats'.
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        self._badge_mgr.update("services", data["stats"].get('failed', 0))
+
+    def _on_vpn_changed(self, data: dict) -> None:
+        """
+        Actualiza el distintivo de VPN desconectada al recibir 'vpn.state_changed'.
+
+        Args:
+            data (dict): Payload del evento con 'offline'.
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        self._badge_mgr.update("vpn_offline", data.get("offline", 0))
 
     def _update_weather_badge(self) -> None:
         """
@@ -294,12 +450,12 @@ class UpdateLoop:
         except Exception as e:
             logger.warning("[UpdateLoop] badge 'service_watchdog_restarts' error: %s", e)
 
-    def _update_system_badges(self) -> None:
+    def _update_system_badges(self, stats: dict) -> None:
         """
         Actualiza los badges de sistema relacionados con temperatura, CPU, RAM y disco duro.
 
         Args: 
-            Ninguno
+            stats (dict): Muestra de SystemMonitor.
 
         Returns: 
             Ninguno
@@ -309,8 +465,6 @@ class UpdateLoop:
         """
         bm = self._badge_mgr
         try:
-            stats = self._monitors["system_monitor"].get_current_stats()
-
             # Temperatura
             temp = stats['temp']
             if temp >= bm.TEMP_CRIT:
@@ -106,8 +106,31 @@ class MainWindow:
         logger.info("[MainWindow] Dashboard iniciado en %s", self.system_utils.get_hostname())
 
         self._create_ui()
+        self._bind_activity()
         self._update_loop.start()
 
+    # ── Actividad del usuario ─────────────────────────────────────────────────
+
+    def _bind_activity(self):
+        """
+        Notifica al DisplayService cualquier toque o tecla para reiniciar el dim
+        automático y salir al instante del perfil de ahorro.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        if self.display_service is None:
+            return
+        for sequence in ("<ButtonPress>", "<KeyPress>"):
+            self.root.bind_all(sequence,
+                               lambda e: self.display_service.notify_activity(), add="+")
+
     # ── Construcción de la UI ─────────────────────────────────────────────────
 
     def _create_ui(self):
@@ -323,14 +346,15 @@ class MainWindow:
             lambda: USBWindow(root))
         r("disk_window",          BL.MONITOR_DISCO,
             lambda: DiskWindow(root, self.disk_monitor),
-            badge_keys=["disk"])
+            badge_keys=["disk"], demand=["disk_monitor"])
         r("launchers",            BL.LANZADORES,
             lambda: LaunchersWindow(root))
         r("process_window",       BL.PROCESOS,
-            lambda: ProcessWindow(root, self.process_monitor))
+            lambda: ProcessWindow(root, self.process_monitor),
+            demand=["process_monitor"])
         r("service_window",       BL.SERVICIOS,
             lambda: ServiceWindow(root, self.service_monitor),
-            badge_keys=["services"])
+            badge_keys=["services"], demand=["service_monitor"])
         r("services_manager",     BL.SERVICIOS_DASH,
             lambda: ServicesManagerWindow(root, registry=self.registry))
         r("crontab_window",       BL.CRONTAB,
@@ -342,7 +366,7 @@ class MainWindow:
             badge_keys=["updates"])
         r("homebridge",           BL.HOMEBRIDGE,
             lambda: HomebridgeWindow(root, self.homebridge_monitor),
-            badge_keys=["hb_offline", "hb_on", "hb_fault"])
+            badge_keys=["hb_offline", "hb_on", "hb_fault"], demand=["homebridge_monitor"])
         r("log_viewer",           BL.VISOR_LOGS,
             lambda: LogViewerWindow(root))
         r("log_config_window",    BL.LOG_CONFIG,
@@ -365,15 +389,18 @@ class MainWindow:
                 service_monitor=self.service_monitor,
                 pihole_monitor=self.pihole_monitor,
                 network_monitor=self.network_monitor,
-                disk_monitor=self.disk_monitor))
+                disk_monitor=self.disk_monitor),
+            demand=["service_monitor", "disk_monitor"])
         r("camera_window",        BL.CAMARA,
             lambda: CameraWindow(root))
         r("theme_selector",       BL.TEMA,
             lambda: ThemeSelector(root))
         r("ssh_window",           BL.SSH,
-            lambda: SSHWindow(root, self.ssh_monitor))
+            lambda: SSHWindow(root, self.ssh_monitor),
+            demand=["ssh_monitor"])
         r("wifi_window",          BL.WIFI,
-            lambda: WiFiWindow(root, self.wifi_monitor))
+            lambda: WiFiWindow(root, self.wifi_monitor),
+            demand=["wifi_monitor"])
         r("config_editor_window", BL.CONFIG,
             lambda: ConfigEditorWindow(root))
         r("audio_window",         BL.AUDIO,
@@ -382,12 +409,13 @@ class MainWindow:
             lambda: WeatherWindow(root, self.weather_service),
             badge_keys=["weather_rain"])
         r("i2c_window",           BL.I2C,
-            lambda: I2CWindow(root, self.i2c_monitor))
+            lambda: I2CWindow(root, self.i2c_monitor),
+            demand=["i2c_monitor"])
         r("gpio_window",          BL.GPIO,
             lambda: GPIOWindow(root, self.gpio_monitor))
         r("service_watchdog",     BL.SERVICE_WATCHDOG,
             lambda: ServiceWatchdogWindow(root, self.service_monitor, self.service_watchdog),
-            badge_keys=["service_watchdog_restarts"])
+            badge_keys=["service_watchdog_restarts"], demand=["service_monitor"])
         r("button_manager",       BL.BOTONES,
             lambda: ButtonManagerWindow(root,
                 registry=self.registry, window_manager=self._wm))
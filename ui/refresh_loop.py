@@ -0,0 +1,150 @@
+"""
+Bucle de refresco after() de una ventana, ligado al perfil de ahorro.
+
+Con la pantalla atenuada o apagada (DemandRegistry.is_idle) el bucle no se
+reprograma: queda suspendido sin coste. Al salir del perfil (notify_activity,
+screen_on — siempre desde el thread de Tk) se cancela cualquier tick pendiente
+y se refresca al instante, en vez de esperar al siguiente intervalo.
+
+Uso en una ventana:
+    self._refresh = RefreshLoop(self, self._update, UPDATE_MS)
+    self._refresh.start()            # primer refresco inmediato
+    ...
+    def _update(self):               # ya no se reprograma a sí mismo
+        ...
+
+El bucle se detiene solo al destruirse el widget (<Destroy>).
+"""
+import threading
+from typing import Callable, Optional
+from core.demand_registry import get_demand_registry
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RefreshLoop:
+    """
+    Ejecuta un callback periódicamente con widget.after() salvo en perfil de ahorro.
+
+    Args:
+        widget: Widget Tk dueño del bucle (la ventana o popup).
+        callback (Callable[[], None]): Refresco a ejecutar en cada tick.
+        interval_ms (int): Intervalo entre refrescos en milisegundos.
+    """
+
+    def __init__(self, widget, callback: Callable[[], None], interval_ms: int):
+        """
+        Prepara el bucle sin arrancarlo.
+
+        Args:
+            widget: Widget Tk dueño del bucle.
+            callback (Callable[[], None]): Refresco a ejecutar.
+            interval_ms (int): Intervalo entre refrescos en milisegundos.
+
+        Returns:
+            None
+        """
+        self._widget = widget
+        self._callback = callback
+        self._interval_ms = interval_ms
+        self._demand = get_demand_registry()
+        self._job: Optional[str] = None
+        self._running = False
+
+    def start(self) -> None:
+        """
+        Arranca el bucle con un refresco inmediato.
+
+        Returns:
+            None
+        """
+        if self._running:
+            return
+        self._running = True
+        self._demand.add_idle_listener(self._on_idle_changed)
+        # <Destroy> también llega por cada hijo destruido
+        self._widget.bind("<Destroy>",
+                          lambda e: e.widget is self._widget and self.stop(), add="+")
+        self._tick()
+
+    def stop(self) -> None:
+        """
+        Detiene el bucle y cancela el tick pendiente.
+
+        Returns:
+            None
+        """
+        self._running = False
+        self._demand.remove_idle_listener(self._on_idle_changed)
+        self._cancel()
+
+    def is_suspended(self) -> bool:
+        """
+        Indica si el bucle está suspendido por el perfil de ahorro.
+
+        Returns:
+            bool: True si está en marcha pero sin tick programado.
+        """
+        return self._running and self._job is None
+
+    def _cancel(self) -> None:
+        """
+        Cancela el tick pendiente, si lo hay.
+
+        Returns:
+            None
+        """
+        if self._job is not None:
+            try:
+                self._widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _tick(self) -> None:
+        """
+        Ejecuta el refresco y programa el siguiente, o se suspende en perfil de ahorro.
+
+        Returns:
+            None
+        """
+        self._job = None
+        if not self._running:
+            return
+        try:
+            if not self._widget.winfo_exists():
+                self.stop()
+                return
+        except Exception:
+            self.stop()
+            return
+        if self._demand.is_idle():
+            return   # suspendido hasta _on_idle_changed(False)
+        try:
+            self._callback()
+        except Exception as e:
+            logger.error("[RefreshLoop] Error en refresco: %s", e)
+        if self._running and self._job is None:
+            self._job = self._widget.after(self._interval_ms, self._tick)
+
+    def _on_idle_changed(self, idle: bool) -> None:
+        """
+        Al salir del perfil de ahorro, refresca al instante y retoma el intervalo normal.
+
+        Al entrar no hace nada: el siguiente tick ve el perfil y se suspende.
+        Solo toca Tk desde el thread principal (los cambios a no-idle llegan siempre
+        desde él).
+
+        Args:
+            idle (bool): Nuevo estado del perfil de ahorro.
+
+        Returns:
+            None
+        """
+        if idle or not self._running:
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        self._cancel()
+        self._tick()
@@ -3,7 +3,7 @@ Widgets para gráficas y visualización
 """
 import customtkinter as ctk
 from typing import List
-from config.settings import GRAPH_WIDTH, GRAPH_HEIGHT
+from config.settings import GRAPH_WIDTH, GRAPH_HEIGHT, COLORS, CPU_WARN, CPU_CRIT
 
 
 class GraphWidget:
@@ -150,6 +150,151 @@ class GraphWidget:
         self.canvas.grid(**kwargs)
 
 
+class CoreHeatmapWidget:
+    """
+    Mapa de calor de uso por núcleo: una fila por núcleo, una columna por muestra.
+
+    Args:
+        parent: Widget padre.
+        width (int): Ancho del canvas en píxeles.
+        height (int): Alto del canvas en píxeles.
+        columns (int): Número de muestras visibles (por defecto 60).
+
+    Nota: Las celdas se crean una sola vez; cada actualización solo cambia su color.
+    """
+
+    def __init__(self, parent, width: int, height: int, columns: int = 60):
+        """
+        Inicializa el canvas del mapa de calor. Las celdas se crean al recibir la primera muestra.
+
+        Args:
+            parent: El widget padre que contendrá el mapa.
+            width (int): Ancho del canvas en píxeles.
+            height (int): Alto del canvas en píxeles.
+            columns (int): Número de muestras visibles.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.width   = width
+        self.height  = height
+        self.columns = columns
+        self.canvas  = ctk.CTkCanvas(
+            parent,
+            width=self.width,
+            height=self.height,
+            bg=COLORS['bg_dark'],
+            highlightthickness=0
+        )
+        self._cells  = []     # [núcleo][columna] → id de rectángulo
+        self._colors = []     # último color aplicado, para no repetir itemconfig
+
+    def _build_cells(self, cores: int) -> None:
+        """
+        Crea la rejilla de rectángulos para el número de núcleos dado.
+
+        Args:
+            cores (int): Número de núcleos (filas).
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self.canvas.delete("all")
+        cell_w = self.width / self.columns
+        cell_h = self.height / cores
+        self._cells = [
+            [self.canvas.create_rectangle(
+                c * cell_w, r * cell_h, (c + 1) * cell_w, (r + 1) * cell_h,
+                fill=COLORS['bg_dark'], width=0)
+             for c in range(self.columns)]
+            for r in range(cores)
+        ]
+        self._colors = [[None] * self.columns for _ in range(cores)]
+
+    @staticmethod
+    def heat_color(value: float) -> str:
+        """
+        Calcula el color de una celda según el uso del núcleo.
+
+        Por debajo de CPU_WARN se interpola de bg_dark a primary; después se
+        usan los colores warning y danger de los umbrales de CPU.
+
+        Args:
+            value (float): Uso del núcleo en %.
+
+        Returns:
+            str: Color hexadecimal '#rrggbb'.
+        """
+        if value >= CPU_CRIT:
+            return COLORS['danger']
+        if value >= CPU_WARN:
+            return COLORS['warning']
+        t = max(0.0, value) / CPU_WARN
+        lo, hi = COLORS['bg_dark'].lstrip('#'), COLORS['primary'].lstrip('#')
+        rgb = [int(lo[i:i + 2], 16) + (int(hi[i:i + 2], 16) - int(lo[i:i + 2], 16)) * t
+               for i in (0, 2, 4)]
+        return "#%02x%02x%02x" % tuple(int(v) for v in rgb)
+
+    def update(self, history: List[List[float]]) -> None:
+        """
+        Repinta el mapa con el histórico de uso por núcleo.
+
+        Args:
+            history (List[List[float]]): Muestras ordenadas de la más antigua a la
+                más reciente; cada muestra contiene el uso de cada núcleo.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if not history or not history[-1]:
+            return
+        cores = len(history[-1])
+        if len(self._cells) != cores:
+            self._build_cells(cores)
+
+        samples = history[-self.columns:]
+        offset  = self.columns - len(samples)
+        for c, sample in enumerate(samples, start=offset):
+            for r in range(min(cores, len(sample))):
+                color = self.heat_color(sample[r])
+                if self._colors[r][c] != color:
+                    self.canvas.itemconfig(self._cells[r][c], fill=color)
+                    self._colors[r][c] = color
+
+    def pack(self, **kwargs):
+        """
+        Coloca el canvas del mapa de calor con pack.
+
+        Args:
+            **kwargs: Argumentos para pack.
+
+        Returns:
+            None
+        """
+        self.canvas.pack(**kwargs)
+
+    def grid(self, **kwargs):
+        """
+        Coloca el canvas del mapa de calor con grid.
+
+        Args:
+            **kwargs: Argumentos para grid.
+
+        Returns:
+            None
+        """
+        self.canvas.grid(**kwargs)
+
+
 def update_graph_lines(canvas, lines: List, data: List[float], max_val: float) -> None:
     """
     Actualiza las líneas de una gráfica en un canvas de tkinter con nuevos datos.
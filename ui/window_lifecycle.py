@@ -5,6 +5,7 @@ Encapsula el patron repetido en MainWindow:
   - Comprobar si la ventana existe (winfo_exists)
   - Crearla via factory si no existe, o hacer lift si ya esta abierta
   - Gestionar _btn_active / _btn_idle al abrir y al cerrar
+  - Adquirir/liberar leases de demanda sobre los monitores que muestra la ventana
 
 Uso en MainWindow:
     self._wlm = WindowLifecycleManager(
@@ -15,6 +16,10 @@ Uso en MainWindow:
         factory=lambda: FanControlWindow(self.root, self.fan_controller, ...),
         badge_keys=["temp_fan"],
     )
+    self._wlm.register("process_window", BL.PROCESOS,
+        factory=lambda: ProcessWindow(self.root, self.process_monitor),
+        demand=["process_monitor"],   # ProcessMonitor solo sondea con la ventana abierta
+    )
     # En _build_buttons_meta:
     BL.FAN_CONTROL: (lambda: self._wlm.open("fan_control"), ["temp_fan"])
 
@@ -22,6 +27,7 @@ Uso en MainWindow:
     self._wlm.open("button_manager")
     instance = self._wlm.get("button_manager")
 """
+from core.demand_registry import get_demand_registry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -52,11 +58,12 @@ class WindowLifecycleManager:
         """
         self._on_active  = on_btn_active
         self._on_idle    = on_btn_idle
-        self._registry   = {}   # key → {label, factory, badge_keys, instance}
+        self._registry   = {}   # key → {label, factory, badge_keys, demand, instance}
+        self._demand     = get_demand_registry()
 
     # ── Registro ──────────────────────────────────────────────────────────────
 
-    def register(self, key: str, label: str, factory, badge_keys=None) -> None:
+    def register(self, key: str, label: str, factory, badge_keys=None, demand=None) -> None:
         """
         Registra una ventana hija con su información asociada.
 
@@ -65,6 +72,8 @@ class WindowLifecycleManager:
             label (str): Etiqueta o constante asociada al botón de la ventana.
             factory (callable): Función que crea una instancia de CTkToplevel.
             badge_keys (list[str], opcional): Lista de claves de badge. Por defecto es None.
+            demand (list[str], opcional): Fuentes de datos (claves del ServiceRegistry) que
+                la ventana necesita a ritmo completo mientras está abierta.
 
         Returns:
             None
@@ -76,6 +85,7 @@ class WindowLifecycleManager:
             "label":      label,
             "factory":    factory,
             "badge_keys": badge_keys or [],
+            "demand":     demand or [],
             "instance":   None,
         }
 
@@ -108,10 +118,23 @@ class WindowLifecycleManager:
         label = entry["label"]
         self._on_active(label)
 
-        win = entry["factory"]()
+        # El lease se toma antes de construir: el primer refresco ocurre en el __init__ de la ventana
+        for source in entry["demand"]:
+            self._demand.acquire(source, f"window:{key}")
+
+        try:
+            win = entry["factory"]()
+        except Exception:
+            for source in entry["demand"]:
+                self._demand.release(source, f"window:{key}")
+            self._on_idle(label)
+            raise
         entry["instance"] = win
 
-        win.bind("<Destroy>", lambda e, k=key, l=label: self._on_close(k, l))
+        # <Destroy> del toplevel también se dispara por cada hijo destruido
+        win.bind("<Destroy>",
+                 lambda e, w=win, k=key, l=label: e.widget is w and self._on_close(k, l),
+                 add="+")
 
     # ── Consulta ──────────────────────────────────────────────────────────────
 
@@ -149,7 +172,7 @@ class WindowLifecycleManager:
 
     def _on_close(self, key: str, label: str) -> None:
         """
-        Limpia la instancia y el botón asociado cuando una ventana es cerrada.
+        Limpia la instancia, el botón asociado y los leases cuando una ventana es cerrada.
 
         Args:
             key (str): Clave de registro de la ventana.
@@ -164,4 +187,6 @@ class WindowLifecycleManager:
         entry = self._registry.get(key)
         if entry is not None:
             entry["instance"] = None
+            for source in entry["demand"]:
+                self._demand.release(source, f"window:{key}")
         self._on_idle(label)
@@ -1,9 +1,10 @@
 """
 Ventana de historial de alertas disparadas por AlertService.
-Lee data/alert_history.json y muestra las entradas con colores por nivel.
+Consulta la tabla alert_history de data/history.db filtrando por nivel,
+tipo y periodo, y muestra las entradas con colores por nivel.
 """
 import customtkinter as ctk
-from datetime import datetime
+from datetime import datetime, timedelta
 from config.settings import COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, Icons
 from ui.styles import make_window_header, make_futuristic_button, StyleManager
 from ui.widgets import confirm_dialog
@@ -30,6 +31,19 @@ KEY_LABELS = {
     "services_failed": f"{Icons.WARNING} Servicios caídos",
 }
 
+# Filtros: etiqueta del desplegable → valor de la consulta (None = sin filtro)
+_ALL = "Todas"
+LEVEL_FILTERS = {_ALL: None, "Aviso": "warn", "Crítico": "crit"}
+PERIOD_FILTERS = {
+    "24h":  timedelta(hours=24),
+    "7d":   timedelta(days=7),
+    "30d":  timedelta(days=30),
+    "Todo": None,
+}
+
+# Tarjetas máximas por carga (cada una son varios widgets Tk)
+_MAX_CARDS = 200
+
 
 class AlertHistoryWindow(ctk.CTkToplevel):
     """
@@ -71,6 +85,10 @@ class AlertHistoryWindow(ctk.CTkToplevel):
         self.transient(parent)
         self.after(150, self.focus_set)
 
+        self._level_var  = ctk.StringVar(master=self, value=_ALL)
+        self._key_var    = ctk.StringVar(master=self, value=_ALL)
+        self._period_var = ctk.StringVar(master=self, value="Todo")
+
         self._create_ui()
         self._load()
         logger.info("[AlertHistoryWindow] Ventana abierta")
@@ -95,6 +113,8 @@ class AlertHistoryWindow(ctk.CTkToplevel):
 
         make_window_header(main, title="HISTORIAL DE ALERTAS", on_close=self.destroy)
 
+        self._create_filters(main)
+
         # Área scrollable
         scroll_container = ctk.CTkFrame(main, fg_color=COLORS['bg_medium'])
         scroll_container.pack(fill="both", expand=True, padx=5, pady=5)
@@ -137,8 +157,60 @@ class AlertHistoryWindow(ctk.CTkToplevel):
             width=12, height=5, font_size=14
         ).pack(side="right", padx=4)
 
+    def _create_filters(self, parent):
+        """
+        Crea la fila de filtros (nivel, tipo y periodo) del historial.
+
+        Args:
+            parent: Frame contenedor.
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        row = ctk.CTkFrame(parent, fg_color=COLORS['bg_dark'], corner_radius=8)
+        row.pack(fill="x", padx=5, pady=(4, 0))
+
+        for text, var, values, width in (
+            ("Nivel:",   self._level_var,  list(LEVEL_FILTERS),                 100),
+            ("Tipo:",    self._key_var,    [_ALL] + list(KEY_LABELS.values()),  240),
+            ("Últimos:", self._period_var, list(PERIOD_FILTERS),                 80),
+        ):
+            ctk.CTkLabel(row, text=text, font=(FONT_FAMILY, FONT_SIZES['small']),
+                         text_color=COLORS['text_dim']).pack(side="left", padx=(8, 4), pady=6)
+            ctk.CTkOptionMenu(
+                row, variable=var, values=values, width=width,
+                font=(FONT_FAMILY, FONT_SIZES['small']),
+                fg_color=COLORS['bg_medium'], button_color=COLORS['primary'],
+                command=lambda _: self._load()
+            ).pack(side="left", padx=(0, 8), pady=6)
+
     # ── Carga ─────────────────────────────────────────────────────────────────
 
+    def _current_filters(self) -> dict:
+        """
+        Traduce los desplegables a argumentos de AlertService.get_history().
+
+        Args:
+            Ninguno
+
+        Returns:
+            dict: key, level y since (None si no se filtra).
+
+        Raises:
+            Ninguno
+        """
+        label = self._key_var.get()
+        key = next((k for k, v in KEY_LABELS.items() if v == label), None)
+        window = PERIOD_FILTERS.get(self._period_var.get())
+        return {
+            "key":   key,
+            "level": LEVEL_FILTERS.get(self._level_var.get()),
+            "since": datetime.now() - window if window else None,
+        }
+
     def _load(self):
         """
         Carga el historial de alertas y actualiza la lista de alertas en la ventana.
@@ -155,7 +227,8 @@ class AlertHistoryWindow(ctk.CTkToplevel):
         for w in self._list_frame.winfo_children():
             w.destroy()
 
-        history = self._alert_service.get_history()
+        filters = self._current_filters()
+        history = self._alert_service.get_history(limit=_MAX_CARDS, **filters)
 
         if not history:
             ctk.CTkLabel(
@@ -172,7 +245,12 @@ class AlertHistoryWindow(ctk.CTkToplevel):
             self._create_entry_card(entry)
 
         total = len(history)
-        self._count_label.configure(text=f"{total} alerta{'s' if total != 1 else ''}")
+        if total >= _MAX_CARDS:
+            total = self._alert_service.count_history(**filters)
+        text = f"{total} alerta{'s' if total != 1 else ''}"
+        if total > len(history):
+            text += f" (mostrando las {len(history)} más recientes)"
+        self._count_label.configure(text=text)
 
     def _create_entry_card(self, entry: dict):
         """
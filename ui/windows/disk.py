@@ -7,6 +7,7 @@ from config.settings import (COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH,
 from ui.styles import StyleManager, make_window_header
 from ui.widgets import GraphWidget
 from core.disk_monitor import DiskMonitor
+from ui.refresh_loop import RefreshLoop
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,8 +15,8 @@ logger = get_logger(__name__)
 _COL_W   = (DSI_WIDTH - 70) // 2
 _GRAPH_H = 95
 
-# Cada cuántos ciclos de _update se refresca el SMART (es lento — smartctl tarda ~1s)
-# UPDATE_MS suele ser 1000ms → cada 30 ciclos = cada 30 segundos
+# Cada cuántos ciclos de _update se repintan las etiquetas SMART. Solo lee el
+# caché del SmartCollector (smartctl corre en su thread cada pocos minutos).
 _SMART_EVERY = 30
 
 
@@ -50,9 +51,13 @@ class DiskWindow(ctk.CTkToplevel):
         self._widgets = {}
         self._graphs  = {}
 
-        self._smart_tick = 0          # contador de ciclos para el SMART
+        self._smart_tick = _SMART_EVERY   # contador de ciclos para el SMART (pinta al abrir)
         self._smart_cache = {}        # último resultado SMART
 
+        self._device_var  = ctk.StringVar(master=self, value="--")
+        self._device_list = []        # dispositivos mostrados en el selector
+        self._mount_rows  = {}        # mountpoint → (barra, etiqueta)
+
         self.title("Monitor de Disco")
         self.configure(fg_color=COLORS['bg_medium'])
         self.overrideredirect(True)
@@ -60,7 +65,8 @@ class DiskWindow(ctk.CTkToplevel):
         self.resizable(False, False)
 
         self._create_ui()
-        self._update()
+        self._refresh = RefreshLoop(self, self._update, UPDATE_MS)
+        self._refresh.start()
         logger.info("[DiskWindow] Ventana Abierta")
 
 
@@ -115,17 +121,21 @@ class DiskWindow(ctk.CTkToplevel):
         self._create_cell(grid, 1, 0, "ESCRITURA", "disk_write", "MB/s", _GRAPH_H)
         self._create_cell(grid, 1, 1, "LECTURA",   "disk_read",  "MB/s", _GRAPH_H)
 
+        self._create_device_section(inner)
+        self._create_mounts_section(inner)
+
         # ── Tarjeta SMART NVMe (ancha, debajo del grid) ──
         smart_card = ctk.CTkFrame(inner, fg_color=COLORS['bg_dark'], corner_radius=8)
         smart_card.pack(fill="x", padx=5, pady=(0, 5))
 
-        ctk.CTkLabel(
+        self._smart_title = ctk.CTkLabel(
             smart_card,
             text=f"{Icons.MONITOR_DISCO} NVMe SMART",
             font=(FONT_FAMILY, FONT_SIZES['small'], "bold"),
             text_color=COLORS['primary'],
             anchor="w",
-        ).pack(anchor="w", padx=8, pady=(6, 4))
+        )
+        self._smart_title.pack(anchor="w", padx=8, pady=(6, 4))
 
         # Fila 1: Horas de uso / Ciclos de encendido / Apagados bruscos
         row1 = ctk.CTkFrame(smart_card, fg_color="transparent")
@@ -159,6 +169,86 @@ class DiskWindow(ctk.CTkToplevel):
         ]):
             self._create_smart_col(row2, col_idx, key, title)
 
+    def _create_device_section(self, parent):
+        """
+        Crea la vista por dispositivo de bloque: selector y cuatro celdas con gráfica.
+
+        Args:
+            parent: Widget contenedor.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        bar = ctk.CTkFrame(parent, fg_color=COLORS['bg_dark'], corner_radius=8)
+        bar.pack(fill="x", padx=5, pady=(5, 0))
+
+        ctk.CTkLabel(
+            bar,
+            text=f"{Icons.MONITOR_DISCO} POR DISPOSITIVO",
+            font=(FONT_FAMILY, FONT_SIZES['small'], "bold"),
+            text_color=COLORS['primary'],
+        ).pack(side="left", padx=8, pady=6)
+
+        self._device_menu = ctk.CTkOptionMenu(
+            bar,
+            variable=self._device_var,
+            values=["--"],
+            width=120,
+            font=(FONT_FAMILY, FONT_SIZES['small']),
+            fg_color=COLORS['bg_medium'],
+            button_color=COLORS['primary'],
+            command=lambda _dev: self._update_device(),
+        )
+        self._device_menu.pack(side="left", padx=4, pady=6)
+
+        self._device_info = ctk.CTkLabel(
+            bar, text="",
+            font=(FONT_FAMILY, FONT_SIZES['small']),
+            text_color=COLORS['text_dim'],
+        )
+        self._device_info.pack(side="right", padx=8, pady=6)
+
+        grid = ctk.CTkFrame(parent, fg_color=COLORS['bg_medium'])
+        grid.pack(fill="x")
+        grid.grid_columnconfigure(0, weight=1)
+        grid.grid_columnconfigure(1, weight=1)
+
+        self._create_cell(grid, 0, 0, "ESCRITURA", "dev_write", "MB/s", _GRAPH_H)
+        self._create_cell(grid, 0, 1, "LECTURA",   "dev_read",  "MB/s", _GRAPH_H)
+        self._create_cell(grid, 1, 0, "IOPS",      "dev_iops",  "IOPS", _GRAPH_H)
+        self._create_cell(grid, 1, 1, "LATENCIA",  "dev_await", "ms",   _GRAPH_H)
+
+    def _create_mounts_section(self, parent):
+        """
+        Crea la tarjeta de uso por sistema de archivos montado (filas dinámicas).
+
+        Args:
+            parent: Widget contenedor.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        card = ctk.CTkFrame(parent, fg_color=COLORS['bg_dark'], corner_radius=8)
+        card.pack(fill="x", padx=5, pady=(0, 5))
+
+        ctk.CTkLabel(
+            card,
+            text=f"{Icons.MONITOR_DISCO} SISTEMAS DE ARCHIVOS",
+            font=(FONT_FAMILY, FONT_SIZES['small'], "bold"),
+            text_color=COLORS['primary'],
+            anchor="w",
+        ).pack(anchor="w", padx=8, pady=(6, 4))
+
+        self._mounts_frame = ctk.CTkFrame(card, fg_color="transparent")
+        self._mounts_frame.pack(fill="x", padx=8, pady=(0, 8))
+        self._mounts_frame.grid_columnconfigure(1, weight=1)
+
     def _create_cell(self, parent, row, col, title, key, unit, graph_h):
         """
         Crea una celda con gráfica en la ventana de disco.
@@ -252,10 +342,8 @@ class DiskWindow(ctk.CTkToplevel):
             return
         if not self._disk_monitor.is_running():
             StyleManager.show_service_stopped_banner(self._content_inner, "Disk Monitor")
-            self.after(UPDATE_MS, self._update)
             return
         stats   = self._disk_monitor.get_current_stats()
-        self._disk_monitor.update_history(stats)
         history = self._disk_monitor.get_history()
 
         # Métricas originales con gráfica
@@ -267,13 +355,98 @@ class DiskWindow(ctk.CTkToplevel):
         self._header.status_label.configure(
             text=f"Uso {stats['disk_usage']:.0f}%  ·  NVMe {stats['nvme_temp']:.0f}°C")
 
+        self._update_device()
+        self._update_mounts()
+
         # SMART — solo cada _SMART_EVERY ciclos (smartctl es lento)
         self._smart_tick += 1
         if self._smart_tick >= _SMART_EVERY:
             self._smart_tick = 0
             self._refresh_smart()
 
-        self.after(UPDATE_MS, self._update)
+
+    def _update_device(self):
+        """
+        Actualiza el selector de dispositivos y las celdas del dispositivo elegido.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        devices = self._disk_monitor.get_device_stats()
+        names = sorted(devices)
+        if names != self._device_list:
+            self._device_list = names
+            self._device_menu.configure(values=names or ["--"])
+            if self._device_var.get() not in names:
+                self._device_var.set(names[0] if names else "--")
+
+        rates = devices.get(self._device_var.get())
+        if not rates:
+            self._device_info.configure(text="")
+            return
+        hist = self._disk_monitor.get_device_history(self._device_var.get())
+
+        self._update_io('dev_write', rates['write_mb'], hist['write_mb'])
+        self._update_io('dev_read',  rates['read_mb'],  hist['read_mb'])
+        iops_hist = [r + w for r, w in zip(hist['read_iops'], hist['write_iops'])]
+        self._update_scaled('dev_iops', rates['read_iops'] + rates['write_iops'], iops_hist,
+                            "IOPS", floor=50, warn=500, crit=2000, decimals=0)
+        self._update_scaled('dev_await', rates['await_ms'], hist['await_ms'],
+                            "ms", floor=10, warn=20, crit=100, decimals=1)
+        self._device_info.configure(
+            text=f"Cola {rates['queue_depth']:.2f}  ·  Ocupado {rates['util']:.0f}%")
+
+    def _update_mounts(self):
+        """
+        Actualiza las filas de uso por punto de montaje, recreándolas si cambian los montajes.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        mounts = self._disk_monitor.get_mount_stats()
+        keys = [m['mountpoint'] for m in mounts]
+        if keys != list(self._mount_rows):
+            for child in self._mounts_frame.winfo_children():
+                child.destroy()
+            self._mount_rows = {}
+            for row, mp in enumerate(keys):
+                ctk.CTkLabel(
+                    self._mounts_frame, text=mp,
+                    font=(FONT_FAMILY, FONT_SIZES['small']),
+                    text_color=COLORS['text'], anchor="w",
+                ).grid(row=row, column=0, sticky="w", padx=(0, 8), pady=2)
+                bar = ctk.CTkProgressBar(
+                    self._mounts_frame,
+                    fg_color=COLORS['bg_light'],
+                    height=12,
+                )
+                bar.grid(row=row, column=1, sticky="ew", pady=2)
+                lbl = ctk.CTkLabel(
+                    self._mounts_frame, text="",
+                    font=(FONT_FAMILY, FONT_SIZES['small']),
+                    text_color=COLORS['text_dim'], anchor="e",
+                )
+                lbl.grid(row=row, column=2, sticky="e", padx=(8, 0), pady=2)
+                self._mount_rows[mp] = (bar, lbl)
+
+        for m in mounts:
+            bar, lbl = self._mount_rows[m['mountpoint']]
+            color = self._disk_monitor.level_color(m['percent'], 60, 80)
+            bar.configure(progress_color=color)
+            bar.set(m['percent'] / 100.0)
+            lbl.configure(text=f"{m['used_gb']:.1f}/{m['total_gb']:.1f} GB  {m['percent']:.0f}%")
 
     def _refresh_smart(self):
         """
@@ -290,6 +463,7 @@ class DiskWindow(ctk.CTkToplevel):
         """
         smart = self._disk_monitor.get_nvme_smart()
         self._smart_cache = smart
+        self._smart_title.configure(text=self._fmt_smart_title(smart))
 
         if not smart.get("available"):
             for key in ("power_on_hours", "power_cycles", "unsafe_shutdowns",
@@ -368,6 +542,23 @@ class DiskWindow(ctk.CTkToplevel):
 
     # ── Formateo ──────────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _fmt_smart_title(smart: dict) -> str:
+        """
+        Título de la tarjeta SMART con la antigüedad de la última lectura.
+
+        Args:
+            smart (dict): Resultado de get_nvme_smart().
+
+        Returns:
+            str: Título, ej. 'NVMe SMART · hace 3 min'.
+        """
+        title = f"{Icons.MONITOR_DISCO} NVMe SMART"
+        age = smart.get("age_s")
+        if age is None:
+            return title
+        return f"{title}  ·  hace {int(age // 60)} min"
+
     @staticmethod
     def _fmt_hours(hours) -> str:
         """
@@ -441,6 +632,32 @@ class DiskWindow(ctk.CTkToplevel):
         g = self._graphs[key]
         g['widget'].update(history, g['max_val'], color)
 
+    def _update_scaled(self, key, value, history, unit, floor, warn, crit, decimals):
+        """
+        Actualiza una celda cuya escala se ajusta al máximo del historial (IOPS, latencia).
+
+        Args:
+            key (str): Identificador de la celda.
+            value (float): Valor actual.
+            history (list): Historial.
+            unit (str): Unidad a mostrar.
+            floor (float): Escala mínima de la gráfica.
+            warn (float): Umbral de advertencia.
+            crit (float): Umbral crítico.
+            decimals (int): Decimales del valor mostrado.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        color = self._disk_monitor.level_color(value, warn, crit)
+        self._widgets[f"{key}_value"].configure(text=f"{value:.{decimals}f} {unit}", text_color=color)
+        self._widgets[f"{key}_label"].configure(text_color=color)
+        g = self._graphs[key]
+        g['widget'].update(history, max(floor, max(history, default=0) * 1.2), color)
+
     def _update_io(self, key, value, history):
         """
         Actualiza label, color y gráfico para métricas de I/O (lectura/escritura).
@@ -5,7 +5,8 @@ Modos de operación (toggle en barra superior):
   LIBRE       — dashboard libera todos los pines. Los scripts externos
                 pueden usarlos sin conflictos.
   CONTROLANDO — dashboard reclama los pines con gpiozero.
-                INPUT: lectura en tiempo real.
+                INPUT: estado por flancos (evento gpio.input_changed) con
+                       pulsos, frecuencia, duty cycle y tiempo entre flancos.
                 OUTPUT: botón toggle HIGH/LOW.
                 PWM: slider 0–100% duty cycle.
 
@@ -30,6 +31,8 @@ from config.settings import (COLORS, FONT_FAMILY, FONT_SIZES,
                               DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, Icons)
 from ui.styles import StyleManager, make_window_header, make_futuristic_button
 from utils.logger import get_logger
+from core.event_bus import get_event_bus
+from core.events import GPIO_INPUT_CHANGED
 from core.gpio_monitor import (MODE_INPUT, MODE_OUTPUT, MODE_PWM, VALID_MODES,
                                 OP_CONTROLANDO, OP_LIBRE)
 
@@ -102,6 +105,7 @@ class GPIOWindow(ctk.CTkToplevel):
         self._last_op_mode: str = self._monitor.get_op_mode()
 
         self._create_ui()
+        get_event_bus().subscribe(GPIO_INPUT_CHANGED, self._on_input_changed)
         self._update()
         logger.info("[GPIOWindow] Ventana abierta")
 
@@ -395,7 +399,7 @@ class GPIOWindow(ctk.CTkToplevel):
             "dot": dot_c, "oval": oval,
             "lbl_mode": lbl_mode, "lbl_label": lbl_label, "mode": mode,
             "lbl_state": None, "btn_toggle": None,
-            "slider": None, "lbl_duty": None,
+            "slider": None, "lbl_duty": None, "lbl_edges": None,
         }
 
         if is_libre:
@@ -414,6 +418,14 @@ class GPIOWindow(ctk.CTkToplevel):
             lbl_state.pack(side="left", padx=4)
             row_w["lbl_state"] = lbl_state
 
+            lbl_edges = ctk.CTkLabel(
+                ctrl, text="",
+                font=(FONT_FAMILY, FONT_SIZES['small']),
+                text_color=COLORS['text_dim'], anchor="w",
+            )
+            lbl_edges.pack(side="left", padx=(8, 4))
+            row_w["lbl_edges"] = lbl_edges
+
         elif mode == MODE_OUTPUT:
             lbl_state = ctk.CTkLabel(
                 ctrl, text="LOW",
@@ -516,14 +528,7 @@ class GPIOWindow(ctk.CTkToplevel):
                 rw["lbl_label"].configure(text=data.get("label", f"GPIO {pin}"))
 
                 if mode == MODE_INPUT and rw["lbl_state"]:
-                    if error:
-                        rw["lbl_state"].configure(text="ERR", text_color=_C_ERR)
-                    elif value is None:
-                        rw["lbl_state"].configure(text="—", text_color=_C_NONE)
-                    elif value:
-                        rw["lbl_state"].configure(text="HIGH", text_color=_C_HIGH)
-                    else:
-                        rw["lbl_state"].configure(text="LOW", text_color=_C_LOW)
+                    self._render_input(rw, value, error, data)
 
                 if mode == MODE_OUTPUT and rw["lbl_state"] and rw["btn_toggle"]:
                     if error:
@@ -548,6 +553,70 @@ class GPIOWindow(ctk.CTkToplevel):
 
         self.after(_REFRESH_MS, self._update)
 
+    def _on_input_changed(self, data: dict):
+        """
+        Repinta una entrada al recibir 'gpio.input_changed' (thread de Tk).
+
+        Args:
+            data (dict): Payload con 'pin', 'value', 'ts_ns' y 'stats'.
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        if not self.winfo_exists() or self._monitor.get_op_mode() == OP_LIBRE:
+            return
+        rw = self._rows.get(data["pin"])
+        if rw is None or rw["mode"] != MODE_INPUT or not rw["lbl_state"]:
+            return
+        value = data["value"]
+        rw["dot"].itemconfigure(
+            rw["oval"], fill=_C_HIGH if value else _C_LOW)
+        self._render_input(rw, value, None, data["stats"])
+
+    @staticmethod
+    def _render_input(rw: dict, value, error, stats: dict):
+        """
+        Pinta el estado y los contadores de flancos de una fila INPUT.
+
+        Args:
+            rw (dict): Widgets de la fila.
+            value (bool | None): Estado actual del pin.
+            error (str | None): Error del pin, si lo hay.
+            stats (dict): pulses, freq_hz, duty_cycle y last_interval_ms.
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        if error:
+            rw["lbl_state"].configure(text="ERR", text_color=_C_ERR)
+        elif value is None:
+            rw["lbl_state"].configure(text="—", text_color=_C_NONE)
+        elif value:
+            rw["lbl_state"].configure(text="HIGH", text_color=_C_HIGH)
+        else:
+            rw["lbl_state"].configure(text="LOW", text_color=_C_LOW)
+
+        if rw["lbl_edges"] is None:
+            return
+        pulses = stats.get("pulses")
+        if error or pulses is None:
+            rw["lbl_edges"].configure(text="")
+            return
+        parts = [f"{pulses} pulsos"]
+        if stats.get("freq_hz"):
+            parts.append(f"{stats['freq_hz']:.1f} Hz")
+        if stats.get("duty_cycle") is not None:
+            parts.append(f"duty {stats['duty_cycle'] * 100:.0f}%")
+        if stats.get("last_interval_ms") is not None:
+            parts.append(f"Δ {stats['last_interval_ms']:.3f} ms")
+        rw["lbl_edges"].configure(text="  ·  ".join(parts))
+
     # ── Acciones OUTPUT ───────────────────────────────────────────────────────
 
     def _toggle_output(self, pin: int):
@@ -674,6 +743,7 @@ class GPIOWindow(ctk.CTkToplevel):
         Raises: 
             Ninguno
         """
+        get_event_bus().unsubscribe(GPIO_INPUT_CHANGED, self._on_input_changed)
         logger.info("[GPIOWindow] Ventana cerrada")
         super().destroy()
 
@@ -271,7 +271,8 @@ class HistoryWindow(ctk.CTkToplevel):
         graphs_frame = ctk.CTkFrame(parent, fg_color=COLORS['bg_medium'])
         graphs_frame.pack(fill="both", expand=True, padx=(0, 10), pady=(0, 10))
 
-        self._fig = Figure(figsize=(9, 20), facecolor=COLORS['bg_medium'])
+        n_graphs = len(self._METRICS) + len(self._PIHOLE_METRICS)
+        self._fig = Figure(figsize=(9, 2.5 * n_graphs), facecolor=COLORS['bg_medium'])
         self._fig.set_tight_layout(True)
 
         self._canvas = FigureCanvasTkAgg(self._fig, master=graphs_frame)
@@ -508,6 +509,17 @@ class HistoryWindow(ctk.CTkToplevel):
             hours  = {"24h": 24, "7d": 24 * 7, "30d": 24 * 30}[period]
             stats  = self._analyzer.get_stats(hours)
             rango_label = period
+            end    = datetime.now()
+            start  = end - timedelta(hours=hours)
+
+        # Totales DNS del rango: un solo tramo que cubre todo el periodo
+        span_min = int((end - start).total_seconds() // 60) + 1
+        dns = self._analyzer.get_pihole_rollup(start, end, bucket_minutes=span_min)
+        dns_queries = sum(b['queries'] or 0 for b in dns)
+        dns_blocked = sum(b['blocked'] or 0 for b in dns)
+        dns_cached  = sum(b['cached'] or 0 for b in dns)
+        dns_pct     = 100.0 * dns_blocked / dns_queries if dns_queries else 0.0
+        dns_cache   = 100.0 * dns_cached / dns_queries if dns_queries else 0.0
 
         total_records = self._logger.get_metrics_count()
         db_size       = self._logger.get_db_size_mb()
@@ -535,6 +547,8 @@ class HistoryWindow(ctk.CTkToplevel):
             f"• Uptime promedio: {stats.get('uptime_avg')}\n"
             f"• Uptime maximo: {stats.get('uptime_max')}\n"
             f"• Uptime minimo: {stats.get('uptime_min')}\n"
+            f"• DNS: {dns_queries:,} consultas  "
+            f"(bloqueadas: {dns_pct:.1f}%, caché: {dns_cache:.1f}%)\n"
             f"• Muestras: {stats.get('total_samples', 0)} en {rango_label}\n"
             f"• Total registros: {total_records}  |  DB: {db_size:.2f} MB"
         )
@@ -558,8 +572,51 @@ class HistoryWindow(ctk.CTkToplevel):
         ('disk_read_mb',    'Disk Read MB/s',  'primary'),
         ('disk_write_mb',   'Disk Write MB/s', 'secondary'),
         ('fan_pwm',         'PWM',             'warning'),
+        ('cpu_freq_mhz',    'CPU MHz',         'primary'),
     ]
 
+    # Serie temporal de Pi-hole (tabla pihole_metrics, agregada por tramos)
+    _PIHOLE_METRICS = [
+        ('queries_per_min', 'DNS consultas/min', 'primary'),
+        ('block_percent',   'DNS bloqueo %',     'danger'),
+    ]
+
+    @staticmethod
+    def _pihole_bucket_minutes(start: datetime, end: datetime) -> int:
+        """
+        Elige el tramo de agregación de Pi-hole según la duración del rango.
+
+        Args:
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+
+        Returns:
+            int: Minutos por tramo (10 hasta 1 día, 60 hasta 7 días, 240 a partir de ahí).
+        """
+        span_h = (end - start).total_seconds() / 3600
+        if span_h <= 24:
+            return 10
+        if span_h <= 24 * 7:
+            return 60
+        return 240
+
+    def _draw_pihole(self, axes, start: datetime, end: datetime):
+        """
+        Dibuja las gráficas de carga DNS de Pi-hole en los ejes indicados.
+
+        Args:
+            axes: Ejes reservados para _PIHOLE_METRICS, en el mismo orden.
+            start (datetime): Fecha de inicio.
+            end (datetime): Fecha de fin.
+
+        Returns:
+            None
+        """
+        bucket = self._pihole_bucket_minutes(start, end)
+        for (metric, ylabel, color_key), ax in zip(self._PIHOLE_METRICS, axes):
+            ts, vals = self._analyzer.get_pihole_graph_data(metric, start, end, bucket)
+            self._draw_metric(ax, ts, vals, ylabel, COLORS[color_key])
+
     def _update_graphs(self, hours: int):
         """
         Actualiza todas las gráficas de métricas para un período fijo en horas.
@@ -574,10 +631,13 @@ class HistoryWindow(ctk.CTkToplevel):
             None
         """
         self._fig.clear()
-        axes = [self._fig.add_subplot(8, 1, i) for i in range(1, 9)]
+        n = len(self._METRICS) + len(self._PIHOLE_METRICS)
+        axes = [self._fig.add_subplot(n, 1, i) for i in range(1, n + 1)]
         for (metric, ylabel, color_key), ax in zip(self._METRICS, axes):
             ts, vals = self._analyzer.get_graph_data(metric, hours)
             self._draw_metric(ax, ts, vals, ylabel, COLORS[color_key])
+        end = datetime.now()
+        self._draw_pihole(axes[len(self._METRICS):], end - timedelta(hours=hours), end)
         self._fig.tight_layout()
         self._canvas.draw()
 
@@ -596,10 +656,12 @@ class HistoryWindow(ctk.CTkToplevel):
             None
         """
         self._fig.clear()
-        axes = [self._fig.add_subplot(8, 1, i) for i in range(1, 9)]
+        n = len(self._METRICS) + len(self._PIHOLE_METRICS)
+        axes = [self._fig.add_subplot(n, 1, i) for i in range(1, n + 1)]
         for (metric, ylabel, color_key), ax in zip(self._METRICS, axes):
             ts, vals = self._analyzer.get_graph_data_between(metric, start, end)
             self._draw_metric(ax, ts, vals, ylabel, COLORS[color_key])
+        self._draw_pihole(axes[len(self._METRICS):], start, end)
         self._fig.tight_layout()
         self._canvas.draw()
 
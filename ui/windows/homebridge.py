@@ -1,12 +1,17 @@
 """
 Ventana de control de dispositivos Homebridge
 Muestra enchufes e interruptores y permite encenderlos / apagarlos
+
+No sondea por su cuenta: se suscribe a los cambios que publica el
+HomebridgeMonitor y reconstruye solo las tarjetas de los accesorios cambiados.
 """
 import threading
 import customtkinter as ctk
 from config.settings import COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, UPDATE_MS, Icons
 from ui.styles import StyleManager, make_futuristic_button, make_window_header, make_homebridge_switch
 from ui.widgets import custom_msgbox
+from core.event_bus import get_event_bus
+from core.events import HOMEBRIDGE_ACCESSORIES_CHANGED
 from core.homebridge_monitor import HomebridgeMonitor
 from utils.logger import get_logger
 
@@ -47,8 +52,10 @@ class HomebridgeWindow(ctk.CTkToplevel):
         super().__init__(parent)
         self._hb = homebridge_monitor
         self._accessories = []
+        self._cards       = {}     # uniqueId → (tarjeta, fila, columna)
+        self._reachable   = None
+        self._stopped     = False  # mostrando el aviso de servicio parado
         self._update_job  = None
-        self._busy        = False
 
         self.title("Homebridge")
         self.configure(fg_color=COLORS['bg_medium'])
@@ -57,6 +64,7 @@ class HomebridgeWindow(ctk.CTkToplevel):
         self.resizable(False, False)
 
         self._create_ui()
+        get_event_bus().subscribe(HOMEBRIDGE_ACCESSORIES_CHANGED, self._on_accessories_changed)
         self._schedule_update()
         logger.info("[HomebridgeWindow] Ventana abierta")
 
@@ -143,7 +151,7 @@ class HomebridgeWindow(ctk.CTkToplevel):
 
     def _schedule_update(self):
         """
-        Programa la actualización periódica de los dispositivos.
+        Pinta la caché actual, pide un sondeo inmediato y programa la comprobación del servicio.
 
         Args: 
             Ninguno
@@ -154,7 +162,12 @@ class HomebridgeWindow(ctk.CTkToplevel):
         Raises: 
             Ninguno
         """
-        self._update_job = self.after(100, self._fetch_and_render)
+        if self._hb.is_running():
+            self._set_status("Actualizando...")
+            if self._hb.get_version():
+                self._render(self._hb.get_accessories_cached())
+            self._hb.request_refresh()
+        self._update_job = self.after(100, self._check_service)
 
     def _force_refresh(self):
         """
@@ -169,13 +182,21 @@ class HomebridgeWindow(ctk.CTkToplevel):
         Raises:
             Ninguno
         """
-        if self._update_job:
-            self.after_cancel(self._update_job)
-        self._fetch_and_render()
+        if not self._hb.is_running():
+            self._show_stopped()
+            return
+        self._set_status("Actualizando...")
+        self._hb.request_refresh()
+        # Si nada cambia no llega ningún evento: restaurar el resumen
+        if self._reachable is not None:
+            self.after(1500, self._update_summary)
 
-    def _fetch_and_render(self):
+    def _check_service(self):
         """
-        Obtiene los accesorios de Homebridge y los renderiza en la UI de forma asíncrona.
+        Muestra el aviso de servicio parado mientras el monitor esté detenido.
+
+        Los datos llegan por el EventBus; este bucle solo vigila el estado del
+        servicio y refresca el resumen (indicador "en vivo" del socket).
 
         Args: Ninguno
 
@@ -184,44 +205,73 @@ class HomebridgeWindow(ctk.CTkToplevel):
         Raises: Ninguno
         """
         if not self._hb.is_running():
+            self._show_stopped()
+        elif self._stopped:
+            self._render(self._hb.get_accessories_cached())
+        elif self._reachable is not None:
+            self._update_summary()   # el estado del socket no publica eventos
+        self._update_job = self.after(HB_UPDATE_MS, self._check_service)
+
+    def _show_stopped(self):
+        """
+        Sustituye las tarjetas por el aviso de servicio parado (una sola vez).
+
+        Args: Ninguno
+
+        Returns: Ninguno
+        """
+        if not self._stopped:
+            self._stopped   = True
+            self._cards     = {}
+            self._reachable = None
             StyleManager.show_service_stopped_banner(self._device_frame, "Homebridge Monitor")
-            self._update_job = self.after(HB_UPDATE_MS, self._fetch_and_render)
-            return
 
-        if self._busy:
-            return
+    def _on_accessories_changed(self, data: dict):
+        """
+        Aplica un cambio publicado por el monitor reconstruyendo solo las tarjetas afectadas.
 
-        self._busy = True
-        self._set_status("Actualizando...")
+        Si cambia el conjunto u orden de accesorios, o la alcanzabilidad, repinta la rejilla completa.
 
-        def fetch():
-            """Función interna para obtener accesorios de Homebridge y renderizar."""
-            accessories = self._hb.get_accessories()
-            if self.winfo_exists():
-                self.after(0, lambda: self._render(accessories))
+        Args:
+            data (dict): Payload de homebridge.accessories_changed.
 
-        threading.Thread(target=fetch, daemon=True, name="HB-Fetch").start()
+        Returns:
+            None
+        """
+        if not self._hb.is_running():
+            return
+        accessories = self._hb.get_accessories_cached()
+        if data["reachable"] != self._reachable or data["order"] != list(self._cards):
+            self._render(accessories)
+            return
 
-    def _render(self, accessories):
+        self._accessories = accessories
+        self._update_summary()
+        for acc in data["changed"]:
+            entry = self._cards.get(acc["uniqueId"])
+            if entry is None:
+                continue
+            card, row, col = entry
+            card.destroy()
+            self._cards[acc["uniqueId"]] = (self._create_device_card(acc, row, col), row, col)
+
+    def _update_summary(self):
         """
-        Renderiza la lista de accesorios en tarjetas de dispositivos en la interfaz.
+        Actualiza la cabecera y la barra de estado con el resumen de accesorios.
 
         Args:
-            accessories (list): Lista de accesorios a renderizar.
+            Ninguno
 
         Returns:
             None
-
-        Raises:
-            Exception: Si ocurre un error al configurar la etiqueta de estado.
         """
-        self._accessories = accessories
-        self._busy = False
-
-        if self._hb.is_reachable():
+        accessories = self._accessories
+        if self._reachable:
             on_count      = sum(1 for a in accessories if a.get('on', False))
             total         = len(accessories)
             header_status = f"{on_count}/{total} encendidos"
+            if self._hb.is_streaming():
+                header_status += " · en vivo"
             self._set_status(
                 f"{total} dispositivo{'s' if total != 1 else ''} "
                 f"encontrado{'s' if total != 1 else ''}"
@@ -235,13 +285,34 @@ class HomebridgeWindow(ctk.CTkToplevel):
         except Exception:
             pass
 
+    def _render(self, accessories):
+        """
+        Renderiza la lista completa de accesorios en tarjetas de dispositivos en la interfaz.
+
+        Args:
+            accessories (list): Lista de accesorios a renderizar.
+
+        Returns:
+            None
+
+        Raises:
+            Exception: Si ocurre un error al configurar la etiqueta de estado.
+        """
+        self._accessories = accessories
+        self._reachable   = self._hb.is_reachable()
+        self._stopped     = False
+        self._update_summary()
+
         for widget in self._device_frame.winfo_children():
             widget.destroy()
+        self._cards = {}
 
+        if not self._reachable:
+            accessories = []
         if not accessories:
             msg = (
                 "Sin conexión con Homebridge"
-                if not self._hb.is_reachable()
+                if not self._reachable
                 else "No se encontraron enchufes ni interruptores"
             )
             ctk.CTkLabel(
@@ -254,9 +325,8 @@ class HomebridgeWindow(ctk.CTkToplevel):
             self._device_frame.grid_columnconfigure(0, weight=1, uniform="col")
             self._device_frame.grid_columnconfigure(1, weight=1, uniform="col")
             for idx, acc in enumerate(accessories):
-                self._create_device_card(acc, idx // 2, idx % 2)
-
-        self._update_job = self.after(HB_UPDATE_MS, self._fetch_and_render)
+                row, col = idx // 2, idx % 2
+                self._cards[acc["uniqueId"]] = (self._create_device_card(acc, row, col), row, col)
 
     # ── Tarjetas ──────────────────────────────────────────────────────────────
 
@@ -270,7 +340,7 @@ class HomebridgeWindow(ctk.CTkToplevel):
             grid_col (int): Columna de la cuadrícula donde se posicionará la tarjeta.
 
         Returns:
-            None
+            CTkFrame: La tarjeta creada.
         """
         dev_type = acc.get("type", "switch")
         is_fault = acc.get("fault", False)
@@ -300,6 +370,7 @@ class HomebridgeWindow(ctk.CTkToplevel):
             self._card_sensor(card, acc)
         elif dev_type == "blind":
             self._card_blind(card, acc, disabled)
+        return card
 
     def _card_switch(self, card, acc, disabled):
         """
@@ -503,21 +574,15 @@ class HomebridgeWindow(ctk.CTkToplevel):
         """
         """Envía el comando ON/OFF en background."""
         if not self._hb.is_running():
-            StyleManager.show_service_stopped_banner(self._device_frame, "Homebridge Monitor")
-            self._update_job = self.after(HB_UPDATE_MS, self._fetch_and_render)
-            return
-
-        if self._busy:
+            self._show_stopped()
             return
 
         def send():
-            """Ejecuta el toggle en Homebridge y maneja respuesta."""
+            """Ejecuta el toggle en Homebridge; el monitor actualiza la caché y publica el cambio."""
             ok = self._hb.toggle(unique_id, turn_on)
             if not self.winfo_exists():
                 return
-            if ok:
-                self.after(500, self._force_refresh)
-            else:
+            if not ok:
                 self.after(
                     0,
                     lambda: custom_msgbox(
@@ -549,7 +614,7 @@ class HomebridgeWindow(ctk.CTkToplevel):
 
     def _on_close(self):
         """
-        Maneja el cierre de la ventana, cancelando trabajos pendientes y liberando recursos.
+        Maneja el cierre de la ventana desde el botón de cerrar.
 
         Args: 
             None
@@ -560,7 +625,28 @@ class HomebridgeWindow(ctk.CTkToplevel):
         Raises: 
             None
         """
+        self.destroy()
+
+    def destroy(self):
+        """
+        Destruye la ventana cancelando trabajos pendientes y la suscripción al EventBus.
+
+        Se ejecuta por cualquier vía de cierre (botón, gestor de ventanas o
+        destrucción del padre), así el bus nunca guarda un handler de un
+        widget muerto.
+
+        Args: 
+            Ninguno
+
+        Returns: 
+            Ninguno
+
+        Raises: 
+            Ninguno
+        """
         if self._update_job:
             self.after_cancel(self._update_job)
+            self._update_job = None
+        get_event_bus().unsubscribe(HOMEBRIDGE_ACCESSORIES_CHANGED, self._on_accessories_changed)
         logger.info("[HomebridgeWindow] Ventana cerrada")
-        self.destroy()
+        super().destroy()
@@ -2,11 +2,12 @@
 ui/windows/i2c_window.py
 
 Ventana de escaneo I2C — muestra dispositivos detectados en cada bus.
-Solo lectura. Refresco manual o automático cada 30s.
+Solo lectura. El monitor comprueba la presencia de los dispositivos conocidos
+mientras la ventana está abierta; el barrido completo es manual. Solo se
+repinta cuando cambia la versión de las estadísticas.
 """
 import tkinter as tk
 import time
-import threading
 import customtkinter as ctk
 from config.settings import COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, Icons
 from ui.styles import StyleManager, make_window_header, make_futuristic_button
@@ -30,7 +31,7 @@ class I2CWindow(ctk.CTkToplevel):
         Ninguno.
     """
 
-    _REFRESH_MS = 30_000   # refresco automático cada 30s
+    _REFRESH_MS = 1000   # consulta de la versión de las estadísticas
 
     def __init__(self, parent, i2c_monitor):
         """
@@ -48,6 +49,7 @@ class I2CWindow(ctk.CTkToplevel):
         self._mon          = i2c_monitor
         self._after_id     = None
         self._scanning     = False
+        self._rendered_version = None
 
         self.title("Scanner I2C")
         self.configure(fg_color=COLORS['bg_medium'])
@@ -158,9 +160,39 @@ class I2CWindow(ctk.CTkToplevel):
             StyleManager.show_service_stopped_banner(self._inner, "I2C Monitor" )
             self._scan_btn.configure(state="disabled")
             return
-        self._render(self._mon.get_stats())
+        self._scan_btn.configure(state="disabled" if self._scanning else "normal")
+        stats = self._mon.get_stats()
+        if stats.get("version") != self._rendered_version:
+            self._rendered_version = stats.get("version")
+            self._render(stats)
+        if self._scanning and not stats.get("scanning"):
+            self._scanning = False
+            self._scan_btn.configure(state="normal")
+        self._update_status(stats)
         self._after_id = self.after(self._REFRESH_MS, self._update)
 
+    def _update_status(self, stats: dict) -> None:
+        """
+        Actualiza la etiqueta de estado con la antigüedad del último barrido
+        y de la última comprobación, sin repintar la lista.
+
+        Args:
+            stats (dict): Estadísticas de I2CMonitor.
+
+        Returns:
+            None
+        """
+        if self._scanning or stats.get("scanning"):
+            self._status_lbl.configure(text="Escaneando...")
+            return
+        now = time.time()
+        parts = []
+        if stats.get("last_full_scan"):
+            parts.append(f"barrido hace {int(now - stats['last_full_scan'])}s")
+        if stats.get("last_check"):
+            parts.append(f"comprobado hace {int(now - stats['last_check'])}s")
+        self._status_lbl.configure(text=" · ".join(parts))
+
     def _render(self, stats: dict) -> None:
         """
         Renderiza las estadísticas I2C en la interfaz.
@@ -181,7 +213,7 @@ class I2CWindow(ctk.CTkToplevel):
         for w in self._inner.winfo_children():
             w.destroy()
 
-        if not stats:
+        if not stats.get("buses") and (stats.get("scanning") or "error" not in stats):
             self._show_placeholder("Escaneando buses I²C...")
             self._total_lbl.configure(text="")
             return
@@ -241,6 +273,14 @@ class I2CWindow(ctk.CTkToplevel):
         ).pack(side="left")
 
         color_count = COLORS['success'] if count > 0 else COLORS['text_dim']
+        ctk.CTkLabel(
+            hdr,
+            text=(f"barrido {bus_info.get('scan_ms', 0):.0f} ms · "
+                  f"{bus_info.get('avg_probe_ms', 0):.2f} ms/dir"),
+            font=(FONT_FAMILY, FONT_SIZES['small'] - 2),
+            text_color=COLORS['text_dim'],
+        ).pack(side="left", padx=12)
+
         ctk.CTkLabel(
             hdr,
             text=f"{count} dispositivo{'s' if count != 1 else ''}",
@@ -272,7 +312,7 @@ class I2CWindow(ctk.CTkToplevel):
 
         Args:
             parent: Frame contenedor de la fila.
-            dev (dict): Info del dispositivo con 'addr_hex', 'name', 'addr'.
+            dev (dict): Info del dispositivo con 'addr_hex', 'name', 'addr', 'probe_ms'.
 
         Returns:
             None
@@ -301,10 +341,10 @@ class I2CWindow(ctk.CTkToplevel):
             anchor="w",
         ).pack(side="left", padx=14, pady=6)
 
-        # Decimal
+        # Decimal + tiempo del último sondeo
         ctk.CTkLabel(
             row,
-            text=f"dec {dev.get('addr', '--')}",
+            text=f"dec {dev.get('addr', '--')} · {dev.get('probe_ms', 0):.2f} ms",
             font=(FONT_FAMILY, FONT_SIZES['small'] - 2),
             text_color=COLORS['text_dim'],
             anchor="e",
@@ -337,7 +377,7 @@ class I2CWindow(ctk.CTkToplevel):
 
     def _on_scan(self) -> None:
         """
-        Inicia un escaneo manual I2C en un hilo separado.
+        Lanza un barrido completo; _update() detecta cuándo termina.
 
         Args:
             None
@@ -353,37 +393,7 @@ class I2CWindow(ctk.CTkToplevel):
         self._scanning = True
         self._scan_btn.configure(state="disabled")
         self._status_lbl.configure(text="Escaneando...", text_color=COLORS['text_dim'])
-
-        def _do():
-            """Función interna para escaneo: ejecuta scan_now, espera y agenda callback."""
-            self._mon.scan_now()
-            time.sleep(2)
-            if self.winfo_exists():
-                self.after(0, self._on_scan_done)
-
-        threading.Thread(target=_do, daemon=True, name="I2CScanUI").start()
-
-    def _on_scan_done(self) -> None:
-        """
-        Callback ejecutado tras completar el escaneo manual.
-
-        Re-habilita el botón, limpia status y refresca la visualización.
-
-        Args:
-            None
-
-        Returns:
-            None
-
-        Raises:
-            None
-        """
-        if not self.winfo_exists():
-            return
-        self._scanning = False
-        self._scan_btn.configure(state="normal")
-        self._status_lbl.configure(text="")
-        self._render(self._mon.get_stats())
+        self._mon.scan_now()
 
     # ── Cierre limpio ─────────────────────────────────────────────────────────
 
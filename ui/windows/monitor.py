@@ -5,10 +5,13 @@ import customtkinter as ctk
 from config.settings import (COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH,
                              DSI_HEIGHT, DSI_X, DSI_Y, UPDATE_MS,
                              CPU_WARN, CPU_CRIT, TEMP_WARN, TEMP_CRIT,
-                             RAM_WARN, RAM_CRIT, Icons)
+                             RAM_WARN, RAM_CRIT, HISTORY, Icons)
 from ui.styles import StyleManager, make_window_header
-from ui.widgets import GraphWidget
+from ui.widgets import GraphWidget, CoreHeatmapWidget
 from core.system_monitor import SystemMonitor
+from core.event_bus import get_event_bus
+from core.events import SYSTEM_SAMPLE
+from ui.refresh_loop import RefreshLoop
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -60,9 +63,29 @@ class MonitorWindow(ctk.CTkToplevel):
         self.resizable(False, False)
 
         self._create_ui()
-        self._update()
+        get_event_bus().subscribe(SYSTEM_SAMPLE, self._on_system_sample)
+        if self._system_monitor.is_running():
+            self._render_system(self._system_monitor.get_current_stats())
+        self._refresh = RefreshLoop(self, self._update, UPDATE_MS)
+        self._refresh.start()
         logger.info("[MonitorWindow] Ventana Abierta")
 
+    def destroy(self):
+        """
+        Cancela la suscripción al EventBus y destruye la ventana.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        get_event_bus().unsubscribe(SYSTEM_SAMPLE, self._on_system_sample)
+        super().destroy()
+
 
     def _create_ui(self):
         """
@@ -113,6 +136,7 @@ class MonitorWindow(ctk.CTkToplevel):
         self._create_cell(grid, 0, 0, "CPU %",   "cpu",  "%",  _GRAPH_H_TOP)
         self._create_cell(grid, 0, 1, "RAM %",   "ram",  "%",  _GRAPH_H_TOP)
         self._create_cell(grid, 1, 0, "TEMP °C", "temp", "°C", _GRAPH_H_TOP)
+        self._create_cores_cell(grid, 1, 1, _GRAPH_H_TOP)
 
         # ── Tarjeta hardware FNK0100K (temperatura chasis + fan duty real) ───
         # Solo se crea si se pasó _hardware_monitor (fase1 activo)
@@ -196,12 +220,84 @@ class MonitorWindow(ctk.CTkToplevel):
         self._widgets[f"{key}_value"] = val
         self._graphs[key] = {'widget': graph, 'max_val': 100 if unit in ('%', '°C') else 50}
 
-    def _update(self):
+    def _create_cores_cell(self, parent, row, col, graph_h):
         """
-        Actualiza todas las métricas del monitoreo en ciclo recursivo.
+        Crea la celda de uso por núcleo con mapa de calor, frecuencia y estado de throttling.
 
         Args:
-            Ninguno
+            parent: Frame contenedor (grid).
+            row, col: Posición en grid.
+            graph_h: Altura del mapa de calor en píxeles.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        cell = ctk.CTkFrame(parent, fg_color=COLORS['bg_dark'], corner_radius=8)
+        cell.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+
+        ctk.CTkLabel(cell, text="CPU POR NÚCLEO", text_color=COLORS['primary'],
+                     font=(FONT_FAMILY, FONT_SIZES['small'], "bold"),
+                     anchor="w").pack(anchor="w", padx=8, pady=(6, 0))
+
+        freq = ctk.CTkLabel(cell, text="-- MHz", text_color=COLORS['primary'],
+                            font=(FONT_FAMILY, FONT_SIZES['small'], "bold"), anchor="e")
+        freq.pack(anchor="e", padx=8)
+
+        throttle = ctk.CTkLabel(cell, text="", text_color=COLORS['text_dim'],
+                                font=(FONT_FAMILY, FONT_SIZES['small']), anchor="e")
+        throttle.pack(anchor="e", padx=8, pady=(0, 2))
+
+        heatmap = CoreHeatmapWidget(cell, width=_COL_W - 16, height=graph_h, columns=HISTORY)
+        heatmap.pack(padx=4, pady=(0, 6))
+
+        self._widgets["cores_freq"]     = freq
+        self._widgets["cores_throttle"] = throttle
+        self._graphs["cores"] = {'widget': heatmap}
+
+    def _update_cores(self, stats, history):
+        """
+        Actualiza el mapa de calor por núcleo, la frecuencia y los flags de throttling.
+
+        Args:
+            stats (dict): Estadísticas actuales de SystemMonitor.
+            history (dict): Histórico de SystemMonitor (usa 'cpu_cores').
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        self._graphs["cores"]['widget'].update(history.get('cpu_cores', []))
+
+        freq     = stats.get('cpu_freq_mhz', 0.0)
+        freq_max = stats.get('cpu_freq_max_mhz', 0.0)
+        if freq:
+            text = f"{freq:.0f} / {freq_max:.0f} MHz" if freq_max else f"{freq:.0f} MHz"
+            self._widgets["cores_freq"].configure(text=text)
+
+        flags = stats.get('throttle_flags', {})
+        now   = [name for name in ('under_voltage', 'throttled', 'freq_capped', 'soft_temp_limit')
+                 if flags.get(name)]
+        if now:
+            self._widgets["cores_throttle"].configure(
+                text=f"{Icons.WARNING} {', '.join(now)}", text_color=COLORS['danger'])
+        elif flags.get('under_voltage_occurred') or flags.get('throttled_occurred'):
+            self._widgets["cores_throttle"].configure(
+                text="throttling previo", text_color=COLORS['warning'])
+        elif flags:
+            self._widgets["cores_throttle"].configure(
+                text="sin throttling", text_color=COLORS['text_dim'])
+
+    def _on_system_sample(self, data):
+        """
+        Repinta CPU, RAM, temperatura y núcleos al recibir 'system.sample'.
+
+        Args:
+            data (dict): Payload del evento con 'stats' y 'changed'.
 
         Returns:
             Ninguno
@@ -209,26 +305,57 @@ class MonitorWindow(ctk.CTkToplevel):
         Raises:
             Ninguno
         """
-
         if not self.winfo_exists():
             return
+        self._render_system(data["stats"])
 
-        if not self._system_monitor.is_running():
-            StyleManager.show_service_stopped_banner(self._content_frame, "System Monitor")
-            self.after(UPDATE_MS, self._update)
-            return
+    def _render_system(self, stats):
+        """
+        Pinta las métricas de SystemMonitor con su histórico.
+
+        Args:
+            stats (dict): Muestra de SystemMonitor.
 
-        stats   = self._system_monitor.get_current_stats()
-        self._system_monitor.update_history(stats)
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
         history = self._system_monitor.get_history()
 
         self._update_metric('cpu',  stats['cpu'],  history['cpu'],  "%",  CPU_WARN,  CPU_CRIT)
         self._update_metric('ram',  stats['ram'],  history['ram'],  "%",  RAM_WARN,  RAM_CRIT)
         self._update_metric('temp', stats['temp'], history['temp'], "°C", TEMP_WARN, TEMP_CRIT)
+        self._update_cores(stats, history)
 
         self._header.status_label.configure(
             text=f"CPU {stats['cpu']:.0f}%  ·  RAM {stats['ram']:.0f}%  ·  {stats['temp']:.0f}°C")
 
+    def _update(self):
+        """
+        Comprueba el estado del monitor y refresca el hardware FNK0100K (tick de RefreshLoop).
+
+        Las métricas de sistema llegan por 'system.sample'; aquí solo queda lo
+        que no publica eventos.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+
+        if not self.winfo_exists():
+            return
+
+        if not self._system_monitor.is_running():
+            StyleManager.show_service_stopped_banner(self._content_frame, "System Monitor")
+            return
+
         # ── Hardware FNK0100K ──────────────────────────────────────────────────
         if self._hardware_monitor:
             if self._hardware_monitor.is_available():
@@ -254,8 +381,6 @@ class MonitorWindow(ctk.CTkToplevel):
                     if entry:
                         entry[0].configure(text="fase1 inactivo", text_color=COLORS['text_dim'])
 
-        self.after(UPDATE_MS, self._update)
-
     def _update_metric(self, key, value, history, unit, warn, crit):
         """
         Actualiza visualmente una métrica específica según su valor actual.
@@ -7,6 +7,7 @@ from config.settings import (COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH,
 from ui.styles import StyleManager, make_futuristic_button, make_window_header
 from ui.widgets import GraphWidget
 from utils.system_utils import SystemUtils
+from ui.refresh_loop import RefreshLoop
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -58,7 +59,8 @@ class NetworkWindow(ctk.CTkToplevel):
         self.resizable(False, False)
 
         self._create_ui()
-        self._update()
+        self._refresh = RefreshLoop(self, self._update, UPDATE_MS)
+        self._refresh.start()
         logger.info("[NetworkWindow] Ventana Abierta")
 
 
@@ -347,7 +349,6 @@ class NetworkWindow(ctk.CTkToplevel):
             if not self._banner_shown:
                 StyleManager.show_service_stopped_banner(self._inner, f"{Icons.MONITOR_RED} Monitor de Red")
                 self._banner_shown = True
-            self.after(UPDATE_MS, self._update)
             return
 
         if self._banner_shown:
@@ -385,4 +386,3 @@ class NetworkWindow(ctk.CTkToplevel):
             self._update_interfaces()
             self._interface_update_counter = 0
 
-        self.after(UPDATE_MS, self._update)
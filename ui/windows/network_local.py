@@ -1,7 +1,11 @@
 """
 Ventana de panel de red local.
-Muestra los dispositivos encontrados por arp-scan con IP, MAC, fabricante y hostname.
+Muestra el inventario de NetworkScanner (descubrimiento pasivo + arp-scan) con
+IP, MAC, fabricante, hostname y última vez visto; los dispositivos que ya no
+están en la red aparecen atenuados.
+Los hostnames se rellenan según los va resolviendo NetworkScanner.
 """
+import time
 import customtkinter as ctk
 from config.settings import (
     COLORS, FONT_FAMILY, FONT_SIZES,
@@ -12,8 +16,10 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Refresco automático cada N segundos (0 = desactivado)
-AUTO_REFRESH_S = 60
+# Consulta de cambios del inventario (solo repinta si cambia la versión)
+_POLL_MS = 1000
+# Al abrir, escaneo activo solo si el último tiene más de N segundos
+ACTIVE_SCAN_MAX_AGE_S = 600
 
 
 class NetworkLocalWindow(ctk.CTkToplevel):
@@ -45,8 +51,9 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         """
         super().__init__(parent)
         self._scanner     = network_scanner  # ── MODIFICADO: usa el scanner externo ──
-        self._auto_job    = None
         self._poll_job    = None
+        self._rendered_version = None
+        self._rendered_status  = None
 
         self.title("Panel de Red Local")
         self.configure(fg_color=COLORS['bg_medium'])
@@ -57,8 +64,12 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         self.after(150, self.focus_set)
 
         self._create_ui()
-        # Lanzar primer escaneo automáticamente
-        self._start_scan()
+        # El inventario pasivo ya está al día: arp-scan solo si el último es viejo
+        age = self._scanner.get_last_scan_age()
+        if age is None or age > ACTIVE_SCAN_MAX_AGE_S:
+            self._start_scan()
+        else:
+            self._poll_result()
         logger.info("[NetworkLocalWindow] Ventana abierta")
 
     # ── UI ────────────────────────────────────────────────────────────────────
@@ -153,16 +164,15 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         # ── si estaba con banner, limpiar y reactivar botón ──────────────────
         self._scan_btn.configure(state="normal", text="⟳  Escanear")
 
-        if self._scanner.get_status() == "scanning":
-            return
-        self._scan_btn.configure(state="disabled", text="Escaneando...")
-        self._header.status_label.configure(text="Escaneando red...")
-        self._scanner.scan()
-        self._poll_result()
+        if self._scanner.get_status() != "scanning":
+            self._scanner.scan()
+        if self._poll_job is None:
+            self._poll_result()
 
     def _poll_result(self):
         """
-        Verifica periódicamente el estado del escaneo y actualiza la interfaz gráfica accordingly.
+        Consulta el escáner cada _POLL_MS y repinta solo si cambió el inventario
+        o el estado del escaneo activo.
 
         Args: 
             None
@@ -173,24 +183,23 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         Raises: 
             None
         """
-        # Si el servicio se paró durante el escaneo, mostrar banner
+        self._poll_job = None
+        # Si el servicio se paró, mostrar banner
         if not self._scanner.is_running():
             self._start_scan()  # redirige al banner
             return
 
-        status = self._scanner.get_status()
-        if status == "scanning":
-            self._poll_job = self.after(500, self._poll_result)
-            return
-        # Escaneo terminado
-        self._render()
-        # Programar refresco automático
-        if AUTO_REFRESH_S > 0:
-            self._auto_job = self.after(AUTO_REFRESH_S * 1000, self._start_scan)
+        status  = self._scanner.get_status()
+        version = self._scanner.get_version()
+        if version != self._rendered_version or status != self._rendered_status:
+            self._rendered_version = version
+            self._rendered_status  = status
+            self._render()
+        self._poll_job = self.after(_POLL_MS, self._poll_result)
 
     def _render(self):
         """
-        Redibuja la lista con los dispositivos encontrados en la red local.
+        Redibuja la lista con el inventario de dispositivos de la red local.
 
         Args:
             Ninguno
@@ -202,7 +211,7 @@ class NetworkLocalWindow(ctk.CTkToplevel):
             Ninguno
         """
         status  = self._scanner.get_status()
-        devices = self._scanner.get_devices()
+        devices = self._scanner.get_inventory()
 
         # Limpiar lista anterior
         for w in self._device_frame.winfo_children():
@@ -217,38 +226,46 @@ class NetworkLocalWindow(ctk.CTkToplevel):
                 font=(FONT_FAMILY, FONT_SIZES['medium']),
                 wraplength=DSI_WIDTH - 80,
                 justify="left",
-            ).pack(pady=30, padx=20)
-            self._header.status_label.configure(text="Error")
-            self._count_label.configure(text="")
-
-        elif not devices:
-            ctk.CTkLabel(
-                self._device_frame,
-                text="No se encontraron dispositivos.",
-                text_color=COLORS['text_dim'],
-                font=(FONT_FAMILY, FONT_SIZES['medium']),
-            ).pack(pady=40)
-            self._header.status_label.configure(text="0 dispositivos")
+            ).pack(pady=(20, 10), padx=20)
+
+        if not devices:
+            if status != "error":
+                ctk.CTkLabel(
+                    self._device_frame,
+                    text="No se encontraron dispositivos.",
+                    text_color=COLORS['text_dim'],
+                    font=(FONT_FAMILY, FONT_SIZES['medium']),
+                ).pack(pady=40)
             self._count_label.configure(text="0 dispositivos")
-
         else:
-            for device in devices:
+            # Conectados primero; los que se fueron al final y atenuados
+            for device in sorted(devices, key=lambda d: not d["online"]):
                 self._create_device_row(device)
-            n = len(devices)
-            age = self._scanner.get_last_scan_age()
-            age_str = f" · hace {int(age)}s" if age is not None else ""
-            self._header.status_label.configure(text=f"{n} dispositivos{age_str}")
+            online = sum(1 for d in devices if d["online"])
             self._count_label.configure(
-                text=f"{n} dispositivo{'s' if n != 1 else ''} en la red")
+                text=f"{online} dispositivo{'s' if online != 1 else ''} en la red"
+                     f" · {len(devices) - online} fuera")
 
-        self._scan_btn.configure(state="normal", text="⟳  Escanear")
+        if status == "scanning":
+            self._header.status_label.configure(text="Escaneando red...")
+            self._scan_btn.configure(state="disabled", text="Escaneando...")
+        else:
+            if status == "error":
+                header = "Error"
+            else:
+                age = self._scanner.get_last_scan_age()
+                age_str = f" · escaneo hace {int(age // 60)} min" if age is not None else ""
+                header = f"{sum(1 for d in devices if d['online'])} en línea{age_str}"
+            self._header.status_label.configure(text=header)
+            self._scan_btn.configure(state="normal", text="⟳  Escanear")
 
     def _create_device_row(self, device: dict):
         """
         Crea una fila que representa un dispositivo en la interfaz gráfica.
 
         Args:
-            device (dict): Diccionario que contiene la información del dispositivo, incluyendo 'ip', 'hostname' y 'MAC' (aunque este último no se utiliza en este método).
+            device (dict): Entrada del inventario ('ip', 'mac', 'vendor', 'hostname',
+                           'online' y 'last_seen').
 
         Returns:
             None
@@ -262,6 +279,7 @@ class NetworkLocalWindow(ctk.CTkToplevel):
             corner_radius=6,
         )
         row.pack(fill="x", padx=6, pady=2)
+        online = device["online"]
 
         # Columna izquierda: IP + hostname
         left = ctk.CTkFrame(row, fg_color="transparent")
@@ -270,7 +288,7 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         ctk.CTkLabel(
             left,
             text=device["ip"],
-            text_color=COLORS['primary'],
+            text_color=COLORS['primary'] if online else COLORS['text_dim'],
             font=(FONT_FAMILY, FONT_SIZES['medium'], "bold"),
             anchor="w",
         ).pack(fill="x")
@@ -284,6 +302,15 @@ class NetworkLocalWindow(ctk.CTkToplevel):
                 anchor="w",
             ).pack(fill="x")
 
+        if not online:
+            ctk.CTkLabel(
+                left,
+                text=f"visto {self._format_ago(device['last_seen'])}",
+                text_color=COLORS['text_dim'],
+                font=(FONT_FAMILY, FONT_SIZES['small']),
+                anchor="w",
+            ).pack(fill="x")
+
         # Columna derecha: fabricante + MAC
         right = ctk.CTkFrame(row, fg_color="transparent")
         right.pack(side="right", padx=10, pady=6)
@@ -291,7 +318,7 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         ctk.CTkLabel(
             right,
             text=device["vendor"],
-            text_color=COLORS['text'],
+            text_color=COLORS['text'] if online else COLORS['text_dim'],
             font=(FONT_FAMILY, FONT_SIZES['small']),
             anchor="e",
             wraplength=200,
@@ -305,6 +332,24 @@ class NetworkLocalWindow(ctk.CTkToplevel):
             anchor="e",
         ).pack(anchor="e")
 
+    @staticmethod
+    def _format_ago(ts: float) -> str:
+        """
+        Texto relativo para la última vez que se vio un dispositivo.
+
+        Args:
+            ts (float): Epoch de la última confirmación.
+
+        Returns:
+            str: 'hace N min', 'hace N h' o 'hace N d'.
+        """
+        elapsed = max(0, time.time() - ts)
+        if elapsed < 3600:
+            return f"hace {int(elapsed // 60)} min"
+        if elapsed < 86400:
+            return f"hace {int(elapsed // 3600)} h"
+        return f"hace {int(elapsed // 86400)} d"
+
     # ── Cierre ────────────────────────────────────────────────────────────────
 
     def _on_close(self):
@@ -320,8 +365,6 @@ class NetworkLocalWindow(ctk.CTkToplevel):
         Raises:
             Ninguno
         """
-        if self._auto_job:
-            self.after_cancel(self._auto_job)
         if self._poll_job:
             self.after_cancel(self._poll_job)
         logger.info("[NetworkLocalWindow] Ventana cerrada")
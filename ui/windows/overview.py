@@ -3,6 +3,8 @@ Ventana de resumen general del sistema.
 Muestra todas las métricas críticas en un solo vistazo.
 Pensada para usarse como pantalla de reposo en la DSI.
 """
+import time
+from datetime import datetime, timedelta
 import customtkinter as ctk
 from config.settings import (
     COLORS, FONT_FAMILY, FONT_SIZES,
@@ -11,11 +13,15 @@ from config.settings import (
     RAM_WARN,  RAM_CRIT,
     TEMP_WARN, TEMP_CRIT, Icons)
 from ui.styles import StyleManager, make_window_header
+from core.data_analyzer import DataAnalyzer
+from ui.refresh_loop import RefreshLoop
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 _REFRESH_MS = 2000
+_DNS_REFRESH_S = 300   # la serie DNS se guarda cada 5 min: no tiene sentido consultarla más a menudo
+_DNS_HOURS = 24
 
 
 class OverviewWindow(ctk.CTkToplevel):
@@ -70,9 +76,12 @@ class OverviewWindow(ctk.CTkToplevel):
 
         self._widgets = {}
         self._running = True
+        self._analyzer = DataAnalyzer()
+        self._dns_next = 0.0
 
         self._create_ui()
-        self._update()
+        self._refresh = RefreshLoop(self, self._update, _REFRESH_MS)
+        self._refresh.start()
         logger.info("[OverviewWindow] Ventana abierta")
 
     def destroy(self):
@@ -209,6 +218,27 @@ class OverviewWindow(ctk.CTkToplevel):
             lbl.pack()
             self._widgets[sub_key] = lbl
 
+        # Carga DNS de las últimas 24h (serie pihole_metrics del histórico)
+        spark_row = ctk.CTkFrame(pihole_card, fg_color="transparent")
+        spark_row.pack(fill="x", padx=12, pady=(0, 10))
+
+        ctk.CTkLabel(
+            spark_row, text=f"DNS {_DNS_HOURS}h",
+            font=(FONT_FAMILY, FONT_SIZES['small']),
+            text_color=COLORS['text_dim'],
+        ).pack(side="left", padx=(0, 8))
+
+        self._dns_peak = ctk.CTkLabel(
+            spark_row, text="--",
+            font=(FONT_FAMILY, FONT_SIZES['small']),
+            text_color=COLORS['text_dim'],
+        )
+        self._dns_peak.pack(side="right", padx=(8, 0))
+
+        self._dns_canvas = ctk.CTkCanvas(
+            spark_row, height=40, bg=COLORS['bg_dark'], highlightthickness=0)
+        self._dns_canvas.pack(side="left", fill="x", expand=True)
+
     # ── Actualización ─────────────────────────────────────────────────────────
 
     def _update(self):
@@ -233,9 +263,9 @@ class OverviewWindow(ctk.CTkToplevel):
             self._refresh_services()
             self._refresh_net()
             self._refresh_pihole()
+            self._refresh_dns_trend()
         except Exception as e:
             logger.error("[OverviewWindow] Error en _update: %s", e)
-        self.after(_REFRESH_MS, self._update)
 
     def _color_for(self, value, warn, crit):
         """
@@ -378,3 +408,44 @@ class OverviewWindow(ctk.CTkToplevel):
         except Exception:
             for k in ('pihole_blocked', 'pihole_pct', 'pihole_total', 'pihole_status'):
                 self._widgets[k].configure(text="--", text_color=COLORS['text_dim'])
+
+    def _refresh_dns_trend(self):
+        """
+        Redibuja la mini-gráfica de consultas DNS por minuto (tramos de 1h, últimas 24h).
+
+        Consulta el histórico como mucho cada _DNS_REFRESH_S segundos.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+        """
+        now_mono = time.monotonic()
+        if now_mono < self._dns_next:
+            return
+        canvas = self._dns_canvas
+        width, height = canvas.winfo_width(), int(canvas.cget("height"))
+        if width < 10:
+            return  # aún sin geometría: reintentar en el siguiente ciclo
+        self._dns_next = now_mono + _DNS_REFRESH_S
+
+        end = datetime.now()
+        start = end - timedelta(hours=_DNS_HOURS)
+        rollup = self._analyzer.get_pihole_rollup(start, end, bucket_minutes=60)
+
+        canvas.delete("all")
+        if not rollup:
+            self._dns_peak.configure(text="sin datos")
+            return
+        peak = max(b['queries_per_min'] for b in rollup) or 1.0
+        slot = width / _DNS_HOURS
+        for bucket in rollup:
+            ts = datetime.strptime(bucket['timestamp'], "%Y-%m-%d %H:%M:%S")
+            idx = min(int((ts - start).total_seconds() // 3600), _DNS_HOURS - 1)
+            bar_h = max(1, int((height - 2) * bucket['queries_per_min'] / peak))
+            x0 = idx * slot + 1
+            canvas.create_rectangle(
+                x0, height - bar_h, x0 + max(1, slot - 2), height,
+                fill=COLORS['primary'], width=0)
+        self._dns_peak.configure(text=f"máx {peak:.0f}/min")
@@ -1,11 +1,15 @@
 """
 Ventana de monitor de procesos
+
+Pulsar el nombre de un proceso abre su histórico (CPU, RSS, I/O, fds y threads)
+desde los ring buffers de ProcessMonitor; la vista árbol agrega cada subárbol.
 """
 import customtkinter as ctk
 from config.settings import COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, UPDATE_MS, Icons
 from ui.styles import StyleManager, make_futuristic_button, make_window_header
-from ui.widgets import confirm_dialog, custom_msgbox
+from ui.widgets import confirm_dialog, custom_msgbox, GraphWidget
 from core.process_monitor import ProcessMonitor
+from ui.refresh_loop import RefreshLoop
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,8 +52,8 @@ class ProcessWindow(ctk.CTkToplevel):
         # Estado
         self._search_var    = ctk.StringVar(master=self)
         self._filter_var    = ctk.StringVar(master=self, value="all")
+        self._tree_var      = ctk.BooleanVar(master=self, value=False)
         self._update_paused = False
-        self._update_job    = None
 
         # Configurar ventana
         self.title("Monitor de Procesos")
@@ -62,7 +66,8 @@ class ProcessWindow(ctk.CTkToplevel):
         self._create_ui()
 
         # Iniciar actualización
-        self._update()
+        self._refresh = RefreshLoop(self, self._update, UPDATE_MS * 2)
+        self._refresh.start()
         logger.info("[ProcessWindow] Ventana Abierta")
 
 
@@ -197,6 +202,16 @@ class ProcessWindow(ctk.CTkToplevel):
             rb.pack(side="left", padx=5)
             StyleManager.style_radiobutton_ctk(rb)
 
+        # Vista árbol: costes agregados por subárbol
+        ctk.CTkCheckBox(
+            controls,
+            text="Árbol",
+            variable=self._tree_var,
+            command=self._on_view_change,
+            text_color=COLORS['text'],
+            font=(FONT_FAMILY, FONT_SIZES['small'])
+        ).pack(side="left", padx=10, pady=10)
+
     def _create_column_headers(self, parent):
         """
         Crea los encabezados de columnas ordenables para la ventana de procesos.
@@ -286,6 +301,24 @@ class ProcessWindow(ctk.CTkToplevel):
         self._update_now()
         self.after(2000, self._resume_updates)
 
+    def _on_view_change(self):
+        """
+        Alterna entre lista plana y vista árbol.
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        self._update_paused = True
+        self._process_monitor.set_view_mode("tree" if self._tree_var.get() else "flat")
+        self._update_now()
+        self.after(2000, self._resume_updates)
+
     def _on_search_change(self):
         """
         Establece un retardo para actualizar la búsqueda cuando el usuario ha dejado de escribir.
@@ -375,7 +408,7 @@ class ProcessWindow(ctk.CTkToplevel):
 
     def _update_now(self):
         """
-        Actualiza inmediatamente la ventana de procesos sin programar la siguiente actualización.
+        Actualiza inmediatamente la ventana de procesos; el RefreshLoop sigue su ritmo.
 
         Args:
             None
@@ -389,10 +422,6 @@ class ProcessWindow(ctk.CTkToplevel):
         if not self.winfo_exists():
             return
 
-        if self._update_job:
-            self.after_cancel(self._update_job)
-            self._update_job = None
-
         self._render_processes()
 
     def _update(self):
@@ -413,15 +442,12 @@ class ProcessWindow(ctk.CTkToplevel):
 
         if not self._process_monitor.is_running():
             StyleManager.show_service_stopped_banner(self._content, "Process Monitor")
-            self.after(UPDATE_MS, self._update)
             return
 
         if self._update_paused:
-            self._update_job = self.after(UPDATE_MS * 2, self._update)
             return
 
         self._render_processes()
-        self._update_job = self.after(UPDATE_MS * 2, self._update)
 
     def _create_process_row(self, proc: dict, row: int):
         """
@@ -460,17 +486,22 @@ class ProcessWindow(ctk.CTkToplevel):
             anchor="center"
         ).grid(row=0, column=0, sticky="n", padx=5, pady=5)
 
-        # Nombre
+        # Nombre — pulsar abre el histórico del proceso
         name_text = proc.get('display_name', proc['name'])
-        ctk.CTkLabel(
+        if proc.get('tree_count', 1) > 1:
+            name_text = f"{name_text}  (+{proc['tree_count'] - 1})"
+        name_lbl = ctk.CTkLabel(
             row_frame,
             text=name_text,
             text_color=COLORS['text'],
             font=(FONT_FAMILY, FONT_SIZES['small']),
             wraplength=250,
             justify="left",
-            anchor="center"
-        ).grid(row=0, column=1, sticky="n", padx=5, pady=5)
+            anchor="center",
+            cursor="hand2"
+        )
+        name_lbl.grid(row=0, column=1, sticky="n", padx=5, pady=5)
+        name_lbl.bind("<Button-1>", lambda e, p=proc: self._show_history(p))
 
         # Usuario
         ctk.CTkLabel(
@@ -509,6 +540,93 @@ class ProcessWindow(ctk.CTkToplevel):
             font=(FONT_FAMILY, 9)
         ).grid(row=0, column=5, padx=5, pady=5)
 
+    # ── Histórico por proceso ─────────────────────────────────────────────────
+
+    _HISTORY_GRAPHS = [
+        # clave, etiqueta, escala para mostrar, unidad
+        ('cpu',     "CPU",     1.0,         "%"),
+        ('rss',     "RSS",     1 / 1048576, "MB"),
+        ('io_bps',  "I/O",     1 / 1024,    "KB/s"),
+        ('fds',     "FDs",     1.0,         ""),
+        ('threads', "Threads", 1.0,         ""),
+    ]
+
+    def _show_history(self, proc: dict):
+        """
+        Abre un panel con el histórico del proceso leído de la caché del monitor.
+
+        No muestrea nada: solo pinta los ring buffers que ProcessMonitor ya guarda
+        para los procesos del top por CPU o RSS.
+
+        Args:
+            proc (dict): Fila del proceso seleccionado.
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        popup = ctk.CTkToplevel(self)
+        popup.transient(self)
+        popup.overrideredirect(True)
+        popup.configure(fg_color=COLORS['bg_medium'])
+        popup.geometry(f"{DSI_WIDTH}x{DSI_HEIGHT}+{DSI_X}+{DSI_Y}")
+
+        main = ctk.CTkFrame(popup, fg_color=COLORS['bg_medium'])
+        main.pack(fill="both", expand=True, padx=5, pady=5)
+        header = make_window_header(
+            main,
+            title=f"HISTÓRICO · PID {proc['pid']}",
+            on_close=popup.destroy,
+            status_text=proc.get('display_name', proc['name'])[:40],
+        )
+
+        body = ctk.CTkFrame(main, fg_color=COLORS['bg_dark'])
+        body.pack(fill="both", expand=True, padx=5, pady=5)
+
+        cells = {}
+        for key, label, _scale, _unit in self._HISTORY_GRAPHS:
+            row = ctk.CTkFrame(body, fg_color="transparent")
+            row.pack(fill="x", padx=10, pady=3)
+            value_lbl = ctk.CTkLabel(
+                row, text=f"{label}: --", width=150, anchor="w",
+                text_color=COLORS['text'],
+                font=(FONT_FAMILY, FONT_SIZES['small'], "bold"))
+            value_lbl.pack(side="left")
+            graph = GraphWidget(row, width=DSI_WIDTH - 200, height=50)
+            graph.pack(side="left", fill="x", expand=True)
+            cells[key] = (value_lbl, graph)
+
+        subtree_lbl = ctk.CTkLabel(
+            body, text="", anchor="w",
+            text_color=COLORS['text_dim'],
+            font=(FONT_FAMILY, FONT_SIZES['small']))
+        subtree_lbl.pack(fill="x", padx=10, pady=(6, 4))
+
+        def refresh():
+            if not popup.winfo_exists():
+                return
+            hist = self._process_monitor.get_process_history(proc['pid'])
+            if not hist['ts']:
+                header.status_label.configure(text="Sin histórico (fuera del top de consumo)")
+            for key, label, scale, unit in self._HISTORY_GRAPHS:
+                value_lbl, graph = cells[key]
+                data = [v * scale for v in hist[key] if v is not None]
+                if not data:
+                    value_lbl.configure(text=f"{label}: --")
+                    continue
+                value_lbl.configure(text=f"{label}: {data[-1]:.1f} {unit}".rstrip())
+                graph.update(data, max(max(data) * 1.2, 1.0), COLORS['primary'])
+            tree = self._process_monitor.get_subtree_totals(proc['pid'])
+            if tree['processes'] > 1:
+                subtree_lbl.configure(text=(
+                    f"Subárbol: {tree['processes']} procesos · "
+                    f"CPU {tree['cpu']:.1f}% · RSS {tree['rss'] / 1048576:.0f} MB"))
+
+        RefreshLoop(popup, refresh, UPDATE_MS * 2).start()
+        popup.after(150, popup.focus_set)
+
     # ── Acciones ──────────────────────────────────────────────────────────────
 
     def _kill_process(self, proc: dict):
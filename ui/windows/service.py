@@ -5,11 +5,17 @@ import customtkinter as ctk
 from config.settings import COLORS, FONT_FAMILY, FONT_SIZES, DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, UPDATE_MS, Icons
 from ui.styles import StyleManager, make_futuristic_button, make_window_header
 from ui.widgets import confirm_dialog, custom_msgbox
+from ui.refresh_loop import RefreshLoop
+from core.journal_follower import JOURNAL_BUFFER_LINES
 from core.service_monitor import ServiceMonitor
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Refresco de la vista de logs en vivo (solo lee el buffer del seguidor)
+_LOGS_REFRESH_MS = 500
+# Opciones del filtro de prioridad: etiqueta → prioridad de journalctl
+_LOG_PRIORITIES = {"Todos": None, "Error": "err", "Aviso": "warning", "Info": "info"}
 
 
 class ServiceWindow(ctk.CTkToplevel):
@@ -621,7 +627,10 @@ class ServiceWindow(ctk.CTkToplevel):
 
     def _view_logs(self, service: dict):
         """
-        Abre una ventana modal con los últimos 30 logs del servicio.
+        Abre una ventana con los logs del servicio en vivo.
+
+        Un seguidor de journalctl por ventana: el bucle after() solo añade
+        las líneas nuevas del buffer y el seguidor se para al cerrar.
 
         Args:
             service (dict): Información del servicio cuyos logs mostrar.
@@ -632,21 +641,67 @@ class ServiceWindow(ctk.CTkToplevel):
         Raises:
             None
         """
-        logs = self._service_monitor.get_logs(service['name'], lines=30)
+        follower = self._service_monitor.follow_logs(service['name'], lines=30)
 
         logs_window = ctk.CTkToplevel(self)
         logs_window.title(f"Logs: {service['name']}")
         logs_window.geometry("700x500")
 
+        priority_var = ctk.StringVar(master=logs_window, value="Todos")
+        ctk.CTkOptionMenu(
+            logs_window,
+            variable=priority_var,
+            values=list(_LOG_PRIORITIES),
+            width=100,
+            font=(FONT_FAMILY, FONT_SIZES['small']),
+            fg_color=COLORS['bg_medium'],
+            button_color=COLORS['primary'],
+            command=lambda label: follower.set_priority(_LOG_PRIORITIES[label]),
+        ).pack(anchor="e", padx=10, pady=(10, 0))
+
         textbox = ctk.CTkTextbox(
             logs_window,
             font=(FONT_FAMILY, FONT_SIZES['small']),
             wrap="word"
         )
         textbox.pack(fill="both", expand=True, padx=10, pady=10)
-        textbox.insert("1.0", logs)
         textbox.configure(state="disabled")
 
+        state = {"seq": 0, "lines": 0, "error": None}
+
+        def refresh():
+            seq, lines, reset = follower.get_lines(state["seq"])
+            state["seq"] = seq
+            error = follower.error if not state["lines"] and not lines else None
+            reset = reset or error != state["error"]
+            state["error"] = error
+            if reset or lines:
+                at_bottom = textbox.yview()[1] >= 0.999
+                textbox.configure(state="normal")
+                if reset:
+                    textbox.delete("1.0", "end")
+                    state["lines"] = 0
+                if lines:
+                    textbox.insert("end", "\n".join(lines) + "\n")
+                    state["lines"] += len(lines)
+                excess = state["lines"] - JOURNAL_BUFFER_LINES
+                if excess > 0:
+                    textbox.delete("1.0", f"{excess + 1}.0")
+                    state["lines"] -= excess
+                if error:
+                    textbox.insert("end", f"Error obteniendo logs: {error}")
+                textbox.configure(state="disabled")
+                if at_bottom:
+                    textbox.see("end")
+
+        def on_destroy(event):
+            if event.widget is not logs_window:
+                return
+            follower.stop(wait=False)
+
+        logs_window.bind("<Destroy>", on_destroy, add="+")
+        RefreshLoop(logs_window, refresh, _LOGS_REFRESH_MS).start()
+
         make_futuristic_button(
             logs_window, text="Cerrar",
             command=logs_window.destroy,
@@ -1,7 +1,7 @@
 """
 Ventana de monitor de sesiones SSH.
-Muestra sesiones activas (who) e historial de conexiones (last).
-Se refresca automáticamente cada 30 segundos via SSHMonitor.
+Muestra sesiones activas (utmp) e historial de conexiones (wtmp).
+Consulta SSHMonitor cada segundo y solo repinta cuando sus datos cambian.
 Los widgets se crean una sola vez — solo se actualizan los valores.
 """
 import re
@@ -12,7 +12,7 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-_REFRESH_MS = 30_000
+_REFRESH_MS = 1000
 
 
 # ── Helpers de formato ────────────────────────────────────────────────────────
@@ -82,10 +82,32 @@ def _fmt_time_active(date: str, time: str) -> str:
     return f"Conectado desde las {time}"
 
 
+# Marca de tiempo del historial: 'YYYY-MM-DD HH:MM' (o ISO de `last`) o solo 'HH:MM'
+_HISTORY_TS = re.compile(r'(?:(\d{4}-\d{2}-\d{2})[T ])?(\d{2}:\d{2})(?::\d{2})?(?:[+-]\d{2}:?\d{2})?')
+_HISTORY_DUR = re.compile(r'\((?:(\d+)\+)?(\d{2}):(\d{2})\)')
+
+
+def _history_stamps(raw: str) -> list:
+    """
+    Extrae las marcas de tiempo de una línea de historial, sin la duración.
+
+    Args:
+        raw (str): Cadena time_info.
+
+    Returns:
+        list: Marcas como 'YYYY-MM-DD HH:MM' o 'HH:MM', en orden.
+    """
+    head = raw.split("(", 1)[0]
+    return [f"{d} {t}" if d else t for d, t in _HISTORY_TS.findall(head)]
+
+
 def _fmt_time_history(raw: str) -> str:
     """
     Formatea una cadena de historial de tiempo en un formato legible.
 
+    Conserva la fecha de inicio y la de fin cuando es de otro día, para que
+    las sesiones antiguas o que cruzan la medianoche no sean ambiguas.
+
     Args:
         raw (str): Cadena de tiempo en formato raw.
 
@@ -99,44 +121,41 @@ def _fmt_time_history(raw: str) -> str:
         return ""
 
     raw = raw.strip()
+    stamps = _history_stamps(raw)
+    inicio = stamps[0] if stamps else ""
 
     # Detectar sesión activa
     if "still logged in" in raw:
-        # Extraer hora de inicio
-        m = re.search(r'(\d{2}:\d{2})', raw)
-        hora = m.group(1) if m else ""
-        return f"Activa desde las {hora}" if hora else "Activa"
+        return f"Activa desde {inicio}" if inicio else "Activa"
 
     # Detectar cierre por crash o apagado
     if "crash" in raw:
-        m = re.search(r'(\d{2}:\d{2})', raw)
-        hora = m.group(1) if m else ""
-        return f"Cortada por crash  ({hora})" if hora else "Cortada por crash"
+        return f"Cortada por crash  ({inicio})" if inicio else "Cortada por crash"
     if "down" in raw:
-        m = re.search(r'(\d{2}:\d{2})', raw)
-        hora = m.group(1) if m else ""
-        return f"Cortada por apagado  ({hora})" if hora else "Cortada por apagado"
-
-    # Formato normal: hora_inicio - hora_fin  (duración)
-    # Extraer duración entre paréntesis
-    m_dur = re.search(r'\((\d{2}:\d{2})\)', raw)
-    dur = m_dur.group(1) if m_dur else None
-
-    # Extraer horas de inicio y fin
-    horas = re.findall(r'(\d{2}:\d{2})', raw)
-
-    if len(horas) >= 2:
-        inicio, fin = horas[0], horas[1]
-        if dur:
-            h, m2 = dur.split(":")
-            if h == "00":
-                dur_str = f"{int(m2)} min"
-            else:
-                dur_str = f"{int(h)}h {int(m2)}min"
+        return f"Cortada por apagado  ({inicio})" if inicio else "Cortada por apagado"
+
+    # Formato normal: inicio - fin  (duración)
+    m_dur = _HISTORY_DUR.search(raw)
+    dur_str = None
+    if m_dur:
+        days, h, m2 = int(m_dur.group(1) or 0), int(m_dur.group(2)), int(m_dur.group(3))
+        if days:
+            dur_str = f"{days}d {h}h {m2}min"
+        elif h == 0:
+            dur_str = f"{m2} min"
+        else:
+            dur_str = f"{h}h {m2}min"
+
+    if len(stamps) >= 2:
+        fin = stamps[1]
+        # El fin solo lleva fecha si es de otro día
+        if " " in fin and " " in inicio and fin.split()[0] == inicio.split()[0]:
+            fin = fin.split()[1]
+        if dur_str:
             return f"{inicio} → {fin}  ({dur_str})"
         return f"{inicio} → {fin}"
-    elif len(horas) == 1:
-        return f"Desde las {horas[0]}"
+    elif inicio:
+        return f"Desde {inicio}"
 
     return raw
 
@@ -184,6 +203,7 @@ class SSHWindow(ctk.CTkToplevel):
         self.after(150, self.focus_set)
 
         self._refresh_job = None
+        self._rendered_version = None   # versión de SSHMonitor ya pintada
 
         # Referencias a widgets que se actualizan sin recrearse
         self._session_rows:  list = []
@@ -450,14 +470,23 @@ class SSHWindow(ctk.CTkToplevel):
         history  = stats["history"]
         ts       = stats["last_update"]
 
+        # version == -1: lock ocupado, se reintenta en el siguiente tick
+        if stats["version"] == -1:
+            self._refresh_job = self.after(_REFRESH_MS, self._update)
+            return
+        self._update_label.configure(
+            text=f"Actualizado: {ts}" if ts else "")
+        if stats["version"] == self._rendered_version:
+            self._refresh_job = self.after(_REFRESH_MS, self._update)
+            return
+        self._rendered_version = stats["version"]
+
         self._refresh_sessions(sessions)
         self._refresh_history(history)
 
         n = len(sessions)
         self._header.status_label.configure(
             text=f"{n} sesión{'es' if n != 1 else ''} activa{'s' if n != 1 else ''}")
-        self._update_label.configure(
-            text=f"Actualizado: {ts}" if ts else "")
 
         self._refresh_job = self.after(_REFRESH_MS, self._update)
 
@@ -546,6 +575,7 @@ class SSHWindow(ctk.CTkToplevel):
         if self._refresh_job:
 
             self.after_cancel(self._refresh_job)
+        self._rendered_version = None
         self._update()
 
     # ── Cierre ────────────────────────────────────────────────────────────────
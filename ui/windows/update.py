@@ -13,6 +13,9 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Refresco del progreso mientras UpdateMonitor ejecuta apt en su thread
+_PROGRESS_POLL_MS = 500
+
 
 class UpdatesWindow(ctk.CTkToplevel):
     """
@@ -115,6 +118,17 @@ class UpdatesWindow(ctk.CTkToplevel):
         )
         self._info_label.pack(pady=5)
 
+        # Inventario de paquetes actualizables (caché de UpdateMonitor)
+        self._packages_box = ctk.CTkTextbox(
+            parent,
+            font=(FONT_FAMILY, FONT_SIZES['small']),
+            fg_color=COLORS['bg_dark'],
+            height=140,
+            wrap="none",
+        )
+        self._packages_box.pack(fill="both", expand=True, pady=5)
+        self._packages_box.configure(state="disabled")
+
         # Frame para botones
         btn_frame = ctk.CTkFrame(parent, fg_color="transparent")
         btn_frame.pack(side="bottom", fill="x", pady=(10, 20))
@@ -180,10 +194,13 @@ class UpdatesWindow(ctk.CTkToplevel):
 
     def _refresh_status(self, force=False):
         """
-        Actualiza el estado de la ventana de actualizaciones consultando el estado de actualizaciones.
+        Muestra el estado de actualizaciones cacheado; con force pide un refresco en segundo plano.
+
+        Nunca ejecuta apt en el thread de Tk: UpdateMonitor refresca en su propio
+        thread y esta ventana sigue su progreso con _poll_until_ready.
 
         Args:
-            force (bool): Fuerza la comprobación de actualizaciones aunque no haya cambios.
+            force (bool): Pide a UpdateMonitor un 'apt update' nuevo.
 
         Returns:
             None
@@ -194,16 +211,16 @@ class UpdatesWindow(ctk.CTkToplevel):
         if not self._monitor.is_running():
             return
         if force:
+            self._monitor.refresh()
             self._update_btn.configure(state="disabled")
-            self._polling = False
             self._status_label.configure(text=f"{Icons.SEARCH} Buscando...", text_color=COLORS['warning'])
-            self.update_idletasks()
 
-        res = self._monitor.check_updates(force=force)
+        res = self._monitor.check_updates(force=False)
 
-        if res['status'] == "Unknown":
-            self._status_label.configure(text="Comprobando...", text_color=COLORS['text_dim'])
-            self._info_label.configure(text="Verificación inicial en curso")
+        if self._monitor.is_refreshing() or res['status'] == "Unknown":
+            if not force:
+                self._status_label.configure(text="Comprobando...", text_color=COLORS['text_dim'])
+            self._info_label.configure(text="Verificación en curso")
             self._status_icon.configure(text_color=COLORS['text_dim'])
             self._update_btn.configure(state="disabled")
             if not self._polling:
@@ -212,15 +229,43 @@ class UpdatesWindow(ctk.CTkToplevel):
             return
 
         self._polling = False
-        color = COLORS['success'] if res['pending'] == 0 else COLORS['warning']
+        self._render(res)
+
+    def _render(self, res: dict):
+        """
+        Pinta el estado y el inventario de paquetes actualizables.
+
+        Args:
+            res (dict): Resultado de UpdateMonitor.check_updates().
+
+        Returns:
+            None
+
+        Raises:
+            None
+        """
+        if res['status'] == "Error":
+            color = COLORS['danger']
+        else:
+            color = COLORS['success'] if res['pending'] == 0 else COLORS['warning']
         self._status_label.configure(text=res['status'], text_color=color)
         self._info_label.configure(text=res['message'])
         self._status_icon.configure(text_color=color)
         self._update_btn.configure(state="normal" if res['pending'] > 0 else "disabled")
 
+        packages = self._monitor.get_packages()
+        lines = [
+            f"{p['name']:<32} {p['current'] or '?'}  →  {p['version']}"
+            for p in packages
+        ]
+        self._packages_box.configure(state="normal")
+        self._packages_box.delete("1.0", "end")
+        self._packages_box.insert("1.0", "\n".join(lines))
+        self._packages_box.configure(state="disabled")
+
     def _poll_until_ready(self):
         """
-        Reintenta refrescar el estado de actualización cada 2 segundos mientras el resultado sea desconocido.
+        Sigue el progreso del refresco de UpdateMonitor y pinta el resultado al terminar.
 
         Args: Ninguno
 
@@ -235,6 +280,12 @@ class UpdatesWindow(ctk.CTkToplevel):
                 return
         except Exception:
             return
+        if self._monitor.is_refreshing():
+            progress = self._monitor.get_progress()
+            self._info_label.configure(
+                text=f"{progress['stage']}: {progress['message']} ({progress['percent']:.0f}%)")
+            self.after(_PROGRESS_POLL_MS, self._poll_until_ready)
+            return
         res = self._monitor.check_updates(force=False)
         if res['status'] != "Unknown":
             self._refresh_status(force=False)
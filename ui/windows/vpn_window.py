@@ -1,9 +1,13 @@
 """
 Ventana de gestión de conexiones VPN dual (OpenVPN + WireGuard).
 
-Muestra el estado en tiempo real de ambas VPNs y permite conectar/desconectar
+Muestra el estado en tiempo real de ambas VPNs (vía 'vpn.state_changed' en el
+EventBus) y permite conectar/desconectar
 usando los scripts del usuario. Al conectar pregunta con cuál VPN; al
 desconectar, si hay más de una activa también pregunta.
+
+Si el VpnMonitor está parado muestra el banner de servicio detenido y lo
+retira en cuanto vuelve a arrancar (comprobación cada _SERVICE_CHECK_MS).
 """
 import os
 import customtkinter as ctk
@@ -11,14 +15,20 @@ import customtkinter as ctk
 from config.settings import (
     COLORS, FONT_FAMILY, FONT_SIZES,
     DSI_WIDTH, DSI_HEIGHT, DSI_X, DSI_Y, SCRIPTS_DIR,
-    Icons, UPDATE_MS,
+    Icons,
 )
 from ui.styles import StyleManager, make_window_header, make_futuristic_button
 from ui.widgets.dialogs import terminal_dialog, custom_msgbox
+from core.event_bus import get_event_bus
+from core.events import VPN_STATE_CHANGED
+from ui.refresh_loop import RefreshLoop
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Vigilancia del estado del VpnMonitor (el estado de las VPN llega por eventos)
+_SERVICE_CHECK_MS = 2000
+
 # ── Scripts por VPN ───────────────────────────────────────────────────────────
 _SCRIPTS = {
     "openvpn": {
@@ -70,9 +80,13 @@ class VpnWindow(ctk.CTkToplevel):
         self._cards: dict[str, dict] = {}
         
         self._btn_connect = None
+        # None hasta el primer tick; True mientras se muestra el banner de servicio parado
+        self._stopped = None
 
         self._create_ui()
-        self._update()
+        get_event_bus().subscribe(VPN_STATE_CHANGED, self._on_vpn_changed)
+        self._service_check = RefreshLoop(self, self._update, _SERVICE_CHECK_MS)
+        self._service_check.start()
         logger.info("[VpnWindow] Ventana abierta")
 
     def destroy(self):
@@ -82,6 +96,7 @@ class VpnWindow(ctk.CTkToplevel):
         Returns:
             None
         """
+        get_event_bus().unsubscribe(VPN_STATE_CHANGED, self._on_vpn_changed)
         logger.info("[VpnWindow] Ventana cerrada")
         super().destroy()
 
@@ -121,6 +136,18 @@ class VpnWindow(ctk.CTkToplevel):
             "<Configure>",
             lambda e: canvas.configure(scrollregion=canvas.bbox("all")),
         )
+        self._build_content()
+
+    def _build_content(self) -> None:
+        """
+        Construye el contenido del área scrollable: tarjetas, acciones y nota.
+
+        Se vuelve a llamar al quitar el banner de servicio parado, que lo destruye.
+
+        Returns:
+            None
+        """
+        self._cards = {}
 
         # ── Tarjetas de estado (una por VPN) ──────────────────────────────────
         for key, cfg in _SCRIPTS.items():
@@ -247,7 +274,11 @@ class VpnWindow(ctk.CTkToplevel):
 
     def _update(self) -> None:
         """
-        Actualiza el estado visual de todas las tarjetas VPN.
+        Vigila el estado del VpnMonitor cada _SERVICE_CHECK_MS.
+
+        Muestra el banner al pararse y, cuando vuelve a arrancar, reconstruye
+        las tarjetas y pinta el estado en caché. Mientras sigue en marcha no
+        hace nada: el estado de las VPN llega por 'vpn.state_changed'.
 
         Returns:
             None
@@ -255,13 +286,47 @@ class VpnWindow(ctk.CTkToplevel):
         if not self.winfo_exists():
             return
 
-        if not self._vpn_monitor.is_running():
-            StyleManager.show_service_stopped_banner(self._inner, "VPN Monitor")
-            self.after(UPDATE_MS, self._update)
+        running = self._vpn_monitor.is_running()
+        if not running:
+            if not self._stopped:
+                self._stopped = True
+                StyleManager.show_service_stopped_banner(self._inner, "VPN Monitor")
             return
 
+        if self._stopped is False:
+            return
+        if self._stopped:
+            for w in self._inner.winfo_children():
+                w.destroy()
+            self._build_content()
+        self._stopped = False
+        self._render(self._vpn_monitor.get_status())
+
+    def _on_vpn_changed(self, data: dict) -> None:
+        """
+        Repinta las tarjetas al recibir 'vpn.state_changed'.
+
+        Args:
+            data (dict): Payload del evento con 'state'.
+
+        Returns:
+            None
+        """
+        if not self.winfo_exists() or self._stopped is not False:
+            return
+        self._render(data["state"])
+
+    def _render(self, status: dict) -> None:
+        """
+        Actualiza el estado visual de todas las tarjetas VPN.
+
+        Args:
+            status (dict): Estado por VPN, como lo devuelve VpnMonitor.get_status().
+
+        Returns:
+            None
+        """
         try:
-            status = self._vpn_monitor.get_status()
             for key, card in self._cards.items():
                 vpn = status.get(key, {})
                 connected = vpn.get("connected", False)
@@ -283,9 +348,7 @@ class VpnWindow(ctk.CTkToplevel):
                 )
 
         except Exception as e:
-            logger.error("[VpnWindow] Error en _update: %s", e)
-
-        self.after(UPDATE_MS, self._update)
+            logger.error("[VpnWindow] Error en _render: %s", e)
 
     # ── Acciones ──────────────────────────────────────────────────────────────
 
@@ -452,10 +515,9 @@ class VpnWindow(ctk.CTkToplevel):
         """
         Callback ejecutado al cerrar el terminal dialog.
 
-        Fuerza un sondeo inmediato para reflejar el nuevo estado en la UI.
+        Fuerza un sondeo inmediato; si el estado cambia llega 'vpn.state_changed'.
 
         Returns:
             None
         """
         self._vpn_monitor.force_poll()
-        self.after(2000, self._update)
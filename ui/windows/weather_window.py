@@ -6,7 +6,10 @@ via Open-Meteo (gratuito, sin clave API).
 
 Arquitectura:
   - Todos los datos vienen de WeatherService.get_stats() — caché, no bloquea UI
-  - Refresco solo al abrir la ventana y con el botón Actualizar
+  - Al abrir o cambiar de ciudad se pinta al instante desde el caché en disco
+    del servicio; si la revalidación en segundo plano trae datos nuevos,
+    get_version() cambia y la ventana se repinta
+  - Descarga forzada con el botón Actualizar
   - Ciudad editable desde la propia ventana
   - Favoritos: guardar ciudad activa, seleccionar desde desplegable, eliminar
   - Máximo de favoritos editable y persistido en config/local_settings.py
@@ -24,7 +27,8 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-
+_VERSION_POLL_MS  = 500   # comprobación barata de stats nuevas del servicio
+_REFRESH_TIMEOUT_S = 30   # el botón Actualizar se reactiva aunque la red no responda
 
 class WeatherWindow(ctk.CTkToplevel):
     """
@@ -75,10 +79,13 @@ class WeatherWindow(ctk.CTkToplevel):
         self._max_fav_var = ctk.StringVar(master=self,
                                           value=str(self._svc.get_max_favorites()))
         self._after_id    = None
+        self._version     = self._svc.get_version()
+        self._refresh_deadline = None    # monotonic; no None mientras se espera Actualizar
 
         self._create_ui()
         self._refresh_favorites_dropdown()
         self._update()
+        self._after_id = self.after(_VERSION_POLL_MS, self._poll_version)
         logger.info("[WeatherWindow] Ventana abierta")
 
     # ── Cierre limpio ─────────────────────────────────────────────────────────
@@ -849,6 +856,31 @@ class WeatherWindow(ctk.CTkToplevel):
         else:
             self._update_forecast_daily(stats.get("forecast_daily", []))
 
+    def _poll_version(self):
+        """
+        Repinta cuando el servicio publica stats nuevas (caché o revalidación).
+
+        Args:
+            Ninguno
+
+        Returns:
+            Ninguno
+
+        Raises:
+            Ninguno
+        """
+        if not self.winfo_exists():
+            return
+        version = self._svc.get_version()
+        changed = version != self._version
+        self._version = version
+        if self._refresh_deadline is not None and (
+                changed or time.monotonic() >= self._refresh_deadline):
+            self._on_refresh_done()
+        elif changed:
+            self._update()
+        self._after_id = self.after(_VERSION_POLL_MS, self._poll_version)
+
     # ── Callbacks — búsqueda ──────────────────────────────────────────────────
 
     def _on_search(self):
@@ -922,16 +954,9 @@ class WeatherWindow(ctk.CTkToplevel):
         self._refresh_btn.configure(state="disabled")
         self._error_lbl.configure(text="Actualizando...", text_color=COLORS['text_dim'])
 
-        
-        def _do():
-            """Función auxiliar interna para fetch_now en hilo separado con delay post-fetch."""
-            
-            self._svc.fetch_now()
-            time.sleep(2)
-            if self.winfo_exists():
-                self.after(0, self._on_refresh_done)
-
-        threading.Thread(target=_do, daemon=True, name="WeatherRefresh").start()
+        # _poll_version cierra el refresco al llegar la nueva versión de stats
+        self._refresh_deadline = time.monotonic() + _REFRESH_TIMEOUT_S
+        self._svc.fetch_now()
 
     def _on_refresh_done(self):
         """
@@ -949,6 +974,7 @@ class WeatherWindow(ctk.CTkToplevel):
         
         if not self.winfo_exists():
             return
+        self._refresh_deadline = None
         self._refresh_btn.configure(state="normal")
         self._error_lbl.configure(text="")
         self._update()
@@ -488,9 +488,12 @@ class WiFiWindow(ctk.CTkToplevel):
         # Interfaz (puede haber cambiado)
         self._lbl_iface.configure(text=self._wifi_monitor.interface)
 
-        # SSID
+        # SSID (+ BSSID del AP, útil para ver roaming)
+        ssid_text = info.get("ssid") or "Sin conexión"
+        if info.get("connected") and info.get("bssid"):
+            ssid_text = f"{ssid_text}  ({info['bssid']})"
         self._lbl_ssid.configure(
-            text=info.get("ssid") or "Sin conexión",
+            text=ssid_text,
             text_color=COLORS['text'] if info.get("connected") else COLORS['warning'])
 
         # Señal
@@ -524,8 +527,8 @@ class WiFiWindow(ctk.CTkToplevel):
             text=info.get("bitrate") or "—",
             text_color=COLORS['text'])
 
-        # Gráfica señal
-        signal_hist = self._wifi_monitor.get_signal_history()
+        # Gráfica señal (muestreo de 0.5s si el monitor lo ofrece)
+        signal_hist = self._wifi_monitor.get_signal_history(fast=True)
         if signal_hist:
             normalized = [max(0.0, min(100.0, 2.0 * (v + 100))) for v in signal_hist]
             self._graph_signal.update(normalized, 100.0, color)
@@ -4,5 +4,6 @@ Paquete de utilidades
 from .file_manager import FileManager
 from .system_utils import SystemUtils
 from .logger import DashboardLogger
+from .http_client import HttpClient, HttpError
 
-__all__ = ['FileManager', 'SystemUtils', 'DashboardLogger']
+__all__ = ['FileManager', 'SystemUtils', 'DashboardLogger', 'HttpClient', 'HttpError']
@@ -0,0 +1,284 @@
+"""
+Homebridge falso para probar HomebridgeMonitor sin red.
+
+Ubicación: utils/homebridge_stub.py
+
+Imita lo que usa el dashboard de homebridge-config-ui-x sobre un StubServer:
+  - REST: POST /api/auth/login, GET /api/accessories, PUT /api/accessories/<uid>
+  - Socket.IO (Engine.IO v4 sobre WebSocket) en /socket.io/, namespace
+    /accessories: responde a "get-accessories" con la lista completa y empuja
+    "accessories-data" con el accesorio afectado en cada cambio
+
+Uso:
+    with FakeHomebridge([
+        {"uniqueId": "a1", "serviceName": "Lámpara", "values": {"On": False}},
+    ]) as hb:
+        monitor = HomebridgeMonitor(base_url=hb.url)
+        monitor.start()
+        hb.set_value("a1", "On", True)      # cambio hecho desde HomeKit → push
+        hb.drop_sockets()                   # simula una caída del socket
+        hb.socket_enabled = False           # fuerza el modo sondeo
+"""
+import copy
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from utils.http_stub import StubRequest, StubServer, StubWebSocket
+
+TOKEN     = "fake-homebridge-token"
+NAMESPACE = "/accessories"
+
+
+class FakeHomebridge:
+    """
+    Servidor Homebridge de pruebas con REST y socket de accesorios.
+
+    Args:
+        accessories (List[Dict]): Accesorios en el formato de /api/accessories.
+        ping_interval (float): Segundos entre pings de Engine.IO.
+    """
+
+    def __init__(self, accessories: List[Dict], ping_interval: float = 25.0):
+        """
+        Prepara el servidor sin arrancarlo.
+
+        Args:
+            accessories (List[Dict]): Accesorios iniciales.
+            ping_interval (float): Segundos entre pings de Engine.IO.
+
+        Returns:
+            None
+        """
+        self._accessories = {a["uniqueId"]: copy.deepcopy(a) for a in accessories}
+        self._lock = threading.Lock()
+        self._clients: List[StubWebSocket] = []
+        self.ping_interval = ping_interval
+        self.socket_enabled = True
+
+        routes = {
+            ("POST", "/api/auth/login"): {"access_token": TOKEN},
+            ("GET", "/api/accessories"): self._get_accessories,
+        }
+        for uid in self._accessories:
+            routes[("PUT", f"/api/accessories/{uid}")] = self._put_accessory
+        self.server = StubServer(routes, ws_routes={"/socket.io/": self._socket})
+
+    @property
+    def url(self) -> str:
+        """
+        URL base HTTP del servidor arrancado.
+
+        Returns:
+            str: http://127.0.0.1:PUERTO
+        """
+        return self.server.url
+
+    def start(self) -> "FakeHomebridge":
+        """
+        Arranca el servidor.
+
+        Returns:
+            FakeHomebridge: self, para encadenar.
+        """
+        self.server.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Para el servidor y cierra los sockets abiertos.
+
+        Returns:
+            None
+        """
+        self.server.stop()
+
+    def __enter__(self) -> "FakeHomebridge":
+        """
+        Arranca el servidor al entrar en el bloque with.
+
+        Returns:
+            FakeHomebridge: self.
+        """
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """
+        Para el servidor al salir del bloque with.
+
+        Returns:
+            None
+        """
+        self.stop()
+
+    # ── Control desde la prueba ───────────────────────────────────────────────
+
+    def set_value(self, unique_id: str, characteristic: str, value: Any,
+                  push: bool = True) -> None:
+        """
+        Cambia una característica como si se hubiera tocado desde HomeKit.
+
+        Args:
+            unique_id (str): Accesorio.
+            characteristic (str): Característica (On, Brightness...).
+            value (Any): Nuevo valor.
+            push (bool): Empujar el cambio a los sockets conectados.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            acc = self._accessories[unique_id]
+            acc.setdefault("values", {})[characteristic] = value
+            snapshot = copy.deepcopy(acc)
+        if push:
+            self._emit_all("accessories-data", [snapshot])
+
+    def drop_sockets(self) -> None:
+        """
+        Cierra desde el servidor todas las conexiones de socket.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            clients = list(self._clients)
+        for ws in clients:
+            ws.close()
+
+    def socket_clients(self) -> int:
+        """
+        Número de clientes conectados al namespace de accesorios.
+
+        Returns:
+            int: Clientes conectados.
+        """
+        with self._lock:
+            return len(self._clients)
+
+    # ── REST ──────────────────────────────────────────────────────────────────
+
+    def _authorized(self, req: StubRequest) -> bool:
+        """
+        Comprueba la cabecera Authorization.
+
+        Args:
+            req (StubRequest): Petición.
+
+        Returns:
+            bool: True si lleva el token válido.
+        """
+        return req.headers.get("authorization") == f"Bearer {TOKEN}"
+
+    def _get_accessories(self, req: StubRequest):
+        """
+        GET /api/accessories.
+
+        Args:
+            req (StubRequest): Petición.
+
+        Returns:
+            Any: Lista de accesorios, o 401.
+        """
+        if not self._authorized(req):
+            return 401, {"message": "Unauthorized"}
+        with self._lock:
+            return copy.deepcopy(list(self._accessories.values()))
+
+    def _put_accessory(self, req: StubRequest):
+        """
+        PUT /api/accessories/<uid>: escribe una característica y la empuja al socket.
+
+        Args:
+            req (StubRequest): Petición.
+
+        Returns:
+            Any: Accesorio actualizado, o 401.
+        """
+        if not self._authorized(req):
+            return 401, {"message": "Unauthorized"}
+        body = req.json() or {}
+        uid = req.path.rsplit("/", 1)[-1]
+        self.set_value(uid, body.get("characteristicType"), body.get("value"))
+        with self._lock:
+            return copy.deepcopy(self._accessories[uid])
+
+    # ── Socket.IO ─────────────────────────────────────────────────────────────
+
+    def _emit(self, ws: StubWebSocket, event: str, data: Any) -> None:
+        """
+        Envía un evento Socket.IO del namespace de accesorios a un cliente.
+
+        Args:
+            ws (StubWebSocket): Cliente.
+            event (str): Nombre del evento.
+            data (Any): Argumento del evento.
+
+        Returns:
+            None
+        """
+        ws.send_text(f"42{NAMESPACE}," + json.dumps([event, data]))
+
+    def _emit_all(self, event: str, data: Any) -> None:
+        """
+        Envía un evento a todos los clientes conectados al namespace.
+
+        Args:
+            event (str): Nombre del evento.
+            data (Any): Argumento del evento.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            clients = list(self._clients)
+        for ws in clients:
+            try:
+                self._emit(ws, event, data)
+            except OSError:
+                pass
+
+    def _socket(self, ws: StubWebSocket) -> None:
+        """
+        Sesión Engine.IO/Socket.IO de un cliente (se ejecuta en su thread).
+
+        Args:
+            ws (StubWebSocket): Conexión WebSocket ya aceptada.
+
+        Returns:
+            None
+        """
+        if not self.socket_enabled:
+            return
+        ws.send_text("0" + json.dumps({
+            "sid": "fake", "upgrades": [], "maxPayload": 1000000,
+            "pingInterval": int(self.ping_interval * 1000), "pingTimeout": 20000,
+        }))
+        joined = False
+        try:
+            while not ws.closed:
+                msg: Optional[str] = ws.recv(timeout=self.ping_interval)
+                if msg is None:
+                    ws.send_text("2")                       # ping de Engine.IO
+                    continue
+                if msg == "3":                              # pong
+                    continue
+                if msg.startswith(f"40{NAMESPACE}"):
+                    if ws.request.query.get("token", [""])[0] != TOKEN:
+                        ws.send_text(f"44{NAMESPACE}," + json.dumps({"message": "Unauthorized"}))
+                        continue
+                    ws.send_text(f"40{NAMESPACE}," + json.dumps({"sid": "fake-ns"}))
+                    with self._lock:
+                        self._clients.append(ws)
+                    joined = True
+                elif msg.startswith(f"42{NAMESPACE},") and joined:
+                    event = json.loads(msg[len(NAMESPACE) + 3:])
+                    if event and event[0] == "get-accessories":
+                        with self._lock:
+                            data = copy.deepcopy(list(self._accessories.values()))
+                        self._emit(ws, "accessories-data", data)
+                elif msg.startswith(f"41{NAMESPACE}") or msg == "1":
+                    return
+        finally:
+            with self._lock:
+                if ws in self._clients:
+                    self._clients.remove(ws)
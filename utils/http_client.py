@@ -0,0 +1,500 @@
+"""
+Cliente HTTP compartido para las integraciones REST (Homebridge, Pi-hole, clima).
+
+Ubicación: utils/http_client.py
+
+  - Conexiones http.client persistentes por host (keep-alive): un pool LIFO
+    de conexiones libres por (esquema, host, puerto), compartido por todos
+    los clientes del proceso
+  - gzip: pide 'Accept-Encoding: gzip' y descomprime la respuesta
+  - Reintentos con backoff exponencial ante errores de red, 429 y 5xx
+    (POST solo se reintenta si la conexión reutilizada estaba muerta)
+  - Métricas por endpoint (host + ruta sin query): peticiones, errores,
+    reintentos y latencia media/última/máxima → get_http_metrics()
+
+Uso:
+    client = HttpClient("http://192.168.1.10:8581", timeout=5)
+    data = client.request_json("POST", "/api/auth/login", json_body={...})
+    client.request_json("GET", "https://api.open-meteo.com/v1/forecast",
+                        params={"latitude": 40.4})
+
+Errores: HttpError para respuestas >= 400 (tras agotar reintentos); los
+fallos de red se propagan como OSError (timeout, conexión rechazada...).
+"""
+import gzip
+import http.client
+import json
+import random
+import threading
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TIMEOUT  = 5.0
+DEFAULT_RETRIES  = 2       # reintentos además del primer intento
+DEFAULT_BACKOFF  = 0.5     # segundos; se duplica en cada reintento
+_BACKOFF_MAX     = 8.0
+_MAX_IDLE_PER_HOST = 4
+_IDLE_TIMEOUT_S  = 60      # conexiones libres más viejas se cierran
+_RETRY_STATUS    = {429, 500, 502, 503, 504}
+_IDEMPOTENT      = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+_USER_AGENT      = "system-dashboard"
+
+# Errores que indican que una conexión keep-alive reutilizada ya estaba cerrada
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+
+class HttpError(Exception):
+    """
+    Respuesta HTTP con código de error (>= 400).
+
+    Args:
+        status (int): Código HTTP.
+        url (str): URL pedida.
+        body (bytes): Cuerpo de la respuesta.
+    """
+
+    def __init__(self, status: int, url: str, body: bytes = b""):
+        """
+        Inicializa el error con el código y la URL.
+
+        Args:
+            status (int): Código HTTP.
+            url (str): URL pedida.
+            body (bytes): Cuerpo de la respuesta.
+
+        Returns:
+            None
+        """
+        super().__init__(f"HTTP {status} en {url}")
+        self.status = status
+        self.url    = url
+        self.body   = body
+
+
+class HttpResponse:
+    """
+    Respuesta ya leída y descomprimida.
+
+    Args:
+        status (int): Código HTTP.
+        headers (Dict[str, str]): Cabeceras (nombres en minúsculas).
+        body (bytes): Cuerpo.
+    """
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        """
+        Guarda los datos de la respuesta.
+
+        Args:
+            status (int): Código HTTP.
+            headers (Dict[str, str]): Cabeceras (nombres en minúsculas).
+            body (bytes): Cuerpo.
+
+        Returns:
+            None
+        """
+        self.status  = status
+        self.headers = headers
+        self.body    = body
+
+    def json(self) -> Any:
+        """
+        Decodifica el cuerpo como JSON.
+
+        Returns:
+            Any: Objeto decodificado; {} si el cuerpo está vacío.
+
+        Raises:
+            ValueError: Si el cuerpo no es JSON válido.
+        """
+        if not self.body:
+            return {}
+        return json.loads(self.body.decode("utf-8"))
+
+
+# ── Métricas ──────────────────────────────────────────────────────────────────
+
+class _Metrics:
+    """
+    Contadores de latencia y errores por endpoint, thread-safe.
+    """
+
+    def __init__(self):
+        """
+        Inicializa las métricas vacías.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict] = {}
+
+    def record(self, endpoint: str, elapsed_ms: float, status: Optional[int],
+               error: str = "", retries: int = 0, reused: bool = False) -> None:
+        """
+        Anota el resultado final de una petición.
+
+        Args:
+            endpoint (str): 'MÉTODO host/ruta'.
+            elapsed_ms (float): Latencia total, reintentos incluidos.
+            status (int | None): Código HTTP, None si falló la red.
+            error (str): Descripción del error, vacío si fue bien.
+            retries (int): Reintentos realizados.
+            reused (bool): True si la conexión venía del pool.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            m = self._data.setdefault(endpoint, {
+                "requests": 0, "errors": 0, "retries": 0, "reused": 0,
+                "total_ms": 0.0, "last_ms": 0.0, "max_ms": 0.0,
+                "last_status": None, "last_error": "", "last_ts": 0.0,
+            })
+            m["requests"]   += 1
+            m["retries"]    += retries
+            m["reused"]     += int(reused)
+            m["total_ms"]   += elapsed_ms
+            m["last_ms"]     = elapsed_ms
+            m["max_ms"]      = max(m["max_ms"], elapsed_ms)
+            m["last_status"] = status
+            m["last_ts"]     = time.time()
+            if error:
+                m["errors"]    += 1
+                m["last_error"] = error
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Copia de las métricas con la latencia media calculada.
+
+        Returns:
+            Dict[str, Dict]: endpoint → requests, errors, retries, reused,
+                             avg_ms, last_ms, max_ms, last_status, last_error, last_ts.
+        """
+        with self._lock:
+            out = {}
+            for endpoint, m in self._data.items():
+                entry = {k: v for k, v in m.items() if k != "total_ms"}
+                entry["avg_ms"] = round(m["total_ms"] / m["requests"], 1) if m["requests"] else 0.0
+                out[endpoint] = entry
+            return out
+
+
+# ── Pool de conexiones ────────────────────────────────────────────────────────
+
+class _ConnectionPool:
+    """
+    Conexiones http.client libres por (esquema, host, puerto).
+
+    Una conexión solo la usa un thread a la vez: se saca del pool con
+    acquire() y se devuelve con release() cuando la respuesta se ha leído
+    entera.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el pool vacío.
+
+        Returns:
+            None
+        """
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[float, http.client.HTTPConnection]]] = {}
+
+    def acquire(self, key: Tuple[str, str, int],
+                timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """
+        Devuelve una conexión libre o crea una nueva.
+
+        Args:
+            key (Tuple[str, str, int]): (esquema, host, puerto).
+            timeout (float): Timeout de socket.
+
+        Returns:
+            Tuple[HTTPConnection, bool]: Conexión y si se reutilizó.
+        """
+        now = time.monotonic()
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                released, candidate = idle.pop()
+                if now - released < _IDLE_TIMEOUT_S:
+                    conn = candidate
+                    break
+                candidate.close()
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        """
+        Devuelve una conexión al pool (o la cierra si ya hay suficientes).
+
+        Args:
+            key (Tuple[str, str, int]): (esquema, host, puerto).
+            conn (HTTPConnection): Conexión con la respuesta ya leída.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < _MAX_IDLE_PER_HOST:
+                idle.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        """
+        Cierra todas las conexiones libres.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, conn in conns:
+                conn.close()
+
+
+_pool    = _ConnectionPool()
+_metrics = _Metrics()
+
+
+def get_http_metrics() -> Dict[str, Dict]:
+    """
+    Métricas de todas las peticiones hechas con HttpClient en el proceso.
+
+    Returns:
+        Dict[str, Dict]: endpoint → contadores (ver _Metrics.snapshot).
+    """
+    return _metrics.snapshot()
+
+
+def close_idle_connections() -> None:
+    """
+    Cierra las conexiones keep-alive libres (p. ej. al salir).
+
+    Returns:
+        None
+    """
+    _pool.close_all()
+
+
+# ── Cliente ───────────────────────────────────────────────────────────────────
+
+class HttpClient:
+    """
+    Cliente REST sobre el pool de conexiones compartido.
+
+    Args:
+        base_url (str): Prefijo de las rutas relativas ('' si se usan URLs absolutas).
+        timeout (float): Timeout de socket por petición.
+        retries (int): Reintentos ante errores transitorios.
+        backoff (float): Espera inicial entre reintentos (se duplica).
+        headers (Dict[str, str], opcional): Cabeceras añadidas a todas las peticiones.
+    """
+
+    def __init__(self, base_url: str = "", timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Configura el cliente; no abre conexiones hasta la primera petición.
+
+        Args:
+            base_url (str): Prefijo de las rutas relativas.
+            timeout (float): Timeout de socket por petición.
+            retries (int): Reintentos ante errores transitorios.
+            backoff (float): Espera inicial entre reintentos.
+            headers (Dict[str, str], opcional): Cabeceras comunes.
+
+        Returns:
+            None
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout  = timeout
+        self.retries  = retries
+        self.backoff  = backoff
+        self._headers = dict(headers or {})
+
+    def request(self, method: str, path: str, params: Optional[Dict] = None,
+                json_body: Any = None, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None,
+                retries: Optional[int] = None) -> HttpResponse:
+        """
+        Hace una petición reutilizando conexiones y reintentando si procede.
+
+        Args:
+            method (str): Método HTTP.
+            path (str): Ruta relativa a base_url, o URL absoluta.
+            params (Dict, opcional): Parámetros de query string.
+            json_body (Any, opcional): Cuerpo a enviar como JSON.
+            headers (Dict[str, str], opcional): Cabeceras de esta petición.
+            timeout (float, opcional): Sustituye al timeout del cliente.
+            retries (int, opcional): Sustituye a los reintentos del cliente.
+
+        Returns:
+            HttpResponse: Respuesta con código < 400.
+
+        Raises:
+            HttpError: Si la respuesta final es >= 400.
+            OSError: Si falla la red en todos los intentos.
+        """
+        method = method.upper()
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        target = parts.path or "/"
+        query = parts.query
+        if params:
+            extra = urllib.parse.urlencode(params)
+            query = f"{query}&{extra}" if query else extra
+        if query:
+            target = f"{target}?{query}"
+        endpoint = f"{method} {parts.netloc}{parts.path or '/'}"
+
+        body = None
+        all_headers = {
+            "Accept-Encoding": "gzip",
+            "User-Agent":      _USER_AGENT,
+            "Connection":      "keep-alive",
+            **self._headers,
+            **(headers or {}),
+        }
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            all_headers.setdefault("Content-Type", "application/json")
+
+        timeout = self.timeout if timeout is None else timeout
+        max_retries = self.retries if retries is None else retries
+        start = time.monotonic()
+        attempt = 0
+        reused_any = False
+        while True:
+            status = None
+            try:
+                resp, reused = self._send(key, method, target, body, all_headers, timeout)
+                reused_any |= reused
+                status = resp.status
+                if status < 400:
+                    self._record(endpoint, start, status, "", attempt, reused_any)
+                    return resp
+                error: Exception = HttpError(status, url, resp.body)
+                retryable = status in _RETRY_STATUS and method in _IDEMPOTENT
+            except OSError as e:
+                error = e
+                retryable = method in _IDEMPOTENT
+            except http.client.HTTPException as e:
+                error = ConnectionError(f"Respuesta HTTP inválida de {parts.netloc}: {e}")
+                retryable = method in _IDEMPOTENT
+
+            if not retryable or attempt >= max_retries:
+                self._record(endpoint, start, status, str(error), attempt, reused_any)
+                raise error
+            delay = min(_BACKOFF_MAX, self.backoff * (2 ** attempt))
+            delay += random.uniform(0, delay * 0.1)
+            logger.debug("[HttpClient] %s falló (%s), reintento %d en %.1fs",
+                         endpoint, error, attempt + 1, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def request_json(self, method: str, path: str, **kwargs) -> Any:
+        """
+        Como request(), pero devuelve el cuerpo decodificado como JSON.
+
+        Args:
+            method (str): Método HTTP.
+            path (str): Ruta relativa o URL absoluta.
+            **kwargs: Argumentos de request().
+
+        Returns:
+            Any: JSON decodificado; {} si la respuesta no tiene cuerpo.
+
+        Raises:
+            HttpError, OSError, ValueError: Ver request() y HttpResponse.json().
+        """
+        return self.request(method, path, **kwargs).json()
+
+    # ── Internos ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _send(key: Tuple[str, str, int], method: str, target: str,
+              body: Optional[bytes], headers: Dict[str, str],
+              timeout: float) -> Tuple[HttpResponse, bool]:
+        """
+        Envía la petición por una conexión del pool y lee la respuesta entera.
+
+        Si una conexión reutilizada resulta estar cerrada por el servidor se
+        repite una vez con una conexión nueva (no cuenta como reintento).
+
+        Args:
+            key (Tuple[str, str, int]): (esquema, host, puerto).
+            method (str): Método HTTP.
+            target (str): Ruta con query string.
+            body (bytes | None): Cuerpo.
+            headers (Dict[str, str]): Cabeceras.
+            timeout (float): Timeout de socket.
+
+        Returns:
+            Tuple[HttpResponse, bool]: Respuesta y si la conexión venía del pool.
+
+        Raises:
+            OSError, http.client.HTTPException: Errores de red o de protocolo.
+        """
+        while True:
+            conn, reused = _pool.acquire(key, timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                raw = conn.getresponse()
+                data = raw.read()
+            except _STALE_ERRORS:
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            resp_headers = {k.lower(): v for k, v in raw.getheaders()}
+            if raw.will_close:
+                conn.close()
+            else:
+                _pool.release(key, conn)
+            if resp_headers.get("content-encoding", "").lower() == "gzip":
+                data = gzip.decompress(data)
+            return HttpResponse(raw.status, resp_headers, data), reused
+
+    @staticmethod
+    def _record(endpoint: str, start: float, status: Optional[int], error: str,
+                retries: int, reused: bool) -> None:
+        """
+        Anota la petición en las métricas globales.
+
+        Args:
+            endpoint (str): 'MÉTODO host/ruta'.
+            start (float): time.monotonic() al empezar.
+            status (int | None): Código HTTP final.
+            error (str): Error final, vacío si fue bien.
+            retries (int): Reintentos hechos.
+            reused (bool): Si alguna conexión venía del pool.
+
+        Returns:
+            None
+        """
+        _metrics.record(endpoint, (time.monotonic() - start) * 1000, status,
+                        error, retries, reused)
@@ -0,0 +1,340 @@
+"""
+Servidor HTTP local de pruebas para utils/http_client.py y las integraciones REST.
+
+Ubicación: utils/http_stub.py
+
+Levanta un ThreadingHTTPServer en 127.0.0.1 (puerto libre) que habla
+HTTP/1.1 con keep-alive y responde según una tabla de rutas. Permite probar
+Homebridge, Pi-hole o el clima sin red y comprobar que las conexiones se
+reutilizan (connections) y que se aplican gzip y reintentos.
+
+Uso:
+    with StubServer({
+        ("GET", "/api/stats/summary"): {"queries": {"total": 10}},
+        ("POST", "/api/auth"): lambda req: (200, {"session": {"sid": "x"}}),
+        ("GET", "/flaky"): [(503, {}), (200, {"ok": True})],   # secuencia
+    }) as stub:
+        client = HttpClient(stub.url)
+        client.request_json("GET", "/api/stats/summary")
+        stub.connections   # → 1 si se reutilizó la conexión
+
+Cada ruta puede ser:
+  - un objeto JSON              → 200 con ese cuerpo
+  - (status, objeto)            → ese código y cuerpo
+  - lista de los anteriores     → uno por petición; el último se repite
+  - callable(StubRequest)       → devuelve alguno de los anteriores
+
+ws_routes añade rutas WebSocket: ruta → callable(StubWebSocket), que se
+ejecuta en el thread de la conexión tras el handshake (utils/homebridge_stub.py).
+"""
+import gzip
+import json
+import select
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from utils.ws_client import (OP_CLOSE, OP_PING, OP_PONG, OP_TEXT, WebSocketError,
+                             accept_key, read_frame, write_frame)
+
+
+class StubRequest:
+    """
+    Petición recibida por el stub.
+
+    Args:
+        method (str): Método HTTP.
+        path (str): Ruta sin query.
+        query (Dict[str, List[str]]): Parámetros de la query string.
+        headers (Dict[str, str]): Cabeceras (nombres en minúsculas).
+        body (bytes): Cuerpo.
+    """
+
+    def __init__(self, method: str, path: str, query: Dict[str, List[str]],
+                 headers: Dict[str, str], body: bytes):
+        """
+        Guarda los datos de la petición.
+
+        Args:
+            method (str): Método HTTP.
+            path (str): Ruta sin query.
+            query (Dict[str, List[str]]): Parámetros de la query string.
+            headers (Dict[str, str]): Cabeceras.
+            body (bytes): Cuerpo.
+
+        Returns:
+            None
+        """
+        self.method  = method
+        self.path    = path
+        self.query   = query
+        self.headers = headers
+        self.body    = body
+
+    def json(self) -> Any:
+        """
+        Cuerpo decodificado como JSON.
+
+        Returns:
+            Any: Objeto decodificado, o None si no hay cuerpo.
+        """
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+
+class StubWebSocket:
+    """
+    Extremo de servidor de una conexión WebSocket del stub.
+
+    Args:
+        sock (socket.socket): Socket de la conexión ya actualizada.
+        request (StubRequest): Petición del handshake (query con el token, etc.).
+    """
+
+    def __init__(self, sock: socket.socket, request: StubRequest):
+        """
+        Envuelve el socket tras el handshake.
+
+        Args:
+            sock (socket.socket): Socket de la conexión.
+            request (StubRequest): Petición del handshake.
+
+        Returns:
+            None
+        """
+        self._sock = sock
+        self._send_lock = threading.Lock()
+        self.request = request
+        self.closed = False
+
+    def send_text(self, text: str) -> None:
+        """
+        Envía un mensaje de texto al cliente.
+
+        Args:
+            text (str): Mensaje.
+
+        Returns:
+            None
+        """
+        with self._send_lock:
+            write_frame(self._sock, OP_TEXT, text.encode("utf-8"), mask=False)
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Espera el siguiente mensaje de texto del cliente.
+
+        Args:
+            timeout (float, opcional): Segundos máximos de espera.
+
+        Returns:
+            Optional[str]: Mensaje, o None si vence el timeout.
+
+        Raises:
+            WebSocketError: Si el cliente cierra la conexión.
+        """
+        while True:
+            ready, _, _ = select.select([self._sock], [], [], timeout)
+            if not ready:
+                return None
+            _fin, opcode, payload = read_frame(self._sock)
+            if opcode == OP_PING:
+                with self._send_lock:
+                    write_frame(self._sock, OP_PONG, payload, mask=False)
+            elif opcode == OP_CLOSE:
+                self.closed = True
+                raise WebSocketError("el cliente cerró la conexión")
+            elif opcode == OP_TEXT:
+                return payload.decode("utf-8")
+
+    def close(self) -> None:
+        """
+        Cierra la conexión desde el servidor (simula una caída).
+
+        Returns:
+            None
+        """
+        self.closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class StubServer:
+    """
+    Servidor HTTP/1.1 de pruebas con rutas fijas.
+
+    Args:
+        routes (Dict[Tuple[str, str], Any]): (método, ruta) → respuesta.
+        gzip_responses (bool): Comprime si el cliente envía Accept-Encoding: gzip.
+        ws_routes (Dict[str, Callable], opcional): ruta → handler(StubWebSocket).
+    """
+
+    def __init__(self, routes: Dict[Tuple[str, str], Any], gzip_responses: bool = True,
+                 ws_routes: Optional[Dict[str, Callable[[StubWebSocket], None]]] = None):
+        """
+        Prepara el servidor sin arrancarlo.
+
+        Args:
+            routes (Dict[Tuple[str, str], Any]): (método, ruta) → respuesta.
+            gzip_responses (bool): Comprime si el cliente lo acepta.
+            ws_routes (Dict[str, Callable], opcional): ruta → handler(StubWebSocket).
+
+        Returns:
+            None
+        """
+        self._routes = {(m.upper(), p): r for (m, p), r in routes.items()}
+        self._ws_routes = dict(ws_routes or {})
+        self.websockets: List[StubWebSocket] = []
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._gzip = gzip_responses
+        self._lock = threading.Lock()
+        self.requests: List[StubRequest] = []
+        self.connections = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        URL base del servidor arrancado.
+
+        Returns:
+            str: http://127.0.0.1:PUERTO
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """
+        Arranca el servidor en un thread daemon.
+
+        Returns:
+            StubServer: self, para encadenar.
+        """
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+                req = StubRequest(self.command, parts.path, parse_qs(parts.query),
+                                  {k.lower(): v for k, v in self.headers.items()}, body)
+                if (req.headers.get("upgrade", "").lower() == "websocket"
+                        and req.path in stub._ws_routes):
+                    self._upgrade(req)
+                    return
+                status, payload = stub._respond(req)
+                data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if stub._gzip and data and "gzip" in req.headers.get("accept-encoding", ""):
+                    data = gzip.compress(data)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _upgrade(self, req):
+                self.send_response(101)
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header("Sec-WebSocket-Accept",
+                                 accept_key(req.headers.get("sec-websocket-key", "")))
+                self.end_headers()
+                self.wfile.flush()
+                ws = StubWebSocket(self.connection, req)
+                with stub._lock:
+                    stub.requests.append(req)
+                    stub.websockets.append(ws)
+                try:
+                    stub._ws_routes[req.path](ws)
+                except (WebSocketError, OSError):
+                    pass
+                finally:
+                    ws.close()
+                    with stub._lock:
+                        stub.websockets.remove(ws)
+                    self.close_connection = True
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True, name="HttpStub")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Para el servidor.
+
+        Returns:
+            None
+        """
+        if self._server is not None:
+            with self._lock:
+                websockets = list(self.websockets)
+            for ws in websockets:
+                ws.close()
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubServer":
+        """
+        Arranca el servidor al entrar en el bloque with.
+
+        Returns:
+            StubServer: self.
+        """
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        """
+        Para el servidor al salir del bloque with.
+
+        Returns:
+            None
+        """
+        self.stop()
+
+    def _respond(self, req: StubRequest) -> Tuple[int, Any]:
+        """
+        Resuelve la respuesta de una petición según la tabla de rutas.
+
+        Args:
+            req (StubRequest): Petición recibida.
+
+        Returns:
+            Tuple[int, Any]: Código y cuerpo JSON (None = sin cuerpo).
+        """
+        key = (req.method, req.path)
+        with self._lock:
+            self.requests.append(req)
+            index = self._calls.get(key, 0)
+            self._calls[key] = index + 1
+        if key not in self._routes:
+            return 404, {"error": f"sin ruta para {req.method} {req.path}"}
+        route = self._routes[key]
+        if isinstance(route, list):
+            route = route[min(index, len(route) - 1)]
+        if callable(route):
+            route = route(req)
+        if isinstance(route, tuple):
+            return route
+        return 200, route
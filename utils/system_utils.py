@@ -1,6 +1,7 @@
 """
 Utilidades para obtener información del sistema
 """
+import os
 import re
 import socket
 import psutil
@@ -463,3 +464,120 @@ class SystemUtils:
             pass
 
         return 0.0
+
+    # ── CPU: frecuencia y throttling ──────────────────────────────────────────
+
+    # Bits de get_throttled (firmware Raspberry Pi)
+    THROTTLE_BITS = {
+        0:  'under_voltage',
+        1:  'freq_capped',
+        2:  'throttled',
+        3:  'soft_temp_limit',
+        16: 'under_voltage_occurred',
+        17: 'freq_capped_occurred',
+        18: 'throttled_occurred',
+        19: 'soft_temp_limit_occurred',
+    }
+
+    _THROTTLED_SYSFS = "/sys/devices/platform/soc/soc:firmware/get_throttled"
+
+    @staticmethod
+    def read_sysfs_int(path: str, base: int = 0) -> Optional[int]:
+        """
+        Lee un fichero de sysfs que contiene un único entero.
+
+        Args:
+            path (str): Ruta del fichero.
+            base (int): Base numérica; 0 deduce la base del prefijo (0x...),
+                16 para nodos que imprimen hex sin prefijo (get_throttled).
+
+        Returns:
+            Optional[int]: Valor leído, o None si no existe o no es un entero.
+        """
+        try:
+            with open(path) as f:
+                return int(f.read().strip(), base)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def get_cpufreq_policies() -> list:
+        """
+        Descubre las políticas cpufreq y los núcleos que gobierna cada una.
+
+        En la Pi 5 todos los núcleos comparten una única política, así que leer
+        una vez por política evita abrir un fichero por núcleo en cada muestra.
+
+        Returns:
+            list: Lista de dicts {'path', 'cores', 'min_mhz', 'max_mhz'}.
+                  Vacía si el kernel no expone cpufreq.
+        """
+        policies = {}
+        for cpu_dir in sorted(glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq")):
+            try:
+                core = int(re.search(r"cpu(\d+)/cpufreq$", cpu_dir).group(1))
+            except AttributeError:
+                continue
+            real = os.path.realpath(cpu_dir)
+            entry = policies.setdefault(real, {'path': real, 'cores': []})
+            entry['cores'].append(core)
+
+        result = []
+        for entry in policies.values():
+            min_khz = SystemUtils.read_sysfs_int(os.path.join(entry['path'], "cpuinfo_min_freq"))
+            max_khz = SystemUtils.read_sysfs_int(os.path.join(entry['path'], "cpuinfo_max_freq"))
+            entry['min_mhz'] = min_khz / 1000.0 if min_khz else 0.0
+            entry['max_mhz'] = max_khz / 1000.0 if max_khz else 0.0
+            entry['cores'].sort()
+            result.append(entry)
+        return result
+
+    @staticmethod
+    def has_throttled_sysfs() -> bool:
+        """
+        Indica si el firmware expone get_throttled en sysfs (lectura sin fork).
+
+        Returns:
+            bool: True si el fichero existe.
+        """
+        return os.path.exists(SystemUtils._THROTTLED_SYSFS)
+
+    @staticmethod
+    def get_throttled() -> Optional[int]:
+        """
+        Obtiene la máscara de throttling/sub-voltaje del firmware de la Raspberry Pi.
+
+        Intenta primero sysfs (sin fork) y recurre a `vcgencmd get_throttled`.
+
+        Returns:
+            Optional[int]: Máscara de bits, o None si no está disponible.
+        """
+        value = SystemUtils.read_sysfs_int(SystemUtils._THROTTLED_SYSFS, base=16)
+        if value is not None:
+            return value
+        try:
+            out = subprocess.check_output(
+                ["vcgencmd", "get_throttled"],
+                universal_newlines=True,
+                timeout=2
+            )
+            return int(out.strip().split("=", 1)[1], 16)
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError,
+                FileNotFoundError, IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def decode_throttled(value: Optional[int]) -> Dict[str, bool]:
+        """
+        Decodifica la máscara de get_throttled en flags legibles.
+
+        Args:
+            value (Optional[int]): Máscara devuelta por get_throttled().
+
+        Returns:
+            Dict[str, bool]: Flag → activo. Vacío si value es None.
+        """
+        if value is None:
+            return {}
+        return {name: bool(value & (1 << bit))
+                for bit, name in SystemUtils.THROTTLE_BITS.items()}
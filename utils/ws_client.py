@@ -0,0 +1,369 @@
+"""
+Cliente WebSocket mínimo (RFC 6455) sin dependencias externas.
+
+Ubicación: utils/ws_client.py
+
+Pensado para las integraciones que empujan estado por una conexión
+persistente (Socket.IO de homebridge-config-ui-x): solo mensajes de texto,
+ping/pong y cierre; sin extensiones ni compresión por mensaje.
+
+Uso:
+    ws = WebSocketClient.connect("ws://192.168.1.10:8581/socket.io/?EIO=4&transport=websocket")
+    ws.send_text("40/accessories,")
+    msg = ws.recv(timeout=30)   # None si vence el timeout
+    ws.close()
+
+Errores: WebSocketError si el handshake falla o el servidor cierra la
+conexión; los fallos de red se propagan como OSError.
+
+read_frame() y write_frame() se comparten con el servidor de pruebas
+(utils/http_stub.py).
+"""
+import base64
+import hashlib
+import os
+import select
+import socket
+import struct
+import threading
+import urllib.parse
+from typing import Dict, Optional, Tuple
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONT  = 0x0
+OP_TEXT  = 0x1
+OP_BIN   = 0x2
+OP_CLOSE = 0x8
+OP_PING  = 0x9
+OP_PONG  = 0xA
+
+_MAX_FRAME = 16 * 1024 * 1024  # protección ante longitudes absurdas
+_FRAME_TIMEOUT = 10.0          # una trama ya empezada debe completarse en este tiempo
+
+
+class WebSocketError(Exception):
+    """Handshake rechazado, trama inválida o conexión cerrada por el servidor."""
+
+
+def accept_key(key: str) -> str:
+    """
+    Calcula Sec-WebSocket-Accept para una Sec-WebSocket-Key.
+
+    Args:
+        key (str): Clave enviada por el cliente.
+
+    Returns:
+        str: Valor esperado de Sec-WebSocket-Accept.
+    """
+    digest = hashlib.sha1((key + _GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _read_exact(sock: socket.socket, n: int) -> bytes:
+    """
+    Lee exactamente n bytes del socket.
+
+    Args:
+        sock (socket.socket): Socket conectado.
+        n (int): Bytes a leer.
+
+    Returns:
+        bytes: Datos leídos.
+
+    Raises:
+        WebSocketError: Si el otro extremo cierra la conexión.
+    """
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise WebSocketError("conexión cerrada por el otro extremo")
+        buf += chunk
+    return bytes(buf)
+
+
+def read_frame(sock: socket.socket) -> Tuple[bool, int, bytes]:
+    """
+    Lee una trama y la desenmascara si viene enmascarada.
+
+    Args:
+        sock (socket.socket): Socket conectado.
+
+    Returns:
+        Tuple[bool, int, bytes]: (fin, opcode, payload).
+
+    Raises:
+        WebSocketError: Si la trama es inválida o la conexión se cierra.
+    """
+    b1, b2 = _read_exact(sock, 2)
+    fin, opcode = bool(b1 & 0x80), b1 & 0x0F
+    masked, length = bool(b2 & 0x80), b2 & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", _read_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", _read_exact(sock, 8))[0]
+    if length > _MAX_FRAME:
+        raise WebSocketError(f"trama demasiado grande ({length} bytes)")
+    mask = _read_exact(sock, 4) if masked else None
+    payload = _read_exact(sock, length) if length else b""
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return fin, opcode, payload
+
+
+def write_frame(sock: socket.socket, opcode: int, payload: bytes, mask: bool) -> None:
+    """
+    Escribe una trama completa (FIN=1).
+
+    Args:
+        sock (socket.socket): Socket conectado.
+        opcode (int): Tipo de trama (OP_TEXT, OP_PING...).
+        payload (bytes): Datos.
+        mask (bool): True en el cliente (obligatorio por RFC 6455), False en el servidor.
+
+    Returns:
+        None
+    """
+    length = len(payload)
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    sock.sendall(bytes(header) + payload)
+
+
+class WebSocketClient:
+    """
+    Conexión WebSocket de cliente ya establecida.
+
+    Args:
+        sock (socket.socket): Socket tras un handshake correcto.
+        buffered (bytes): Bytes recibidos junto a la respuesta del handshake.
+    """
+
+    def __init__(self, sock: socket.socket, buffered: bytes = b""):
+        """
+        Envuelve un socket ya actualizado a WebSocket.
+
+        Args:
+            sock (socket.socket): Socket conectado.
+            buffered (bytes): Bytes leídos de más durante el handshake.
+
+        Returns:
+            None
+        """
+        self._sock = _BufferedSocket(sock, buffered)
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def connect(cls, url: str, timeout: float = 10.0,
+                headers: Optional[Dict[str, str]] = None) -> "WebSocketClient":
+        """
+        Abre la conexión TCP y realiza el handshake HTTP Upgrade.
+
+        Args:
+            url (str): URL ws:// (wss:// no está soportado).
+            timeout (float): Timeout de conexión y handshake en segundos.
+            headers (Dict[str, str], opcional): Cabeceras extra del handshake.
+
+        Returns:
+            WebSocketClient: Conexión lista para enviar y recibir.
+
+        Raises:
+            WebSocketError: Si el esquema no es ws:// o el servidor rechaza el upgrade.
+            OSError: Si falla la conexión.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "ws":
+            raise WebSocketError(f"esquema no soportado: {parts.scheme}")
+        host, port = parts.hostname, parts.port or 80
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        sock = socket.create_connection((host, port), timeout=timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            key = base64.b64encode(os.urandom(16)).decode("ascii")
+            lines = [
+                f"GET {target} HTTP/1.1",
+                f"Host: {host}:{port}",
+                "Upgrade: websocket",
+                "Connection: Upgrade",
+                f"Sec-WebSocket-Key: {key}",
+                "Sec-WebSocket-Version: 13",
+            ]
+            lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+            data = b""
+            while b"\r\n\r\n" not in data:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise WebSocketError("conexión cerrada durante el handshake")
+                data += chunk
+                if len(data) > 65536:
+                    raise WebSocketError("cabeceras de handshake demasiado largas")
+            head, _, rest = data.partition(b"\r\n\r\n")
+            status_line, *header_lines = head.decode("latin-1").split("\r\n")
+            status = status_line.split(" ", 2)
+            if len(status) < 2 or status[1] != "101":
+                raise WebSocketError(f"upgrade rechazado: {status_line}")
+            resp = {}
+            for line in header_lines:
+                name, _, value = line.partition(":")
+                resp[name.strip().lower()] = value.strip()
+            if resp.get("sec-websocket-accept") != accept_key(key):
+                raise WebSocketError("Sec-WebSocket-Accept inválido")
+        except BaseException:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        return cls(sock, rest)
+
+    def send_text(self, text: str) -> None:
+        """
+        Envía un mensaje de texto.
+
+        Args:
+            text (str): Mensaje.
+
+        Returns:
+            None
+        """
+        with self._send_lock:
+            write_frame(self._sock, OP_TEXT, text.encode("utf-8"), mask=True)
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Espera el siguiente mensaje de texto, respondiendo a los ping por el camino.
+
+        Args:
+            timeout (float, opcional): Segundos máximos de espera; None bloquea.
+
+        Returns:
+            Optional[str]: Mensaje recibido, o None si vence el timeout.
+
+        Raises:
+            WebSocketError: Si el servidor cierra la conexión o envía una trama inválida.
+        """
+        parts = []
+        while True:
+            # Esperar al inicio de trama con select: un timeout nunca corta una trama a medias
+            if not self._sock.pending():
+                ready, _, _ = select.select([self._sock], [], [], timeout)
+                if not ready:
+                    if parts:
+                        raise WebSocketError("timeout a mitad de un mensaje fragmentado")
+                    return None
+            self._sock.settimeout(_FRAME_TIMEOUT)
+            try:
+                fin, opcode, payload = read_frame(self._sock)
+            except socket.timeout:
+                raise WebSocketError("trama incompleta")
+            if opcode == OP_PING:
+                with self._send_lock:
+                    write_frame(self._sock, OP_PONG, payload, mask=True)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                self._closed = True
+                raise WebSocketError("el servidor cerró la conexión")
+            parts.append(payload)
+            if fin:
+                return b"".join(parts).decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        """
+        Envía la trama de cierre (si se puede) y cierra el socket.
+
+        Puede llamarse desde otro thread para desbloquear recv().
+
+        Returns:
+            None
+        """
+        if not self._closed:
+            self._closed = True
+            try:
+                with self._send_lock:
+                    write_frame(self._sock, OP_CLOSE, struct.pack("!H", 1000), mask=True)
+            except OSError:
+                pass
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class _BufferedSocket:
+    """
+    Socket que entrega primero los bytes leídos de más durante el handshake.
+
+    Args:
+        sock (socket.socket): Socket real.
+        buffered (bytes): Bytes pendientes de entregar.
+    """
+
+    def __init__(self, sock: socket.socket, buffered: bytes):
+        """
+        Envuelve el socket.
+
+        Args:
+            sock (socket.socket): Socket real.
+            buffered (bytes): Bytes pendientes.
+
+        Returns:
+            None
+        """
+        self._sock = sock
+        self._buf = buffered
+
+    def pending(self) -> bool:
+        """
+        Indica si quedan bytes del handshake por entregar.
+
+        Returns:
+            bool: True si hay bytes en el buffer.
+        """
+        return bool(self._buf)
+
+    def recv(self, n: int) -> bytes:
+        """
+        Lee del buffer pendiente y, cuando se agota, del socket.
+
+        Args:
+            n (int): Bytes máximos.
+
+        Returns:
+            bytes: Datos leídos.
+        """
+        if self._buf:
+            data, self._buf = self._buf[:n], self._buf[n:]
+            return data
+        return self._sock.recv(n)
+
+    def __getattr__(self, name):
+        """
+        Delega el resto de operaciones en el socket real.
+
+        Args:
+            name (str): Atributo pedido.
+
+        Returns:
+            Any: Atributo del socket real.
+        """
+        return getattr(self._sock, name)